@@ -0,0 +1,113 @@
+"""
+Compare the legacy `LoadImage` path (PIL decode -> np.array copy -> cvtColor copy) with
+    the current `utils.images.LoadImage` on large generated images, and the binarization
+    of the loaded image with the strip-wise `LoadBinaryImage`.
+
+Usage (from the `app` folder):
+```
+python -m benchmarks.load_image --width 8000 --height 6000 --repeat 3
+```
+
+The traced peak only counts the Python/NumPy allocations, the decoder's own buffer
+    (allocated by PIL in C) is the same for both paths and is not included.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+from PIL import Image
+import numpy as np
+import cv2 as cv
+
+from utils.images import ConvertToBinary, LoadImage, LoadBinaryImage
+
+
+def LegacyLoadImage(imagePath: str) -> cv.Mat | None:
+    return cv.cvtColor(np.array(Image.open(imagePath)), cv.COLOR_RGB2BGR)  # type: ignore
+
+
+def CreateTestImage(folder: str, width: int, height: int, extension: str) -> str:
+    # smooth gradients with some noise: compresses like a photo, not like random data
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    noise = np.random.default_rng(0).integers(0, 16, (height, width), dtype=np.uint8)
+    red = (x + y * 0).astype(np.uint8) + noise
+    green = (x * 0 + y).astype(np.uint8)
+    blue = ((x + y) / 2).astype(np.uint8)
+
+    imagePath = os.path.join(folder, f"benchmark-{width}x{height}.{extension}")
+    Image.fromarray(np.dstack([red, green, blue])).save(imagePath, quality=90)
+    return imagePath
+
+
+def Measure(
+    loader: Callable[[], cv.Mat | None], repeat: int
+) -> tuple[float, float, tuple[int, ...]]:
+    """
+    Returns:
+        The best duration (seconds), the peak of the traced NumPy allocations (MiB) and
+            the shape of the loaded image.
+    """
+    bestDuration = float("inf")
+    peak = 0
+    shape: tuple[int, ...] = ()
+
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        image = loader()
+        bestDuration = min(bestDuration, time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        assert image is not None
+        shape = image.shape
+        del image
+
+    return bestDuration, peak / (1024 * 1024), shape
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LoadImage benchmark")
+    parser.add_argument("--width", type=int, default=8000)
+    parser.add_argument("--height", type=int, default=6000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in ("png", "jpg"):
+            imagePath = CreateTestImage(folder, args.width, args.height, extension)
+            cases: list[tuple[str, Callable[[], cv.Mat | None]]] = [
+                ("legacy", lambda: LegacyLoadImage(imagePath)),
+                ("LoadImage", lambda: LoadImage(imagePath)),
+            ]
+            cases += [
+                (f"LoadImage 1/{reduce}", lambda reduce=reduce: LoadImage(imagePath, reduce))  # type: ignore
+                for reduce in (2, 4, 8)
+            ]
+            cases += [
+                (
+                    "binarize loaded",
+                    lambda: ConvertToBinary(LoadImage(imagePath)),
+                ),
+                ("binarize strips", lambda: LoadBinaryImage(imagePath)),
+                (
+                    "binarize strips 1/4",
+                    lambda: LoadBinaryImage(imagePath, reduce=4),
+                ),
+            ]
+
+            print(f"===== {extension.upper()} {args.width}x{args.height} =====")
+            for name, loader in cases:
+                duration, peak, shape = Measure(loader, args.repeat)
+                print(
+                    f"{name:<20} {duration * 1000:>9.1f} ms "
+                    f"{peak:>9.1f} MiB traced peak   shape={shape}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measure the scaling of `CarveVolumeParallel` with the number of worker processes,
+    compared with the single-process `CarveVolume`, on generated silhouettes.
+
+Usage (from the `app` folder):
+```
+python -m benchmarks.parallel_carving --resolution 512 --views 4 --repeat 3
+```
+
+The speedup is only near-linear up to the number of physical cores, and it includes
+    the start of the pool (and the copy of the silhouettes into each worker).
+"""
+
+import argparse
+import os
+import time
+from typing import Callable
+import numpy as np
+import cv2 as cv
+
+from modules.parallel_carving import CarveVolumeParallel
+from modules.sculpture_engine import CarveVolume, Silhouette
+
+
+def CreateSilhouettes(count: int, size: int = 512) -> list[Silhouette]:
+    mask = np.zeros((size, size), dtype=np.uint8)
+    cv.circle(mask, (size // 2, size // 2), size * 2 // 5, 255, -1)
+    cv.rectangle(mask, (size // 8, size // 2), (size * 7 // 8, size * 5 // 8), 255, -1)
+
+    directions = [(0, 0, -1), (-1, 0, 0), (0, -1, 0), (1, 1, 1), (-1, 1, -1), (1, 0, 1)]
+    return [Silhouette(mask, directions[i % len(directions)]) for i in range(count)]
+
+
+def Measure(carve: Callable[[], None], repeat: int) -> float:
+    """
+    Returns:
+        The best duration (seconds).
+    """
+    bestDuration = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        carve()
+        bestDuration = min(bestDuration, time.perf_counter() - start)
+
+    return bestDuration
+
+
+def CarveParallel(silhouettes: list[Silhouette], resolution: int, workers: int) -> None:
+    CarveVolumeParallel(silhouettes, resolution, workers).Close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parallel carving benchmark")
+    parser.add_argument("--resolution", type=int, default=512)
+    parser.add_argument("--views", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    silhouettes = CreateSilhouettes(args.views)
+    print(
+        f"===== {args.resolution}^3, {args.views} views, "
+        f"{os.cpu_count()} logical cores ====="
+    )
+
+    baseline = Measure(lambda: CarveVolume(silhouettes, args.resolution), args.repeat)
+    print(f"{'CarveVolume':<20} {baseline * 1000:>9.1f} ms")
+
+    # the powers of two and the maximum itself
+    workerCounts = sorted(
+        {2**i for i in range(args.max_workers.bit_length())} | {args.max_workers}
+    )
+    for workers in workerCounts:
+        duration = Measure(
+            lambda: CarveParallel(silhouettes, args.resolution, workers), args.repeat
+        )
+        print(
+            f"{f'{workers} workers':<20} {duration * 1000:>9.1f} ms "
+            f"{baseline / duration:>6.2f}x speedup"
+        )
+
+
+if __name__ == "__main__":
+    main()
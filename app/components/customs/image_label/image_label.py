@@ -1,10 +1,23 @@
+import numpy as np
 import cv2 as cv
-from PyQt6.QtGui import QImage, QPixmap
-from PyQt6.QtWidgets import QLabel, QWidget
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QMouseEvent, QPixmap, QResizeEvent, QWheelEvent
+from PyQt6.QtWidgets import QLabel, QSizePolicy, QWidget
+from PyQt6.QtCore import QPointF, Qt
+
+from .image_pyramid import ImagePyramid
+
+MAX_IMAGE_LABEL_ZOOM = 64.0
 
 
 class ImageLabel(QLabel):
+    """
+    Display a cv.Mat fitted inside the label. The image is kept as an `ImagePyramid` and
+        only the level and the region which match the current label size are converted
+        into the pixmap, so the memory and the painting cost depend on the label size
+        instead of the source image size. The full resolution level is used only when the
+        user zooms in (mouse wheel) far enough, the zoomed image can be panned by dragging.
+    """
+
     def __init__(
         self,
         parent: QWidget | None = None,
@@ -14,16 +27,151 @@ class ImageLabel(QLabel):
 
         self.hasContent = False
 
+        self._pyramid: ImagePyramid | None = None
+        self._format: QImage.Format = QImage.Format.Format_BGR888
+        self._zoom: float = 1.0
+        self._center: QPointF = QPointF()
+        self._prevMousePosition: QPointF | None = None
+
+        self.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        self.setMinimumSize(1, 1)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+    @property
+    def Image(self) -> cv.Mat | None:
+        """
+        The displayed image at full resolution, None if no image was set.
+        """
+        return self._pyramid.Level(0) if self._pyramid is not None else None
+
     def SetImage(
         self,
         image: cv.Mat | None,
         format: QImage.Format = QImage.Format.Format_BGR888,
     ) -> None:
+        """
+        Change the displayed image, the zoom and the panning are kept if the new image has
+            the same size as the old one (e.g. a new binary image of the same source).
+
+        Note:
+            The label keeps a reference to the `image` for building the pyramid levels.
+        """
         if image is None:
             return
 
+        if (
+            self._pyramid is None
+            or self._pyramid.Width != image.shape[1]
+            or self._pyramid.Height != image.shape[0]
+        ):
+            self._zoom = 1.0
+            self._center = QPointF(image.shape[1] / 2, image.shape[0] / 2)
+
         self.hasContent = True
+        self._pyramid = ImagePyramid(image)
+        self._format = format
+        self._Render()
+
+    def ResetZoom(self) -> None:
+        if self._pyramid is None:
+            return
+
+        self._zoom = 1.0
+        self._center = QPointF(self._pyramid.Width / 2, self._pyramid.Height / 2)
+        self._Render()
+
+    @property
+    def _Scale(self) -> float:
+        """
+        The number of displayed pixels per source pixel.
+        """
+        assert self._pyramid is not None
+        fitScale = min(
+            self.width() / self._pyramid.Width,
+            self.height() / self._pyramid.Height,
+        )
+        return fitScale * self._zoom
+
+    def _Render(self) -> None:
+        if self._pyramid is None or self.width() <= 0 or self.height() <= 0:
+            return
+
+        pyramid = self._pyramid
+        scale = self._Scale
+
+        # ============ visible region in the source coordinates ============
+        regionWidth = min(float(pyramid.Width), self.width() / scale)
+        regionHeight = min(float(pyramid.Height), self.height() / scale)
+        centerX = min(
+            max(self._center.x(), regionWidth / 2), pyramid.Width - regionWidth / 2
+        )
+        centerY = min(
+            max(self._center.y(), regionHeight / 2), pyramid.Height - regionHeight / 2
+        )
+        self._center = QPointF(centerX, centerY)
+        # ==================================================================
+
+        level = pyramid.Level(pyramid.LevelForScale(scale))
+        levelScaleX = level.shape[1] / pyramid.Width
+        levelScaleY = level.shape[0] / pyramid.Height
+
+        left = int((centerX - regionWidth / 2) * levelScaleX)
+        top = int((centerY - regionHeight / 2) * levelScaleY)
+        right = max(left + 1, int(round((centerX + regionWidth / 2) * levelScaleX)))
+        bottom = max(top + 1, int(round((centerY + regionHeight / 2) * levelScaleY)))
+        region = level[top:bottom, left:right]
+
+        targetSize = (
+            max(1, int(round(regionWidth * scale))),
+            max(1, int(round(regionHeight * scale))),
+        )
+        if targetSize != (region.shape[1], region.shape[0]):
+            region = cv.resize(
+                region,
+                targetSize,
+                interpolation=(
+                    cv.INTER_AREA
+                    if targetSize[0] < region.shape[1]
+                    else cv.INTER_NEAREST
+                ),
+            )
+
+        region = np.ascontiguousarray(region)
         imageData = QImage(
-            image.data, image.shape[1], image.shape[0], format  # type: ignore
+            region.data,  # type: ignore
+            region.shape[1],
+            region.shape[0],
+            region.strides[0],
+            self._format,
         )
         self.setPixmap(QPixmap.fromImage(imageData))
+
+    def resizeEvent(self, a0: QResizeEvent) -> None:
+        super().resizeEvent(a0)
+        self._Render()
+
+    def wheelEvent(self, a0: QWheelEvent) -> None:
+        if self._pyramid is None:
+            return
+
+        factor = 1.25 if a0.angleDelta().y() > 0 else 0.8
+        self._zoom = min(max(self._zoom * factor, 1.0), MAX_IMAGE_LABEL_ZOOM)
+        self._Render()
+        a0.accept()
+
+    def mousePressEvent(self, ev: QMouseEvent) -> None:
+        if ev.button() == Qt.MouseButton.LeftButton:
+            self._prevMousePosition = ev.position()
+        super().mousePressEvent(ev)
+
+    def mouseMoveEvent(self, ev: QMouseEvent) -> None:
+        if self._prevMousePosition is not None and self._zoom > 1.0:
+            delta = (ev.position() - self._prevMousePosition) / self._Scale
+            self._center -= delta
+            self._prevMousePosition = ev.position()
+            self._Render()
+        super().mouseMoveEvent(ev)
+
+    def mouseReleaseEvent(self, ev: QMouseEvent) -> None:
+        self._prevMousePosition = None
+        super().mouseReleaseEvent(ev)
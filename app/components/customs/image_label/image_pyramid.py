@@ -0,0 +1,60 @@
+import math
+import cv2 as cv
+
+MIN_PYRAMID_LEVEL_SIZE = 32
+
+
+class ImagePyramid:
+    """
+    The power-of-two downsampled levels of an image, level 0 is the original image and
+        level `k` is (roughly) `1 / 2^k` of its size. The levels are built lazily from the
+        closest already built level, so only the levels which are really displayed cost
+        memory and computation.
+    """
+
+    def __init__(self, image: cv.Mat) -> None:
+        height, width = image.shape[:2]
+        levelCount = 1
+        while (
+            max(width, height) >> levelCount >= MIN_PYRAMID_LEVEL_SIZE
+            and min(width, height) >> levelCount >= 1
+        ):
+            levelCount += 1
+
+        self._levels: list[cv.Mat | None] = [image] + [None] * (levelCount - 1)
+
+    @property
+    def Width(self) -> int:
+        return self._levels[0].shape[1]  # type: ignore
+
+    @property
+    def Height(self) -> int:
+        return self._levels[0].shape[0]  # type: ignore
+
+    @property
+    def LevelCount(self) -> int:
+        return len(self._levels)
+
+    def LevelForScale(self, scale: float) -> int:
+        """
+        The smallest level which still has at least `scale` times the original resolution,
+            so that the displayed image is never upsampled from a downsampled level.
+        """
+        if scale >= 1.0:
+            return 0
+
+        return min(int(math.floor(math.log2(1.0 / scale))), self.LevelCount - 1)
+
+    def Level(self, index: int) -> cv.Mat:
+        index = max(0, min(index, self.LevelCount - 1))
+
+        if self._levels[index] is None:
+            previous = self.Level(index - 1)
+            height, width = previous.shape[:2]
+            self._levels[index] = cv.resize(
+                previous,
+                (max(1, width // 2), max(1, height // 2)),
+                interpolation=cv.INTER_AREA,
+            )
+
+        return self._levels[index]  # type: ignore
@@ -0,0 +1,148 @@
+from typing import Any, Callable
+import cv2 as cv
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from utils.logger import logger  # type: ignore
+
+
+class _BinarizationTask(QRunnable):
+    def __init__(
+        self,
+        service: "BinarizationService",
+        binarize: Callable[[], cv.Mat | None],
+        threshold: int,
+    ) -> None:
+        super().__init__()
+        self._service = service
+        self._binarize = binarize
+        self._threshold = threshold
+
+    def run(self) -> None:
+        coverage = 0.0
+        try:
+            image = self._binarize()
+            if image is not None:
+                coverage = cv.countNonZero(image) / image.size
+        except Exception as e:
+            logger.error(f"Failed to binarize with threshold {self._threshold}: {e}")
+            image = None
+
+        try:
+            self._service.finished.emit(self._threshold, image, coverage)
+        except RuntimeError:
+            pass  # the service was deleted with its widget while the task was running
+
+
+class BinarizationService(QObject):
+    """
+    Run the binarization of the threshold slider on the thread pool instead of the GUI
+        thread. The binarization of a request is prepared when it is requested, on the
+        GUI thread, so it does not read the parameters while they are edited (see
+        `ImagePreviewViewModel.PrepareBinarization`). Only one job is in flight at a
+        time: while it is running, new requests replace the pending one (latest wins),
+        the replaced requests are dropped without being computed. The result and its
+        coverage (the ratio of the non-zero pixels, counted on the thread pool too) are
+        posted back on the GUI thread through the `callback`.
+
+    Because only one job is running at a time and the next job is started after the
+        callback returns, the image of a job is not written again before the callback has
+        replaced it with the image of the next job. So `binarize` may return one of two
+        buffers in turn (see `ThresholdEngine`), but not always the same buffer: the
+        callback may keep the image (e.g. `ImageLabel.SetImage`).
+
+    Examples:
+    ```python
+        service = BinarizationService(
+            viewModel.PrepareBinarization, self._ShowBinaryImage
+        )
+
+        service.Request(100) # started on the thread pool
+        service.Request(110) # pending
+        service.Request(120) # replaces 110, which is dropped
+    ```
+    """
+
+    finished = pyqtSignal(int, object, float)
+
+    def __init__(
+        self,
+        prepare: Callable[[int], Callable[[], cv.Mat | None]],
+        callback: Callable[[cv.Mat | None, float], Any],
+        threadPool: QThreadPool | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._prepare = prepare
+        self._callback = callback
+        self._threadPool = (
+            threadPool if threadPool is not None else QThreadPool.globalInstance()
+        )
+
+        self._isRunning = False
+        self._pendingJob: tuple[int, Callable[[], cv.Mat | None]] | None = None
+
+        self._requestedCount = 0
+        self._droppedCount = 0
+        self._completedCount = 0
+
+        self.finished.connect(self._OnFinished)
+
+    @property
+    def IsBusy(self) -> bool:
+        return self._isRunning or self._pendingJob is not None
+
+    @property
+    def RequestedCount(self) -> int:
+        return self._requestedCount
+
+    @property
+    def DroppedCount(self) -> int:
+        """
+        The number of requests which were replaced by a newer one before being started.
+        """
+        return self._droppedCount
+
+    @property
+    def CompletedCount(self) -> int:
+        return self._completedCount
+
+    def Request(self, threshold: int) -> None:
+        """
+        Ask for the binary image with the `threshold`, the job is started immediately if
+            the service is idle, otherwise it is kept as the pending request.
+        """
+        self._requestedCount += 1
+        job = (threshold, self._prepare(threshold))
+
+        if not self._isRunning:
+            self._Start(job)
+            return
+
+        if self._pendingJob is not None:
+            self._droppedCount += 1
+
+        self._pendingJob = job
+
+    def _Start(self, job: tuple[int, Callable[[], cv.Mat | None]]) -> None:
+        self._isRunning = True
+        threshold, binarize = job
+        self._threadPool.start(_BinarizationTask(self, binarize, threshold))
+
+    @pyqtSlot(int, object, float)
+    def _OnFinished(
+        self, threshold: int, image: cv.Mat | None, coverage: float
+    ) -> None:
+        self._isRunning = False
+        self._completedCount += 1
+
+        self._callback(image, coverage)
+
+        if self._pendingJob is not None:
+            pendingJob = self._pendingJob
+            self._pendingJob = None
+            self._Start(pendingJob)
+        else:
+            logger.debug(
+                f"Binarization is idle: {self._completedCount} completed, "
+                f"{self._droppedCount} dropped of {self._requestedCount} requests"
+            )
@@ -1,7 +1,10 @@
+from copy import deepcopy
 from typing import Any
 from constants import IMAGE_PREVIEW_CHANGED_EVENT_NAME
 from modules.event_system.event_system import EventSystem
 from modules.history_manager import Command
+from structs.color_range import ColorRange
+from structs.mask_stage import MaskStage
 from structs.project import Project
 
 
@@ -22,3 +25,92 @@ class ChangeThesholdCommand(Command):
             self._index,
         )
         return None
+
+
+class ChangeThresholdParametersCommand(Command):
+    """
+    Change the threshold mode, the block size and the bias of the image together.
+    """
+
+    def __init__(
+        self,
+        project: Project,
+        index: int,
+        thresholdMode: str,
+        blockSize: int,
+        bias: int,
+    ):
+        self._project = project
+        self._index = index
+        self._values = (thresholdMode, blockSize, bias)
+        self._preValues: tuple[str, int, int] | None = None
+
+    def _ExecuteImpl(self, *args: Any, **kwargs: Any) -> None:
+        image = self._project.images[self._index]
+        self._preValues = (image.thresholdMode, image.blockSize, image.bias)
+        image.thresholdMode, image.blockSize, image.bias = self._values
+
+    def _UndoImpl(self) -> str | None:
+        assert self._preValues is not None, "Command is not executed"
+        image = self._project.images[self._index]
+        image.thresholdMode, image.blockSize, image.bias = self._preValues
+
+        EventSystem.TriggerEvent(
+            IMAGE_PREVIEW_CHANGED_EVENT_NAME,
+            self._index,
+        )
+        return None
+
+
+class ChangeColorRangeCommand(Command):
+    """
+    Change the color range of the color segmentation of the image.
+    """
+
+    def __init__(self, project: Project, index: int, colorRange: ColorRange):
+        self._project = project
+        self._index = index
+        self._value = deepcopy(colorRange)
+        self._preValue: ColorRange | None = None
+
+    def _ExecuteImpl(self, *args: Any, **kwargs: Any) -> None:
+        image = self._project.images[self._index]
+        self._preValue = deepcopy(image.colorRange)
+        image.colorRange.Update(self._value)
+
+    def _UndoImpl(self) -> str | None:
+        assert self._preValue is not None, "Command is not executed"
+        self._project.images[self._index].colorRange.Update(self._preValue)
+
+        EventSystem.TriggerEvent(
+            IMAGE_PREVIEW_CHANGED_EVENT_NAME,
+            self._index,
+        )
+        return None
+
+
+class ChangeMaskStagesCommand(Command):
+    """
+    Replace the mask stages of the image.
+    """
+
+    def __init__(self, project: Project, index: int, maskStages: list[MaskStage]):
+        self._project = project
+        self._index = index
+        self._value = deepcopy(maskStages)
+        self._preValue: list[MaskStage] | None = None
+
+    def _ExecuteImpl(self, *args: Any, **kwargs: Any) -> None:
+        image = self._project.images[self._index]
+        self._preValue = deepcopy(image.maskStages)
+        image.maskStages = deepcopy(self._value)
+
+    def _UndoImpl(self) -> str | None:
+        assert self._preValue is not None, "Command is not executed"
+        self._project.images[self._index].maskStages = deepcopy(self._preValue)
+
+        EventSystem.TriggerEvent(
+            IMAGE_PREVIEW_CHANGED_EVENT_NAME,
+            self._index,
+        )
+        return None
@@ -1,14 +1,45 @@
+import os
+from copy import deepcopy
+from typing import Callable
 import cv2 as cv
+import numpy as np
+from constants import (
+    DEFAULT_CONTOUR_TOLERANCE,
+    MASK_PARAMETERS_CHANGED_EVENT_NAME,
+    MASK_PARAMETERS_PREVIEWED_EVENT_NAME,
+    THRESHOLD_MODE_GLOBAL,
+)
+from modules.color_segmentation import ColorPlanes
+from modules.contour_cache import ContourCache, Contours
 from modules.dependency_injection.helper import as_dependency
+from modules.distance_field import DistanceFieldCache
+from modules.event_system.event_system import EventSystem
 from modules.history_manager import HistoryManager
+from modules.image_cache import ImageCache
+from modules.luminance_histogram import LuminanceHistogram
+from modules.mask_pipeline import CreateMaskSource, MaskPipeline, MaskSource
+from modules.mask_store import ResampleMask, WorkingSize
+from modules.packed_mask import PackedMask
+from modules.threshold_engine import ThresholdEngine
 from structs.application import Application
+from structs.color_range import ColorRange
 from structs.image_meta import ImageMeta
+from structs.mask_stage import MaskStage
 from structs.project import Project
-from utils.application import GetImageFilePath
-from utils.images import ConvertToBinary, LoadImage
+from utils.application import (
+    GetContourFolder,
+    GetDistanceFieldFolder,
+    GetImageFilePath,
+)
+from utils.images import LoadImage
 from utils.logger import logger  # type: ignore
 
-from .commands import ChangeThesholdCommand
+from .commands import (
+    ChangeColorRangeCommand,
+    ChangeMaskStagesCommand,
+    ChangeThesholdCommand,
+    ChangeThresholdParametersCommand,
+)
 
 
 @as_dependency(Project, Application)
@@ -23,9 +54,22 @@ class ImagePreviewViewModel:
         self._application = application
         self._metaFile: ImageMeta | None = None
         self._tempThreshold: int = 0
+        self._tempThresholdParameters: tuple[str, int, int] = (
+            THRESHOLD_MODE_GLOBAL,
+            0,
+            0,
+        )
+        self._tempColorRange = ColorRange()
 
         self._isLoaded = False
         self._image: cv.Mat | None = None
+        self._thresholdEngine = ThresholdEngine()
+        self._workingGray: cv.Mat | None = None
+        self._histogram: LuminanceHistogram | None = None
+        self._colorPlanes: ColorPlanes | None = None
+        self._imageKey: str | None = None
+        self._contourCache: ContourCache | None = None
+        self._distanceFieldCache: DistanceFieldCache | None = None
 
     @property
     def Index(self) -> int:
@@ -35,6 +79,8 @@ class ImagePreviewViewModel:
     def Index(self, value: int) -> None:
         self._metaFile = self._project.images[value]
         self._tempThreshold = self._metaFile.threshold
+        self._tempThresholdParameters = self._GetThresholdParameters()
+        self._tempColorRange = deepcopy(self._metaFile.colorRange)
         self._index = value
 
     @property
@@ -57,8 +103,151 @@ class ImagePreviewViewModel:
 
         self._metaFile.threshold = value
 
+    @property
+    def ThresholdMode(self) -> str:
+        if self._metaFile is None:
+            return THRESHOLD_MODE_GLOBAL
+
+        return self._metaFile.thresholdMode
+
+    @ThresholdMode.setter
+    def ThresholdMode(self, value: str) -> None:
+        """
+        Change the threshold mode while it is edited, the change is recorded by
+            `CompleteThresholdParametersModification`.
+        """
+        if self._metaFile is None:
+            return
+
+        self._metaFile.thresholdMode = value
+
+    @property
+    def BlockSize(self) -> int:
+        if self._metaFile is None:
+            return 0
+
+        return self._metaFile.blockSize
+
+    @BlockSize.setter
+    def BlockSize(self, value: int) -> None:
+        """
+        Change the block size while it is edited (e.g. the arrows of a spin box are
+            clicked), the change is recorded by `CompleteThresholdParametersModification`.
+        """
+        if self._metaFile is None:
+            return
+
+        self._metaFile.blockSize = value
+
+    @property
+    def Bias(self) -> int:
+        if self._metaFile is None:
+            return 0
+
+        return self._metaFile.bias
+
+    @Bias.setter
+    def Bias(self, value: int) -> None:
+        """
+        Change the bias while it is edited, the change is recorded by
+            `CompleteThresholdParametersModification`.
+        """
+        if self._metaFile is None:
+            return
+
+        self._metaFile.bias = value
+
+    @property
+    def ColorRangeParameters(self) -> ColorRange:
+        if self._metaFile is None:
+            return ColorRange()
+
+        return self._metaFile.colorRange
+
+    @ColorRangeParameters.setter
+    def ColorRangeParameters(self, value: ColorRange) -> None:
+        """
+        Change the color range while it is edited (e.g. a slider is dragged), the change
+            is recorded by `CompleteColorRangeModification`.
+        """
+        if self._metaFile is None:
+            return
+
+        self._metaFile.colorRange.Update(value)
+
+    @property
+    def MaskSource(self) -> MaskSource | None:
+        """
+        The mask which replaces the global threshold of the image, the local threshold
+            in the adaptive modes or the color range in the color modes. None in the
+            global mode.
+        """
+        if self._metaFile is None:
+            return None
+
+        return CreateMaskSource(self._metaFile, self._GetColorPlanes)
+
+    def SetThresholdParameters(
+        self, thresholdMode: str, blockSize: int, bias: int
+    ) -> None:
+        """
+        Change the threshold mode, the block size and the bias as one undoable action.
+        """
+        if self._metaFile is None:
+            return
+
+        if (
+            thresholdMode == self._metaFile.thresholdMode
+            and blockSize == self._metaFile.blockSize
+            and bias == self._metaFile.bias
+        ):
+            return
+
+        HistoryManager.Execute(
+            ChangeThresholdParametersCommand(
+                self._project, self.Index, thresholdMode, blockSize, bias
+            )
+        )
+        self._tempThresholdParameters = self._GetThresholdParameters()
+        self._OnMaskParametersChanged()
+
+    def CompleteThresholdParametersModification(self) -> None:
+        """
+        Record the changes made through `ThresholdMode`, `BlockSize` and `Bias` since the
+            last recorded change as one undoable action.
+        """
+        assert self._metaFile is not None, "Meta file is not set"
+        parameters = self._GetThresholdParameters()
+        if parameters == self._tempThresholdParameters:
+            return
+
+        (
+            self._metaFile.thresholdMode,
+            self._metaFile.blockSize,
+            self._metaFile.bias,
+        ) = self._tempThresholdParameters
+        self.SetThresholdParameters(*parameters)
+
+    def _GetThresholdParameters(self) -> tuple[str, int, int]:
+        assert self._metaFile is not None, "Meta file is not set"
+        return (
+            self._metaFile.thresholdMode,
+            self._metaFile.blockSize,
+            self._metaFile.bias,
+        )
+
     @property
     def Image(self) -> cv.Mat | None:
+        return self.LoadImage()
+
+    def LoadImage(self, isCancelled: Callable[[], bool] | None = None) -> cv.Mat | None:
+        """
+        The decoded image, it is decoded on the first call.
+
+        Args:
+            isCancelled: Polled while the image is decoded, the image is left unloaded
+                (and None is returned) if the decoding is cancelled.
+        """
         if self._isLoaded:
             return self._image
 
@@ -67,18 +256,253 @@ class ImagePreviewViewModel:
 
         imagePath = GetImageFilePath(
             self._application.CurrentProjectDirectory,
-            self._project.images[self._index].name,
+            self._project.images[self._index].FileName,
+        )
+
+        image = ImageCache.Get(
+            imagePath, lambda path: LoadImage(path, isCancelled=isCancelled)
         )
+        if isCancelled is not None and isCancelled():
+            return None
 
-        self._image = LoadImage(imagePath)
+        self._image = image
+        self._thresholdEngine.SetImage(self._image)
         self._isLoaded = True
         return self._image
 
+    @property
+    def Histogram(self) -> LuminanceHistogram | None:
+        """
+        The luminance histogram stored in the image meta, it is computed from the loaded
+            image (and stored in the meta) if the image was imported without it.
+        """
+        if self._histogram is not None:
+            return self._histogram
+
+        if self._metaFile is None:
+            return None
+
+        self._histogram = LuminanceHistogram.Decode(self._metaFile.histogram)
+        if (
+            self._histogram is None
+            and self.Image is not None
+            and self._thresholdEngine.Gray is not None
+        ):
+            self._histogram = LuminanceHistogram.FromGray(self._thresholdEngine.Gray)
+            self._metaFile.histogram = self._histogram.Encode()
+
+        return self._histogram
+
+    def GetCoverage(self, threshold: int) -> float:
+        """
+        The ratio of the foreground pixels of the binary image of the global `threshold`
+            (without the mask stages), answered from the histogram without touching the
+            pixels. The coverage of the other masks is counted on the binary image once
+            it is computed.
+        """
+        histogram = self.Histogram
+        return histogram.Coverage(threshold) if histogram is not None else 0.0
+
     def GetBinaryImage(self, threshold: int) -> cv.Mat | None:
+        return self.PrepareBinarization(threshold)()
+
+    def PrepareBinarization(self, threshold: int) -> Callable[[], cv.Mat | None]:
+        """
+        Take the mask parameters of the image (threshold mode, color range, mask stages,
+            ...) now, on the GUI thread, and return the binarization with them, to be run
+            on the thread pool while the parameters are edited.
+        """
+        parameters = self._GetMaskParameters(threshold)
+        return lambda: self._Binarize(parameters)
+
+    def _Binarize(self, parameters: ImageMeta) -> cv.Mat | None:
+        if self.Image is None:
+            return None
+
+        if parameters.thresholdMode == THRESHOLD_MODE_GLOBAL and not any(
+            stage.enabled for stage in parameters.maskStages
+        ):
+            return self._thresholdEngine.Apply(parameters.threshold)
+
+        return self._GetMask(parameters)
+
+    def GetContours(
+        self, tolerance: float = DEFAULT_CONTOUR_TOLERANCE
+    ) -> Contours | None:
+        """
+        The simplified contours of the current mask, taken from the contour cache of the
+            project if they were already traced.
+        """
+        if self._metaFile is None:
+            return None
+
+        imageHash = self._GetImageHash()
+        if imageHash is None:
+            return None
+
+        parameters = self._GetMaskParameters()
+        return self.ContourCache.Get(
+            imageHash,
+            parameters.threshold,
+            parameters.maskStages,
+            tolerance,
+            lambda: self._GetMask(parameters),
+            self.MaskSource,
+        )
+
+    def GetDistanceField(self) -> np.ndarray | None:
+        """
+        The signed distance field of the current mask (the global, adaptive or color
+            range threshold and the mask stages), positive inside the silhouette. It is
+            computed once per image and mask, then mapped from the project folder.
+        """
+        if self._metaFile is None:
+            return None
+
+        parameters = self._GetMaskParameters()
+        return self.DistanceFieldCache.Get(
+            self._metaFile.CacheId,
+            parameters.threshold,
+            lambda: self._GetMask(parameters),
+            self.MaskSource,
+            parameters.maskStages,
+        )
+
+    def GetPackedMask(self) -> PackedMask | None:
+        """
+        The current mask (threshold and mask stages) packed 8 pixels per byte, for the
+            comparisons between the silhouettes (intersection, IoU, ...).
+        """
+        mask = self._GetMask(self._GetMaskParameters())
+        return PackedMask.FromMat(mask) if mask is not None else None
+
+    def _GetImageHash(self) -> str | None:
+        """
+        The content hash of the stored image file, or the key of the pixels if the image
+            was not imported into the store. The images of the same content share their
+            contours, unlike their distance fields (see `ImageMeta.CacheId`).
+        """
+        if self._metaFile is None:
+            return None
+
+        imageHash = os.path.splitext(self._metaFile.storedName)[0]
+        if imageHash == "":
+            imageHash = self._GetImageKey() or ""
+
+        return imageHash or None
+
+    def _GetImageKey(self) -> str | None:
+        if self.Image is None or self._thresholdEngine.Gray is None:
+            return None
+
+        if self._imageKey is None:
+            self._imageKey = MaskPipeline.ImageKey(self._thresholdEngine.Gray)
+
+        return self._imageKey
+
+    def _GetColorPlanes(self) -> ColorPlanes | None:
+        """
+        The color conversions of the image, kept while the tab is open so the color range
+            can be changed without converting the image again.
+        """
         if self.Image is None:
             return None
 
-        return ConvertToBinary(self.Image, threshold)
+        if self._colorPlanes is None:
+            self._colorPlanes = ColorPlanes(self.Image)
+
+        return self._colorPlanes
+
+    def _GetMaskParameters(self, threshold: int | None = None) -> ImageMeta:
+        """
+        A copy of the mask parameters of the image, which are edited live on the GUI
+            thread while the masks are computed on the thread pool.
+
+        Args:
+            threshold: The threshold, that of the image if None.
+        """
+        if self._metaFile is None:
+            return ImageMeta(threshold=threshold if threshold is not None else 0)
+
+        return ImageMeta(
+            threshold=threshold if threshold is not None else self._metaFile.threshold,
+            maskStages=deepcopy(self._metaFile.maskStages),
+            thresholdMode=self._metaFile.thresholdMode,
+            blockSize=self._metaFile.blockSize,
+            bias=self._metaFile.bias,
+            colorRange=deepcopy(self._metaFile.colorRange),
+        )
+
+    def _GetMask(self, parameters: ImageMeta) -> cv.Mat | None:
+        """
+        The mask from the pipeline, unlike `GetBinaryImage` it is never the buffer of the
+            threshold engine, so it can be used while the preview is binarizing.
+
+        Args:
+            parameters: The mask parameters, see `_GetMaskParameters`.
+        """
+        imageKey = self._GetImageKey()
+        if imageKey is None or self._thresholdEngine.Gray is None:
+            return None
+
+        return MaskPipeline.Run(
+            self._thresholdEngine.Gray,
+            parameters.threshold,
+            parameters.maskStages,
+            imageKey,
+            CreateMaskSource(parameters, self._GetColorPlanes),
+        )
+
+    @property
+    def ContourCache(self) -> ContourCache:
+        contourFolder = GetContourFolder(self._application.CurrentProjectDirectory)
+
+        if (
+            self._contourCache is None
+            or self._contourCache.CacheFolder != contourFolder
+        ):
+            self._contourCache = ContourCache(contourFolder)
+
+        return self._contourCache
+
+    @property
+    def DistanceFieldCache(self) -> DistanceFieldCache:
+        distanceFieldFolder = GetDistanceFieldFolder(
+            self._application.CurrentProjectDirectory
+        )
+
+        if (
+            self._distanceFieldCache is None
+            or self._distanceFieldCache.CacheFolder != distanceFieldFolder
+        ):
+            self._distanceFieldCache = DistanceFieldCache(distanceFieldFolder)
+
+        return self._distanceFieldCache
+
+    @property
+    def MaskStages(self) -> list[MaskStage]:
+        if self._metaFile is None:
+            return []
+
+        return self._metaFile.maskStages
+
+    def SetMaskStages(self, maskStages: list[MaskStage]) -> None:
+        """
+        Replace the mask stages as one undoable action.
+        """
+        if self._metaFile is None:
+            return
+
+        if len(maskStages) == len(self._metaFile.maskStages) and all(
+            stage.Compare(otherStage)
+            for stage, otherStage in zip(maskStages, self._metaFile.maskStages)
+        ):
+            return
+
+        HistoryManager.Execute(
+            ChangeMaskStagesCommand(self._project, self.Index, maskStages)
+        )
+        self._OnMaskParametersChanged()
 
     def CompleteThresholdModification(self) -> None:
         assert self._metaFile is not None, "Meta file is not set"
@@ -86,3 +510,97 @@ class ImagePreviewViewModel:
             ChangeThesholdCommand(self._project, self.Index, self._tempThreshold)
         )
         self._tempThreshold = self._metaFile.threshold
+        self._OnMaskParametersChanged()
+
+    def SetColorRange(self, colorRange: ColorRange) -> None:
+        """
+        Change the color range as one undoable action.
+        """
+        if self._metaFile is None or self._metaFile.colorRange.Compare(colorRange):
+            return
+
+        HistoryManager.Execute(
+            ChangeColorRangeCommand(self._project, self.Index, colorRange)
+        )
+        self._tempColorRange = deepcopy(self._metaFile.colorRange)
+        self._OnMaskParametersChanged()
+
+    def CompleteColorRangeModification(self) -> None:
+        """
+        Record the changes made through `ColorRangeParameters` since the last recorded
+            change as one undoable action.
+        """
+        assert self._metaFile is not None, "Meta file is not set"
+        if self._metaFile.colorRange.Compare(self._tempColorRange):
+            return
+
+        colorRange = deepcopy(self._metaFile.colorRange)
+        self._metaFile.colorRange.Update(self._tempColorRange)
+        self.SetColorRange(colorRange)
+
+    def PreviewMaskParameters(self) -> None:
+        """
+        Let the sculpture follow the parameters while they are edited (e.g. a slider is
+            dragged): the working mask of the edited parameters is built in memory from
+            the loaded image (see `PrepareWorkingMask`) and carved in the background,
+            the requests are coalesced while the previous ones run. Nothing is stored
+            before the edit is recorded.
+        """
+        if self._metaFile is None:
+            return
+
+        EventSystem.TriggerEvent(
+            MASK_PARAMETERS_PREVIEWED_EVENT_NAME, self.Index, self.PrepareWorkingMask()
+        )
+
+    def PrepareWorkingMask(self) -> Callable[[], cv.Mat | None]:
+        """
+        Take the mask parameters of the image now, on the GUI thread, and return the
+            computation of its working mask (see `ComputeWorkingMask`) from the loaded
+            image instead of the image file, to be run on the thread pool. In the global
+            mode without mask stages the gray plane reduced to the working size is
+            thresholded, otherwise the mask of the preview is reduced.
+
+        The computation returns None if the image is not loaded.
+        """
+        parameters = self._GetMaskParameters()
+        resolution = self._project.sculptureSetting.maskResolution
+        return lambda: self._GetWorkingMask(parameters, resolution)
+
+    def _GetWorkingMask(self, parameters: ImageMeta, resolution: int) -> cv.Mat | None:
+        gray = self._thresholdEngine.Gray
+        if not self._isLoaded or gray is None:
+            return None
+
+        size = WorkingSize(gray.shape[1], gray.shape[0], resolution)
+
+        if parameters.thresholdMode == THRESHOLD_MODE_GLOBAL and not any(
+            stage.enabled for stage in parameters.maskStages
+        ):
+            workingGray = self._workingGray
+            if (
+                workingGray is None
+                or (workingGray.shape[1], workingGray.shape[0]) != size
+            ):
+                # reduced once, each threshold then costs the working size only
+                workingGray = cv.resize(gray, size, interpolation=cv.INTER_AREA)
+                self._workingGray = workingGray
+
+            _, mask = cv.threshold(
+                workingGray, parameters.threshold, 255, cv.THRESH_BINARY
+            )
+            return mask
+
+        mask = self._GetMask(parameters)
+        return ResampleMask(mask, size) if mask is not None else None
+
+    def _OnMaskParametersChanged(self) -> None:
+        """
+        The distance field of the previous parameters is not used anymore, the working
+            mask of the recorded parameters is stored from the loaded image.
+        """
+        assert self._metaFile is not None, "Meta file is not set"
+        self.DistanceFieldCache.Invalidate(self._metaFile.CacheId)
+        EventSystem.TriggerEvent(
+            MASK_PARAMETERS_CHANGED_EVENT_NAME, self.Index, self.PrepareWorkingMask()
+        )
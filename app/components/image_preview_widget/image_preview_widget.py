@@ -1,17 +1,42 @@
-from PyQt6.QtGui import QImage
-from PyQt6.QtWidgets import QWidget
+from copy import deepcopy
+import cv2 as cv
+from PyQt6.QtGui import QColor, QImage
+from PyQt6.QtWidgets import QColorDialog, QWidget
 from PyQt6.QtCore import Qt
-from constants import IMAGE_PREVIEW_CHANGED_EVENT_NAME
+from constants import (
+    IMAGE_PREVIEW_CHANGED_EVENT_NAME,
+    IMAGE_PREVIEW_LOAD_FAILED_TEXT,
+    IMAGE_PREVIEW_LOADING_TEXT,
+    THRESHOLD_MODE_GLOBAL,
+    THRESHOLD_MODE_GLOBAL_OPTION,
+    THRESHOLD_MODE_HSV,
+    THRESHOLD_MODE_HSV_OPTION,
+    THRESHOLD_MODE_LAB,
+    THRESHOLD_MODE_LAB_OPTION,
+    THRESHOLD_MODE_MEAN,
+    THRESHOLD_MODE_MEAN_OPTION,
+    THRESHOLD_MODE_SAUVOLA,
+    THRESHOLD_MODE_SAUVOLA_OPTION,
+)
 from converted_uis.image_preview import Ui_ImagePreviewWidget
 
 from modules.dependency_injection.helper import as_dependency
+from modules.color_segmentation import BgrToLab, LabToBgr
 from modules.event_system.event_system import EventSystem
+from .binarization_service import BinarizationService
 from .image_preview_viewmodel import ImagePreviewViewModel
+from .preview_loader import PreviewLoader
 from utils.logger import logger  # type: ignore
 
 
 @as_dependency(ImagePreviewViewModel)
 class ImagePreviewWidget(QWidget):
+    """
+    The tab of an image. The widget is shown immediately with a placeholder, the image is
+        decoded and binarized for the first time on the thread pool (see `PreviewLoader`)
+        and the controls are enabled once it is loaded.
+    """
+
     def __init__(
         self,
         viewmodel: ImagePreviewViewModel,
@@ -23,9 +48,50 @@ class ImagePreviewWidget(QWidget):
         self.viewModel = viewmodel
         self.viewModel.Index = index
         self.ui = Ui_ImagePreviewWidget()
+        self._binarizationService = BinarizationService(
+            self.viewModel.PrepareBinarization,
+            self._ShowBinaryImage,
+            parent=self,
+        )
+        self._loader = PreviewLoader(
+            self.viewModel.LoadImage,
+            lambda: self.viewModel.PrepareBinarization(self.viewModel.Threshold),
+            self._OnLoaded,
+            parent=self,
+        )
+        self._isLoaded = False
 
         self._SetupUI()
 
+    @property
+    def IsLoaded(self) -> bool:
+        return self._isLoaded
+
+    @property
+    def IsLoading(self) -> bool:
+        return self._loader.IsBusy
+
+    @property
+    def IsBinarizing(self) -> bool:
+        return self._binarizationService.IsBusy
+
+    def Cancel(self) -> None:
+        """
+        Stop loading the image, e.g. the tab is closed before the image is shown.
+        """
+        self._loader.Cancel()
+
+    def Close(self) -> None:
+        """
+        Stop loading the image and detach the widget from the events before it is
+            deleted, e.g. its tab is closed.
+        """
+        self.Cancel()
+        EventSystem.UnregisterEvent(
+            IMAGE_PREVIEW_CHANGED_EVENT_NAME,
+            self._OnImagePreviewChanged,
+        )
+
     def _SetupUI(self) -> None:
         self.ui.setupUi(self)  # type: ignore
 
@@ -34,25 +100,222 @@ class ImagePreviewWidget(QWidget):
             self._OnImagePreviewChanged,
         )
 
-        self.ui.imagePreviewLabel.SetImage(self.viewModel.Image)
+        self.ui.thresholdModeComboBox.addItem(
+            THRESHOLD_MODE_GLOBAL_OPTION, THRESHOLD_MODE_GLOBAL
+        )
+        self.ui.thresholdModeComboBox.addItem(
+            THRESHOLD_MODE_MEAN_OPTION, THRESHOLD_MODE_MEAN
+        )
+        self.ui.thresholdModeComboBox.addItem(
+            THRESHOLD_MODE_SAUVOLA_OPTION, THRESHOLD_MODE_SAUVOLA
+        )
+        self.ui.thresholdModeComboBox.addItem(
+            THRESHOLD_MODE_HSV_OPTION, THRESHOLD_MODE_HSV
+        )
+        self.ui.thresholdModeComboBox.addItem(
+            THRESHOLD_MODE_LAB_OPTION, THRESHOLD_MODE_LAB
+        )
         self.ui.thresholdSlider.setValue(self.viewModel.Threshold)
+        self._ShowThresholdParameters()
+
+        self.ui.imagePreviewLabel.setText(IMAGE_PREVIEW_LOADING_TEXT)
+        self.ui.binaryImageLabel.setText(IMAGE_PREVIEW_LOADING_TEXT)
+        self.ui.widget.setEnabled(False)
+
+        self._loader.Start()
+
+    def _OnLoaded(
+        self, image: cv.Mat | None, binaryImage: cv.Mat | None, coverage: float
+    ) -> None:
+        if image is None:
+            self.ui.imagePreviewLabel.setText(IMAGE_PREVIEW_LOAD_FAILED_TEXT)
+            self.ui.binaryImageLabel.setText("")
+            return
+
+        self._isLoaded = True
+        self.ui.imagePreviewLabel.SetImage(image)
+
         self.ui.thresholdSlider.valueChanged.connect(self._UpdateBinaryImage)
         self.ui.thresholdSlider.sliderReleased.connect(
             self.viewModel.CompleteThresholdModification
         )
-        self._UpdateBinaryImage()
+        self.ui.thresholdModeComboBox.currentIndexChanged.connect(
+            self._UpdateThresholdMode
+        )
+        # previewed on every step, recorded once the edit is finished
+        for spinBox in (self.ui.blockSizeSpinBox, self.ui.biasSpinBox):
+            spinBox.valueChanged.connect(self._UpdateThresholdParameters)
+            spinBox.editingFinished.connect(
+                self.viewModel.CompleteThresholdParametersModification
+            )
+        for spinBox in self._ColorRangeSpinBoxes():
+            spinBox.valueChanged.connect(self._UpdateColorRange)
+            spinBox.editingFinished.connect(
+                self.viewModel.CompleteColorRangeModification
+            )
+        self.ui.keyColorButton.clicked.connect(self._PickKeyColor)
+        self.ui.labDistanceSlider.valueChanged.connect(self._UpdateLabDistance)
+        self.ui.labDistanceSlider.sliderReleased.connect(
+            self.viewModel.CompleteColorRangeModification
+        )
+        self.ui.widget.setEnabled(True)
+
+        self._ShowBinaryImage(binaryImage, coverage)
 
     def _OnImagePreviewChanged(self, index: int) -> None:
         if self.viewModel.Index != index:
             return
 
+        self.viewModel.Index = index  # the undone values are the recorded ones
         self.ui.thresholdSlider.setValue(self.viewModel.Threshold)
+        self._ShowThresholdParameters()
+        if not self._isLoaded:
+            return  # shown with the new values once loaded
+
+        self._binarizationService.Request(self.viewModel.Threshold)
+
+    def _ShowThresholdParameters(self) -> None:
+        """
+        Show the parameters of the image without recording them as a modification.
+        """
+        widgets = (
+            self.ui.thresholdModeComboBox,
+            self.ui.blockSizeSpinBox,
+            self.ui.biasSpinBox,
+            self.ui.labDistanceSlider,
+            *self._ColorRangeSpinBoxes(),
+        )
+        for widget in widgets:
+            widget.blockSignals(True)
+
+        self.ui.thresholdModeComboBox.setCurrentIndex(
+            max(self.ui.thresholdModeComboBox.findData(self.viewModel.ThresholdMode), 0)
+        )
+        self.ui.blockSizeSpinBox.setValue(self.viewModel.BlockSize)
+        self.ui.biasSpinBox.setValue(self.viewModel.Bias)
+
+        colorRange = self.viewModel.ColorRangeParameters
+        self.ui.hueMinSpinBox.setValue(colorRange.hueMin)
+        self.ui.hueMaxSpinBox.setValue(colorRange.hueMax)
+        self.ui.saturationMinSpinBox.setValue(colorRange.saturationMin)
+        self.ui.saturationMaxSpinBox.setValue(colorRange.saturationMax)
+        self.ui.valueMinSpinBox.setValue(colorRange.valueMin)
+        self.ui.valueMaxSpinBox.setValue(colorRange.valueMax)
+        self.ui.labDistanceSlider.setValue(colorRange.labDistance)
+        self._ShowKeyColor()
+
+        for widget in widgets:
+            widget.blockSignals(False)
+
+        self._EnableThresholdWidgets()
+
+    def _ShowKeyColor(self) -> None:
+        blue, green, red = LabToBgr(self.viewModel.ColorRangeParameters.labColor)
+        self.ui.keyColorButton.setStyleSheet(
+            f"background-color: rgb({red}, {green}, {blue})"
+        )
+
+    def _ColorRangeSpinBoxes(self) -> tuple:
+        return (
+            self.ui.hueMinSpinBox,
+            self.ui.hueMaxSpinBox,
+            self.ui.saturationMinSpinBox,
+            self.ui.saturationMaxSpinBox,
+            self.ui.valueMinSpinBox,
+            self.ui.valueMaxSpinBox,
+        )
+
+    def _EnableThresholdWidgets(self) -> None:
+        mode = self.viewModel.ThresholdMode
+        isGlobal = mode == THRESHOLD_MODE_GLOBAL
+        isAdaptive = mode in (THRESHOLD_MODE_MEAN, THRESHOLD_MODE_SAUVOLA)
+        self.ui.thresholdSlider.setEnabled(isGlobal)
+        self.ui.blockSizeSpinBox.setEnabled(isAdaptive)
+        self.ui.biasSpinBox.setEnabled(isAdaptive)
+
+        # only the rows of the current color mode are shown
+        formLayout = self.ui.formLayout
+        formLayout.setRowVisible(self.ui.hueRangeWidget, mode == THRESHOLD_MODE_HSV)
+        formLayout.setRowVisible(
+            self.ui.saturationRangeWidget, mode == THRESHOLD_MODE_HSV
+        )
+        formLayout.setRowVisible(self.ui.valueRangeWidget, mode == THRESHOLD_MODE_HSV)
+        formLayout.setRowVisible(self.ui.keyColorButton, mode == THRESHOLD_MODE_LAB)
+        formLayout.setRowVisible(self.ui.labDistanceSlider, mode == THRESHOLD_MODE_LAB)
+
+    def _UpdateThresholdMode(self) -> None:
+        self.viewModel.ThresholdMode = self.ui.thresholdModeComboBox.currentData()
+        self.viewModel.CompleteThresholdParametersModification()
+        self._EnableThresholdWidgets()
+        self._RequestBinaryImage()
+
+    def _UpdateThresholdParameters(self) -> None:
+        blockSize = self.ui.blockSizeSpinBox.value()
+        if blockSize % 2 == 0:  # typed in, the arrows keep it odd
+            blockSize += 1
+
+        self.viewModel.BlockSize = blockSize
+        self.viewModel.Bias = self.ui.biasSpinBox.value()
+        self._RequestBinaryImage()
+        self.viewModel.PreviewMaskParameters()
+
+    def _UpdateColorRange(self) -> None:
+        colorRange = deepcopy(self.viewModel.ColorRangeParameters)
+        colorRange.hueMin = self.ui.hueMinSpinBox.value()
+        colorRange.hueMax = self.ui.hueMaxSpinBox.value()
+        colorRange.saturationMin = self.ui.saturationMinSpinBox.value()
+        colorRange.saturationMax = self.ui.saturationMaxSpinBox.value()
+        colorRange.valueMin = self.ui.valueMinSpinBox.value()
+        colorRange.valueMax = self.ui.valueMaxSpinBox.value()
+
+        self.viewModel.ColorRangeParameters = colorRange
+        self._RequestBinaryImage()
+        self.viewModel.PreviewMaskParameters()
+
+    def _PickKeyColor(self) -> None:
+        blue, green, red = LabToBgr(self.viewModel.ColorRangeParameters.labColor)
+        color = QColorDialog.getColor(QColor(red, green, blue), self, "Key Color")
+        if not color.isValid():
+            return
+
+        colorRange = deepcopy(self.viewModel.ColorRangeParameters)
+        colorRange.labColor = BgrToLab((color.blue(), color.green(), color.red()))
+
+        self.viewModel.ColorRangeParameters = colorRange
+        self.viewModel.CompleteColorRangeModification()
+        self._ShowKeyColor()
+        self._RequestBinaryImage()
+
+    def _UpdateLabDistance(self) -> None:
+        colorRange = deepcopy(self.viewModel.ColorRangeParameters)
+        colorRange.labDistance = self.ui.labDistanceSlider.value()
+
+        self.viewModel.ColorRangeParameters = colorRange
+        self._RequestBinaryImage()
+        self.viewModel.PreviewMaskParameters()
+
+    def _RequestBinaryImage(self) -> None:
+        self._binarizationService.Request(self.viewModel.Threshold)
 
     def _UpdateBinaryImage(self) -> None:
         value = self.ui.thresholdSlider.value()
         self.viewModel.Threshold = value
 
-        self.ui.binaryImageLabel.SetImage(
-            self.viewModel.GetBinaryImage(value),
-            QImage.Format.Format_Grayscale8,
-        )
+        if self.viewModel.ThresholdMode == THRESHOLD_MODE_GLOBAL:
+            # shown at once, corrected by the binary image if there are mask stages
+            self._ShowCoverage(self.viewModel.GetCoverage(value))
+        self._binarizationService.Request(value)
+        self.viewModel.PreviewMaskParameters()
+
+    def _ShowCoverage(self, coverage: float) -> None:
+        self.ui.coverageLabel.setText(f"Coverage: {coverage * 100:.1f}%")
+
+    def _ShowBinaryImage(self, image: cv.Mat | None, coverage: float) -> None:
+        """
+        Show the binary image and its coverage, both computed on the thread pool.
+        """
+        if image is None:
+            return
+
+        self.ui.binaryImageLabel.SetImage(image, QImage.Format.Format_Grayscale8)
+        self._ShowCoverage(coverage)
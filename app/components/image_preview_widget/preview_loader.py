@@ -0,0 +1,130 @@
+from typing import Any, Callable
+import cv2 as cv
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from utils.logger import logger  # type: ignore
+
+
+class _LoadTask(QRunnable):
+    def __init__(
+        self,
+        loader: "PreviewLoader",
+        loadImage: Callable[[Callable[[], bool]], cv.Mat | None],
+        binarize: Callable[[], cv.Mat | None],
+    ) -> None:
+        super().__init__()
+        self._loader = loader
+        self._loadImage = loadImage
+        self._binarize = binarize
+
+    def run(self) -> None:
+        if self._loader.IsCancelled:
+            return
+
+        image: cv.Mat | None = None
+        binaryImage: cv.Mat | None = None
+        coverage = 0.0
+        try:
+            image = self._loadImage(lambda: self._loader.IsCancelled)
+            if image is not None and not self._loader.IsCancelled:
+                binaryImage = self._binarize()
+            if binaryImage is not None:
+                coverage = cv.countNonZero(binaryImage) / binaryImage.size
+        except Exception as e:
+            logger.error(f"Failed to load the image preview: {e}")
+
+        if self._loader.IsCancelled:
+            return
+
+        try:
+            self._loader.finished.emit(image, binaryImage, coverage)
+        except RuntimeError:
+            pass  # the loader was deleted with its widget while the task was running
+
+
+class PreviewLoader(QObject):
+    """
+    Decode the image and compute its first binary image (and its coverage) on the
+        thread pool, so the tab of the image can be shown (with a placeholder) before the
+        image is loaded. The result is posted back on the GUI thread through the
+        `callback`, unless the load was cancelled (e.g. the tab was closed) before it
+        finished.
+
+    The `loadImage` function gets the cancellation flag of the load and is expected to
+        poll it while decoding, the binarization is skipped if the load is cancelled.
+        The binarization is prepared when the load starts, on the GUI thread.
+
+    Examples:
+    ```python
+        loader = PreviewLoader(
+            viewModel.LoadImage,
+            lambda: viewModel.PrepareBinarization(viewModel.Threshold),
+            self._OnLoaded,
+        )
+        loader.Start()
+    ```
+    """
+
+    finished = pyqtSignal(object, object, float)
+
+    def __init__(
+        self,
+        loadImage: Callable[[Callable[[], bool]], cv.Mat | None],
+        prepareBinarization: Callable[[], Callable[[], cv.Mat | None]],
+        callback: Callable[[cv.Mat | None, cv.Mat | None, float], Any],
+        threadPool: QThreadPool | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._loadImage = loadImage
+        self._prepareBinarization = prepareBinarization
+        self._callback = callback
+        self._threadPool = (
+            threadPool if threadPool is not None else QThreadPool.globalInstance()
+        )
+
+        self._isRunning = False
+        self._isCancelled = False
+
+        self.finished.connect(self._OnFinished)
+
+    @property
+    def IsBusy(self) -> bool:
+        return self._isRunning
+
+    @property
+    def IsCancelled(self) -> bool:
+        return self._isCancelled
+
+    def Start(self) -> None:
+        """
+        Raises:
+            RuntimeError: If the loader is already running.
+        """
+        if self._isRunning:
+            raise RuntimeError("Preview is already loading")
+
+        self._isRunning = True
+        self._isCancelled = False
+        self._threadPool.start(
+            _LoadTask(self, self._loadImage, self._prepareBinarization())
+        )
+
+    def Cancel(self) -> None:
+        """
+        Stop the running load, the decoding stops at the next read of the file and the
+            result is never shown.
+        """
+        if self._isRunning:
+            self._isCancelled = True
+            self._isRunning = False
+
+    @pyqtSlot(object, object, float)
+    def _OnFinished(
+        self, image: cv.Mat | None, binaryImage: cv.Mat | None, coverage: float
+    ) -> None:
+        if not self._isRunning:
+            return
+
+        self._isRunning = False
+        self._callback(image, binaryImage, coverage)
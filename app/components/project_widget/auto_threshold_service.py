@@ -0,0 +1,65 @@
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from modules.auto_threshold import AutoThresholdJob, AutoThresholdResult
+
+
+class AutoThresholdService(QObject):
+    """
+    Run an `AutoThresholdJob` and post its progress and its results back on the GUI
+        thread through the `progress` and `finished` signals. Only one job runs at a time,
+        nothing is reported anymore for a cancelled job.
+    """
+
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(list)  # list[AutoThresholdResult]
+
+    _jobProgress = pyqtSignal(object, int, int)
+    _jobFinished = pyqtSignal(object, list)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._job: AutoThresholdJob | None = None
+
+        self._jobProgress.connect(self._OnJobProgress)
+        self._jobFinished.connect(self._OnJobFinished)
+
+    @property
+    def IsBusy(self) -> bool:
+        return self._job is not None
+
+    def Start(self, method: str, images: list[tuple[str, list[int]]]) -> None:
+        """
+        Raises:
+            RuntimeError: If the previous job is not finished yet.
+        """
+        if self._job is not None:
+            raise RuntimeError("The previous auto threshold is not finished yet")
+
+        job: AutoThresholdJob | None = None
+        job = AutoThresholdJob(
+            method,
+            lambda done, total: self._jobProgress.emit(job, done, total),
+            lambda results: self._jobFinished.emit(job, results),
+        )
+        self._job = job
+        job.Start(images)
+
+    def Cancel(self) -> None:
+        if self._job is not None:
+            self._job.Cancel()
+            self._job = None
+
+    @pyqtSlot(object, int, int)
+    def _OnJobProgress(self, job: AutoThresholdJob, done: int, total: int) -> None:
+        if job is self._job:
+            self.progress.emit(done, total)
+
+    @pyqtSlot(object, list)
+    def _OnJobFinished(
+        self, job: AutoThresholdJob, results: list[AutoThresholdResult]
+    ) -> None:
+        if job is not self._job:
+            return
+
+        self._job = None
+        self.finished.emit(results)
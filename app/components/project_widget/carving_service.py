@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from typing import Any, Callable
+import numpy as np
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from modules.incremental_carving import IncrementalCarver
+from modules.mask_store import MaskStore
+from modules.sculpture_engine import Silhouette
+from utils.logger import logger  # type: ignore
+
+
+@dataclass(frozen=True)
+class CarvingView:
+    """
+    An image as it is carved: its view id, the `key` of its silhouette (the mask key and
+        the light direction) and the stored working mask of its current parameters, or
+        the builder of the working mask of the parameters which are being edited (see
+        `ImagePreviewViewModel.PrepareWorkingMask`), which is not stored.
+    """
+
+    viewId: str
+    key: str
+    imageHash: str
+    maskKey: str
+    direction: tuple[float, float, float]
+    buildMask: Callable[[], np.ndarray | None] | None = None
+
+
+@dataclass(frozen=True)
+class CarvingJob:
+    """
+    The views of all the images, taken on the GUI thread when the job is requested.
+    """
+
+    carver: IncrementalCarver
+    store: MaskStore
+    views: tuple[CarvingView, ...]
+
+
+def Carve(job: CarvingJob) -> bool:
+    """
+    Carve again only the views whose working mask or light direction changed, and
+        remove the views of the deleted images. A view whose new working mask is not
+        built yet keeps its previous silhouette until the mask is ready.
+
+    Returns:
+        Whether the sculpture changed.
+    """
+    carver = job.carver
+    isChanged = False
+
+    for view in job.views:
+        if carver.GetKey(view.viewId) == view.key:
+            continue
+
+        if view.buildMask is not None:
+            mask = view.buildMask()
+        else:
+            mask = job.store.Get(view.imageHash, view.maskKey)
+        if mask is None:
+            continue
+
+        silhouette = Silhouette(mask, view.direction)
+        isChanged |= carver.SetView(view.viewId, silhouette, view.key)
+
+    viewIds = {view.viewId for view in job.views}
+    for viewId in carver.ViewIds:
+        if viewId not in viewIds:
+            isChanged |= carver.RemoveView(viewId)
+
+    return isChanged
+
+
+class _CarvingTask(QRunnable):
+    def __init__(self, service: "CarvingService", job: CarvingJob) -> None:
+        super().__init__()
+        self._service = service
+        self._job = job
+
+    def run(self) -> None:
+        isChanged = False
+        voxelCount = 0
+        try:
+            isChanged = Carve(self._job)
+            if isChanged:
+                voxelCount = int(np.count_nonzero(self._job.carver.Volume))
+        except Exception as e:
+            logger.error(f"Failed to carve the sculpture: {e}")
+
+        try:
+            self._service.finished.emit(
+                isChanged, len(self._job.carver.ViewIds), voxelCount
+            )
+        except RuntimeError:
+            pass  # the service was deleted with its widget while the task was running
+
+
+class CarvingService(QObject):
+    """
+    Carve the sculpture on the thread pool instead of the GUI thread (see `Carve`). Only
+        one job is in flight at a time, so the carver is only changed by that job: while
+        it is running, new requests replace the pending one (latest wins). The number of
+        the views and of the occupied voxels are posted back on the GUI thread through
+        the `callback` when the sculpture changed.
+
+    Examples:
+    ```python
+        service = CarvingService(self._OnSculptureCarved)
+
+        service.Request(viewModel.PrepareCarving()) # started on the thread pool
+        service.Request(viewModel.PrepareCarving()) # pending
+        service.Request(viewModel.PrepareCarving()) # replaces the pending one
+    ```
+    """
+
+    finished = pyqtSignal(bool, int, int)
+
+    def __init__(
+        self,
+        callback: Callable[[int, int], Any],
+        threadPool: QThreadPool | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._callback = callback
+        self._threadPool = (
+            threadPool if threadPool is not None else QThreadPool.globalInstance()
+        )
+
+        self._isRunning = False
+        self._pendingJob: CarvingJob | None = None
+
+        self.finished.connect(self._OnFinished)
+
+    @property
+    def IsBusy(self) -> bool:
+        return self._isRunning or self._pendingJob is not None
+
+    def Request(self, job: CarvingJob) -> None:
+        """
+        Carve the views of the `job`, the job is started immediately if the service is
+            idle, otherwise it is kept as the pending request.
+        """
+        if not self._isRunning:
+            self._Start(job)
+            return
+
+        self._pendingJob = job
+
+    def _Start(self, job: CarvingJob) -> None:
+        self._isRunning = True
+        self._threadPool.start(_CarvingTask(self, job))
+
+    @pyqtSlot(bool, int, int)
+    def _OnFinished(self, isChanged: bool, viewCount: int, voxelCount: int) -> None:
+        self._isRunning = False
+
+        if isChanged:
+            self._callback(viewCount, voxelCount)
+
+        if self._pendingJob is not None:
+            pendingJob = self._pendingJob
+            self._pendingJob = None
+            self._Start(pendingJob)
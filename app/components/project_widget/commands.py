@@ -0,0 +1,35 @@
+from typing import Any
+from constants import IMAGE_PREVIEW_CHANGED_EVENT_NAME
+from modules.event_system.event_system import EventSystem
+from modules.history_manager import Command
+from structs.image_meta import ImageMeta
+from structs.project import Project
+
+
+class ChangeThresholdsCommand(Command):
+    """
+    Change the thresholds of several images at once (e.g. the auto threshold of the whole
+        project), be undone as a single history entry.
+    """
+
+    def __init__(self, project: Project, changes: list[tuple[ImageMeta, int]]):
+        self._project = project
+        self._changes = changes
+        self._preValues = [(image, image.threshold) for image, _ in changes]
+
+    def _ExecuteImpl(self, *args: Any, **kwargs: Any) -> None:
+        self._SetThresholds(self._changes)
+
+    def _UndoImpl(self) -> str | None:
+        self._SetThresholds(self._preValues)
+        return None
+
+    def _SetThresholds(self, thresholds: list[tuple[ImageMeta, int]]) -> None:
+        for image, threshold in thresholds:
+            image.threshold = threshold
+
+        # the images are matched by identity, the list may be reordered since the change
+        changedImages = {id(image) for image, _ in thresholds}
+        for index, image in enumerate(self._project.images):
+            if id(image) in changedImages:
+                EventSystem.TriggerEvent(IMAGE_PREVIEW_CHANGED_EVENT_NAME, index)
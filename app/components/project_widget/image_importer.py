@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from threading import Lock
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from modules.image_probe import ProbeImage
+from modules.image_store import ImageStore
+from modules.luminance_histogram import LuminanceHistogram
+from structs.image_meta import ImageMeta
+from utils.logger import logger  # type: ignore
+
+
+@dataclass
+class ImageImportJob:
+    sourcePath: str
+    image: ImageMeta
+
+
+class _StoreTask(QRunnable):
+    def __init__(
+        self,
+        importer: "ImageImporter",
+        store: ImageStore,
+        batchId: int,
+        index: int,
+        job: ImageImportJob,
+    ) -> None:
+        super().__init__()
+        self._importer = importer
+        self._store = store
+        self._batchId = batchId
+        self._index = index
+        self._job = job
+
+    def run(self) -> None:
+        if self._importer.IsCancelled(self._batchId):
+            self._importer.copied.emit(self._batchId, self._index, False)
+            return
+
+        try:
+            self._job.image.storedName = self._store.Import(self._job.sourcePath)
+            success = True
+        except OSError as e:
+            logger.error(f'Failed to import "{self._job.sourcePath}": {e}')
+            success = False
+
+        if success:
+            storedPath = self._store.GetPath(self._job.image.storedName)
+
+            header = ProbeImage(storedPath)
+            if header is not None:
+                header.ApplyTo(self._job.image)
+
+            storedName = self._job.image.storedName
+            encoded = self._importer.GetHistogram(storedName)
+            if encoded is None:
+                histogram = LuminanceHistogram.FromFile(storedPath)
+                if histogram is not None:
+                    encoded = histogram.Encode()
+                    self._importer.AddHistogram(storedName, encoded)
+
+            if encoded is not None:
+                self._job.image.histogram = encoded
+
+        self._importer.copied.emit(self._batchId, self._index, success)
+
+
+class ImageImporter(QObject):
+    """
+    Store the image files of an import batch concurrently on the thread pool (see
+        `ImageStore`, the duplicated content is stored only once). The progress
+        is posted back on the GUI thread through the `progress` signal, and once every
+        file of the batch is handled, `finished` is emitted once with the images whose
+        files were copied, in the order of the jobs. Only one batch runs at a time.
+
+    The histogram of a stored file is computed only once: the files whose content is
+        already stored take the histogram of the images of the same `storedName`.
+
+    Examples:
+    ```python
+        importer = ImageImporter()
+        importer.progress.connect(lambda done, total: ...)
+        importer.finished.connect(viewModel.CommitImport)
+
+        importer.Import(
+            viewModel.ImageStore,
+            viewModel.PrepareImport(imagePaths),
+            viewModel.StoredHistograms,
+        )
+    ```
+    """
+
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(list)  # list[ImageMeta]
+    copied = pyqtSignal(int, int, bool)  # batch id, job index, success
+
+    def __init__(
+        self,
+        threadPool: QThreadPool | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._threadPool = (
+            threadPool if threadPool is not None else QThreadPool.globalInstance()
+        )
+
+        self._batchId = 0
+        self._cancelledBatchId = -1
+        self._jobs: list[ImageImportJob] = []
+        self._succeeded: list[bool] = []
+        self._doneCount = 0
+
+        self._histograms: dict[str, str] = {}
+        self._histogramLock = Lock()
+
+        self.copied.connect(self._OnCopied)
+
+    @property
+    def IsBusy(self) -> bool:
+        return self._doneCount < len(self._jobs)
+
+    def IsCancelled(self, batchId: int) -> bool:
+        return batchId <= self._cancelledBatchId
+
+    def GetHistogram(self, storedName: str) -> str | None:
+        """
+        The encoded histogram of the stored file (see `LuminanceHistogram.Encode`), None
+            if it is not known yet. Safe to be called from the worker threads.
+        """
+        with self._histogramLock:
+            return self._histograms.get(storedName)
+
+    def AddHistogram(self, storedName: str, histogram: str) -> None:
+        with self._histogramLock:
+            self._histograms[storedName] = histogram
+
+    def Import(
+        self,
+        store: ImageStore,
+        jobs: list[ImageImportJob],
+        storedHistograms: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Start storing the files of the `jobs` in the background, the `storedName` of each
+            job image is set once its file is stored, followed by its header (size,
+            channels and dtype) and its `histogram`.
+
+        Args:
+            storedHistograms: The known histograms by `storedName`, e.g. those of the
+                project images.
+
+        Raises:
+            RuntimeError: If the previous batch is not finished yet.
+        """
+        if self.IsBusy:
+            raise RuntimeError("The previous import is not finished yet")
+
+        self._batchId += 1
+        self._jobs = jobs
+        with self._histogramLock:
+            self._histograms = dict(storedHistograms or {})
+        self._succeeded = [False] * len(jobs)
+        self._doneCount = 0
+
+        if len(jobs) == 0:
+            self.finished.emit([])
+            return
+
+        self.progress.emit(0, len(jobs))
+        for index, job in enumerate(jobs):
+            self._threadPool.start(_StoreTask(self, store, self._batchId, index, job))
+
+    def Cancel(self) -> None:
+        """
+        The files which are not copied yet are skipped, the already copied images are
+            still reported by `finished`.
+        """
+        self._cancelledBatchId = self._batchId
+
+    @pyqtSlot(int, int, bool)
+    def _OnCopied(self, batchId: int, index: int, success: bool) -> None:
+        if batchId != self._batchId:
+            return
+
+        self._succeeded[index] = success
+        self._doneCount += 1
+        self.progress.emit(self._doneCount, len(self._jobs))
+
+        if self._doneCount < len(self._jobs):
+            return
+
+        images = [
+            job.image
+            for job, succeeded in zip(self._jobs, self._succeeded)
+            if succeeded
+        ]
+        logger.info(f"Imported {len(images)} of {len(self._jobs)} images")
+
+        self._jobs = []
+        self._succeeded = []
+        self._doneCount = 0
+        self.finished.emit(images)
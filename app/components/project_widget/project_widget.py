@@ -6,18 +6,39 @@ from PyQt6.QtGui import (
     QStandardItem,
     QStandardItemModel,
 )
-from PyQt6.QtWidgets import QFileDialog, QMenu, QWidget
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QFileDialog, QMenu, QProgressDialog, QWidget
+from PyQt6.QtCore import QSize, Qt
 from functools import partial
+from typing import Any, Callable
+import numpy as np
 
 from constants import (
+    AUTO_THRESHOLD_OTSU_METHOD,
+    AUTO_THRESHOLD_OTSU_OPTION,
+    AUTO_THRESHOLD_PROGRESS_EVENT_NAME,
+    AUTO_THRESHOLD_TRIANGLE_METHOD,
+    AUTO_THRESHOLD_TRIANGLE_OPTION,
+    CHANGE_PROJECT_EVENT_NAME,
     IMAGE_CONTEXT_DELETE_OPTION,
     IMAGE_CONTEXT_OPEN_OPTION,
+    IMAGE_PREVIEW_CHANGED_EVENT_NAME,
+    MASK_PARAMETERS_CHANGED_EVENT_NAME,
+    MASK_PARAMETERS_PREVIEWED_EVENT_NAME,
     MODIFY_IMAGES_LIST_EVENT_NAME,
     OPEN_IMAGE_TAB_EVENT_NAME,
+    SCULPTURE_CHANGED_EVENT_NAME,
+    THUMBNAIL_SIZE,
 )
+from modules.auto_threshold import AutoThresholdResult
 from modules.event_system.event_system import EventSystem
-from .project_widget_view_model import ProjectWidgetViewModel
+from modules.mask_store import MaskKey
+from structs.image_meta import ImageMeta
+from .project_widget_view_model import ImageItem, ProjectWidgetViewModel
+from .auto_threshold_service import AutoThresholdService
+from .carving_service import CarvingService
+from .image_importer import ImageImporter
+from .thumbnail_loader import ThumbnailLoader
+from .working_mask_loader import WorkingMaskLoader
 from converted_uis.project_widget import Ui_ProjectWidget
 from modules.dependency_injection.helper import as_dependency
 from utils.logger import logger  # type: ignore
@@ -35,6 +56,21 @@ class ProjectWidget(QWidget):
         self.ui = Ui_ProjectWidget()
 
         self.viewModel = viewModel
+        self._thumbnailLoader = ThumbnailLoader(parent=self)
+        self._thumbnailLoader.thumbnailReady.connect(self._OnThumbnailReady)
+        self._imageItems: dict[str, ImageItem] = {}
+        self._workingMaskLoader = WorkingMaskLoader(parent=self)
+        self._workingMaskLoader.maskReady.connect(self._OnWorkingMaskReady)
+        self._carvingService = CarvingService(self._OnSculptureCarved, parent=self)
+        self._imageImporter = ImageImporter(parent=self)
+        self._imageImporter.progress.connect(self._OnImportProgress)
+        self._imageImporter.finished.connect(self._OnImportFinished)
+        self._importProgressDialog: QProgressDialog | None = None
+        self._autoThresholdService = AutoThresholdService(parent=self)
+        self._autoThresholdService.progress.connect(self._OnAutoThresholdProgress)
+        self._autoThresholdService.finished.connect(self._OnAutoThresholdFinished)
+        self._autoThresholdImages: list[ImageMeta] = []
+        self._autoThresholdProgressDialog: QProgressDialog | None = None
 
         self._SetupUI()
 
@@ -49,28 +85,211 @@ class ProjectWidget(QWidget):
         self.addAction(self.importImageAction)
         self.ui.importFileButton.clicked.connect(self.importImageAction.trigger)
 
+        autoThresholdMenu = QMenu(self.ui.autoThresholdButton)
+        autoThresholdMenu.addAction(
+            AUTO_THRESHOLD_OTSU_OPTION,
+            partial(self._AutoThreshold, AUTO_THRESHOLD_OTSU_METHOD),
+        )
+        autoThresholdMenu.addAction(
+            AUTO_THRESHOLD_TRIANGLE_OPTION,
+            partial(self._AutoThreshold, AUTO_THRESHOLD_TRIANGLE_METHOD),
+        )
+        self.ui.autoThresholdButton.setMenu(autoThresholdMenu)
+
         self._ShowImages()
         EventSystem.RegisterEvent(MODIFY_IMAGES_LIST_EVENT_NAME, self._ShowImages)
+        EventSystem.RegisterEvent(CHANGE_PROJECT_EVENT_NAME, self.viewModel.PruneMasks)
+        EventSystem.RegisterEvent(
+            IMAGE_PREVIEW_CHANGED_EVENT_NAME, self._RequestWorkingMasks
+        )
+        EventSystem.RegisterEvent(
+            MASK_PARAMETERS_CHANGED_EVENT_NAME, self._OnMaskParametersChanged
+        )
+        EventSystem.RegisterEvent(
+            MASK_PARAMETERS_PREVIEWED_EVENT_NAME, self._OnMaskParametersPreviewed
+        )
 
     def _ImportImageFile(self) -> None:
-        file, _ = QFileDialog.getOpenFileName(
-            self, "Import Image File", "", "Image Files (*.png *.jpg *.jpeg)"
+        files, _ = QFileDialog.getOpenFileNames(
+            self, "Import Image Files", "", "Image Files (*.png *.jpg *.jpeg)"
+        )
+
+        if not files or self._imageImporter.IsBusy:
+            return
+
+        self.importImageAction.setEnabled(False)
+        self.ui.importFileButton.setEnabled(False)
+
+        self._importProgressDialog = QProgressDialog(
+            "Importing images...", "Cancel", 0, len(files), self
+        )
+        self._importProgressDialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self._importProgressDialog.canceled.connect(self._imageImporter.Cancel)
+
+        self._imageImporter.Import(
+            self.viewModel.ImageStore,
+            self.viewModel.PrepareImport(files),
+            self.viewModel.StoredHistograms,
         )
 
-        if file:
-            self.viewModel.LoadImage(file)
+    def _OnImportProgress(self, done: int, total: int) -> None:
+        if self._importProgressDialog is not None:
+            self._importProgressDialog.setMaximum(total)
+            self._importProgressDialog.setValue(done)
+
+    def _OnImportFinished(self, images: list[ImageMeta]) -> None:
+        if self._importProgressDialog is not None:
+            self._importProgressDialog.canceled.disconnect()
+            self._importProgressDialog.close()
+            self._importProgressDialog.deleteLater()
+            self._importProgressDialog = None
+
+        self.importImageAction.setEnabled(True)
+        self.ui.importFileButton.setEnabled(True)
+
+        self.viewModel.CommitImport(images)
+
+    def _AutoThreshold(self, method: str) -> None:
+        if self._autoThresholdService.IsBusy:
+            return
+
+        images, inputs = self.viewModel.PrepareAutoThreshold()
+        if len(images) == 0:
+            return
+
+        self._autoThresholdImages = images
+        self.ui.autoThresholdButton.setEnabled(False)
+
+        self._autoThresholdProgressDialog = QProgressDialog(
+            "Computing the thresholds...", "Cancel", 0, len(images), self
+        )
+        self._autoThresholdProgressDialog.setWindowModality(
+            Qt.WindowModality.WindowModal
+        )
+        self._autoThresholdProgressDialog.canceled.connect(self._CancelAutoThreshold)
+
+        self._autoThresholdService.Start(method, inputs)
+
+    def _OnAutoThresholdProgress(self, done: int, total: int) -> None:
+        EventSystem.TriggerEvent(AUTO_THRESHOLD_PROGRESS_EVENT_NAME, done, total)
+
+        if self._autoThresholdProgressDialog is not None:
+            self._autoThresholdProgressDialog.setValue(done)
+
+    def _OnAutoThresholdFinished(self, results: list[AutoThresholdResult]) -> None:
+        images = self._autoThresholdImages
+        self._CloseAutoThresholdProgressDialog()
+
+        self.viewModel.ApplyAutoThresholds(images, results)
+
+    def _CancelAutoThreshold(self) -> None:
+        self._autoThresholdService.Cancel()
+        self._CloseAutoThresholdProgressDialog()
+
+    def _CloseAutoThresholdProgressDialog(self) -> None:
+        if self._autoThresholdProgressDialog is not None:
+            self._autoThresholdProgressDialog.canceled.disconnect()
+            self._autoThresholdProgressDialog.close()
+            self._autoThresholdProgressDialog.deleteLater()
+            self._autoThresholdProgressDialog = None
+
+        self._autoThresholdImages = []
+        self.ui.autoThresholdButton.setEnabled(True)
 
     def _ShowImages(self) -> None:
         projectView = self.ui.projectTreeView
         projectView.setHeaderHidden(True)
+        projectView.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
 
         model = QStandardItemModel()
         rootNode = model.invisibleRootItem()
+        thumbnailCache = self.viewModel.ThumbnailCache
+        self._imageItems.clear()
+
+        for item in self.viewModel.ImageItemsWithThumbnails:
+            if item.thumbnailPath is not None:
+                item.SetThumbnail(item.thumbnailPath)
+            else:
+                self._thumbnailLoader.Request(
+                    thumbnailCache,
+                    item.imageName,
+                    item.imagePath,
+                    item.contentHash,
+                )
 
-        for item in self.viewModel.ImageItems:
+            self._imageItems[item.imageName] = item
             rootNode.appendRow(item)
 
         projectView.setModel(model)
+        self._RequestWorkingMasks()
+
+    def _RequestWorkingMasks(self, *args: Any) -> None:
+        """
+        Build the working masks whose image or parameters changed in the background, the
+            masks which are up to date are only checked on disk.
+        """
+        for image in self.viewModel.project.images:
+            self._RequestWorkingMask(image)
+
+        self._carvingService.Request(self.viewModel.PrepareCarving())
+
+    def _RequestWorkingMask(
+        self,
+        image: ImageMeta,
+        buildMask: Callable[[], np.ndarray | None] | None = None,
+    ) -> None:
+        resolution = self.viewModel.MaskResolution
+        self._workingMaskLoader.Request(
+            self.viewModel.MaskStore,
+            image.CacheId,
+            MaskKey(image, resolution),
+            self.viewModel.GetImagePath(image),
+            image,
+            resolution,
+            buildMask,
+        )
+
+    def _OnMaskParametersChanged(
+        self, index: int, buildMask: Callable[[], np.ndarray | None]
+    ) -> None:
+        """
+        Store the working mask of the recorded parameters of the image, built from the
+            image of its preview, and carve it (at once if it is already stored,
+            otherwise once it is stored).
+        """
+        images = self.viewModel.project.images
+        if index < 0 or index >= len(images):
+            return
+
+        self._RequestWorkingMask(images[index], buildMask)
+        self._carvingService.Request(self.viewModel.PrepareCarving())
+
+    def _OnMaskParametersPreviewed(
+        self, index: int, buildMask: Callable[[], np.ndarray | None]
+    ) -> None:
+        """
+        Carve the working mask of the parameters which are being edited, it is built in
+            memory and only the edited image is carved again.
+        """
+        self._carvingService.Request(self.viewModel.PrepareCarving(index, buildMask))
+
+    def _OnWorkingMaskReady(self, imageHash: str, key: str) -> None:
+        self._carvingService.Request(self.viewModel.PrepareCarving())
+
+    def _OnSculptureCarved(self, viewCount: int, voxelCount: int) -> None:
+        EventSystem.TriggerEvent(SCULPTURE_CHANGED_EVENT_NAME, viewCount, voxelCount)
+
+    def _OnThumbnailReady(
+        self,
+        projectDirectory: str,
+        imageName: str,
+        thumbnailPath: str,
+    ) -> None:
+        if projectDirectory != self.viewModel.ThumbnailCache.ProjectDirectory:
+            return
+
+        if imageName in self._imageItems:
+            self._imageItems[imageName].SetThumbnail(thumbnailPath)
 
     def _MousePressEvent(self, e: QMouseEvent) -> None:
         if e.button() != Qt.MouseButton.RightButton:
@@ -1,28 +1,69 @@
-import shutil
-from PyQt6.QtGui import QStandardItem
-from constants import MODIFY_IMAGES_LIST_EVENT_NAME
+import os
+from datetime import datetime
+from typing import Callable
+import numpy as np
+from PyQt6.QtGui import QIcon, QPixmap, QStandardItem
+from constants import MODIFY_IMAGES_LIST_EVENT_NAME, THRESHOLD_MODE_GLOBAL
 from structs.application import Application
 from structs.image_meta import ImageMeta
 from structs.project import Project
 from modules.dependency_injection.helper import as_dependency
 from modules.event_system.event_system import EventSystem
+from modules.auto_threshold import AutoThresholdResult
+from modules.distance_field import DistanceFieldCache
+from modules.history_manager import HistoryManager
+from modules.image_probe import ProbeImage
+from modules.incremental_carving import IncrementalCarver
+from modules.image_store import ImageStore
+from modules.mask_store import MaskKey, MaskStore
+from modules.sculpture_engine import Silhouette
+from modules.luminance_histogram import LuminanceHistogram
+from modules.thumbnail_cache import ThumbnailCache
 from utils.application import (
     GetImageFileNameFromFilePath,
     GetImageFilePath,
+    GetDistanceFieldFolder,
+    GetImageFolder,
+    GetMaskFolder,
     GetImageNameBasedOnExistedImageNames,
 )
 from utils.logger import logger  # type: ignore
+from .carving_service import CarvingJob, CarvingView
+from .commands import ChangeThresholdsCommand
+from .image_importer import ImageImportJob
 
 
 class ImageItem(QStandardItem):
     def __init__(
         self,
         imageName: str,
+        thumbnailPath: str | None = None,
+        imagePath: str = "",
+        contentHash: str = "",
     ) -> None:
         super().__init__()
         self.imageName = imageName
+        self.thumbnailPath = thumbnailPath
+        self.imagePath = imagePath
+        self.contentHash = contentHash
         self.setText(imageName)
 
+    def SetThumbnail(self, thumbnailPath: str) -> None:
+        """
+        The thumbnail file is read through Python (not by Qt) and decoded from memory.
+        """
+        try:
+            with open(thumbnailPath, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.warning(f'Cannot read thumbnail "{thumbnailPath}": {e}')
+            return
+
+        pixmap = QPixmap()
+        if pixmap.loadFromData(data):
+            self.thumbnailPath = thumbnailPath
+            self.setIcon(QIcon(pixmap))
+
 
 @as_dependency(Project, Application)
 class ProjectWidgetViewModel:
@@ -33,28 +74,295 @@ class ProjectWidgetViewModel:
     ) -> None:
         self.project = project
         self.application = application
+        self._thumbnailCache: ThumbnailCache | None = None
+        self._imageStore: ImageStore | None = None
+        self._maskStore: MaskStore | None = None
+        self._carver: IncrementalCarver | None = None
 
     def LoadImage(self, imagePath: str) -> None:
-        imageName = GetImageFileNameFromFilePath(imagePath)
-        imageName = GetImageNameBasedOnExistedImageNames(
-            imageName,
-            [image.name for image in self.project.images],
-        )
-        self.project.images.append(ImageMeta(name=imageName))
+        """
+        Import a single image synchronously, prefer `PrepareImport` with `ImageImporter`
+            for the files selected in the dialog.
+        """
+        jobs = self.PrepareImport([imagePath])
+        storedHistograms = self.StoredHistograms
 
-        targetPath = GetImageFilePath(
-            self.application.CurrentProjectDirectory,
-            imageName,
-        )
+        for job in jobs:
+            job.image.storedName = self.ImageStore.Import(job.sourcePath)
+            storedPath = self.ImageStore.GetPath(job.image.storedName)
+
+            header = ProbeImage(storedPath)
+            if header is not None:
+                header.ApplyTo(job.image)
+
+            if job.image.storedName in storedHistograms:
+                job.image.histogram = storedHistograms[job.image.storedName]
+                continue
+
+            histogram = LuminanceHistogram.FromFile(storedPath)
+            if histogram is not None:
+                job.image.histogram = histogram.Encode()
+
+        self.CommitImport([job.image for job in jobs])
 
-        shutil.copyfile(imagePath, targetPath)
+    @property
+    def StoredHistograms(self) -> dict[str, str]:
+        """
+        The known encoded histograms of the stored files by `storedName`, the images
+            imported from the same content share their histogram.
+        """
+        return {
+            image.storedName: image.EncodedHistogram
+            for image in self.project.images
+            if image.storedName != "" and image.EncodedHistogram != ""
+        }
+
+    def PrepareImport(self, imagePaths: list[str]) -> list[ImageImportJob]:
+        """
+        Choose the unique name of each imported image, nothing is stored nor added to the
+            project yet.
+        """
+        existedImageNames = {image.name for image in self.project.images}
+        copiedAt = datetime.now().timestamp()
+        jobs: list[ImageImportJob] = []
+
+        for imagePath in imagePaths:
+            imageName = GetImageNameBasedOnExistedImageNames(
+                GetImageFileNameFromFilePath(imagePath),
+                existedImageNames,
+            )
+            existedImageNames.add(imageName)
+
+            jobs.append(
+                ImageImportJob(
+                    sourcePath=imagePath,
+                    image=ImageMeta(name=imageName, copiedAt=copiedAt),
+                )
+            )
 
+        return jobs
+
+    def CommitImport(self, images: list[ImageMeta]) -> None:
+        """
+        Add the imported images to the project, the images list event (which saves the
+            project and rebuilds the tree) is triggered once for the whole batch.
+        """
+        if len(images) == 0:
+            return
+
+        self.project.images.extend(images)
         EventSystem.TriggerEvent(MODIFY_IMAGES_LIST_EVENT_NAME)
 
+    @property
+    def ThumbnailCache(self) -> ThumbnailCache:
+        """
+        The thumbnail cache of the current project, be recreated when the project changes.
+        """
+        projectDirectory = self.application.CurrentProjectDirectory
+
+        if (
+            self._thumbnailCache is None
+            or self._thumbnailCache.ProjectDirectory != projectDirectory
+        ):
+            self._thumbnailCache = ThumbnailCache(projectDirectory)
+
+        return self._thumbnailCache
+
+    @property
+    def ImageStore(self) -> ImageStore:
+        """
+        The image store of the current project, be recreated when the project changes.
+        """
+        imageFolder = GetImageFolder(self.application.CurrentProjectDirectory)
+
+        if self._imageStore is None or self._imageStore.ImageFolder != imageFolder:
+            self._imageStore = ImageStore(imageFolder)
+
+        return self._imageStore
+
+    @property
+    def MaskStore(self) -> MaskStore:
+        """
+        The working mask store of the current project, be recreated when the project
+            changes.
+        """
+        maskFolder = GetMaskFolder(self.application.CurrentProjectDirectory)
+
+        if self._maskStore is None or self._maskStore.CacheFolder != maskFolder:
+            self._maskStore = MaskStore(maskFolder)
+
+        return self._maskStore
+
+    def PruneMasks(self) -> None:
+        """
+        Delete the working masks which no image of the project uses anymore, once the
+            project is loaded.
+        """
+        self.MaskStore.Prune(
+            (image.CacheId, MaskKey(image, self.MaskResolution))
+            for image in self.project.images
+        )
+
+    @property
+    def MaskResolution(self) -> int:
+        return self.project.sculptureSetting.maskResolution
+
+    def GetWorkingMask(self, image: ImageMeta) -> np.ndarray | None:
+        """
+        The read-only working mask of the current parameters of the image, mapped from the
+            project folder. None if it is not built yet (see `WorkingMaskLoader`).
+        """
+        return self.MaskStore.Get(image.CacheId, MaskKey(image, self.MaskResolution))
+
+    def GetSilhouettes(self) -> list[Silhouette]:
+        """
+        The working masks of the images with their light directions, the input of
+            `CarveVolume`. The images whose working mask is not built yet are skipped.
+        """
+        silhouettes: list[Silhouette] = []
+
+        for image in self.project.images:
+            mask = self.GetWorkingMask(image)
+            if mask is not None:
+                silhouettes.append(Silhouette(mask, tuple(image.lightDirection)))
+
+        return silhouettes
+
+    @property
+    def Carver(self) -> IncrementalCarver:
+        """
+        The incremental carving of the working masks, be recreated when the volume
+            resolution changes.
+        """
+        resolution = self.project.sculptureSetting.volumeResolution
+
+        if self._carver is None or self._carver.Resolution != resolution:
+            self._carver = IncrementalCarver(resolution)
+
+        return self._carver
+
+    def PrepareCarving(
+        self,
+        editedIndex: int | None = None,
+        buildMask: Callable[[], np.ndarray | None] | None = None,
+    ) -> CarvingJob:
+        """
+        The views of the images with their current parameters, the input of
+            `CarvingService.Request`. The parameters may change while the job is running.
+
+        Args:
+            editedIndex: The image whose parameters are being edited, its working mask is
+                built by `buildMask` instead of being read from the mask store.
+        """
+        views: list[CarvingView] = []
+
+        for index, image in enumerate(self.project.images):
+            # the name is the view id: the images of the same file share their content
+            maskKey = MaskKey(image, self.MaskResolution)
+            views.append(
+                CarvingView(
+                    viewId=image.name,
+                    key=f"{maskKey}:{image.lightDirection}",
+                    imageHash=image.CacheId,
+                    maskKey=maskKey,
+                    direction=tuple(image.lightDirection),  # type: ignore
+                    buildMask=buildMask if index == editedIndex else None,
+                )
+            )
+
+        return CarvingJob(self.Carver, self.MaskStore, tuple(views))
+
+    def GetImagePath(self, image: ImageMeta) -> str:
+        return GetImageFilePath(
+            self.application.CurrentProjectDirectory, image.FileName
+        )
+
     @property
     def ImageItems(self) -> list[QStandardItem]:
         return [ImageItem(image.name) for image in self.project.images]
 
+    @property
+    def ImageItemsWithThumbnails(self) -> list[ImageItem]:
+        """
+        The image items with the cached thumbnail paths, the items whose `thumbnailPath`
+            is None have no valid thumbnail yet.
+        """
+        thumbnailCache = self.ThumbnailCache
+        items: list[ImageItem] = []
+
+        for image in self.project.images:
+            imagePath = self.GetImagePath(image)
+            contentHash = os.path.splitext(image.storedName)[0]
+            item = ImageItem(
+                image.name,
+                thumbnailCache.GetCachedThumbnail(imagePath, contentHash),
+                imagePath,
+                contentHash,
+            )
+            if image.IsProbed:
+                item.setToolTip(
+                    f"{image.width} x {image.height}, {image.channels} channels, "
+                    f"{image.dtype}"
+                )
+
+            items.append(item)
+
+        return items
+
+    def PrepareAutoThreshold(
+        self,
+    ) -> tuple[list[ImageMeta], list[tuple[str, str]]]:
+        """
+        Returns:
+            The images of the project in the global threshold mode (the only mode the
+                threshold is computed from the histogram) and the file path and the
+                known histogram of each one, the input of `AutoThresholdService.Start`.
+        """
+        images = [
+            image
+            for image in self.project.images
+            if image.thresholdMode == THRESHOLD_MODE_GLOBAL
+        ]
+        return images, [
+            (self.GetImagePath(image), image.EncodedHistogram) for image in images
+        ]
+
+    def ApplyAutoThresholds(
+        self,
+        images: list[ImageMeta],
+        results: list[AutoThresholdResult],
+    ) -> None:
+        """
+        Apply the computed thresholds as one undoable history entry, the `images` are the
+            ones returned by `PrepareAutoThreshold`. The newly computed histograms are
+            kept in the image metas. The images switched to another threshold mode while
+            the thresholds were computed keep their threshold.
+        """
+        changes: list[tuple[ImageMeta, int]] = []
+
+        for result in results:
+            image = images[result.index]
+            if image.EncodedHistogram == "":
+                image.histogram = result.histogram
+
+            if (
+                image.thresholdMode == THRESHOLD_MODE_GLOBAL
+                and image.threshold != result.threshold
+            ):
+                changes.append((image, result.threshold))
+
+        if len(changes) == 0:
+            return
+
+        HistoryManager.Execute(ChangeThresholdsCommand(self.project, changes))
+
     def DeleteImage(self, index: int) -> None:
-        self.project.images.pop(index)
+        image = self.project.images.pop(index)
+
+        # the cached files of the image are not used by any other image
+        self.MaskStore.Invalidate(image.CacheId)
+        DistanceFieldCache(
+            GetDistanceFieldFolder(self.application.CurrentProjectDirectory)
+        ).Invalidate(image.CacheId)
+
         EventSystem.TriggerEvent(MODIFY_IMAGES_LIST_EVENT_NAME)
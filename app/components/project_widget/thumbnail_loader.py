@@ -0,0 +1,91 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from modules.thumbnail_cache import ThumbnailCache
+from utils.logger import logger  # type: ignore
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(
+        self,
+        loader: "ThumbnailLoader",
+        cache: ThumbnailCache,
+        imageName: str,
+        imagePath: str,
+        contentHash: str,
+    ) -> None:
+        super().__init__()
+        self._loader = loader
+        self._cache = cache
+        self._imageName = imageName
+        self._imagePath = imagePath
+        self._contentHash = contentHash
+
+    def run(self) -> None:
+        try:
+            thumbnailPath = self._cache.BuildThumbnail(
+                self._imagePath, self._contentHash
+            )
+        except Exception as e:
+            logger.error(f'Failed to build the thumbnail of "{self._imagePath}": {e}')
+            thumbnailPath = None
+
+        self._loader.finished.emit(self._cache, self._imageName, thumbnailPath or "")
+
+
+class ThumbnailLoader(QObject):
+    """
+    Build the missing thumbnails on the thread pool, each finished thumbnail is posted back
+        on the GUI thread through the `thumbnailReady` signal. The thumbnail index is saved
+        once all the requested thumbnails of the cache are built.
+    """
+
+    thumbnailReady = pyqtSignal(str, str, str)  # project directory, image name, path
+    finished = pyqtSignal(object, str, str)
+
+    def __init__(
+        self,
+        threadPool: QThreadPool | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._threadPool = (
+            threadPool if threadPool is not None else QThreadPool.globalInstance()
+        )
+        self._pending: set[tuple[str, str]] = set()
+
+        self.finished.connect(self._OnFinished)
+
+    def Request(
+        self,
+        cache: ThumbnailCache,
+        imageName: str,
+        imagePath: str,
+        contentHash: str = "",
+    ) -> None:
+        """
+        Build the thumbnail in the background, the request is ignored if the same image is
+            already being built.
+
+        Args:
+            contentHash: The hash the stored image is named by, see `ThumbnailCache`.
+        """
+        key = (cache.ProjectDirectory, imageName)
+        if key in self._pending:
+            return
+
+        self._pending.add(key)
+        self._threadPool.start(
+            _ThumbnailTask(self, cache, imageName, imagePath, contentHash)
+        )
+
+    @pyqtSlot(object, str, str)
+    def _OnFinished(
+        self, cache: ThumbnailCache, imageName: str, thumbnailPath: str
+    ) -> None:
+        self._pending.discard((cache.ProjectDirectory, imageName))
+
+        if not any(key[0] == cache.ProjectDirectory for key in self._pending):
+            cache.SaveIndex()
+
+        if thumbnailPath != "":
+            self.thumbnailReady.emit(cache.ProjectDirectory, imageName, thumbnailPath)
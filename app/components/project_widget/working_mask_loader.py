@@ -0,0 +1,148 @@
+from copy import deepcopy
+from typing import Callable
+import cv2 as cv
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from modules.mask_store import ComputeWorkingMask, MaskStore
+from structs.image_meta import ImageMeta
+from utils.logger import logger  # type: ignore
+
+# the mask key, the image path, the image, the resolution and the mask builder
+_WorkingMaskJob = tuple[str, str, ImageMeta, int, Callable[[], cv.Mat | None] | None]
+
+
+class _WorkingMaskTask(QRunnable):
+    def __init__(
+        self,
+        loader: "WorkingMaskLoader",
+        store: MaskStore,
+        imageHash: str,
+        key: str,
+        imagePath: str,
+        image: ImageMeta,
+        resolution: int,
+        buildMask: Callable[[], cv.Mat | None] | None,
+    ) -> None:
+        super().__init__()
+        self._loader = loader
+        self._store = store
+        self._imageHash = imageHash
+        self._key = key
+        self._imagePath = imagePath
+        self._image = image
+        self._resolution = resolution
+        self._buildMask = buildMask
+
+    def run(self) -> None:
+        success = False
+        try:
+            mask = self._buildMask() if self._buildMask is not None else None
+            if mask is None:
+                mask = ComputeWorkingMask(
+                    self._imagePath, self._image, self._resolution
+                )
+            if mask is not None:
+                self._store.Put(self._imageHash, self._key, mask)
+                success = True
+        except Exception as e:
+            logger.error(
+                f'Failed to build the working mask of "{self._imagePath}": {e}'
+            )
+
+        try:
+            self._loader.finished.emit(self._store, self._imageHash, self._key, success)
+        except RuntimeError:
+            pass  # the loader was deleted with its widget while the task was running
+
+
+class WorkingMaskLoader(QObject):
+    """
+    Build the missing working masks on the thread pool (see `MaskStore`). A mask which
+        is being built is not requested again, and if the parameters of its image change
+        meanwhile, the mask of the latest parameters is built once the running one is
+        finished.
+
+    The mask is computed from the image file, unless it is built from an image which is
+        already decoded (see `ImagePreviewViewModel.PrepareWorkingMask`).
+    """
+
+    maskReady = pyqtSignal(str, str)  # image hash, mask key
+    finished = pyqtSignal(object, str, str, bool)
+
+    def __init__(
+        self,
+        threadPool: QThreadPool | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._threadPool = (
+            threadPool if threadPool is not None else QThreadPool.globalInstance()
+        )
+        # (mask folder, image hash) -> the key of the running job
+        self._running: dict[tuple[str, str], str] = {}
+        # (mask folder, image hash) -> the job requested while another one is running
+        self._latest: dict[tuple[str, str], _WorkingMaskJob] = {}
+
+        self.finished.connect(self._OnFinished)
+
+    @property
+    def IsBusy(self) -> bool:
+        return len(self._running) > 0
+
+    def Request(
+        self,
+        store: MaskStore,
+        imageHash: str,
+        key: str,
+        imagePath: str,
+        image: ImageMeta,
+        resolution: int,
+        buildMask: Callable[[], cv.Mat | None] | None = None,
+    ) -> None:
+        """
+        Build the working mask in the background unless it is already stored or being
+            built. The `image` is copied, its parameters may change while the mask is
+            built.
+
+        Args:
+            buildMask: Build the mask without decoding the image file, the file is
+                decoded if it returns None.
+        """
+        imageId = (store.CacheFolder, imageHash)
+        job = (key, imagePath, deepcopy(image), resolution, buildMask)
+
+        if imageId in self._running:
+            if self._running[imageId] != key:
+                self._latest[imageId] = job
+            else:
+                self._latest.pop(imageId, None)
+            return
+
+        if store.Contains(imageHash, key):
+            return
+
+        self._Start(store, imageHash, job)
+
+    def _Start(self, store: MaskStore, imageHash: str, job: _WorkingMaskJob) -> None:
+        key, imagePath, image, resolution, buildMask = job
+        self._running[(store.CacheFolder, imageHash)] = key
+        self._threadPool.start(
+            _WorkingMaskTask(
+                self, store, imageHash, key, imagePath, image, resolution, buildMask
+            )
+        )
+
+    @pyqtSlot(object, str, str, bool)
+    def _OnFinished(
+        self, store: MaskStore, imageHash: str, key: str, success: bool
+    ) -> None:
+        imageId = (store.CacheFolder, imageHash)
+        self._running.pop(imageId, None)
+
+        job = self._latest.pop(imageId, None)
+        if job is not None:
+            self._Start(store, imageHash, job)
+            return
+
+        if success:
+            self.maskReady.emit(imageHash, key)
@@ -3,6 +3,8 @@ from typing import Generator
 import warnings
 
 from modules.history_manager import HistoryManager
+from modules.image_cache import ImageCache
+from modules.mask_pipeline import MaskPipeline
 from pyfakefs.fake_filesystem import FakeFilesystem
 
 from modules.event_system.event_system import EventSystem
@@ -47,6 +49,8 @@ def CleanDependencyContainer(fs: FakeFilesystem) -> Generator[None, None, None]:
     DependencyInjectionConfig()
     HistoryManager.Reset()
     EventSystem.Clear()
+    ImageCache.Clear()
+    MaskPipeline.Clear()
     fs.reset()
     yield
     fs.reset()
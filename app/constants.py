@@ -9,10 +9,54 @@ TEST_IMAGE_FOLDER = os.path.join(ASSETS_FOLDER, "images", "tests")
 VIEW_TAB_NAME = "OpenGL View"
 IMAGE_CONTEXT_OPEN_OPTION = "Open"
 IMAGE_CONTEXT_DELETE_OPTION = "Delete"
+AUTO_THRESHOLD_OTSU_OPTION = "Auto Threshold All Images (Otsu)"
+AUTO_THRESHOLD_TRIANGLE_OPTION = "Auto Threshold All Images (Triangle)"
+THRESHOLD_MODE_GLOBAL_OPTION = "Global"
+THRESHOLD_MODE_MEAN_OPTION = "Adaptive (Mean - C)"
+THRESHOLD_MODE_SAUVOLA_OPTION = "Adaptive (Sauvola)"
+THRESHOLD_MODE_HSV_OPTION = "Color Range (HSV)"
+THRESHOLD_MODE_LAB_OPTION = "Key Color (Lab)"
+IMAGE_PREVIEW_LOADING_TEXT = "Loading..."
+IMAGE_PREVIEW_LOAD_FAILED_TEXT = "Cannot load the image"
 # ==================================================================================
 
 # ================================ PARAMETERS ======================================
 DEFAULT_THRESHOLD = 128
+IMAGE_CACHE_BUDGET_BYTES = 1024 * 1024 * 1024  # the decoded images shared between tabs
+THUMBNAIL_SIZE = 64
+IMAGE_STORE_COPY_CHUNK_SIZE = 1024 * 1024
+IMAGE_STRIP_ROWS = 256  # the output rows of each strip of the binarization
+MAX_LARGE_IMAGE_PIXELS = 4 * 1024 * 1024 * 1024  # the decompression bomb limit
+MAX_DECODED_FRAME_PIXELS = 256 * 1024 * 1024  # the largest frame decoded at once
+IMAGE_PROBE_WORKERS = 8  # the threads which read the image headers
+AUTO_THRESHOLD_OTSU_METHOD = "otsu"
+AUTO_THRESHOLD_TRIANGLE_METHOD = "triangle"
+MASK_PIPELINE_CACHE_BUDGET_BYTES = 256 * 1024 * 1024  # the memoized stage outputs
+CONTOUR_MEMORY_CACHE_SIZE = 128  # the number of the contours kept in memory
+DEFAULT_CONTOUR_TOLERANCE = 1.0  # pixels
+MASK_STAGE_OPEN = "open"
+MASK_STAGE_CLOSE = "close"
+MASK_STAGE_FILL_HOLES = "fill_holes"
+MASK_STAGE_REMOVE_SMALL_COMPONENTS = "remove_small_components"
+MASK_STAGE_DILATE = "dilate"
+MASK_STAGE_ERODE = "erode"
+THRESHOLD_MODE_GLOBAL = "global"
+THRESHOLD_MODE_MEAN = "mean"  # the local mean minus the bias
+THRESHOLD_MODE_SAUVOLA = "sauvola"  # the bias is k in hundredths
+THRESHOLD_MODE_HSV = "hsv"  # the hue, saturation and value ranges
+THRESHOLD_MODE_LAB = "lab"  # the distance to a key color
+DEFAULT_ADAPTIVE_BLOCK_SIZE = 31  # pixels, odd
+DEFAULT_ADAPTIVE_BIAS = 10
+SAUVOLA_DYNAMIC_RANGE = 128.0  # the R of Sauvola's formula for 8-bit images
+DEFAULT_MASK_RESOLUTION = 512  # the longest side of the working masks, pixels
+MIN_MASK_RESOLUTION = 16
+MAX_MASK_RESOLUTION = 4096
+DEFAULT_VOLUME_RESOLUTION = 128  # the voxels along each side of the carved volume
+MAX_VOLUME_RESOLUTION = 1024
+CARVE_SLAB_VOXELS = 16 * 1024 * 1024  # the voxels carved at once, bounds the memory
+BRICK_SIZE = 8  # the voxels along each side of a brick of the sparse volume
+CARVE_BATCH_BRICKS = 4096  # the bricks carved at once
+DEFAULT_LIGHT_DIRECTION = [0.0, 0.0, -1.0]  # the light travels along -z
 # ==================================================================================
 
 # ================================ ENVIRONMENT VARIABLES ===========================
@@ -26,6 +70,12 @@ APPLICATION_DATA_FILE = "application.json"
 
 # ================================ PROJECT DATA ================================
 PROJECT_DATA_FILE = "project.json"
+IMAGE_FOLDER = "images"
+THUMBNAIL_FOLDER = "thumbnails"
+THUMBNAIL_INDEX_FILE = "index.json"
+CONTOUR_FOLDER = "contours"
+DISTANCE_FIELD_FOLDER = "distance_fields"
+MASK_FOLDER = "masks"  # the working-resolution masks
 # ==================================================================================
 
 # ================================ TEST CONSTANTS ==================================
@@ -67,5 +117,9 @@ HISTORY_NOT_EMPTY_EVENT_NAME = "history_not_empty"
 COMMAND_CAN_NOT_BE_EXECUTED_EVENT_NAME = "command_can_not_be_executed"
 
 IMAGE_PREVIEW_CHANGED_EVENT_NAME = "image_preview_changed"
+MASK_PARAMETERS_CHANGED_EVENT_NAME = "mask_parameters_changed"
+MASK_PARAMETERS_PREVIEWED_EVENT_NAME = "mask_parameters_previewed"
+SCULPTURE_CHANGED_EVENT_NAME = "sculpture_changed"
+AUTO_THRESHOLD_PROGRESS_EVENT_NAME = "auto_threshold_progress"
 OPENGL_SETTING_CHANGED_EVENT_NAME = "opengl_setting_changed"
 # ==================================================================================
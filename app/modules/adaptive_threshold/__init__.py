@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from typing import Callable
+import numpy as np
+import cv2 as cv
+
+from constants import (
+    SAUVOLA_DYNAMIC_RANGE,
+    THRESHOLD_MODE_MEAN,
+    THRESHOLD_MODE_SAUVOLA,
+)
+
+
+def LocalStatistics(
+    gray: cv.Mat, blockSize: int, withDeviation: bool = True
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    The mean and the standard deviation of the `blockSize` x `blockSize` window centered
+        on every pixel, the windows are clipped at the image border. The window sums are
+        running sums of box filters (the outside of the image counts as 0), so the cost
+        does not depend on the window size, then they are divided in place by the number
+        of pixels of each clipped window.
+
+    Returns:
+        The float32 means and deviations (None if `withDeviation` is False).
+    """
+    height, width = gray.shape[:2]
+    half = max(blockSize, 1) // 2
+    windowSize = (2 * half + 1, 2 * half + 1)
+
+    # the number of pixels of a clipped window is the product of its height and width
+    rows = np.arange(height)
+    columns = np.arange(width)
+    rowCounts = np.minimum(rows + half + 1, height) - np.maximum(rows - half, 0)
+    columnCounts = np.minimum(columns + half + 1, width) - np.maximum(columns - half, 0)
+    rowCounts = rowCounts.astype(np.float32).reshape(-1, 1)
+    columnCounts = columnCounts.astype(np.float32).reshape(1, -1)
+
+    def WindowMeans(filter: Callable[..., np.ndarray]) -> np.ndarray:
+        means = filter(
+            gray,
+            cv.CV_32F,
+            windowSize,
+            normalize=False,
+            borderType=cv.BORDER_CONSTANT,
+        )
+        means /= rowCounts
+        means /= columnCounts
+        return means
+
+    means = WindowMeans(cv.boxFilter)
+    if not withDeviation:
+        return means, None
+
+    deviations = WindowMeans(cv.sqrBoxFilter)  # the means of the squares
+    deviations -= np.square(means)
+    np.maximum(deviations, 0.0, out=deviations)
+    np.sqrt(deviations, out=deviations)
+
+    return means, deviations
+
+
+def _MeanThreshold(gray: cv.Mat, blockSize: int, bias: int) -> np.ndarray:
+    means, _ = LocalStatistics(gray, blockSize, withDeviation=False)
+    return means - bias
+
+
+def _SauvolaThreshold(gray: cv.Mat, blockSize: int, bias: int) -> np.ndarray:
+    means, deviations = LocalStatistics(gray, blockSize)
+    assert deviations is not None
+
+    k = bias / 100.0
+    return means * (1.0 + k * (deviations / SAUVOLA_DYNAMIC_RANGE - 1.0))
+
+
+ADAPTIVE_THRESHOLD_MODES: dict[str, Callable[[cv.Mat, int, int], np.ndarray]] = {
+    THRESHOLD_MODE_MEAN: _MeanThreshold,
+    THRESHOLD_MODE_SAUVOLA: _SauvolaThreshold,
+}
+
+
+@dataclass(frozen=True)
+class AdaptiveThreshold:
+    """
+    The local threshold of each pixel, computed from the window around it, for the
+        images whose lighting is uneven (e.g. a shadow which fades across the photo).
+
+    - `THRESHOLD_MODE_MEAN`: the local mean minus `bias` gray levels.
+    - `THRESHOLD_MODE_SAUVOLA`: `mean * (1 + k * (deviation / R - 1))` with `k = bias / 100`.
+
+    As with the global threshold, the pixels which are greater than their threshold are
+        foreground (255).
+
+    Examples:
+    ```python
+        adaptive = AdaptiveThreshold(THRESHOLD_MODE_SAUVOLA, blockSize=51, bias=20)
+        mask = adaptive.Apply(gray)
+    ```
+    """
+
+    mode: str
+    blockSize: int
+    bias: int
+
+    def __post_init__(self) -> None:
+        """
+        Raises:
+            ValueError: If the `mode` is unknown or the `blockSize` is not a positive odd
+                number.
+        """
+        if self.mode not in ADAPTIVE_THRESHOLD_MODES:
+            raise ValueError(f'Unknown adaptive threshold mode "{self.mode}"')
+        if self.blockSize < 1 or self.blockSize % 2 == 0:
+            raise ValueError("Block size must be a positive odd number")
+
+    @property
+    def Key(self) -> str:
+        return f"{self.mode}:{self.blockSize}:{self.bias}"
+
+    def Apply(self, gray: cv.Mat) -> cv.Mat:
+        """
+        Returns:
+            The binary mask (0 or 255) of the grayscale image.
+        """
+        thresholds = ADAPTIVE_THRESHOLD_MODES[self.mode](
+            gray, self.blockSize, self.bias
+        )
+        return np.where(gray > thresholds, np.uint8(255), np.uint8(0))
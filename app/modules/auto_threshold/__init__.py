@@ -0,0 +1,219 @@
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+import numpy as np
+
+from constants import (
+    AUTO_THRESHOLD_OTSU_METHOD,
+    AUTO_THRESHOLD_TRIANGLE_METHOD,
+)
+from modules.luminance_histogram import HISTOGRAM_BINS, LuminanceHistogram
+from utils.logger import logger  # type: ignore
+
+
+def OtsuThreshold(histogram: LuminanceHistogram) -> int:
+    """
+    The threshold which maximizes the between-class variance of the pixels which are
+        less than or equal to it and the pixels which are greater (the same value as
+        `cv.THRESH_OTSU`), computed from the histogram in one vectorized pass.
+    """
+    counts = histogram.Counts.astype(np.float64)
+    total = counts.sum()
+    if total == 0:
+        return 0
+
+    probabilities = counts / total
+    backgroundWeights = np.cumsum(probabilities)
+    backgroundMeans = np.cumsum(probabilities * np.arange(HISTOGRAM_BINS))
+    totalMean = backgroundMeans[-1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variances = (totalMean * backgroundWeights - backgroundMeans) ** 2 / (
+            backgroundWeights * (1.0 - backgroundWeights)
+        )
+
+    variances = np.nan_to_num(variances, nan=0.0, posinf=0.0)
+    return int(np.argmax(variances))
+
+
+def TriangleThreshold(histogram: LuminanceHistogram) -> int:
+    """
+    The threshold of the triangle method: the bin with the largest distance to the line
+        from the histogram peak to the end of its longer tail (the same value as
+        `cv.THRESH_TRIANGLE`).
+    """
+    counts = histogram.Counts
+    nonZero = np.flatnonzero(counts)
+    if nonZero.size == 0:
+        return 0
+
+    leftBound = max(int(nonZero[0]) - 1, 0)
+    rightBound = min(int(nonZero[-1]) + 1, HISTOGRAM_BINS - 1)
+    peakIndex = int(np.argmax(counts))
+
+    isFlipped = peakIndex - leftBound < rightBound - peakIndex
+    if isFlipped:
+        counts = counts[::-1]
+        leftBound = HISTOGRAM_BINS - 1 - rightBound
+        peakIndex = HISTOGRAM_BINS - 1 - peakIndex
+
+    threshold = leftBound
+    indices = np.arange(leftBound + 1, peakIndex + 1)
+    if indices.size > 0:
+        distances = int(counts[peakIndex]) * indices + (leftBound - peakIndex) * counts[
+            indices
+        ].astype(np.int64)
+
+        bestIndex = int(np.argmax(distances))
+        if distances[bestIndex] > 0:
+            threshold = int(indices[bestIndex])
+
+    threshold -= 1
+
+    return HISTOGRAM_BINS - 1 - threshold if isFlipped else threshold
+
+
+AUTO_THRESHOLD_METHODS: dict[str, Callable[[LuminanceHistogram], int]] = {
+    AUTO_THRESHOLD_OTSU_METHOD: OtsuThreshold,
+    AUTO_THRESHOLD_TRIANGLE_METHOD: TriangleThreshold,
+}
+
+
+@dataclass
+class AutoThresholdResult:
+    index: int
+    threshold: int
+    histogram: str  # see LuminanceHistogram.Encode, empty if the image is not loaded
+
+
+def _ComputeFromFile(index: int, imagePath: str, method: str) -> AutoThresholdResult:
+    """
+    Run in a worker process: decode the image, compute its histogram and its threshold.
+    """
+    histogram = LuminanceHistogram.FromFile(imagePath)
+    if histogram is None:
+        return AutoThresholdResult(index, -1, "")
+
+    return AutoThresholdResult(
+        index,
+        AUTO_THRESHOLD_METHODS[method](histogram),
+        histogram.Encode(),
+    )
+
+
+class AutoThresholdJob:
+    """
+    Compute the automatic threshold of many images. The images whose histogram is
+        already known are computed immediately (a 256-bin pass each), only the other
+        images are decoded, in parallel on a process pool (one process per core by
+        default), because decoding is the expensive part.
+
+    Examples:
+    ```python
+        job = AutoThresholdJob(AUTO_THRESHOLD_OTSU_METHOD, onProgress, onFinished)
+        job.Start([(imagePath, imageMeta.histogram) for imageMeta in project.images])
+    ```
+
+    Note:
+        `onProgress` and `onFinished` are called from the pool's callback thread, post
+            them to the GUI thread if they touch the UI.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        onProgress: Callable[[int, int], None],
+        onFinished: Callable[[list[AutoThresholdResult]], None],
+        executorFactory: Callable[[int], Executor] | None = None,
+    ) -> None:
+        """
+        Raises:
+            ValueError: If the `method` is unknown.
+        """
+        if method not in AUTO_THRESHOLD_METHODS:
+            raise ValueError(f'Unknown auto threshold method "{method}"')
+
+        self._method = method
+        self._onProgress = onProgress
+        self._onFinished = onFinished
+        self._executorFactory = executorFactory or (
+            lambda workers: ProcessPoolExecutor(max_workers=workers)
+        )
+        self._executor: Executor | None = None
+        self._lock = Lock()
+
+        self._results: list[AutoThresholdResult] = []
+        self._total = 0
+        self._remaining = 0
+
+    def Start(self, images: list[tuple[str, str]]) -> None:
+        """
+        Args:
+            images: The image file path and the known encoded histogram (empty if
+                unknown, see `LuminanceHistogram.Encode`) of each image, the results are
+                indexed by the position in this list.
+        """
+        self._total = len(images)
+        self._results = []
+
+        pending: list[tuple[int, str]] = []
+        for index, (imagePath, encoded) in enumerate(images):
+            histogram = LuminanceHistogram.Decode(encoded)
+            if histogram is not None:
+                threshold = AUTO_THRESHOLD_METHODS[self._method](histogram)
+                self._results.append(AutoThresholdResult(index, threshold, encoded))
+            else:
+                pending.append((index, imagePath))
+
+        self._remaining = len(pending)
+        self._onProgress(len(self._results), self._total)
+
+        if len(pending) == 0:
+            self._Finish()
+            return
+
+        workers = min(len(pending), os.cpu_count() or 1)
+        self._executor = self._executorFactory(workers)
+        logger.info(f"Decoding {len(pending)} images on {workers} workers")
+
+        for index, imagePath in pending:
+            future = self._executor.submit(
+                _ComputeFromFile, index, imagePath, self._method
+            )
+            future.add_done_callback(self._OnDone)
+
+    def Cancel(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _OnDone(self, future: "Future[AutoThresholdResult]") -> None:
+        if future.cancelled():
+            return
+
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Failed to compute the auto threshold: {e}")
+            result = None
+
+        with self._lock:
+            if result is not None and result.threshold >= 0:
+                self._results.append(result)
+
+            self._remaining -= 1
+            remaining = self._remaining
+
+        self._onProgress(self._total - remaining, self._total)
+
+        if remaining == 0:
+            self._Finish()
+
+    def _Finish(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        self._results.sort(key=lambda result: result.index)
+        self._onFinished(self._results)
@@ -0,0 +1,229 @@
+import numpy as np
+
+from constants import BRICK_SIZE, CARVE_BATCH_BRICKS, MAX_VOLUME_RESOLUTION
+from modules.sculpture_engine import SamplePoints, Silhouette, VoxelCenters
+
+BRICK_EMPTY = 0
+BRICK_FULL = 1
+BRICK_MIXED = 2
+
+_BRICK_VOXELS = BRICK_SIZE**3
+
+
+class BrickVolume:
+    """
+    Sparse boolean volume made of `BRICK_SIZE`^3 bricks. A brick is either uniformly
+        empty, uniformly full (only its state is stored) or mixed, and only the mixed
+        bricks store their voxels, packed 8 per byte along x. The mixed bricks are the
+        ones crossed by the surface, so the memory follows the surface area instead of
+        the volume (a 1024^3 sphere takes a few tens of megabytes instead of a gigabyte).
+
+    The voxels are indexed (z, y, x) as in `CarveVolume`, and so is the brick grid.
+
+    Examples:
+    ```python
+        volume = CarveBrickVolume(viewModel.GetSilhouettes(), 1024)
+
+        occupied = volume.Contains(zs, ys, xs)
+        print(volume.Count(), volume.NBytes)
+    ```
+    """
+
+    def __init__(self, resolution: int, full: bool = False) -> None:
+        """
+        Args:
+            resolution: The voxels along each side, a multiple of `BRICK_SIZE`.
+            full: Whether every voxel is set, otherwise every voxel is clear.
+
+        Raises:
+            ValueError: If the resolution is not a positive multiple of `BRICK_SIZE`.
+        """
+        if resolution < BRICK_SIZE or resolution % BRICK_SIZE != 0:
+            raise ValueError(
+                f"Volume resolution must be a positive multiple of {BRICK_SIZE}, "
+                f"got {resolution}"
+            )
+
+        self._resolution = resolution
+        gridSize = resolution // BRICK_SIZE
+        self._states = np.full(
+            (gridSize,) * 3, BRICK_FULL if full else BRICK_EMPTY, dtype=np.uint8
+        )
+        self._indices = np.full((gridSize,) * 3, -1, dtype=np.int32)
+        self._bricks = np.empty((0, BRICK_SIZE, BRICK_SIZE), dtype=np.uint8)
+
+    @staticmethod
+    def FromDense(volume: np.ndarray) -> "BrickVolume":
+        """
+        Args:
+            volume: The cubic (z, y, x) boolean volume.
+        """
+        bricks = BrickVolume(volume.shape[0])
+        blocks = bricks._Blocks(volume)
+        counts = np.count_nonzero(blocks, axis=(3, 4, 5))
+
+        bricks._states[counts == _BRICK_VOXELS] = BRICK_FULL
+        bricks._SetMixed(np.argwhere((counts > 0) & (counts < _BRICK_VOXELS)), blocks)
+        return bricks
+
+    def ToDense(self) -> np.ndarray:
+        """
+        Returns:
+            The (z, y, x) boolean volume, of shape (resolution,) * 3.
+        """
+        volume = np.zeros((self._resolution,) * 3, dtype=bool)
+        blocks = self._Blocks(volume)  # a view of the volume
+
+        blocks[self._states == BRICK_FULL] = True
+        mixed = self._states == BRICK_MIXED
+        blocks[mixed] = self._Unpack(self._indices[mixed])
+        return volume
+
+    @property
+    def Resolution(self) -> int:
+        return self._resolution
+
+    @property
+    def States(self) -> np.ndarray:
+        """
+        The state of each brick (`BRICK_EMPTY`, `BRICK_FULL` or `BRICK_MIXED`).
+        """
+        return self._states
+
+    @property
+    def MixedBrickCount(self) -> int:
+        return self._bricks.shape[0]
+
+    @property
+    def NBytes(self) -> int:
+        return self._states.nbytes + self._indices.nbytes + self._bricks.nbytes
+
+    def Count(self) -> int:
+        """
+        The number of the set voxels.
+        """
+        fullCount = int(np.count_nonzero(self._states == BRICK_FULL))
+        return fullCount * _BRICK_VOXELS + int(
+            np.bitwise_count(self._bricks).sum(dtype=np.int64)
+        )
+
+    def Contains(self, zs: np.ndarray, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+        """
+        Whether the voxels are set, the voxel indices are broadcastable to each other.
+        """
+        zs, ys, xs = np.broadcast_arrays(np.asarray(zs), np.asarray(ys), np.asarray(xs))
+        brick = (zs // BRICK_SIZE, ys // BRICK_SIZE, xs // BRICK_SIZE)
+        states = self._states[brick]
+
+        result = states == BRICK_FULL
+        mixed = states == BRICK_MIXED
+        if mixed.any():
+            rows = self._bricks[
+                self._indices[brick][mixed],
+                zs[mixed] % BRICK_SIZE,
+                ys[mixed] % BRICK_SIZE,
+            ]
+            shifts = (BRICK_SIZE - 1 - xs[mixed] % BRICK_SIZE).astype(np.uint8)
+            result[mixed] = (rows >> shifts) & 1 == 1
+
+        return result
+
+    def Carve(
+        self, silhouette: Silhouette, batchBricks: int = CARVE_BATCH_BRICKS
+    ) -> None:
+        """
+        Intersect the volume with the extrusion of the silhouette (see `CarveVolume`).
+            Only the bricks which are not empty are sampled, `batchBricks` at a time,
+            each batch is sampled, intersected and classified with array operations.
+        """
+        candidates = np.argwhere(self._states != BRICK_EMPTY)
+        oldStates = self._states.copy()
+        oldIndices = self._indices
+        oldBricks = self._bricks
+
+        self._indices = np.full_like(oldIndices, -1)
+        self._bricks = np.empty((0, BRICK_SIZE, BRICK_SIZE), dtype=np.uint8)
+        centers = VoxelCenters(self._resolution).reshape(-1, BRICK_SIZE)
+        mixedBricks: list[np.ndarray] = []
+        mixedCount = 0
+
+        for start in range(0, len(candidates), batchBricks):
+            batch = candidates[start : start + batchBricks]
+            brick = (batch[:, 0], batch[:, 1], batch[:, 2])
+
+            voxels = np.broadcast_to(
+                SamplePoints(
+                    silhouette,
+                    centers[batch[:, 2]][:, None, None, :],
+                    centers[batch[:, 1]][:, None, :, None],
+                    centers[batch[:, 0]][:, :, None, None],
+                ),
+                (len(batch),) + (BRICK_SIZE,) * 3,
+            ).copy()
+
+            mixed = oldStates[brick] == BRICK_MIXED
+            if mixed.any():
+                voxels[mixed] &= np.unpackbits(
+                    oldBricks[oldIndices[brick][mixed]][..., None], axis=-1
+                ).astype(bool)
+
+            counts = np.count_nonzero(voxels, axis=(1, 2, 3))
+            self._states[brick] = np.where(
+                counts == 0,
+                BRICK_EMPTY,
+                np.where(counts == _BRICK_VOXELS, BRICK_FULL, BRICK_MIXED),
+            )
+
+            isMixed = (counts > 0) & (counts < _BRICK_VOXELS)
+            newCount = int(np.count_nonzero(isMixed))
+            self._indices[batch[isMixed, 0], batch[isMixed, 1], batch[isMixed, 2]] = (
+                np.arange(mixedCount, mixedCount + newCount, dtype=np.int32)
+            )
+            mixedBricks.append(np.packbits(voxels[isMixed], axis=-1)[..., 0])
+            mixedCount += newCount
+
+        if len(mixedBricks) > 0:
+            self._bricks = np.concatenate(mixedBricks)
+
+    def _Blocks(self, volume: np.ndarray) -> np.ndarray:
+        """
+        The (brick z, brick y, brick x, z, y, x) view of the dense volume.
+        """
+        gridSize = self._resolution // BRICK_SIZE
+        return volume.reshape(
+            gridSize, BRICK_SIZE, gridSize, BRICK_SIZE, gridSize, BRICK_SIZE
+        ).transpose(0, 2, 4, 1, 3, 5)
+
+    def _SetMixed(self, positions: np.ndarray, blocks: np.ndarray) -> None:
+        brick = (positions[:, 0], positions[:, 1], positions[:, 2])
+        self._states[brick] = BRICK_MIXED
+        self._indices[brick] = np.arange(len(positions), dtype=np.int32)
+        self._bricks = np.packbits(blocks[brick], axis=-1)[..., 0]
+
+    def _Unpack(self, indices: np.ndarray) -> np.ndarray:
+        return np.unpackbits(self._bricks[indices][..., None], axis=-1).astype(bool)
+
+
+def CarveBrickVolume(
+    silhouettes: list[Silhouette],
+    resolution: int,
+    batchBricks: int = CARVE_BATCH_BRICKS,
+) -> BrickVolume:
+    """
+    The visual hull of the silhouettes as a `BrickVolume`, the sparse counterpart of
+        `CarveVolume` for the resolutions whose dense grid does not fit in memory.
+
+    Raises:
+        ValueError: If the resolution is greater than `MAX_VOLUME_RESOLUTION` or is not
+            a multiple of `BRICK_SIZE`.
+    """
+    if resolution > MAX_VOLUME_RESOLUTION:
+        raise ValueError(
+            f"Volume resolution must be at most {MAX_VOLUME_RESOLUTION}, got {resolution}"
+        )
+
+    volume = BrickVolume(resolution, full=len(silhouettes) > 0)
+    for silhouette in silhouettes:
+        volume.Carve(silhouette, batchBricks)
+
+    return volume
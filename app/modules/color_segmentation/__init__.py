@@ -0,0 +1,185 @@
+import hashlib
+from dataclasses import dataclass, field
+from threading import Lock
+import numpy as np
+import cv2 as cv
+
+from constants import THRESHOLD_MODE_HSV, THRESHOLD_MODE_LAB
+from structs.color_range import ColorRange
+
+
+def BgrToLab(color: tuple[int, int, int]) -> list[int]:
+    """
+    The 8-bit OpenCV Lab of the BGR `color`, e.g. for the key color picked in a dialog.
+    """
+    pixel = np.array([[color]], dtype=np.uint8)
+    return [int(channel) for channel in cv.cvtColor(pixel, cv.COLOR_BGR2Lab)[0, 0]]
+
+
+def LabToBgr(color: list[int]) -> tuple[int, int, int]:
+    pixel = np.array([[color]], dtype=np.uint8)
+    blue, green, red = cv.cvtColor(pixel, cv.COLOR_Lab2BGR)[0, 0]
+    return int(blue), int(green), int(red)
+
+
+class ColorPlanes:
+    """
+    The color space conversions of one image, each one is computed on its first use and
+        kept, so changing the color range only costs the comparison pass. The squared Lab
+        distances to the last key color are kept as well, dragging the distance slider
+        compares them without computing them again.
+
+    Examples:
+    ```python
+        planes = ColorPlanes(image) # per image
+        mask = ColorRangeMask(planes, THRESHOLD_MODE_HSV, imageMeta.colorRange).Apply()
+    ```
+    """
+
+    def __init__(self, image: cv.Mat) -> None:
+        """
+        Args:
+            image: The BGR image.
+        """
+        self._image = image
+        self._lock = Lock()
+        self._key: str | None = None
+        self._hsv: cv.Mat | None = None
+        self._lab: np.ndarray | None = None
+        self._labDistances: tuple[tuple[int, int, int], np.ndarray] | None = None
+
+    @property
+    def Key(self) -> str:
+        """
+        The hash of the color pixels, the hash of the grayscale image cannot tell apart
+            two images with the same luminance.
+        """
+        with self._lock:
+            if self._key is None:
+                digest = hashlib.blake2b(
+                    np.ascontiguousarray(self._image).data, digest_size=16
+                )
+                digest.update(str(self._image.shape).encode())
+                self._key = digest.hexdigest()
+
+            return self._key
+
+    @property
+    def Hsv(self) -> cv.Mat:
+        with self._lock:
+            if self._hsv is None:
+                self._hsv = cv.cvtColor(self._image, cv.COLOR_BGR2HSV)
+
+            return self._hsv
+
+    @property
+    def Lab(self) -> np.ndarray:
+        """
+        The 8-bit Lab planes as int16, so the differences do not overflow.
+        """
+        with self._lock:
+            if self._lab is None:
+                self._lab = cv.cvtColor(self._image, cv.COLOR_BGR2Lab).astype(np.int16)
+
+            return self._lab
+
+    def LabSquaredDistances(self, color: tuple[int, int, int]) -> np.ndarray:
+        """
+        The squared Euclidean distance of every pixel to the Lab `color`, (height, width)
+            int32.
+        """
+        lab = self.Lab
+
+        with self._lock:
+            if self._labDistances is not None and self._labDistances[0] == color:
+                return self._labDistances[1]
+
+        differences = lab - np.array(color, dtype=np.int16)
+        distances = np.einsum("ijk,ijk->ij", differences, differences, dtype=np.int32)
+
+        with self._lock:
+            self._labDistances = (color, distances)
+
+        return distances
+
+
+@dataclass(frozen=True, eq=False)
+class ColorRangeMask:
+    """
+    The mask of the pixels whose color is inside the range, it can be passed to
+        `MaskPipeline.Run` as the `source` of the mask.
+
+    - `THRESHOLD_MODE_HSV`: inside the hue, saturation and value ranges (`cv.inRange`),
+        the hue range wraps around if `hueMin` is greater than `hueMax`.
+    - `THRESHOLD_MODE_LAB`: at most `labDistance` away from the `labColor`.
+    """
+
+    planes: ColorPlanes
+    mode: str
+    colorRange: ColorRange = field(default_factory=ColorRange)
+
+    def __post_init__(self) -> None:
+        """
+        Raises:
+            ValueError: If the `mode` is not a color mode.
+        """
+        if self.mode not in (THRESHOLD_MODE_HSV, THRESHOLD_MODE_LAB):
+            raise ValueError(f'Unknown color segmentation mode "{self.mode}"')
+
+    @property
+    def Key(self) -> str:
+        colorRange = self.colorRange
+        if self.mode == THRESHOLD_MODE_LAB:
+            lightness, a, b = colorRange.labColor
+            parameters = f"{lightness},{a},{b}:{colorRange.labDistance}"
+        else:
+            parameters = (
+                f"{colorRange.hueMin}-{colorRange.hueMax}:"
+                f"{colorRange.saturationMin}-{colorRange.saturationMax}:"
+                f"{colorRange.valueMin}-{colorRange.valueMax}"
+            )
+
+        return f"{self.mode}:{self.planes.Key}:{parameters}"
+
+    def Apply(self, gray: cv.Mat | None = None) -> cv.Mat:
+        """
+        Args:
+            gray: Not used, the mask is computed from the color planes.
+
+        Returns:
+            The binary mask (0 or 255).
+        """
+        if self.mode == THRESHOLD_MODE_LAB:
+            return self._ApplyLab()
+
+        return self._ApplyHsv()
+
+    def _ApplyHsv(self) -> cv.Mat:
+        hsv = self.planes.Hsv
+        colorRange = self.colorRange
+
+        if colorRange.hueMin <= colorRange.hueMax:
+            return cv.inRange(
+                hsv,
+                (colorRange.hueMin, colorRange.saturationMin, colorRange.valueMin),
+                (colorRange.hueMax, colorRange.saturationMax, colorRange.valueMax),
+            )
+
+        upper = cv.inRange(
+            hsv,
+            (colorRange.hueMin, colorRange.saturationMin, colorRange.valueMin),
+            (179, colorRange.saturationMax, colorRange.valueMax),
+        )
+        lower = cv.inRange(
+            hsv,
+            (0, colorRange.saturationMin, colorRange.valueMin),
+            (colorRange.hueMax, colorRange.saturationMax, colorRange.valueMax),
+        )
+        return cv.bitwise_or(upper, lower)
+
+    def _ApplyLab(self) -> cv.Mat:
+        color = tuple(int(channel) for channel in self.colorRange.labColor)
+        distances = self.planes.LabSquaredDistances(color)  # type: ignore
+        limit = self.colorRange.labDistance**2
+
+        return np.where(distances <= limit, np.uint8(255), np.uint8(0))
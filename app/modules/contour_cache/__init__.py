@@ -0,0 +1,190 @@
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+import numpy as np
+import cv2 as cv
+
+from constants import CONTOUR_MEMORY_CACHE_SIZE
+from modules.mask_pipeline import MaskSource
+from structs.mask_stage import MaskStage
+from utils.logger import logger  # type: ignore
+
+
+@dataclass
+class Contours:
+    """
+    The simplified outer and inner (hole) polygons of a binary mask, packed into flat
+        arrays: the vertices of polygon `i` are `points[offsets[i]:offsets[i + 1]]`.
+    """
+
+    points: np.ndarray  # (vertices, 2) float32, x and y in pixels
+    offsets: np.ndarray  # (polygons + 1,) int32
+    holes: np.ndarray  # (polygons,) bool, True for the inner contours
+
+    @property
+    def PolygonCount(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def VertexCount(self) -> int:
+        return len(self.points)
+
+    def Polygon(self, index: int) -> np.ndarray:
+        return self.points[self.offsets[index] : self.offsets[index + 1]]
+
+    @staticmethod
+    def FromMask(mask: cv.Mat, tolerance: float) -> "Contours":
+        """
+        Trace the contours of the mask and simplify them with the Douglas-Peucker
+            algorithm, the simplified polygons stay within `tolerance` pixels of the
+            traced ones (not simplified if 0).
+        """
+        traced, hierarchy = cv.findContours(mask, cv.RETR_CCOMP, cv.CHAIN_APPROX_SIMPLE)
+
+        polygons: list[np.ndarray] = []
+        holes: list[bool] = []
+        for index, contour in enumerate(traced):
+            if tolerance > 0:
+                contour = cv.approxPolyDP(contour, tolerance, True)
+            if len(contour) < 3:
+                continue
+
+            polygons.append(contour.reshape(-1, 2))
+            holes.append(bool(hierarchy[0][index][3] != -1))  # has a parent
+
+        offsets = np.zeros(len(polygons) + 1, dtype=np.int32)
+        offsets[1:] = np.cumsum([len(polygon) for polygon in polygons])
+
+        return Contours(
+            points=(
+                np.concatenate(polygons).astype(np.float32)
+                if len(polygons) > 0
+                else np.empty((0, 2), dtype=np.float32)
+            ),
+            offsets=offsets,
+            holes=np.array(holes, dtype=bool),
+        )
+
+    def Save(self, filePath: str) -> None:
+        with open(filePath, "wb") as f:
+            np.savez(f, points=self.points, offsets=self.offsets, holes=self.holes)
+
+    @staticmethod
+    def Load(filePath: str) -> "Contours":
+        with open(filePath, "rb") as f:
+            data = np.load(f)
+            return Contours(
+                points=data["points"],
+                offsets=data["offsets"],
+                holes=data["holes"],
+            )
+
+
+class ContourCache:
+    """
+    The contours of the image masks of a project, cached in memory (the most recently
+        used ones) and on disk inside the `contours/` folder of the project. An entry is
+        identified by the hash of the image content, the threshold (global, adaptive or
+        color range), the mask stages and the simplification tolerance, so a changed
+        parameter gets new contours and the unchanged ones are never traced again.
+
+    Examples:
+    ```python
+        cache = ContourCache(GetContourFolder(projectDirectory))
+        contours = cache.Get(imageHash, threshold, stages, tolerance, ComputeMask)
+    ```
+    """
+
+    def __init__(self, cacheFolder: str) -> None:
+        self._cacheFolder = cacheFolder
+        self._entries: "OrderedDict[str, Contours]" = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def CacheFolder(self) -> str:
+        return self._cacheFolder
+
+    @staticmethod
+    def Key(
+        imageHash: str,
+        threshold: int,
+        stages: list[MaskStage],
+        tolerance: float,
+        source: MaskSource | None = None,
+    ) -> str:
+        thresholdParameters = str(threshold) if source is None else source.Key
+        stageParameters = ",".join(
+            f"{stage.kind}:{stage.size}:{stage.iterations}"
+            for stage in stages
+            if stage.enabled
+        )
+        return hashlib.blake2b(
+            f"{imageHash}|{thresholdParameters}|{stageParameters}|{tolerance:g}".encode(),
+            digest_size=16,
+        ).hexdigest()
+
+    def Get(
+        self,
+        imageHash: str,
+        threshold: int,
+        stages: list[MaskStage],
+        tolerance: float,
+        computeMask: Callable[[], cv.Mat | None],
+        source: MaskSource | None = None,
+    ) -> Contours | None:
+        """
+        Args:
+            computeMask: Return the mask of the image, only be called if the contours
+                are neither in memory nor on disk.
+            source: The mask (adaptive or color range) which replaces the global
+                `threshold`.
+
+        Returns:
+            The contours or None if the mask cannot be computed.
+        """
+        key = ContourCache.Key(imageHash, threshold, stages, tolerance, source)
+
+        with self._lock:
+            contours = self._entries.get(key)
+            if contours is not None:
+                self._entries.move_to_end(key)
+                return contours
+
+        filePath = os.path.join(self._cacheFolder, f"{key}.npz")
+        contours = self._LoadFile(filePath)
+
+        if contours is None:
+            mask = computeMask()
+            if mask is None:
+                return None
+
+            contours = Contours.FromMask(mask, tolerance)
+            self._SaveFile(filePath, contours)
+
+        with self._lock:
+            self._entries[key] = contours
+            while len(self._entries) > CONTOUR_MEMORY_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+        return contours
+
+    def _LoadFile(self, filePath: str) -> Contours | None:
+        if not os.path.exists(filePath):
+            return None
+
+        try:
+            return Contours.Load(filePath)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f'Cached contours "{filePath}" are invalid: {e}')
+            return None
+
+    def _SaveFile(self, filePath: str, contours: Contours) -> None:
+        try:
+            os.makedirs(self._cacheFolder, exist_ok=True)
+            contours.Save(f"{filePath}.tmp")
+            os.replace(f"{filePath}.tmp", filePath)
+        except OSError as e:
+            logger.warning(f'Failed to cache the contours "{filePath}": {e}')
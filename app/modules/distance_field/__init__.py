@@ -0,0 +1,176 @@
+import hashlib
+import os
+from typing import Callable
+import numpy as np
+import cv2 as cv
+
+from modules.mask_pipeline import MaskSource
+from structs.mask_stage import MaskStage
+from utils.logger import logger  # type: ignore
+
+
+def ComputeSignedDistanceField(mask: cv.Mat) -> np.ndarray:
+    """
+    The exact Euclidean distance of every pixel to the silhouette border, positive inside
+        (the distance to the nearest background pixel) and negative outside (minus the
+        distance to the nearest foreground pixel).
+
+    Args:
+        mask: The binary mask, the non-zero pixels are inside.
+
+    Returns:
+        The float32 field with the shape of the mask.
+    """
+    inside = np.where(mask > 0, np.uint8(255), np.uint8(0))
+    outside = cv.bitwise_not(inside)
+
+    field = cv.distanceTransform(inside, cv.DIST_L2, cv.DIST_MASK_PRECISE)
+    field -= cv.distanceTransform(outside, cv.DIST_L2, cv.DIST_MASK_PRECISE)
+    return field
+
+
+class DistanceFieldCache:
+    """
+    The signed distance fields of the image masks of a project, stored as float16 `.npy`
+        files inside the `distance_fields/` folder of the project and opened as
+        read-only memory maps, so the geometry operations share the pages of the file
+        instead of computing or copying the field.
+
+    Each image keeps only the field of its current mask: the file is named after the
+        `ImageMeta.CacheId` of the image, the threshold (or the adaptive or color range
+        parameters) and the hash of the enabled mask stages, and the files of the other
+        masks of the same image are deleted when a new field is stored.
+
+    Examples:
+    ```python
+        cache = DistanceFieldCache(GetDistanceFieldFolder(projectDirectory))
+        field = cache.Get(
+            imageMeta.CacheId,
+            threshold,
+            lambda: MaskPipeline.Run(gray, threshold, stages),
+            stages=stages,
+        )
+    ```
+    """
+
+    def __init__(self, cacheFolder: str) -> None:
+        self._cacheFolder = cacheFolder
+
+    @property
+    def CacheFolder(self) -> str:
+        return self._cacheFolder
+
+    def GetPath(
+        self,
+        imageHash: str,
+        threshold: int,
+        source: MaskSource | None = None,
+        stages: list[MaskStage] | None = None,
+    ) -> str:
+        thresholdName = (
+            str(threshold) if source is None else source.Key.replace(":", "-")
+        )
+        stageParameters = ",".join(
+            f"{stage.kind}:{stage.size}:{stage.iterations}"
+            for stage in stages or []
+            if stage.enabled
+        )
+        if stageParameters != "":
+            stageHash = hashlib.blake2b(
+                stageParameters.encode(), digest_size=8
+            ).hexdigest()
+            thresholdName = f"{thresholdName}_{stageHash}"
+
+        return os.path.join(self._cacheFolder, f"{imageHash}_{thresholdName}.npy")
+
+    def Get(
+        self,
+        imageHash: str,
+        threshold: int,
+        computeMask: Callable[[], cv.Mat | None],
+        source: MaskSource | None = None,
+        stages: list[MaskStage] | None = None,
+    ) -> np.ndarray | None:
+        """
+        Args:
+            computeMask: Return the mask of the `threshold` and the `stages`, only be
+                called if the field is not stored yet.
+            source: The mask (adaptive or color range) which replaces the global
+                `threshold`.
+            stages: The mask stages applied to the binary image of the threshold.
+
+        Returns:
+            The read-only float16 field or None if the mask cannot be computed.
+        """
+        filePath = self.GetPath(imageHash, threshold, source, stages)
+
+        if os.path.exists(filePath):
+            field = self._Open(filePath)
+            if field is not None:
+                return field
+
+        mask = computeMask()
+        if mask is None:
+            return None
+
+        field = ComputeSignedDistanceField(mask).astype(np.float16)
+        if self._Save(imageHash, filePath, field):
+            mappedField = self._Open(filePath)
+            if mappedField is not None:
+                return mappedField
+
+        field.setflags(write=False)
+        return field
+
+    def Invalidate(self, imageHash: str) -> None:
+        """
+        Delete the stored fields of the image (e.g. when the image is deleted).
+        """
+        self._RemoveFields(imageHash, keep=None)
+
+    def _Save(self, imageHash: str, filePath: str, field: np.ndarray) -> bool:
+        try:
+            os.makedirs(self._cacheFolder, exist_ok=True)
+            with open(f"{filePath}.tmp", "wb") as f:
+                np.save(f, field)
+            os.replace(f"{filePath}.tmp", filePath)
+        except OSError as e:
+            logger.warning(f'Failed to store the distance field "{filePath}": {e}')
+            return False
+
+        self._RemoveFields(imageHash, keep=filePath)
+        return True
+
+    def _Open(self, filePath: str) -> np.ndarray | None:
+        try:
+            return np.load(filePath, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            # the memory map is not supported by every file system, read it instead
+            logger.debug(f'Cannot map the distance field "{filePath}": {e}')
+
+        try:
+            with open(filePath, "rb") as f:
+                field = np.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f'Distance field "{filePath}" is invalid: {e}')
+            try:
+                os.remove(filePath)
+            except OSError as e:
+                logger.warning(f'Failed to remove "{filePath}": {e}')
+            return None
+
+        field.setflags(write=False)
+        return field
+
+    def _RemoveFields(self, imageHash: str, keep: str | None) -> None:
+        if not os.path.isdir(self._cacheFolder):
+            return
+
+        prefix = f"{imageHash}_"
+        for fileName in os.listdir(self._cacheFolder):
+            filePath = os.path.join(self._cacheFolder, fileName)
+            if fileName.startswith(prefix) and filePath != keep:
+                try:
+                    os.remove(filePath)
+                except OSError as e:
+                    logger.warning(f'Failed to remove "{filePath}": {e}')
@@ -47,6 +47,24 @@ class EventSystem:
 
         EventSystem._callbackMap[eventName].append(callback)
 
+    @staticmethod
+    def UnregisterEvent(eventName: str, callback: EventCallback):
+        """
+        Detach the callback from the current system, whereas the callback will not be triggered anymore when the
+            `eventName` is triggered, e.g. the object which owns the callback is deleted.
+
+        Args:
+            eventName (str): The name of the event which the callback was registered to. Nothing will happen
+                if the callback is not registered to this event.
+            callback (EventCallback): The callback which was registered with `RegisterEvent`.
+        """
+        if eventName not in EventSystem._callbackMap:
+            return
+
+        callbacks = EventSystem._callbackMap[eventName]
+        if callback in callbacks:
+            callbacks.remove(callback)
+
     @staticmethod
     def TriggerEvent(eventName: str, *args: Any, **kwargs: Any):
         """
@@ -77,7 +95,8 @@ class EventSystem:
                 f'Event "{eventName}" is not registered, nothing will happen.'
             )
         else:
-            for callback in EventSystem._callbackMap[eventName]:
+            # a copy, the callbacks may be unregistered while the event is triggered
+            for callback in list(EventSystem._callbackMap[eventName]):
                 callback(*args, **kwargs)
 
         if eventName not in EventSystem._eventDependencyMap:
@@ -0,0 +1,136 @@
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, TypeAlias
+import cv2 as cv
+
+from constants import IMAGE_CACHE_BUDGET_BYTES
+from utils.images import LoadImage
+from utils.logger import logger  # type: ignore
+
+ImageCacheKey: TypeAlias = tuple[str, int, int]
+
+
+class ImageCache:
+    """
+    Process-wide cache of the decoded images, be shared by all the view models so opening
+        the same image in several tabs (or reopening a closed tab) does not decode the file
+        again. The entries are keyed by the file path, the modified time and the file size,
+        so a modified file is decoded again. The least recently used entries are evicted
+        when the total size of the cached images exceeds the byte budget.
+
+    The cached images are read-only, they are shared between all the callers.
+
+    Examples:
+    ```python
+        image = ImageCache.Get(imagePath) # decoded
+        image = ImageCache.Get(imagePath) # returned from the cache
+    ```
+    """
+
+    _entries: "OrderedDict[ImageCacheKey, cv.Mat]" = OrderedDict()
+    _lock: Lock = Lock()
+    _budget: int = IMAGE_CACHE_BUDGET_BYTES
+    _usedBytes: int = 0
+
+    _hits: int = 0
+    _misses: int = 0
+    _evictions: int = 0
+
+    @staticmethod
+    def Get(
+        imagePath: str,
+        loader: Callable[[str], cv.Mat | None] = LoadImage,
+    ) -> cv.Mat | None:
+        """
+        Get the decoded image of the file, decode it with the `loader` if it is not cached.
+
+        Args:
+            imagePath: The path of the image file.
+            loader: The function which decodes the file, only be called on cache misses.
+
+        Returns:
+            The read-only decoded image or None if the file cannot be loaded.
+        """
+        try:
+            stat = os.stat(imagePath)
+        except OSError as e:
+            logger.warning(f'Cannot access image "{imagePath}": {e}')
+            return None
+
+        key: ImageCacheKey = (
+            os.path.normcase(os.path.abspath(imagePath)),
+            stat.st_mtime_ns,
+            stat.st_size,
+        )
+
+        with ImageCache._lock:
+            image = ImageCache._entries.get(key)
+            if image is not None:
+                ImageCache._entries.move_to_end(key)
+                ImageCache._hits += 1
+                return image
+
+            ImageCache._misses += 1
+
+        image = loader(imagePath)
+        if image is None:
+            return None
+
+        image.setflags(write=False)
+
+        with ImageCache._lock:
+            if key not in ImageCache._entries:
+                ImageCache._entries[key] = image
+                ImageCache._usedBytes += image.nbytes
+                ImageCache._Evict()
+
+        return image
+
+    @staticmethod
+    def _Evict() -> None:
+        """
+        Must be called with the lock held. The most recently added entry is always kept,
+            even if it is larger than the whole budget.
+        """
+        while (
+            ImageCache._usedBytes > ImageCache._budget and len(ImageCache._entries) > 1
+        ):
+            _, evicted = ImageCache._entries.popitem(last=False)
+            ImageCache._usedBytes -= evicted.nbytes
+            ImageCache._evictions += 1
+
+    @staticmethod
+    def SetBudget(budget: int) -> None:
+        with ImageCache._lock:
+            ImageCache._budget = budget
+            ImageCache._Evict()
+
+    @staticmethod
+    def Hits() -> int:
+        return ImageCache._hits
+
+    @staticmethod
+    def Misses() -> int:
+        return ImageCache._misses
+
+    @staticmethod
+    def Evictions() -> int:
+        return ImageCache._evictions
+
+    @staticmethod
+    def UsedBytes() -> int:
+        return ImageCache._usedBytes
+
+    @staticmethod
+    def Clear() -> None:
+        """
+        Remove all the cached images and reset the counters and the budget.
+        """
+        with ImageCache._lock:
+            ImageCache._entries.clear()
+            ImageCache._budget = IMAGE_CACHE_BUDGET_BYTES
+            ImageCache._usedBytes = 0
+            ImageCache._hits = 0
+            ImageCache._misses = 0
+            ImageCache._evictions = 0
@@ -0,0 +1,158 @@
+import struct
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO
+from PIL import Image
+
+from constants import IMAGE_PROBE_WORKERS
+from structs.image_meta import ImageMeta
+from utils.logger import logger  # type: ignore
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}  # color type -> channels
+_JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}  # TEM, RST0-7
+_JPEG_FRAME_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}  # SOF0-15
+_PIL_CHANNELS = {"1": 1, "L": 1, "P": 3, "RGB": 3, "LA": 2, "RGBA": 4, "CMYK": 4}
+
+
+@dataclass(frozen=True)
+class ImageHeader:
+    """
+    The size and the pixel layout of an image file, as stored in the file (the palette
+        images have 3 channels, the colors of their palette).
+    """
+
+    format: str
+    width: int
+    height: int
+    channels: int
+    dtype: str  # "uint8" or "uint16"
+
+    @property
+    def DecodedBytes(self) -> int:
+        """
+        The size of the image once decoded by `LoadImage` (BGR uint8), e.g. for the
+            memory budget of the image cache.
+        """
+        return self.width * self.height * 3
+
+    def ApplyTo(self, image: ImageMeta) -> None:
+        image.width = self.width
+        image.height = self.height
+        image.channels = self.channels
+        image.dtype = self.dtype
+
+
+def ProbeImage(imagePath: str) -> ImageHeader | None:
+    """
+    Read the header of the image file without decoding its pixels: only the first bytes
+        of a PNG (IHDR) and the segment headers of a JPEG up to its frame header (SOF)
+        are read. The other formats are opened by PIL, which reads their header only.
+
+    Returns:
+        The header or None if the file is not a readable image.
+    """
+    try:
+        with open(imagePath, "rb") as f:
+            signature = f.read(8)
+            f.seek(0)
+
+            if signature == _PNG_SIGNATURE:
+                return _ProbePng(f)
+            if signature[:2] == b"\xff\xd8":
+                return _ProbeJpeg(f)
+
+            return _ProbeWithPil(f)
+    except (OSError, ValueError, struct.error, Image.DecompressionBombError) as e:
+        logger.warning(f'Cannot probe image "{imagePath}": {e}')
+        return None
+
+
+def ProbeImages(
+    imagePaths: list[str], executor: Executor | None = None
+) -> list[ImageHeader | None]:
+    """
+    Probe the files concurrently, the reads of the headers are I/O bound so they are
+        spread over a thread pool.
+
+    Returns:
+        The header of each file in the order of the `imagePaths`.
+    """
+    if len(imagePaths) == 0:
+        return []
+
+    if executor is not None:
+        return list(executor.map(ProbeImage, imagePaths))
+
+    with ThreadPoolExecutor(
+        max_workers=min(IMAGE_PROBE_WORKERS, len(imagePaths))
+    ) as pool:
+        return list(pool.map(ProbeImage, imagePaths))
+
+
+def _ProbePng(f: BinaryIO) -> ImageHeader:
+    data = f.read(33)  # signature, IHDR length, type and 13 bytes of data
+    if len(data) < 33 or data[12:16] != b"IHDR":
+        raise ValueError("PNG file has no IHDR chunk")
+
+    width, height, bitDepth, colorType = struct.unpack(">IIBB", data[16:26])
+    if colorType not in _PNG_CHANNELS:
+        raise ValueError(f"Unknown PNG color type {colorType}")
+
+    return ImageHeader(
+        "PNG",
+        width,
+        height,
+        _PNG_CHANNELS[colorType],
+        "uint16" if bitDepth == 16 else "uint8",
+    )
+
+
+def _ProbeJpeg(f: BinaryIO) -> ImageHeader:
+    f.seek(2)  # SOI
+
+    while True:
+        byte = f.read(1)
+        if byte == b"":
+            raise ValueError("JPEG file has no frame header")
+        if byte != b"\xff":
+            continue  # the bytes between the segments are skipped
+
+        marker = f.read(1)
+        while marker == b"\xff":  # fill bytes
+            marker = f.read(1)
+        if marker == b"":
+            raise ValueError("JPEG file has no frame header")
+
+        code = marker[0]
+        if code in _JPEG_STANDALONE_MARKERS or code == 0x00:
+            continue
+        if code == 0xD9:  # EOI
+            raise ValueError("JPEG file has no frame header")
+
+        (length,) = struct.unpack(">H", f.read(2))
+        if code in _JPEG_FRAME_MARKERS:
+            precision, height, width, channels = struct.unpack(">BHHB", f.read(6))
+            return ImageHeader(
+                "JPEG",
+                width,
+                height,
+                channels,
+                "uint16" if precision > 8 else "uint8",
+            )
+
+        f.seek(length - 2, 1)
+
+
+def _ProbeWithPil(f: BinaryIO) -> ImageHeader:
+    with Image.open(f) as image:  # lazy, the pixels are not decoded
+        width, height = image.size
+        mode = image.mode
+
+        return ImageHeader(
+            image.format or "",
+            width,
+            height,
+            _PIL_CHANNELS.get(mode, len(image.getbands())),
+            "uint16" if mode.startswith("I;16") or mode == "I" else "uint8",
+        )
@@ -0,0 +1,172 @@
+import hashlib
+import os
+import re
+import tempfile
+from threading import Lock
+
+from constants import IMAGE_STORE_COPY_CHUNK_SIZE
+from utils.logger import logger  # type: ignore
+
+_STORED_NAME_PATTERN = re.compile(r"^([0-9a-f]{64})(\.[^.]*)?$")
+
+
+class ImageStore:
+    """
+    Content-addressed store of the image files of a project. Each imported file is hashed
+        (SHA-256) while it is streamed into the images/ folder and is stored as
+        `<hash><extension>`. If a file with the same hash is already stored, the stored
+        file is reused, so identical content is stored once and can be referenced by
+        several `ImageMeta`. A source file with the size of a stored file is hashed before
+        being copied, so a duplicate is not written at all.
+
+    The hash index is built from the stored files on the first use, afterwards every
+        lookup is a dictionary lookup. The source files which were already imported
+        (same path, modified time and size) are not read again.
+
+    `Import` is safe to be called from the worker threads.
+
+    Examples:
+    ```python
+        store = ImageStore(GetImageFolder(projectDirectory))
+        image.storedName = store.Import(sourcePath)
+    ```
+    """
+
+    def __init__(self, imageFolder: str) -> None:
+        self._imageFolder = imageFolder
+        self._lock = Lock()
+        self._storedNames: dict[str, str] | None = None  # content hash -> stored name
+        self._storedSizes: set[int] = set()
+        self._importedSources: dict[tuple[str, int, int], str] = {}
+
+    @property
+    def ImageFolder(self) -> str:
+        return self._imageFolder
+
+    def Contains(self, contentHash: str) -> bool:
+        with self._lock:
+            return contentHash in self._GetStoredNames()
+
+    def Import(self, sourcePath: str) -> str:
+        """
+        Store the content of the source file if it is not stored yet.
+
+        Returns:
+            The name of the stored file inside the image folder.
+
+        Raises:
+            OSError: If the source file cannot be read or the file cannot be stored.
+        """
+        stat = os.stat(sourcePath)
+        sourceKey = (
+            os.path.normcase(os.path.abspath(sourcePath)),
+            stat.st_mtime_ns,
+            stat.st_size,
+        )
+
+        with self._lock:
+            storedName = self._importedSources.get(sourceKey)
+            if storedName is not None and os.path.exists(self.GetPath(storedName)):
+                return storedName
+
+        with self._lock:
+            mayBeStored = stat.st_size in self._GetStoredSizes()
+
+        if mayBeStored:
+            storedName = self._FindStored(self._HashFile(sourcePath))
+            if storedName is not None:
+                logger.info(f'"{sourcePath}" is already stored as "{storedName}"')
+                with self._lock:
+                    self._importedSources[sourceKey] = storedName
+                return storedName
+
+        os.makedirs(self._imageFolder, exist_ok=True)
+        contentHash, temporaryPath = self._CopyWithHash(sourcePath)
+        extension = os.path.splitext(sourcePath)[1].lower()
+
+        with self._lock:
+            storedNames = self._GetStoredNames()
+            storedName = storedNames.get(contentHash)
+
+            if storedName is not None and os.path.exists(self.GetPath(storedName)):
+                os.remove(temporaryPath)
+                logger.info(f'"{sourcePath}" is already stored as "{storedName}"')
+            else:
+                storedName = f"{contentHash}{extension}"
+                os.replace(temporaryPath, self.GetPath(storedName))
+                storedNames[contentHash] = storedName
+                self._storedSizes.add(stat.st_size)
+
+            self._importedSources[sourceKey] = storedName
+
+        return storedName
+
+    def _FindStored(self, contentHash: str) -> str | None:
+        with self._lock:
+            storedName = self._GetStoredNames().get(contentHash)
+
+        if storedName is None or not os.path.exists(self.GetPath(storedName)):
+            return None
+
+        return storedName
+
+    def _HashFile(self, sourcePath: str) -> str:
+        hasher = hashlib.sha256()
+        with open(sourcePath, "rb") as source:
+            while chunk := source.read(IMAGE_STORE_COPY_CHUNK_SIZE):
+                hasher.update(chunk)
+
+        return hasher.hexdigest()
+
+    def _CopyWithHash(self, sourcePath: str) -> tuple[str, str]:
+        """
+        Stream the source file into a temporary file of the image folder and hash the
+            content on the way, the file is read only once.
+        """
+        hasher = hashlib.sha256()
+        fileDescriptor, temporaryPath = tempfile.mkstemp(
+            suffix=".tmp", dir=self._imageFolder
+        )
+
+        try:
+            with open(sourcePath, "rb") as source, os.fdopen(
+                fileDescriptor, "wb"
+            ) as target:
+                while chunk := source.read(IMAGE_STORE_COPY_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    target.write(chunk)
+        except OSError:
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+            raise
+
+        return hasher.hexdigest(), temporaryPath
+
+    def _GetStoredNames(self) -> dict[str, str]:
+        """
+        Must be called with the lock held.
+        """
+        if self._storedNames is None:
+            self._storedNames = {}
+
+            if os.path.isdir(self._imageFolder):
+                for fileName in os.listdir(self._imageFolder):
+                    match = _STORED_NAME_PATTERN.match(fileName)
+                    if match is not None:
+                        self._storedNames[match.group(1)] = fileName
+                        self._storedSizes.add(
+                            os.path.getsize(os.path.join(self._imageFolder, fileName))
+                        )
+
+        return self._storedNames
+
+    def _GetStoredSizes(self) -> set[int]:
+        """
+        The sizes of the stored files, a file of another size cannot be stored yet. Must
+            be called with the lock held.
+        """
+        self._GetStoredNames()
+        return self._storedSizes
+
+    def GetPath(self, storedName: str) -> str:
+        return os.path.join(self._imageFolder, storedName)
@@ -0,0 +1,166 @@
+import numpy as np
+
+from constants import CARVE_SLAB_VOXELS, MAX_VOLUME_RESOLUTION
+from modules.sculpture_engine import (
+    GatherPoints,
+    SampleSilhouette,
+    Silhouette,
+    VoxelCenters,
+)
+
+MAX_CARVE_VIEWS = int(np.iinfo(np.uint16).max)
+
+
+class IncrementalCarver:
+    """
+    The visual hull of a changing set of views, updated view by view: each voxel keeps
+        the count of the views whose extrusion contains it, and a voxel is occupied if
+        every view keeps it. Changing the silhouette of one view removes its previous
+        extrusion from the counts and adds the new one, the other views are not sampled
+        again, so the update costs the same whatever the number of views. The counts are
+        bytes and are widened to 16 bits once there are more than 255 views.
+
+    Examples:
+    ```python
+        carver = IncrementalCarver(128)
+        for image in project.images:
+            carver.SetView(imageHash, Silhouette(mask, image.lightDirection), maskKey)
+
+        # the threshold of one image changed
+        carver.SetView(imageHash, Silhouette(newMask, image.lightDirection), newMaskKey)
+        volume = carver.Volume
+    ```
+    """
+
+    def __init__(self, resolution: int, slabVoxels: int = CARVE_SLAB_VOXELS) -> None:
+        """
+        Raises:
+            ValueError: If the resolution is not in [1, MAX_VOLUME_RESOLUTION].
+        """
+        if resolution < 1 or resolution > MAX_VOLUME_RESOLUTION:
+            raise ValueError(
+                f"Volume resolution must be in [1, {MAX_VOLUME_RESOLUTION}], got {resolution}"
+            )
+
+        self._resolution = resolution
+        self._slabDepth = max(slabVoxels // (resolution * resolution), 1)
+        self._centers = VoxelCenters(resolution)
+        self._counts = np.zeros((resolution,) * 3, dtype=np.uint8)
+        # view id -> (silhouette, key)
+        self._views: dict[str, tuple[Silhouette, str]] = {}
+
+    @property
+    def Resolution(self) -> int:
+        return self._resolution
+
+    @property
+    def ViewIds(self) -> list[str]:
+        return list(self._views.keys())
+
+    @property
+    def Counts(self) -> np.ndarray:
+        """
+        The number of the views which keep each (z, y, x) voxel, read-only.
+        """
+        counts = self._counts.view()
+        counts.setflags(write=False)
+        return counts
+
+    @property
+    def Volume(self) -> np.ndarray:
+        """
+        The (z, y, x) boolean occupancy, the same as `CarveVolume` of the silhouettes of
+            the views (empty if there is no view).
+        """
+        if len(self._views) == 0:
+            return np.zeros((self._resolution,) * 3, dtype=bool)
+
+        return self._counts == len(self._views)
+
+    def GetKey(self, viewId: str) -> str | None:
+        view = self._views.get(viewId)
+        return view[1] if view is not None else None
+
+    def SetView(self, viewId: str, silhouette: Silhouette, key: str) -> bool:
+        """
+        Add the view or replace its silhouette. The `key` identifies the silhouette
+            (e.g. the mask key and the light direction), nothing is carved if the view
+            already has the same key.
+
+        Returns:
+            Whether the counts changed.
+
+        Raises:
+            ValueError: If the view is new and there are already `MAX_CARVE_VIEWS` views.
+        """
+        previous = self._views.get(viewId)
+        if previous is not None and previous[1] == key:
+            return False
+
+        if previous is None and len(self._views) >= MAX_CARVE_VIEWS:
+            raise ValueError(f"Cannot carve more than {MAX_CARVE_VIEWS} views")
+
+        if previous is None and len(self._views) >= np.iinfo(self._counts.dtype).max:
+            self._counts = self._counts.astype(np.uint16)
+
+        self._Accumulate(silhouette, previous[0] if previous is not None else None)
+        self._views[viewId] = (silhouette, key)
+        return True
+
+    def RemoveView(self, viewId: str) -> bool:
+        """
+        Returns:
+            Whether the view existed.
+        """
+        previous = self._views.pop(viewId, None)
+        if previous is None:
+            return False
+
+        self._Accumulate(None, previous[0])
+        return True
+
+    def _Accumulate(self, added: Silhouette | None, removed: Silhouette | None) -> None:
+        """
+        Add the extrusion of `added` to the counts and remove the one of `removed`, slab
+            by slab. The samples of an axis-aligned view are broadcast along its axis.
+
+        If both silhouettes have the same direction and mask size (e.g. the threshold of
+            the image changed), the voxels are projected once onto the difference of the
+            masks (+1 where a pixel was added, -1 where it was removed).
+        """
+        difference: np.ndarray | None = None
+        if (
+            added is not None
+            and removed is not None
+            and tuple(added.direction) == tuple(removed.direction)
+            and added.mask.shape == removed.mask.shape
+        ):
+            difference = (added.mask > 0).view(np.int8) - (removed.mask > 0).view(
+                np.int8
+            )
+            if not difference.any():
+                return
+
+        xs, ys = self._centers, self._centers
+
+        for zStart in range(0, self._resolution, self._slabDepth):
+            zStop = min(zStart + self._slabDepth, self._resolution)
+            zs = self._centers[zStart:zStop]
+            counts = self._counts[zStart:zStop]
+
+            if difference is not None:
+                assert added is not None
+                changes = GatherPoints(
+                    difference,
+                    added.direction,
+                    xs.reshape(1, 1, -1),
+                    ys.reshape(1, -1, 1),
+                    zs.reshape(-1, 1, 1),
+                )
+                np.add(counts, changes, out=counts, casting="unsafe")
+                continue
+
+            if added is not None:
+                np.add(counts, SampleSilhouette(added, xs, ys, zs), out=counts)
+            if removed is not None:
+                np.subtract(counts, SampleSilhouette(removed, xs, ys, zs), out=counts)
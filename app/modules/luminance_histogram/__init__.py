@@ -0,0 +1,171 @@
+import base64
+import zlib
+import numpy as np
+import cv2 as cv
+
+from utils.images import LoadGrayImage
+
+HISTOGRAM_BINS = 256
+
+
+class LuminanceHistogram:
+    """
+    The 256-bin histogram of the grayscale plane of an image and its cumulative sum. The
+        histogram is computed once with a single vectorized pass, afterwards the
+        statistics which depend on the threshold (e.g. the foreground coverage while the
+        threshold slider is moving) are answered in O(1) without touching the pixels.
+
+    The grayscale plane is the same as the one binarized by `ThresholdEngine`, so the
+        foreground pixels are the pixels which are greater than the threshold.
+
+    The histogram is stored in the project file as a short text (see `Encode`) instead of
+        a list of 256 numbers.
+
+    Examples:
+    ```python
+        histogram = LuminanceHistogram.FromImage(image)
+        imageMeta.histogram = histogram.Encode() # stored in the project file
+
+        histogram = LuminanceHistogram.Decode(imageMeta.histogram)
+        coverage = histogram.Coverage(threshold) # 0.0 ~ 1.0
+    ```
+    """
+
+    def __init__(self, counts: "list[int] | np.ndarray") -> None:
+        """
+        Raises:
+            ValueError: If the `counts` does not have 256 bins.
+        """
+        self._counts = np.asarray(counts, dtype=np.int64).reshape(-1)
+
+        if self._counts.size != HISTOGRAM_BINS:
+            raise ValueError(
+                f"Histogram must have {HISTOGRAM_BINS} bins, got {self._counts.size}"
+            )
+
+        self._cumulative = np.cumsum(self._counts)
+
+    @staticmethod
+    def FromImage(image: cv.Mat) -> "LuminanceHistogram":
+        """
+        Args:
+            image: The BGR, BGRA or grayscale image.
+        """
+        if image.ndim == 2:
+            gray = image
+        elif image.shape[2] == 4:
+            gray = cv.cvtColor(image, cv.COLOR_BGRA2GRAY)
+        else:
+            gray = cv.cvtColor(image, cv.COLOR_BGR2GRAY)
+
+        return LuminanceHistogram.FromGray(gray)
+
+    @staticmethod
+    def FromFile(imagePath: str) -> "LuminanceHistogram | None":
+        """
+        Returns:
+            The histogram of the image file or None if the file cannot be loaded. Only
+                the grayscale plane is decoded, see `LoadGrayImage`.
+        """
+        gray = LoadGrayImage(imagePath)
+        if gray is None:
+            return None
+
+        return LuminanceHistogram.FromGray(gray)
+
+    @staticmethod
+    def FromGray(gray: cv.Mat) -> "LuminanceHistogram":
+        counts = cv.calcHist([gray], [0], None, [HISTOGRAM_BINS], [0, HISTOGRAM_BINS])
+        return LuminanceHistogram(counts.astype(np.int64))
+
+    @staticmethod
+    def Merge(histograms: "list[LuminanceHistogram]") -> "LuminanceHistogram":
+        """
+        The histogram of all pixels of the `histograms`, e.g. for the statistics of a
+            whole project.
+        """
+        counts = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        for histogram in histograms:
+            counts += histogram.Counts
+
+        return LuminanceHistogram(counts)
+
+    @property
+    def Counts(self) -> np.ndarray:
+        return self._counts
+
+    @property
+    def Cumulative(self) -> np.ndarray:
+        """
+        `Cumulative[t]` is the number of pixels whose value is less than or equal to `t`.
+        """
+        return self._cumulative
+
+    @property
+    def PixelCount(self) -> int:
+        return int(self._cumulative[-1])
+
+    def ForegroundCount(self, threshold: int) -> int:
+        """
+        The number of pixels which are greater than the `threshold`.
+        """
+        threshold = min(max(threshold, 0), HISTOGRAM_BINS - 1)
+        return int(self._cumulative[-1] - self._cumulative[threshold])
+
+    def Coverage(self, threshold: int) -> float:
+        """
+        The ratio of the foreground pixels (greater than the `threshold`), 0.0 if the
+            histogram is empty.
+        """
+        pixelCount = self.PixelCount
+        if pixelCount == 0:
+            return 0.0
+
+        return self.ForegroundCount(threshold) / pixelCount
+
+    def Mean(self) -> float:
+        pixelCount = self.PixelCount
+        if pixelCount == 0:
+            return 0.0
+
+        return float(np.dot(self._counts, np.arange(HISTOGRAM_BINS))) / pixelCount
+
+    def ToList(self) -> list[int]:
+        return self._counts.tolist()
+
+    def Encode(self) -> str:
+        """
+        The counts as little-endian uint64, compressed by zlib (most of the high bytes
+            are zero) and encoded in base64.
+        """
+        data = zlib.compress(self._counts.astype("<u8").tobytes())
+        return base64.b64encode(data).decode("ascii")
+
+    @staticmethod
+    def Decode(encoded: "str | list[int]") -> "LuminanceHistogram | None":
+        """
+        Args:
+            encoded: The text of `Encode`, or the list of the counts of the project files
+                written before the histogram was encoded.
+
+        Returns:
+            The histogram or None if the `encoded` is empty or invalid.
+        """
+        if isinstance(encoded, list):
+            if len(encoded) != HISTOGRAM_BINS:
+                return None
+            return LuminanceHistogram(encoded)
+
+        if encoded == "":
+            return None
+
+        try:
+            data = zlib.decompress(base64.b64decode(encoded, validate=True))
+        except (ValueError, zlib.error):
+            return None
+
+        counts = np.frombuffer(data, dtype="<u8")
+        if counts.size != HISTOGRAM_BINS:
+            return None
+
+        return LuminanceHistogram(counts)
@@ -0,0 +1,293 @@
+import hashlib
+from copy import deepcopy
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Protocol
+import numpy as np
+import cv2 as cv
+
+from constants import (
+    MASK_PIPELINE_CACHE_BUDGET_BYTES,
+    MASK_STAGE_CLOSE,
+    MASK_STAGE_DILATE,
+    MASK_STAGE_ERODE,
+    MASK_STAGE_FILL_HOLES,
+    MASK_STAGE_OPEN,
+    MASK_STAGE_REMOVE_SMALL_COMPONENTS,
+    THRESHOLD_MODE_GLOBAL,
+    THRESHOLD_MODE_HSV,
+    THRESHOLD_MODE_LAB,
+)
+from modules.adaptive_threshold import AdaptiveThreshold
+from modules.color_segmentation import ColorPlanes, ColorRangeMask
+from structs.image_meta import ImageMeta
+from structs.mask_stage import MaskStage
+from utils.logger import logger  # type: ignore
+
+
+class MaskSource(Protocol):
+    """
+    The mask which replaces the global threshold of the image, e.g. `AdaptiveThreshold`
+        or `ColorRangeMask`. The `Key` identifies its parameters in the caches.
+    """
+
+    @property
+    def Key(self) -> str: ...
+
+    def Apply(self, gray: cv.Mat) -> cv.Mat: ...
+
+
+def CreateMaskSource(
+    image: ImageMeta, getPlanes: Callable[[], ColorPlanes | None]
+) -> MaskSource | None:
+    """
+    The mask source of the threshold mode of the image, None in the global mode.
+
+    Args:
+        getPlanes: Return the color planes of the image, only be called in the color
+            modes.
+    """
+    if image.thresholdMode == THRESHOLD_MODE_GLOBAL:
+        return None
+
+    if image.thresholdMode in (THRESHOLD_MODE_HSV, THRESHOLD_MODE_LAB):
+        planes = getPlanes()
+        if planes is None:
+            return None
+
+        return ColorRangeMask(  # copied, the range is edited while binarizing
+            planes, image.thresholdMode, deepcopy(image.colorRange)
+        )
+
+    try:
+        return AdaptiveThreshold(image.thresholdMode, image.blockSize, image.bias)
+    except ValueError as e:
+        logger.error(f"Invalid adaptive threshold: {e}")
+        return None
+
+
+def _Kernel(stage: MaskStage) -> cv.Mat:
+    size = max(stage.size, 1)
+    return cv.getStructuringElement(cv.MORPH_ELLIPSE, (size, size))
+
+
+def _Open(mask: cv.Mat, stage: MaskStage) -> cv.Mat:
+    return cv.morphologyEx(
+        mask, cv.MORPH_OPEN, _Kernel(stage), iterations=stage.iterations
+    )
+
+
+def _Close(mask: cv.Mat, stage: MaskStage) -> cv.Mat:
+    return cv.morphologyEx(
+        mask, cv.MORPH_CLOSE, _Kernel(stage), iterations=stage.iterations
+    )
+
+
+def _Dilate(mask: cv.Mat, stage: MaskStage) -> cv.Mat:
+    return cv.dilate(mask, _Kernel(stage), iterations=stage.iterations)
+
+
+def _Erode(mask: cv.Mat, stage: MaskStage) -> cv.Mat:
+    return cv.erode(mask, _Kernel(stage), iterations=stage.iterations)
+
+
+def _FillHoles(mask: cv.Mat, stage: MaskStage) -> cv.Mat:
+    """
+    The holes are the background components which do not touch the image border, only
+        the holes whose area is at most `stage.size` are filled (all of them if 0).
+    """
+    background = cv.bitwise_not(mask)
+    count, labels, stats, _ = cv.connectedComponentsWithStats(background, None, 4)
+
+    height, width = mask.shape[:2]
+    left = stats[:, cv.CC_STAT_LEFT]
+    top = stats[:, cv.CC_STAT_TOP]
+    touchesBorder = (
+        (left == 0)
+        | (top == 0)
+        | (left + stats[:, cv.CC_STAT_WIDTH] == width)
+        | (top + stats[:, cv.CC_STAT_HEIGHT] == height)
+    )
+
+    isHole = ~touchesBorder
+    isHole[0] = False  # the foreground of the mask
+    if stage.size > 0:
+        isHole &= stats[:, cv.CC_STAT_AREA] <= stage.size
+
+    if count <= 1 or not isHole.any():
+        return mask
+
+    return np.where(isHole[labels], np.uint8(255), mask)
+
+
+def _RemoveSmallComponents(mask: cv.Mat, stage: MaskStage) -> cv.Mat:
+    """
+    Remove the foreground components whose area is less than `stage.size`.
+    """
+    count, labels, stats, _ = cv.connectedComponentsWithStats(mask, None, 8)
+
+    keep = stats[:, cv.CC_STAT_AREA] >= stage.size
+    keep[0] = False  # the background
+    if count <= 1 or keep[1:].all():
+        return mask
+
+    return np.where(keep[labels], np.uint8(255), np.uint8(0))
+
+
+MASK_STAGE_FUNCTIONS: dict[str, Callable[[cv.Mat, MaskStage], cv.Mat]] = {
+    MASK_STAGE_OPEN: _Open,
+    MASK_STAGE_CLOSE: _Close,
+    MASK_STAGE_FILL_HOLES: _FillHoles,
+    MASK_STAGE_REMOVE_SMALL_COMPONENTS: _RemoveSmallComponents,
+    MASK_STAGE_DILATE: _Dilate,
+    MASK_STAGE_ERODE: _Erode,
+}
+
+
+class MaskPipeline:
+    """
+    Process-wide memoized chain of the mask stages: the binary image of the threshold,
+        followed by the `MaskStage`s of the image (opening, closing, hole filling, ...).
+
+    The output of each stage is memoized by the key of its input and its parameters.
+        The key of the first input is the hash of the grayscale image, the key of each
+        next input is derived from the previous one, so editing a parameter of one stage
+        only recomputes that stage and the stages after it, the outputs before it are
+        taken from the cache. The least recently used outputs are evicted once the byte
+        budget is exceeded.
+
+    The cached masks are read-only, they are shared between all the callers. The callers
+        which compute a mask once and keep it elsewhere (e.g. `ComputeWorkingMask` on the
+        worker threads) run the pipeline with `memoize=False`, so their full resolution
+        masks do not evict the ones of the open previews.
+
+    Examples:
+    ```python
+        imageKey = MaskPipeline.ImageKey(gray) # hash once per image
+        mask = MaskPipeline.Run(gray, imageMeta.threshold, imageMeta.maskStages, imageKey)
+    ```
+    """
+
+    _entries: "OrderedDict[str, cv.Mat]" = OrderedDict()
+    _lock: Lock = Lock()
+    _budget: int = MASK_PIPELINE_CACHE_BUDGET_BYTES
+    _usedBytes: int = 0
+
+    _hits: int = 0
+    _misses: int = 0
+
+    @staticmethod
+    def ImageKey(gray: cv.Mat) -> str:
+        digest = hashlib.blake2b(np.ascontiguousarray(gray).data, digest_size=16)
+        digest.update(str(gray.shape).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def StageKey(inputKey: str, stage: MaskStage) -> str:
+        parameters = f"{stage.kind}:{stage.size}:{stage.iterations}"
+        return hashlib.blake2b(
+            f"{inputKey}|{parameters}".encode(), digest_size=16
+        ).hexdigest()
+
+    @staticmethod
+    def Run(
+        gray: cv.Mat,
+        threshold: int,
+        stages: list[MaskStage],
+        imageKey: str | None = None,
+        source: MaskSource | None = None,
+        memoize: bool = True,
+    ) -> cv.Mat:
+        """
+        Args:
+            gray: The grayscale image.
+            threshold: The pixels which are greater than the threshold are foreground.
+            stages: The post-processing stages, the disabled and unknown ones are skipped.
+            imageKey: The `ImageKey` of the `gray` image, computed if not given.
+            source: The mask (adaptive or color range) which replaces the global
+                `threshold`.
+            memoize: Whether the outputs are taken from and put into the cache.
+
+        Returns:
+            The binary mask (0 or 255), read-only if it is memoized.
+        """
+        key = f"{imageKey or MaskPipeline.ImageKey(gray)}|" + (
+            f"threshold:{threshold}" if source is None else f"source:{source.Key}"
+        )
+
+        mask = MaskPipeline._Get(key) if memoize else None
+        if mask is None:
+            if source is None:
+                _, mask = cv.threshold(gray, threshold, 255, cv.THRESH_BINARY)
+            else:
+                mask = source.Apply(gray)
+            if memoize:
+                MaskPipeline._Put(key, mask)
+
+        for stage in stages:
+            function = MASK_STAGE_FUNCTIONS.get(stage.kind)
+            if not stage.enabled:
+                continue
+            if function is None:
+                logger.warning(f'Unknown mask stage "{stage.kind}" is skipped')
+                continue
+
+            if not memoize:
+                mask = function(mask, stage)
+                continue
+
+            key = MaskPipeline.StageKey(key, stage)
+            output = MaskPipeline._Get(key)
+            if output is None:
+                output = function(mask, stage)
+                MaskPipeline._Put(key, output)
+
+            mask = output
+
+        return mask
+
+    @staticmethod
+    def _Get(key: str) -> cv.Mat | None:
+        with MaskPipeline._lock:
+            mask = MaskPipeline._entries.get(key)
+            if mask is None:
+                MaskPipeline._misses += 1
+                return None
+
+            MaskPipeline._entries.move_to_end(key)
+            MaskPipeline._hits += 1
+            return mask
+
+    @staticmethod
+    def _Put(key: str, mask: cv.Mat) -> None:
+        mask.setflags(write=False)
+
+        with MaskPipeline._lock:
+            if key in MaskPipeline._entries:
+                return
+
+            MaskPipeline._entries[key] = mask
+            MaskPipeline._usedBytes += mask.nbytes
+
+            while (
+                MaskPipeline._usedBytes > MaskPipeline._budget
+                and len(MaskPipeline._entries) > 1
+            ):
+                _, evicted = MaskPipeline._entries.popitem(last=False)
+                MaskPipeline._usedBytes -= evicted.nbytes
+
+    @staticmethod
+    def Hits() -> int:
+        return MaskPipeline._hits
+
+    @staticmethod
+    def Misses() -> int:
+        return MaskPipeline._misses
+
+    @staticmethod
+    def Clear() -> None:
+        with MaskPipeline._lock:
+            MaskPipeline._entries.clear()
+            MaskPipeline._usedBytes = 0
+            MaskPipeline._hits = 0
+            MaskPipeline._misses = 0
@@ -0,0 +1,298 @@
+import hashlib
+import math
+import os
+import threading
+import weakref
+from typing import Iterable
+import numpy as np
+import cv2 as cv
+
+from constants import THRESHOLD_MODE_GLOBAL, THRESHOLD_MODE_HSV, THRESHOLD_MODE_LAB
+from modules.color_segmentation import ColorPlanes
+from modules.image_probe import ProbeImage
+from modules.mask_pipeline import CreateMaskSource, MaskPipeline
+from structs.image_meta import ImageMeta
+from utils.images import SUPPORTED_REDUCE_FACTORS, LoadImage, LoadBinaryImage
+from utils.logger import logger  # type: ignore
+
+
+def WorkingSize(width: int, height: int, resolution: int) -> tuple[int, int]:
+    """
+    The size of the working mask, its longest side is the `resolution` and the aspect
+        ratio of the image is kept.
+
+    Returns:
+        The (width, height) of the working mask.
+    """
+    scale = resolution / max(width, height, 1)
+    return max(round(width * scale), 1), max(round(height * scale), 1)
+
+
+def MaskKey(image: ImageMeta, resolution: int) -> str:
+    """
+    The hash of everything the working mask depends on beside the image content: the
+        threshold (or the parameters of the threshold mode), the enabled mask stages and
+        the resolution.
+    """
+    if image.thresholdMode == THRESHOLD_MODE_GLOBAL:
+        thresholdParameters = str(image.threshold)
+    elif image.thresholdMode in (THRESHOLD_MODE_HSV, THRESHOLD_MODE_LAB):
+        colorRange = image.colorRange
+        thresholdParameters = (
+            f"{colorRange.hueMin}-{colorRange.hueMax}:"
+            f"{colorRange.saturationMin}-{colorRange.saturationMax}:"
+            f"{colorRange.valueMin}-{colorRange.valueMax}:"
+            f"{colorRange.labColor}:{colorRange.labDistance}"
+        )
+    else:
+        thresholdParameters = f"{image.blockSize}:{image.bias}"
+
+    stageParameters = ",".join(
+        f"{stage.kind}:{stage.size}:{stage.iterations}"
+        for stage in image.maskStages
+        if stage.enabled
+    )
+    return hashlib.blake2b(
+        f"{image.thresholdMode}|{thresholdParameters}|{stageParameters}|{resolution}".encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+def ComputeWorkingMask(
+    imagePath: str, image: ImageMeta, resolution: int
+) -> cv.Mat | None:
+    """
+    The binary mask (0 or 255) of the image resampled to the working resolution. In the
+        global mode without mask stages the image is binarized strip by strip at the
+        largest reduction which keeps at least the working resolution, the other modes
+        and the mask stages work on the full resolution image.
+
+    Returns:
+        The mask or None if the image cannot be decoded.
+    """
+    header = ProbeImage(imagePath)
+    if header is None:
+        return None
+
+    size = WorkingSize(header.width, header.height, resolution)
+
+    if image.thresholdMode == THRESHOLD_MODE_GLOBAL and not any(
+        stage.enabled for stage in image.maskStages
+    ):
+        # the images smaller than the working resolution are enlarged
+        reduce = max(
+            (
+                factor
+                for factor in SUPPORTED_REDUCE_FACTORS
+                if math.ceil(header.width / factor) >= size[0]
+                and math.ceil(header.height / factor) >= size[1]
+            ),
+            default=1,
+        )
+        mask = LoadBinaryImage(imagePath, image.threshold, reduce)
+    else:
+        bgr = LoadImage(imagePath)
+        if bgr is None:
+            return None
+
+        gray = cv.cvtColor(bgr, cv.COLOR_BGR2GRAY)
+        source = CreateMaskSource(image, lambda: ColorPlanes(bgr))
+        mask = MaskPipeline.Run(
+            gray, image.threshold, image.maskStages, source=source, memoize=False
+        )
+
+    if mask is None:
+        return None
+
+    return ResampleMask(mask, size)
+
+
+def ResampleMask(mask: cv.Mat, size: tuple[int, int]) -> cv.Mat:
+    """
+    The binary mask resized to the (width, height) `size` of the working mask, the
+        pixels which are mostly covered by the silhouette are kept.
+    """
+    if (mask.shape[1], mask.shape[0]) == size:
+        return mask
+
+    resampled = cv.resize(mask, size, interpolation=cv.INTER_AREA)
+    _, resampled = cv.threshold(resampled, 127, 255, cv.THRESH_BINARY)
+    return resampled
+
+
+class MaskStore:
+    """
+    The working-resolution masks of the images of a project, stored as uint8 `.npy`
+        files inside the `masks/` folder of the project and opened as read-only memory
+        maps, so the sculpture computation never decodes the images. The file is named
+        after the image content hash and the `MaskKey`, so the mask is computed again
+        only if the image, its threshold parameters or the resolution change. Each image
+        keeps only its current mask.
+
+    The previous masks are removed lazily: a file which is still mapped (e.g. by the
+        silhouette of a carved view) cannot be deleted on Windows, it is kept until its
+        memory map is released and removed on the next open. The masks which are left
+        over, e.g. when the application is closed, are removed by `Prune` when the
+        project is loaded.
+
+    Examples:
+    ```python
+        store = MaskStore(GetMaskFolder(projectDirectory))
+        key = MaskKey(image, resolution)
+
+        mask = store.Get(imageHash, key)
+        if mask is None:
+            mask = store.Put(imageHash, key, ComputeWorkingMask(path, image, resolution))
+    ```
+    """
+
+    def __init__(self, cacheFolder: str) -> None:
+        self._cacheFolder = cacheFolder
+
+        self._lock = threading.Lock()
+        self._mappedMasks: weakref.WeakValueDictionary[str, np.ndarray] = (
+            weakref.WeakValueDictionary()
+        )
+        self._obsoletePaths: set[str] = set()
+
+    @property
+    def CacheFolder(self) -> str:
+        return self._cacheFolder
+
+    def GetPath(self, imageHash: str, key: str) -> str:
+        return os.path.join(self._cacheFolder, f"{imageHash}_{key}.npy")
+
+    def Contains(self, imageHash: str, key: str) -> bool:
+        return os.path.exists(self.GetPath(imageHash, key))
+
+    def Get(self, imageHash: str, key: str) -> np.ndarray | None:
+        """
+        Returns:
+            The read-only mask or None if it is not stored.
+        """
+        filePath = self.GetPath(imageHash, key)
+        if not os.path.exists(filePath):
+            return None
+
+        with self._lock:
+            # e.g. the parameters are restored by an undo before the mask is removed
+            self._obsoletePaths.discard(filePath)
+
+        return self._Open(filePath)
+
+    def Put(self, imageHash: str, key: str, mask: cv.Mat) -> np.ndarray:
+        """
+        Store the mask and delete the other masks of the image.
+
+        Returns:
+            The read-only stored mask, the given one if it cannot be stored.
+        """
+        filePath = self.GetPath(imageHash, key)
+
+        with self._lock:
+            self._obsoletePaths.discard(filePath)
+
+        try:
+            os.makedirs(self._cacheFolder, exist_ok=True)
+            with open(f"{filePath}.tmp", "wb") as f:
+                np.save(f, np.ascontiguousarray(mask, dtype=np.uint8))
+            os.replace(f"{filePath}.tmp", filePath)
+        except OSError as e:
+            logger.warning(f'Failed to store the mask "{filePath}": {e}')
+            mask = mask.copy()
+            mask.setflags(write=False)
+            return mask
+
+        self._RemoveMasks(imageHash, keep=filePath)
+
+        storedMask = self._Open(filePath)
+        if storedMask is not None:
+            return storedMask
+
+        mask = mask.copy()
+        mask.setflags(write=False)
+        return mask
+
+    def Invalidate(self, imageHash: str) -> None:
+        """
+        Delete the stored masks of the image (e.g. when the image is deleted).
+        """
+        self._RemoveMasks(imageHash, keep=None)
+
+    def Prune(self, masks: Iterable[tuple[str, str]]) -> None:
+        """
+        Delete the stored masks which are not in `masks`, the (image hash, key) of the
+            current masks of the project, e.g. the masks of the deleted images or of the
+            previous parameters which were still mapped when the project was closed.
+        """
+        keep = {self.GetPath(imageHash, key) for imageHash, key in masks}
+
+        try:
+            fileNames = os.listdir(self._cacheFolder)
+        except OSError:
+            return
+
+        with self._lock:
+            for fileName in fileNames:
+                filePath = os.path.join(self._cacheFolder, fileName)
+                if fileName.endswith(".npy") and filePath not in keep:
+                    self._obsoletePaths.add(filePath)
+
+            self._RemoveObsoleteMasks()
+
+    def _Open(self, filePath: str) -> np.ndarray | None:
+        with self._lock:
+            self._RemoveObsoleteMasks()
+
+        try:
+            mask = np.load(filePath, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            # the memory map is not supported by every file system, read it instead
+            logger.debug(f'Cannot map the mask "{filePath}": {e}')
+        else:
+            with self._lock:
+                self._mappedMasks[filePath] = mask
+            return mask
+
+        try:
+            mask = np.load(filePath)
+        except (OSError, ValueError) as e:
+            logger.warning(f'Failed to read the mask "{filePath}": {e}')
+            return None
+
+        mask.setflags(write=False)
+        return mask
+
+    def _RemoveMasks(self, imageHash: str, keep: str | None) -> None:
+        try:
+            fileNames = os.listdir(self._cacheFolder)
+        except OSError:
+            return
+
+        with self._lock:
+            for fileName in fileNames:
+                filePath = os.path.join(self._cacheFolder, fileName)
+                if fileName.startswith(f"{imageHash}_") and filePath != keep:
+                    self._obsoletePaths.add(filePath)
+
+            self._RemoveObsoleteMasks()
+
+    def _RemoveObsoleteMasks(self) -> None:
+        """
+        Delete the obsolete masks which are not mapped anymore, must be called with the
+            lock held.
+        """
+        for filePath in list(self._obsoletePaths):
+            if filePath in self._mappedMasks:
+                continue
+
+            try:
+                os.remove(filePath)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # e.g. it is still mapped by another store, tried again on the next open
+                logger.debug(f'Cannot remove the mask "{filePath}" yet: {e}')
+                continue
+
+            self._obsoletePaths.discard(filePath)
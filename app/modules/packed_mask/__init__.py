@@ -0,0 +1,157 @@
+import numpy as np
+import cv2 as cv
+
+
+class PackedMask:
+    """
+    Binary mask with 8 pixels per byte (`np.packbits` along the rows, the first pixel
+        of a byte is its most significant bit), 8 times smaller than the 0/255 `cv.Mat`.
+        The boolean operations, the area and the projections work on the packed bytes
+        directly, the pixels are never unpacked. The padding bits at the end of each row
+        are always 0.
+
+    Examples:
+    ```python
+        first = PackedMask.FromMat(firstMask)
+        second = PackedMask.FromMat(secondMask)
+
+        overlap = (first & second).Area()
+        iou = first.IoU(second)
+        label.SetImage((first ^ second).ToMat(), QImage.Format.Format_Grayscale8)
+    ```
+    """
+
+    __slots__ = ("_bits", "_width")
+
+    def __init__(self, bits: np.ndarray, width: int) -> None:
+        """
+        Args:
+            bits: The (height, ceil(width / 8)) uint8 packed rows.
+            width: The number of pixels of each row.
+
+        Raises:
+            ValueError: If the shape of the `bits` does not match the `width`.
+        """
+        if (
+            bits.dtype != np.uint8
+            or bits.ndim != 2
+            or bits.shape[1] != (width + 7) // 8
+        ):
+            raise ValueError(
+                f"Packed bits {bits.shape} {bits.dtype} do not match the width {width}"
+            )
+
+        self._bits = bits
+        self._width = width
+
+    @staticmethod
+    def FromMat(mask: cv.Mat) -> "PackedMask":
+        """
+        Args:
+            mask: The single-channel mask, the non-zero pixels are set.
+        """
+        return PackedMask(np.packbits(mask > 0, axis=1), mask.shape[1])
+
+    @staticmethod
+    def Zeros(height: int, width: int) -> "PackedMask":
+        return PackedMask(np.zeros((height, (width + 7) // 8), dtype=np.uint8), width)
+
+    def ToMat(self) -> cv.Mat:
+        """
+        Returns:
+            The uint8 mask (0 or 255), e.g. for `ImageLabel`.
+        """
+        bits = np.unpackbits(self._bits, axis=1, count=self._width)
+        return np.multiply(bits, np.uint8(255), out=bits)
+
+    @property
+    def Bits(self) -> np.ndarray:
+        return self._bits
+
+    @property
+    def Width(self) -> int:
+        return self._width
+
+    @property
+    def Height(self) -> int:
+        return self._bits.shape[0]
+
+    @property
+    def Shape(self) -> tuple[int, int]:
+        return (self.Height, self._width)
+
+    @property
+    def NBytes(self) -> int:
+        return self._bits.nbytes
+
+    def Area(self) -> int:
+        """
+        The number of the set pixels.
+        """
+        return int(np.bitwise_count(self._bits).sum(dtype=np.int64))
+
+    def RowProjection(self) -> np.ndarray:
+        """
+        The number of the set pixels of each row, (height,) int64.
+        """
+        return np.bitwise_count(self._bits).sum(axis=1, dtype=np.int64)
+
+    def ColumnProjection(self) -> np.ndarray:
+        """
+        The number of the set pixels of each column, (width,) int64.
+        """
+        counts = np.empty((self._bits.shape[1], 8), dtype=np.int64)
+        for bit in range(8):
+            counts[:, bit] = np.count_nonzero(self._bits & (0x80 >> bit), axis=0)
+
+        return counts.reshape(-1)[: self._width]
+
+    def IntersectionArea(self, other: "PackedMask") -> int:
+        return (self & other).Area()
+
+    def UnionArea(self, other: "PackedMask") -> int:
+        return (self | other).Area()
+
+    def IoU(self, other: "PackedMask") -> float:
+        """
+        The intersection over union, 1 if both masks are empty.
+        """
+        union = self.UnionArea(other)
+        return self.IntersectionArea(other) / union if union > 0 else 1.0
+
+    def __and__(self, other: "PackedMask") -> "PackedMask":
+        self._CheckShape(other)
+        return PackedMask(np.bitwise_and(self._bits, other._bits), self._width)
+
+    def __or__(self, other: "PackedMask") -> "PackedMask":
+        self._CheckShape(other)
+        return PackedMask(np.bitwise_or(self._bits, other._bits), self._width)
+
+    def __xor__(self, other: "PackedMask") -> "PackedMask":
+        self._CheckShape(other)
+        return PackedMask(np.bitwise_xor(self._bits, other._bits), self._width)
+
+    def __invert__(self) -> "PackedMask":
+        bits = np.bitwise_not(self._bits)
+
+        padding = self._bits.shape[1] * 8 - self._width
+        if padding > 0:
+            bits[:, -1] &= np.uint8((0xFF << padding) & 0xFF)
+
+        return PackedMask(bits, self._width)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackedMask):
+            return NotImplemented
+
+        return self._width == other._width and np.array_equal(self._bits, other._bits)
+
+    __hash__ = None  # type: ignore  # mutable
+
+    def _CheckShape(self, other: "PackedMask") -> None:
+        """
+        Raises:
+            ValueError: If the masks have different shapes.
+        """
+        if self.Shape != other.Shape:
+            raise ValueError(f"Mask shapes differ: {self.Shape} and {other.Shape}")
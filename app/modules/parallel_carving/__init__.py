@@ -0,0 +1,164 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+from constants import CARVE_SLAB_VOXELS, MAX_VOLUME_RESOLUTION
+from modules.sculpture_engine import CarveSlab, Silhouette
+
+# the silhouettes of the worker process, sent once by the pool initializer
+_workerSilhouettes: list[Silhouette] = []
+
+
+class SharedVolume:
+    """
+    A (z, y, x) boolean volume allocated in shared memory, which the worker processes
+        write into directly. The owner must `Close` it (or use it as a context manager),
+        `Array` must not be used afterwards, copy it to keep the voxels.
+
+    Examples:
+    ```python
+        with CarveVolumeParallel(viewModel.GetSilhouettes(), 512) as volume:
+            occupied = np.count_nonzero(volume.Array)
+    ```
+    """
+
+    def __init__(self, resolution: int, name: str | None = None) -> None:
+        """
+        Args:
+            name: The shared memory block to attach to, a new block is created if None.
+        """
+        self._resolution = resolution
+        size = max(resolution**3, 1)
+        self._sharedMemory = (
+            SharedMemory(create=True, size=size)
+            if name is None
+            else SharedMemory(name=name)
+        )
+        self._isOwner = name is None
+        self._array: np.ndarray | None = np.ndarray(
+            (resolution,) * 3, dtype=bool, buffer=self._sharedMemory.buf
+        )
+
+    @property
+    def Name(self) -> str:
+        return self._sharedMemory.name
+
+    @property
+    def Resolution(self) -> int:
+        return self._resolution
+
+    @property
+    def Array(self) -> np.ndarray:
+        """
+        Raises:
+            RuntimeError: If the volume is closed.
+        """
+        if self._array is None:
+            raise RuntimeError("The shared volume is closed")
+
+        return self._array
+
+    def Close(self) -> None:
+        """
+        Release the mapping, the owner also frees the shared memory block.
+        """
+        if self._array is None:
+            return
+
+        self._array = None  # the buffer cannot be released while it is exported
+        self._sharedMemory.close()
+        if self._isOwner:
+            self._sharedMemory.unlink()
+
+    def __enter__(self) -> "SharedVolume":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.Close()
+
+
+def _InitWorker(silhouettes: list[Silhouette]) -> None:
+    global _workerSilhouettes
+    _workerSilhouettes = silhouettes
+
+
+def _CarveSharedSlab(name: str, resolution: int, zStart: int, zStop: int) -> None:
+    """
+    Run in a worker process: carve the slab straight into the shared volume.
+    """
+    volume = SharedVolume(resolution, name)
+    try:
+        CarveSlab(
+            _workerSilhouettes,
+            resolution,
+            zStart,
+            zStop,
+            out=volume.Array[zStart:zStop],
+        )
+    finally:
+        volume.Close()
+
+
+def SlabRanges(
+    resolution: int, workers: int, slabVoxels: int = CARVE_SLAB_VOXELS
+) -> list[tuple[int, int]]:
+    """
+    The (zStart, zStop) slabs of the volume, of about `slabVoxels` voxels each and at
+        least as many as the workers so that every worker is busy.
+    """
+    slabDepth = max(
+        min(slabVoxels // (resolution * resolution), math.ceil(resolution / workers)),
+        1,
+    )
+    return [
+        (zStart, min(zStart + slabDepth, resolution))
+        for zStart in range(0, resolution, slabDepth)
+    ]
+
+
+def CarveVolumeParallel(
+    silhouettes: list[Silhouette],
+    resolution: int,
+    workers: int | None = None,
+    slabVoxels: int = CARVE_SLAB_VOXELS,
+) -> SharedVolume:
+    """
+    `CarveVolume` on a process pool (one process per core by default): the volume is
+        split into slabs along z and each worker carves its slabs into the shared
+        volume. Only the silhouettes (once per worker) and the slab bounds are sent to
+        the workers, the volume is never pickled.
+
+    Returns:
+        The shared volume, see `SharedVolume`.
+
+    Raises:
+        ValueError: If the resolution is not in [1, MAX_VOLUME_RESOLUTION].
+    """
+    if resolution < 1 or resolution > MAX_VOLUME_RESOLUTION:
+        raise ValueError(
+            f"Volume resolution must be in [1, {MAX_VOLUME_RESOLUTION}], got {resolution}"
+        )
+
+    volume = SharedVolume(resolution)
+    if len(silhouettes) == 0:
+        volume.Array.fill(False)
+        return volume
+
+    workers = max(min(workers or os.cpu_count() or 1, resolution), 1)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_InitWorker, initargs=(silhouettes,)
+        ) as executor:
+            futures = [
+                executor.submit(_CarveSharedSlab, volume.Name, resolution, *slab)
+                for slab in SlabRanges(resolution, workers, slabVoxels)
+            ]
+            for future in futures:
+                future.result()
+    except BaseException:
+        volume.Close()
+        raise
+
+    return volume
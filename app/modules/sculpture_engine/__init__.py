@@ -0,0 +1,226 @@
+from dataclasses import dataclass
+import numpy as np
+
+from constants import CARVE_SLAB_VOXELS, MAX_VOLUME_RESOLUTION
+
+
+@dataclass(frozen=True, eq=False)
+class Silhouette:
+    """
+    The shadow which the sculpture must cast: the binary `mask` (non-zero is shadow) as
+        seen when looking along the `direction` the light travels, the top of the mask
+        is the side of the +y axis (the +z axis if the light is vertical).
+    """
+
+    mask: np.ndarray
+    direction: tuple[float, float, float]
+
+
+def ProjectionBasis(
+    direction: tuple[float, float, float],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The orthonormal basis of the image plane of the light `direction`.
+
+    Returns:
+        The normalized direction, the right and the up vectors of the image.
+
+    Raises:
+        ValueError: If the direction is the zero vector.
+    """
+    forward = np.asarray(direction, dtype=np.float64)
+    length = np.linalg.norm(forward)
+    if length == 0:
+        raise ValueError("Light direction must not be the zero vector")
+    forward /= length
+
+    worldUp = np.array([0.0, 1.0, 0.0])
+    if abs(forward @ worldUp) > 1.0 - 1e-6:  # vertical light
+        worldUp = np.array([0.0, 0.0, 1.0])
+
+    right = np.cross(forward, worldUp)
+    right /= np.linalg.norm(right)
+    up = np.cross(right, forward)
+
+    return forward, right, up
+
+
+def VoxelCenters(resolution: int) -> np.ndarray:
+    """
+    The coordinates of the voxel centers along an axis, the volume is the cube
+        [-1, 1]^3.
+    """
+    return ((np.arange(resolution, dtype=np.float32) + 0.5) * (2.0 / resolution)) - 1.0
+
+
+def _ProjectPoints(
+    direction: tuple[float, float, float],
+    shape: tuple[int, ...],
+    xs: np.ndarray,
+    ys: np.ndarray,
+    zs: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The pixels of the points in the image of the given shape, see `SamplePoints`.
+
+    Returns:
+        The rows and the columns (clipped to the image) and whether the points are
+            inside the image.
+    """
+    _, right, up = ProjectionBasis(direction)
+    height, width = shape[:2]
+    scale = np.float32(max(height, width) / 2.0)
+
+    columns: np.ndarray | np.float32 = np.float32(width / 2.0)
+    rows: np.ndarray | np.float32 = np.float32(height / 2.0)
+    for coordinates, rightFactor, upFactor in zip((xs, ys, zs), right, up):
+        if abs(rightFactor) > 1e-9:
+            columns = columns + coordinates * np.float32(rightFactor * scale)
+        if abs(upFactor) > 1e-9:
+            rows = rows - coordinates * np.float32(upFactor * scale)
+
+    columns, rows = np.broadcast_arrays(
+        np.floor(columns).astype(np.int32), np.floor(rows).astype(np.int32)
+    )
+    inside = (columns >= 0) & (columns < width) & (rows >= 0) & (rows < height)
+
+    return np.clip(rows, 0, height - 1), np.clip(columns, 0, width - 1), inside
+
+
+def SamplePoints(
+    silhouette: Silhouette,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    zs: np.ndarray,
+) -> np.ndarray:
+    """
+    Whether the points are inside the extrusion of the silhouette along its light
+        direction. The mask is fitted into the square [-1, 1]^2 of the image plane,
+        centered and with its aspect ratio kept.
+
+    The image coordinates are sums of one term per axis, the coordinates of an axis
+        which the image plane does not depend on (e.g. the axis of the light) are not
+        used, so a dimension which only that axis spans stays of size 1 and the result
+        is broadcast along it instead of being sampled.
+
+    Args:
+        xs, ys, zs: The coordinates of the points, broadcastable to each other.
+
+    Returns:
+        The boolean samples.
+    """
+    rows, columns, inside = _ProjectPoints(
+        silhouette.direction, silhouette.mask.shape, xs, ys, zs
+    )
+
+    samples = silhouette.mask[rows, columns] > 0
+    samples &= inside
+    return samples
+
+
+def GatherPoints(
+    image: np.ndarray,
+    direction: tuple[float, float, float],
+    xs: np.ndarray,
+    ys: np.ndarray,
+    zs: np.ndarray,
+) -> np.ndarray:
+    """
+    The values of the image under the points projected along the direction as in
+        `SamplePoints`, zero outside of the image.
+    """
+    rows, columns, inside = _ProjectPoints(direction, image.shape, xs, ys, zs)
+
+    values = image[rows, columns]
+    values[~inside] = 0
+    return values
+
+
+def SampleSilhouette(
+    silhouette: Silhouette,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    zs: np.ndarray,
+) -> np.ndarray:
+    """
+    The `SamplePoints` of the grid `zs` x `ys` x `xs`.
+
+    Returns:
+        The boolean samples, broadcastable to (len(zs), len(ys), len(xs)).
+    """
+    return SamplePoints(
+        silhouette,
+        xs.reshape(1, 1, -1),
+        ys.reshape(1, -1, 1),
+        zs.reshape(-1, 1, 1),
+    )
+
+
+def CarveSlab(
+    silhouettes: list[Silhouette],
+    resolution: int,
+    zStart: int,
+    zStop: int,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Carve the slices `zStart` to `zStop` of the volume, see `CarveVolume`.
+
+    Args:
+        out: The (zStop - zStart, resolution, resolution) boolean output, allocated if
+            None.
+    """
+    if out is None:
+        out = np.empty((zStop - zStart, resolution, resolution), dtype=bool)
+
+    out.fill(True)
+    centers = VoxelCenters(resolution)
+    xs, ys, zs = centers, centers, centers[zStart:zStop]
+
+    for silhouette in silhouettes:
+        np.logical_and(out, SampleSilhouette(silhouette, xs, ys, zs), out=out)
+
+    return out
+
+
+def CarveVolume(
+    silhouettes: list[Silhouette],
+    resolution: int,
+    slabVoxels: int = CARVE_SLAB_VOXELS,
+) -> np.ndarray:
+    """
+    The visual hull of the silhouettes: each mask is extruded along its light direction
+        through the voxel grid of the cube [-1, 1]^3 and the extrusions are intersected,
+        so the shadow of the volume along each direction is at most its silhouette. The
+        grid is carved slab by slab of about `slabVoxels` voxels, the sampling of a slab
+        is fully vectorized.
+
+    Examples:
+    ```python
+        volume = CarveVolume(
+            [Silhouette(frontMask, (0, 0, -1)), Silhouette(sideMask, (-1, 0, 0))], 256
+        )
+    ```
+
+    Returns:
+        The (z, y, x) boolean occupancy of shape (resolution,) * 3, empty if no
+            silhouette is given.
+
+    Raises:
+        ValueError: If the resolution is not in [1, MAX_VOLUME_RESOLUTION].
+    """
+    if resolution < 1 or resolution > MAX_VOLUME_RESOLUTION:
+        raise ValueError(
+            f"Volume resolution must be in [1, {MAX_VOLUME_RESOLUTION}], got {resolution}"
+        )
+
+    volume = np.zeros((resolution, resolution, resolution), dtype=bool)
+    if len(silhouettes) == 0:
+        return volume
+
+    slabDepth = max(slabVoxels // (resolution * resolution), 1)
+    for zStart in range(0, resolution, slabDepth):
+        zStop = min(zStart + slabDepth, resolution)
+        CarveSlab(silhouettes, resolution, zStart, zStop, out=volume[zStart:zStop])
+
+    return volume
@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+import numpy as np
+
+# the corner c of a cell is at the offset (c & 1, (c >> 1) & 1, (c >> 2) & 1) in (x, y, z)
+_CORNER_OFFSETS = np.array(
+    [[corner & 1, (corner >> 1) & 1, (corner >> 2) & 1] for corner in range(8)],
+    dtype=np.float32,
+)
+# the 12 edges of a cell, the pairs of corners which differ along one axis
+_CELL_EDGES = [
+    (corner, corner | bit)
+    for bit in (1, 2, 4)
+    for corner in range(8)
+    if corner & bit == 0
+]
+
+
+def _CreateVertexTable() -> np.ndarray:
+    """
+    The (x, y, z) position of the vertex inside a cell for each of the 256 corner
+        configurations (bit c is set if the corner c is inside): the mean of the
+        midpoints of the edges which cross the surface.
+    """
+    table = np.full((256, 3), 0.5, dtype=np.float32)
+
+    for configuration in range(1, 255):
+        midpoints = [
+            (_CORNER_OFFSETS[start] + _CORNER_OFFSETS[end]) / 2
+            for start, end in _CELL_EDGES
+            if (configuration >> start & 1) != (configuration >> end & 1)
+        ]
+        table[configuration] = np.mean(midpoints, axis=0)
+
+    return table
+
+
+_VERTEX_TABLE = _CreateVertexTable()
+
+
+@dataclass(frozen=True, eq=False)
+class SurfaceMesh:
+    """
+    The triangles of a surface: the (x, y, z) float32 `vertices` and the (N, 3) uint32
+        `indices` of the triangles, counter-clockwise when seen from outside.
+    """
+
+    vertices: np.ndarray
+    indices: np.ndarray
+
+    @property
+    def TriangleCount(self) -> int:
+        return self.indices.shape[0]
+
+    def ToFaceData(self) -> np.ndarray:
+        """
+        The triangles in the layout of the engine's `FaceData`: the normal and the 3
+            nodes of each triangle as vec4 (w = 0), the normal computed as in `Face`.
+
+        Returns:
+            The (N, 4, 4) float32 array, its bytes are the `FaceData` array.
+        """
+        faces = np.zeros((self.TriangleCount, 4, 4), dtype=np.float32)
+        points = self.vertices[self.indices]  # (N, 3, 3)
+        faces[:, 1:, :3] = points
+
+        normals = np.cross(points[:, 0] - points[:, 1], points[:, 1] - points[:, 2])
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        np.divide(normals, lengths, out=normals, where=lengths > 0)
+        faces[:, 0, :3] = normals
+
+        return faces
+
+
+def ExtractSurface(volume: np.ndarray) -> SurfaceMesh:
+    """
+    The surface of the (z, y, x) boolean volume by surface nets, in the coordinates of
+        `CarveVolume` (the volume fills the cube [-1, 1]^3). The volume is padded with
+        empty voxels so the surface is closed.
+
+    A cell is the cube between 8 neighbouring voxel centers. Each cell whose corners
+        are neither all inside nor all outside gets one vertex, placed by the lookup
+        table of its corner configuration, and each pair of neighbouring voxels of which
+        one is inside gets the quad of the 4 cells around it (2 triangles). Everything
+        is computed on whole arrays.
+
+    Examples:
+    ```python
+        mesh = ExtractSurface(CarveVolume(viewModel.GetSilhouettes(), 256))
+        faceData = mesh.ToFaceData()
+    ```
+
+    Raises:
+        ValueError: If the volume is not a non-empty cube.
+    """
+    if volume.ndim != 3 or len(set(volume.shape)) != 1 or volume.shape[0] == 0:
+        raise ValueError(f"Volume must be a non-empty cube, got {volume.shape}")
+
+    resolution = volume.shape[0]
+    padded = np.pad(volume.astype(bool, copy=False), 1).view(np.uint8)
+
+    # the configuration of each cell, the cells are indexed by their lowest corner, the
+    # corners are combined along x, then y, then z
+    configurations = padded[:, :, :-1] | (padded[:, :, 1:] << 1)
+    configurations = configurations[:, :-1] | (configurations[:, 1:] << 2)
+    configurations = configurations[:-1] | (configurations[1:] << 4)
+
+    flatConfigurations = configurations.ravel()
+    cells = np.flatnonzero((flatConfigurations != 0) & (flatConfigurations != 255))
+    cellConfigurations = flatConfigurations[cells]
+    cellPositions = np.stack(np.unravel_index(cells, configurations.shape), axis=1)
+
+    # the padded voxel i is the voxel i - 1, whose center is (i - 0.5) * 2 / resolution - 1
+    vertices = cellPositions[:, ::-1].astype(np.float32)  # (x, y, z)
+    vertices += _VERTEX_TABLE[cellConfigurations] - np.float32(0.5)
+    vertices *= np.float32(2.0 / resolution)
+    vertices -= np.float32(1.0)
+
+    quads = np.concatenate(
+        [
+            _AxisQuads(
+                axis, cells, cellPositions, cellConfigurations, configurations.shape
+            )
+            for axis in range(3)
+        ]
+    )
+    indices = np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+
+    return SurfaceMesh(vertices, indices.astype(np.uint32))
+
+
+def _AxisQuads(
+    axis: int,
+    cells: np.ndarray,
+    cellPositions: np.ndarray,
+    cellConfigurations: np.ndarray,
+    cellShape: tuple[int, ...],
+) -> np.ndarray:
+    """
+    The quads of the neighbouring voxels along the (x, y, z) `axis` of which one is
+        inside, as the indices of the vertices of the 4 cells around them.
+
+    The pair of voxels is the edge from the lowest corner of a cell along the axis, and
+        such an edge crosses the surface only if the cell is mixed, so only the mixed
+        cells are looked at.
+    """
+    bit = 1 << (1 << axis)  # the corner 1, 2 or 4
+    lowerInside = cellConfigurations & 1 == 1
+    crossings = np.flatnonzero(lowerInside != (cellConfigurations & bit == bit))
+    positions = cellPositions[crossings]
+
+    # the cells around the edge, counter-clockwise around the axis: b x c = axis, the
+    # arrays are (z, y, x)
+    bAxis, cAxis = 2 - (axis + 1) % 3, 2 - (axis + 2) % 3
+    corners = []
+    for db, dc in ((-1, -1), (0, -1), (0, 0), (-1, 0)):
+        if db == 0 and dc == 0:
+            corners.append(crossings)
+            continue
+
+        cell = positions.copy()
+        cell[:, bAxis] += db
+        cell[:, cAxis] += dc
+        corners.append(
+            np.searchsorted(cells, np.ravel_multi_index(tuple(cell.T), cellShape))
+        )
+
+    quads = np.stack(corners, axis=1)
+    isFlipped = ~lowerInside[crossings]  # the upper voxel is inside
+    quads[isFlipped] = quads[isFlipped][:, ::-1]
+    return quads
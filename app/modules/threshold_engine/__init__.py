@@ -0,0 +1,98 @@
+import numpy as np
+import cv2 as cv
+
+from constants import DEFAULT_THRESHOLD
+from utils.logger import logger  # type: ignore
+
+
+class ThresholdEngine:
+    """
+    Binarize the same image many times with different thresholds (e.g. while the user is
+        dragging the threshold slider). The grayscale plane is computed only once per image
+        and the binary frames are written, in turn, into two preallocated buffers through a
+        256-entry lookup table, so a slider tick costs a single table lookup pass.
+
+    Examples:
+    ```python
+        engine = ThresholdEngine()
+        engine.SetImage(image) # convert to grayscale once
+
+        binaryImage = engine.Apply(100) # no new allocation
+        binaryImage = engine.Apply(150) # written into the other buffer
+    ```
+
+    Note:
+        The returned binary image is owned by the engine: it stays valid while the next
+            `Apply` call writes into the other buffer (so it can be shown until the next
+            frame replaces it), and is overwritten by the call after. Copy it if it must be
+            kept longer.
+    """
+
+    _ramp: np.ndarray = np.arange(256, dtype=np.uint8).reshape(1, 256)
+
+    def __init__(self) -> None:
+        self._gray: cv.Mat | None = None
+        self._outputs: tuple[cv.Mat, cv.Mat] | None = None
+        self._outputIndex = 0
+        self._threshold: int | None = None
+
+    def SetImage(self, image: cv.Mat | None) -> None:
+        """
+        Change the source image, the grayscale plane and the output buffers are rebuilt only
+            when this method is called.
+
+        Args:
+            image: The BGR (or already grayscale) image, None for clearing the engine.
+        """
+        self._threshold = None
+
+        if image is None:
+            self._gray = None
+            self._outputs = None
+            return
+
+        if image.ndim == 2:
+            self._gray = image
+        elif image.shape[2] == 4:
+            self._gray = cv.cvtColor(image, cv.COLOR_BGRA2GRAY)
+        else:
+            self._gray = cv.cvtColor(image, cv.COLOR_BGR2GRAY)
+
+        self._outputs = (np.empty_like(self._gray), np.empty_like(self._gray))
+        self._outputIndex = 0
+
+    @property
+    def Gray(self) -> cv.Mat | None:
+        return self._gray
+
+    def Apply(self, threshold: int = DEFAULT_THRESHOLD) -> cv.Mat | None:
+        """
+        Binarize the current image, the pixels which are greater than the `threshold` will be
+            255, otherwise 0 (the same rule as `cv.THRESH_BINARY`).
+
+        Args:
+            threshold: The threshold value in range [0, 255].
+
+        Returns:
+            The binary image (one of the internal buffers) or None if there is no image.
+        """
+        if self._gray is None or self._outputs is None:
+            return None
+
+        if threshold == self._threshold:
+            return self._outputs[self._outputIndex]
+
+        try:
+            _, lut = cv.threshold(self._ramp, threshold, 255, cv.THRESH_BINARY)
+        except Exception as e:
+            logger.error(f"Failed to build the threshold lookup table: {e}")
+            return self._gray
+
+        # the previous frame may still be shown, the other buffer is written
+        outputIndex = 1 - self._outputIndex
+        output = self._outputs[outputIndex]
+        cv.LUT(self._gray, lut, dst=output)
+        self._outputIndex = outputIndex
+        self._threshold = threshold
+
+        return output
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import tempfile
+from threading import Lock
+import cv2 as cv
+
+from constants import IMAGE_STORE_COPY_CHUNK_SIZE, THUMBNAIL_SIZE
+from modules.image_probe import ProbeImage
+from utils.application import (
+    GetThumbnailFilePath,
+    GetThumbnailFolder,
+    GetThumbnailIndexFile,
+)
+from utils.images import SUPPORTED_REDUCE_FACTORS, LoadImage
+from utils.logger import logger  # type: ignore
+
+
+class ThumbnailCache:
+    """
+    The thumbnails of the project images, be stored inside the `thumbnails/` folder next
+        to the `images/` folder of the project. Each thumbnail is named by the hash of the
+        image content, so the identical files share the same thumbnail and a changed file
+        gets a new one. The images of the content-addressed store are already named by
+        the hash of their content (`ImageMeta.storedName`), which is passed as the
+        `contentHash` so they are never hashed. Only the images imported before the store
+        are hashed: the index file remembers the modified time, the size and the hash of
+        each of them, so the unchanged files are neither decoded nor hashed again.
+
+    `GetCachedThumbnail` is cheap (only a `stat` call) and can be used on the GUI thread,
+        `BuildThumbnail` decodes the image and should be run in the background. The image
+        is decoded at the smallest reduced scale which still covers the thumbnail size.
+
+    Examples:
+    ```python
+        cache = ThumbnailCache(projectDirectory)
+
+        thumbnailPath = cache.GetCachedThumbnail(imagePath, contentHash)
+        if thumbnailPath is None:
+            # in a worker thread
+            thumbnailPath = cache.BuildThumbnail(imagePath, contentHash)
+            cache.SaveIndex()
+    ```
+    """
+
+    def __init__(self, projectDirectory: str) -> None:
+        self._projectDirectory = projectDirectory
+        self._index: dict[str, dict[str, int | str]] = {}
+        self._lock = Lock()
+        self._isModified = False
+
+        indexFile = GetThumbnailIndexFile(projectDirectory)
+        if projectDirectory != "" and os.path.exists(indexFile):
+            try:
+                with open(indexFile, "r") as f:
+                    self._index = json.loads(f.read())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Thumbnail index is invalid, it will be rebuilt: {e}")
+                self._index = {}
+
+    @property
+    def ProjectDirectory(self) -> str:
+        return self._projectDirectory
+
+    def GetCachedThumbnail(self, imagePath: str, contentHash: str = "") -> str | None:
+        """
+        Args:
+            contentHash: The hash the stored image is named by, empty for the images
+                imported before the content-addressed store.
+
+        Returns:
+            The thumbnail file path if the image file is not changed since its thumbnail
+                was built, otherwise None.
+        """
+        if contentHash != "":
+            thumbnailPath = GetThumbnailFilePath(self._projectDirectory, contentHash)
+            return thumbnailPath if os.path.exists(thumbnailPath) else None
+
+        try:
+            stat = os.stat(imagePath)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._index.get(os.path.basename(imagePath))
+
+        if (
+            entry is None
+            or entry["mtime"] != stat.st_mtime_ns
+            or entry["size"] != stat.st_size
+        ):
+            return None
+
+        thumbnailPath = GetThumbnailFilePath(self._projectDirectory, str(entry["hash"]))
+        return thumbnailPath if os.path.exists(thumbnailPath) else None
+
+    def BuildThumbnail(self, imagePath: str, contentHash: str = "") -> str | None:
+        """
+        Hash the image file (unless its `contentHash` is known) and create its thumbnail
+            if no thumbnail has this hash yet. Safe to be called from the worker threads.
+
+        Returns:
+            The thumbnail file path or None if the image cannot be loaded or the project
+                folder does not exist anymore.
+        """
+        if self._projectDirectory == "" or not os.path.isdir(self._projectDirectory):
+            return None
+
+        thumbnailFolder = GetThumbnailFolder(self._projectDirectory)
+        if not os.path.exists(thumbnailFolder):
+            os.makedirs(thumbnailFolder, exist_ok=True)
+            logger.info(f"Thumbnail folder created: {thumbnailFolder}")
+
+        isIndexed = contentHash == ""
+        if isIndexed:
+            try:
+                stat = os.stat(imagePath)
+                contentHash = self._HashFile(imagePath)
+            except OSError as e:
+                logger.warning(f'Cannot read image "{imagePath}": {e}')
+                return None
+
+        thumbnailPath = GetThumbnailFilePath(self._projectDirectory, contentHash)
+
+        if not os.path.exists(thumbnailPath):
+            thumbnail = self._CreateThumbnail(imagePath)
+            if thumbnail is None:
+                logger.warning(f'Cannot decode image "{imagePath}"')
+                return None
+
+            success, encoded = cv.imencode(".png", thumbnail)
+            if not success:
+                return None
+
+            if not self._WriteThumbnail(thumbnailPath, encoded.tobytes()):
+                return None
+
+        if isIndexed:
+            with self._lock:
+                self._index[os.path.basename(imagePath)] = {
+                    "mtime": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "hash": contentHash,
+                }
+                self._isModified = True
+
+        return thumbnailPath
+
+    def _HashFile(self, imagePath: str) -> str:
+        hasher = hashlib.sha256()
+        with open(imagePath, "rb") as f:
+            while chunk := f.read(IMAGE_STORE_COPY_CHUNK_SIZE):
+                hasher.update(chunk)
+
+        return hasher.hexdigest()
+
+    def _CreateThumbnail(self, imagePath: str) -> cv.Mat | None:
+        header = ProbeImage(imagePath)
+        reduce = 1
+        if header is not None:
+            longestSide = max(header.width, header.height)
+            reduce = max(
+                factor
+                for factor in SUPPORTED_REDUCE_FACTORS
+                if longestSide // factor >= THUMBNAIL_SIZE or factor == 1
+            )
+
+        image = LoadImage(imagePath, reduce)
+        if image is None:
+            return None
+
+        height, width = image.shape[:2]
+        scale = THUMBNAIL_SIZE / max(width, height)
+        if scale >= 1.0:
+            return image
+
+        return cv.resize(
+            image,
+            (max(1, round(width * scale)), max(1, round(height * scale))),
+            interpolation=cv.INTER_AREA,
+        )
+
+    def _WriteThumbnail(self, thumbnailPath: str, content: bytes) -> bool:
+        """
+        Write the thumbnail into a temporary file first, so an interrupted write never
+            leaves a truncated thumbnail under the name of its hash.
+        """
+        fileDescriptor, temporaryPath = tempfile.mkstemp(
+            suffix=".tmp", dir=os.path.dirname(thumbnailPath)
+        )
+
+        try:
+            with os.fdopen(fileDescriptor, "wb") as f:
+                f.write(content)
+            os.replace(temporaryPath, thumbnailPath)
+        except OSError as e:
+            logger.warning(f'Failed to write thumbnail "{thumbnailPath}": {e}')
+            if os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+            return False
+
+        return True
+
+    def SaveIndex(self) -> None:
+        """
+        Write the index file if any thumbnail was built since the last save.
+        """
+        with self._lock:
+            if not self._isModified:
+                return
+
+            indexContent = json.dumps(self._index, indent=4)
+            self._isModified = False
+
+        try:
+            with open(GetThumbnailIndexFile(self._projectDirectory), "w") as f:
+                f.write(indexContent)
+        except OSError as e:
+            logger.warning(f"Failed to save the thumbnail index: {e}")
@@ -0,0 +1,67 @@
+from dataclasses import dataclass, field
+
+from .struct_base import StructBase
+
+
+@dataclass
+class ColorRange(StructBase):
+    """
+    The color range of the color segmentation of an image (see `ColorRangeMask`), in the
+        8-bit OpenCV units.
+
+    The HSV mode keeps the pixels inside the hue, saturation and value ranges, the hue is
+        in [0, 179] and wraps around (e.g. 170 to 10 for the reds) if `hueMin` is greater
+        than `hueMax`. The Lab mode keeps the pixels whose Euclidean distance to the
+        `labColor` is at most `labDistance`.
+    """
+
+    hueMin: int = field(default=0)
+    hueMax: int = field(default=179)
+    saturationMin: int = field(default=0)
+    saturationMax: int = field(default=255)
+    valueMin: int = field(default=0)
+    valueMax: int = field(default=255)
+    labColor: list[int] = field(default_factory=lambda: [255, 128, 128])  # white
+    labDistance: int = field(default=40)
+
+    def Update(self, other: "StructBase") -> None:
+        if not isinstance(other, ColorRange):
+            raise ValueError("other is not a ColorRange")
+
+        self.hueMin = other.hueMin
+        self.hueMax = other.hueMax
+        self.saturationMin = other.saturationMin
+        self.saturationMax = other.saturationMax
+        self.valueMin = other.valueMin
+        self.valueMax = other.valueMax
+        self.labColor = list(other.labColor)
+        self.labDistance = other.labDistance
+
+    def Compare(self, other: "StructBase") -> bool:
+        if not isinstance(other, ColorRange):
+            raise ValueError("other is not a ColorRange")
+
+        return (
+            self.hueMin == other.hueMin
+            and self.hueMax == other.hueMax
+            and self.saturationMin == other.saturationMin
+            and self.saturationMax == other.saturationMax
+            and self.valueMin == other.valueMin
+            and self.valueMax == other.valueMax
+            and self.labColor == other.labColor
+            and self.labDistance == other.labDistance
+        )
+
+    def _Validate(self, loaded: "StructBase") -> bool:
+        if not isinstance(loaded, ColorRange):
+            raise ValueError("loaded is not a ColorRange")
+
+        loaded.hueMin = min(max(loaded.hueMin, 0), 179)
+        loaded.hueMax = min(max(loaded.hueMax, 0), 179)
+        for name in ("saturationMin", "saturationMax", "valueMin", "valueMax"):
+            setattr(loaded, name, min(max(getattr(loaded, name), 0), 255))
+        if len(loaded.labColor) != 3:
+            loaded.labColor = [255, 128, 128]
+        loaded.labDistance = max(loaded.labDistance, 0)
+
+        return super()._Validate(loaded)
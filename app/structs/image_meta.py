@@ -1,16 +1,112 @@
+import hashlib
+import math
+import os
+from copy import deepcopy
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from constants import DEFAULT_THRESHOLD
+from constants import (
+    DEFAULT_ADAPTIVE_BIAS,
+    DEFAULT_ADAPTIVE_BLOCK_SIZE,
+    DEFAULT_LIGHT_DIRECTION,
+    DEFAULT_THRESHOLD,
+    THRESHOLD_MODE_GLOBAL,
+    THRESHOLD_MODE_HSV,
+    THRESHOLD_MODE_LAB,
+    THRESHOLD_MODE_MEAN,
+    THRESHOLD_MODE_SAUVOLA,
+)
+from modules.luminance_histogram import LuminanceHistogram
 
+from .color_range import ColorRange
+from .mask_stage import MaskStage
 from .struct_base import StructBase
 
 
 @dataclass
 class ImageMeta(StructBase):
+    """
+    The image of the project. The imported file is stored once in the images/ folder
+        under the hash of its content (`storedName`), so several images with the same
+        content share one file. The images imported before the content-addressed store
+        have no `storedName` and their file is named after the image `name`.
+
+    The `histogram` is the 256-bin luminance histogram of the image encoded by
+        `LuminanceHistogram.Encode`, empty if it is not computed yet. The project files
+        written before it was encoded store the list of the counts, it is encoded when
+        the project is loaded.
+
+    The `maskStages` are applied in order to the binary image of the `threshold` (e.g.
+        opening, hole filling), see `MaskPipeline`. They are changed through
+        `ImagePreviewViewModel.SetMaskStages`, the image preview has no controls for them
+        yet, so they come from the project file.
+
+    The `thresholdMode` selects the global `threshold` or one of the local thresholds
+        computed in a `blockSize` window with the `bias`, see `AdaptiveThreshold`, or
+        the segmentation of the pixels in the `colorRange`, see `ColorRangeMask`.
+
+    The `width`, `height`, `channels` and `dtype` are read from the header of the file
+        when it is imported (see `ProbeImage`), 0 and empty if it is not probed yet.
+
+    The `lightDirection` is the direction (x, y, z) the light travels to cast the shadow
+        of the image, see `CarveVolume`.
+    """
+
     name: str = field(default="")
     copiedAt: float = field(default=datetime.now().timestamp())
     threshold: int = field(default=DEFAULT_THRESHOLD)
+    storedName: str = field(default="")
+    histogram: str | list[int] = field(default="")  # see LuminanceHistogram
+    maskStages: list[MaskStage] = field(default_factory=list)  # see MaskPipeline
+    thresholdMode: str = field(default=THRESHOLD_MODE_GLOBAL)
+    blockSize: int = field(default=DEFAULT_ADAPTIVE_BLOCK_SIZE)
+    bias: int = field(default=DEFAULT_ADAPTIVE_BIAS)
+    colorRange: ColorRange = field(default_factory=ColorRange)
+    width: int = field(default=0)
+    height: int = field(default=0)
+    channels: int = field(default=0)
+    dtype: str = field(default="")
+    lightDirection: list[float] = field(
+        default_factory=lambda: list(DEFAULT_LIGHT_DIRECTION)
+    )
+
+    @property
+    def IsProbed(self) -> bool:
+        return self.width > 0 and self.height > 0
+
+    @property
+    def EncodedHistogram(self) -> str:
+        """
+        The `histogram` encoded by `LuminanceHistogram.Encode`, also when it is still the
+            list of the counts, empty if it is not computed yet.
+        """
+        if isinstance(self.histogram, str):
+            return self.histogram
+
+        histogram = LuminanceHistogram.Decode(self.histogram)
+        return histogram.Encode() if histogram is not None else ""
+
+    @property
+    def FileName(self) -> str:
+        """
+        The name of the file inside the images/ folder.
+        """
+        return self.storedName if self.storedName != "" else self.name
+
+    @property
+    def CacheId(self) -> str:
+        """
+        The name of the image in the caches of the project (working masks, distance
+            fields): the content hash of the stored file followed by the hash of the image
+            name, the images imported from the same file share the stored file but each
+            one has its own threshold. Only the hash of the name for the images which
+            were not imported into the store.
+        """
+        nameHash = hashlib.blake2b(self.name.encode(), digest_size=16).hexdigest()
+        if self.storedName != "":
+            return f"{os.path.splitext(self.storedName)[0]}-{nameHash[:8]}"
+
+        return nameHash
 
     def Update(self, other: "StructBase") -> None:
         if not isinstance(other, ImageMeta):
@@ -19,6 +115,18 @@ class ImageMeta(StructBase):
         self.name = other.name
         self.copiedAt = other.copiedAt
         self.threshold = other.threshold
+        self.storedName = other.storedName
+        self.histogram = other.histogram
+        self.maskStages = deepcopy(other.maskStages)
+        self.thresholdMode = other.thresholdMode
+        self.blockSize = other.blockSize
+        self.bias = other.bias
+        self.colorRange = deepcopy(other.colorRange)
+        self.width = other.width
+        self.height = other.height
+        self.channels = other.channels
+        self.dtype = other.dtype
+        self.lightDirection = list(other.lightDirection)
 
     def Compare(self, other: "StructBase") -> bool:
         if not isinstance(other, ImageMeta):
@@ -28,6 +136,22 @@ class ImageMeta(StructBase):
             self.name == other.name
             and self.copiedAt == other.copiedAt
             and self.threshold == other.threshold
+            and self.storedName == other.storedName
+            and self.histogram == other.histogram
+            and self.thresholdMode == other.thresholdMode
+            and self.blockSize == other.blockSize
+            and self.bias == other.bias
+            and self.colorRange.Compare(other.colorRange)
+            and self.width == other.width
+            and self.height == other.height
+            and self.channels == other.channels
+            and self.dtype == other.dtype
+            and self.lightDirection == other.lightDirection
+            and len(self.maskStages) == len(other.maskStages)
+            and all(
+                stage.Compare(otherStage)
+                for stage, otherStage in zip(self.maskStages, other.maskStages)
+            )
         )
 
     def _Validate(self, loaded: "StructBase") -> bool:
@@ -38,5 +162,35 @@ class ImageMeta(StructBase):
             loaded.threshold = 0
         if loaded.threshold > 255:
             loaded.threshold = 255
+        histogram = LuminanceHistogram.Decode(loaded.histogram)
+        # computed again when the image is opened if it is invalid
+        loaded.histogram = histogram.Encode() if histogram is not None else ""
+        if loaded.thresholdMode not in (
+            THRESHOLD_MODE_GLOBAL,
+            THRESHOLD_MODE_MEAN,
+            THRESHOLD_MODE_SAUVOLA,
+            THRESHOLD_MODE_HSV,
+            THRESHOLD_MODE_LAB,
+        ):
+            loaded.thresholdMode = THRESHOLD_MODE_GLOBAL
+        if loaded.blockSize < 3:
+            loaded.blockSize = 3
+        if loaded.blockSize % 2 == 0:
+            loaded.blockSize += 1
+
+        if loaded.width < 0 or loaded.height < 0 or loaded.channels < 0:
+            # be probed again
+            loaded.width, loaded.height, loaded.channels, loaded.dtype = 0, 0, 0, ""
+
+        if (
+            len(loaded.lightDirection) != 3
+            or not any(loaded.lightDirection)
+            or not all(math.isfinite(value) for value in loaded.lightDirection)
+        ):
+            loaded.lightDirection = list(DEFAULT_LIGHT_DIRECTION)
+
+        loaded.colorRange._Validate(loaded.colorRange)
+        for stage in loaded.maskStages:
+            stage._Validate(stage)
 
         return super()._Validate(loaded)
@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+
+from .struct_base import StructBase
+
+
+@dataclass
+class MaskStage(StructBase):
+    """
+    One post-processing stage of the binary mask of an image (see `MaskPipeline`).
+
+    `kind` is one of the `MASK_STAGE_*` constants. `size` is the kernel size of the
+        morphological stages, the maximum hole area of the hole filling (0 for all the
+        holes) and the minimum area of the small-component removal. `iterations` is only
+        used by the morphological stages.
+    """
+
+    kind: str = field(default="")
+    size: int = field(default=3)
+    iterations: int = field(default=1)
+    enabled: bool = field(default=True)
+
+    def Update(self, other: "StructBase") -> None:
+        if not isinstance(other, MaskStage):
+            raise ValueError("other is not a MaskStage")
+
+        self.kind = other.kind
+        self.size = other.size
+        self.iterations = other.iterations
+        self.enabled = other.enabled
+
+    def Compare(self, other: "StructBase") -> bool:
+        if not isinstance(other, MaskStage):
+            raise ValueError("other is not a MaskStage")
+
+        return (
+            self.kind == other.kind
+            and self.size == other.size
+            and self.iterations == other.iterations
+            and self.enabled == other.enabled
+        )
+
+    def _Validate(self, loaded: "StructBase") -> bool:
+        if not isinstance(loaded, MaskStage):
+            raise ValueError("loaded is not a MaskStage")
+
+        loaded.size = max(loaded.size, 0)
+        loaded.iterations = max(loaded.iterations, 1)
+
+        return super()._Validate(loaded)
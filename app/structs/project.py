@@ -5,6 +5,7 @@ from utils.logger import logger  # type: ignore
 
 from structs.image_meta import ImageMeta
 from structs.opengl_setting import OpenGLSetting
+from structs.sculpture_setting import SculptureSetting
 
 from .struct_base import StructBase
 
@@ -26,6 +27,7 @@ class Project(StructBase):
     createdAt: int = field(default=0)
     lastEditAt: int = field(default=0)
     openglSetting: OpenGLSetting = field(default_factory=OpenGLSetting)
+    sculptureSetting: SculptureSetting = field(default_factory=SculptureSetting)
 
     def Update(self, other: "StructBase") -> None:
         if not isinstance(other, Project):
@@ -37,6 +39,7 @@ class Project(StructBase):
 
         self.images = deepcopy(other.images)
         self.openglSetting.Update(other.openglSetting)
+        self.sculptureSetting.Update(other.sculptureSetting)
 
     def Compare(self, other: "StructBase") -> bool:
         if not isinstance(other, Project):
@@ -51,8 +54,24 @@ class Project(StructBase):
         if self.openglSetting.Compare(other.openglSetting) is False:
             return False
 
+        if self.sculptureSetting.Compare(other.sculptureSetting) is False:
+            return False
+
         return True
 
+    def _Validate(self, loaded: "StructBase") -> bool:
+        if not isinstance(loaded, Project):
+            raise ValueError("loaded is not a Project")
+
+        if not loaded.sculptureSetting._Validate(loaded.sculptureSetting):
+            return False
+
+        for image in loaded.images:
+            if not image._Validate(image):
+                return False
+
+        return super()._Validate(loaded)
+
     def GetCreatedAt(self) -> datetime:
         return datetime.fromtimestamp(self.createdAt)
 
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+
+from constants import (
+    DEFAULT_MASK_RESOLUTION,
+    DEFAULT_VOLUME_RESOLUTION,
+    MAX_MASK_RESOLUTION,
+    MAX_VOLUME_RESOLUTION,
+    MIN_MASK_RESOLUTION,
+)
+
+from .struct_base import StructBase
+
+
+@dataclass
+class SculptureSetting(StructBase):
+    """
+    The parameters of the sculpture computation of the project.
+
+    The `maskResolution` is the longest side (in pixels) of the working masks, the
+        binary masks of the images resampled once and stored in the project folder (see
+        `MaskStore`), so the computation never reads the original images.
+
+    The `volumeResolution` is the number of the voxels along each side of the carved
+        volume (see `CarveVolume`).
+    """
+
+    maskResolution: int = field(default=DEFAULT_MASK_RESOLUTION)
+    volumeResolution: int = field(default=DEFAULT_VOLUME_RESOLUTION)
+
+    def Update(self, other: StructBase) -> None:
+        if not isinstance(other, SculptureSetting):
+            raise ValueError("other is not a SculptureSetting")
+
+        self.maskResolution = other.maskResolution
+        self.volumeResolution = other.volumeResolution
+
+    def Compare(self, other: StructBase) -> bool:
+        if not isinstance(other, SculptureSetting):
+            raise ValueError("other is not a SculptureSetting")
+
+        return (
+            self.maskResolution == other.maskResolution
+            and self.volumeResolution == other.volumeResolution
+        )
+
+    def _Validate(self, loaded: StructBase) -> bool:
+        if not isinstance(loaded, SculptureSetting):
+            raise ValueError("loaded is not a SculptureSetting")
+
+        loaded.maskResolution = min(
+            max(loaded.maskResolution, MIN_MASK_RESOLUTION), MAX_MASK_RESOLUTION
+        )
+        loaded.volumeResolution = min(
+            max(loaded.volumeResolution, 1), MAX_VOLUME_RESOLUTION
+        )
+
+        return super()._Validate(loaded)
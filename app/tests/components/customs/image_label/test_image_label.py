@@ -0,0 +1,181 @@
+import numpy as np
+from pytest_mock import MockerFixture
+from pytestqt.qtbot import QtBot
+from PyQt6.QtCore import QEvent, QPoint, QPointF, Qt
+from PyQt6.QtGui import QImage, QMouseEvent, QWheelEvent
+from components.customs.image_label.image_label import ImageLabel
+from components.customs.image_label.image_pyramid import ImagePyramid
+
+IMAGE_WIDTH = 200
+IMAGE_HEIGHT = 100
+LABEL_WIDTH = 100
+LABEL_HEIGHT = 50
+# the fitted image is level 1, whose columns are the means of 2 columns: (0 + 1) / 2
+# is rounded to 1
+FITTED_COLUMNS = (1, IMAGE_WIDTH - 1)
+
+
+def CreateTestImage(width: int = IMAGE_WIDTH, height: int = IMAGE_HEIGHT) -> np.ndarray:
+    """
+    A BGR image whose blue channel is the x and green channel the y of each pixel.
+    """
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[:, :, 0] = np.arange(width, dtype=np.uint8).reshape(1, -1)
+    image[:, :, 1] = np.arange(height, dtype=np.uint8).reshape(-1, 1)
+    return image
+
+
+def CreateLabel(qtbot: QtBot) -> ImageLabel:
+    label = ImageLabel()
+    qtbot.addWidget(label)
+    label.resize(LABEL_WIDTH, LABEL_HEIGHT)
+    return label
+
+
+def ShownImage(label: ImageLabel) -> np.ndarray:
+    """
+    The pixels of the pixmap of the label as (B, G, R), like the source image.
+    """
+    image = label.pixmap().toImage().convertToFormat(QImage.Format.Format_BGR888)
+    pointer = image.constBits()
+    pointer.setsize(image.sizeInBytes())  # type: ignore
+    rows = np.frombuffer(pointer, dtype=np.uint8).reshape(  # type: ignore
+        image.height(), image.bytesPerLine()
+    )
+    # copied, the buffer is freed with the image
+    return rows[:, : image.width() * 3].reshape(image.height(), image.width(), 3).copy()
+
+
+def ShownColumns(label: ImageLabel) -> tuple[int, int]:
+    """
+    The first and the last source column which are shown.
+    """
+    columns = ShownImage(label)[:, :, 0]
+    return int(columns.min()), int(columns.max())
+
+
+def Wheel(label: ImageLabel, steps: int) -> None:
+    for _ in range(abs(steps)):
+        label.wheelEvent(
+            QWheelEvent(
+                QPointF(LABEL_WIDTH / 2, LABEL_HEIGHT / 2),
+                QPointF(LABEL_WIDTH / 2, LABEL_HEIGHT / 2),
+                QPoint(),
+                QPoint(0, 120 if steps > 0 else -120),
+                Qt.MouseButton.NoButton,
+                Qt.KeyboardModifier.NoModifier,
+                Qt.ScrollPhase.NoScrollPhase,
+                False,
+            )
+        )
+
+
+def Drag(label: ImageLabel, dx: float) -> None:
+    def Event(type: QEvent.Type, x: float) -> QMouseEvent:
+        position = QPointF(x, LABEL_HEIGHT / 2)
+        return QMouseEvent(
+            type,
+            position,
+            position,
+            Qt.MouseButton.LeftButton,
+            Qt.MouseButton.LeftButton,
+            Qt.KeyboardModifier.NoModifier,
+        )
+
+    start = LABEL_WIDTH / 2
+    label.mousePressEvent(Event(QEvent.Type.MouseButtonPress, start))
+    label.mouseMoveEvent(Event(QEvent.Type.MouseMove, start + dx))
+    label.mouseReleaseEvent(Event(QEvent.Type.MouseButtonRelease, start + dx))
+
+
+def test_image_is_fitted_from_a_downsampled_level(qtbot: QtBot, mocker: MockerFixture):
+    levelSpy = mocker.spy(ImagePyramid, "Level")
+    label = CreateLabel(qtbot)
+
+    label.SetImage(CreateTestImage())
+
+    assert (label.pixmap().width(), label.pixmap().height()) == (
+        LABEL_WIDTH,
+        LABEL_HEIGHT,
+    )
+    assert levelSpy.call_args_list[0][0][1] == 1  # half of the image size
+    assert ShownColumns(label) == FITTED_COLUMNS
+
+
+def test_full_resolution_level_is_used_when_zoomed_in(
+    qtbot: QtBot, mocker: MockerFixture
+):
+    label = CreateLabel(qtbot)
+    label.SetImage(CreateTestImage())
+    levelSpy = mocker.spy(ImagePyramid, "Level")
+
+    Wheel(label, 4)  # 1.25^4 > 2
+
+    assert levelSpy.call_args[0][1] == 0
+
+
+def test_only_the_visible_region_is_rendered(qtbot: QtBot):
+    label = CreateLabel(qtbot)
+    label.SetImage(CreateTestImage())
+
+    Wheel(label, 4)  # zoom 2.44, about 82 of the 200 columns are visible
+
+    first, last = ShownColumns(label)
+    assert (label.pixmap().width(), label.pixmap().height()) == (
+        LABEL_WIDTH,
+        LABEL_HEIGHT,
+    )
+    assert first > 50 and last < 150
+    assert first < IMAGE_WIDTH / 2 < last  # centered
+
+
+def test_zoom_out_is_clamped_to_the_fitted_image(qtbot: QtBot):
+    label = CreateLabel(qtbot)
+    label.SetImage(CreateTestImage())
+
+    Wheel(label, -5)
+
+    assert ShownColumns(label) == FITTED_COLUMNS
+
+
+def test_zoom_in_is_clamped_to_the_max_zoom(qtbot: QtBot):
+    label = CreateLabel(qtbot)
+    label.SetImage(CreateTestImage())
+
+    Wheel(label, 100)
+
+    # 100 / (0.5 * MAX_IMAGE_LABEL_ZOOM) ~ 3 columns around the center
+    assert ShownColumns(label) == (98, 101)
+
+
+def test_pan_is_clamped_to_the_image(qtbot: QtBot):
+    label = CreateLabel(qtbot)
+    label.SetImage(CreateTestImage())
+    Wheel(label, 100)
+
+    Drag(label, 10_000)  # the image follows the mouse, to the left edge
+    assert ShownColumns(label) == (0, 2)
+
+    Drag(label, -10_000)
+    assert ShownColumns(label) == (196, IMAGE_WIDTH - 1)
+
+
+def test_pan_is_ignored_without_zoom(qtbot: QtBot):
+    label = CreateLabel(qtbot)
+    label.SetImage(CreateTestImage())
+
+    Drag(label, 30)
+
+    assert ShownColumns(label) == FITTED_COLUMNS
+
+
+def test_zoom_is_kept_for_an_image_of_the_same_size(qtbot: QtBot):
+    label = CreateLabel(qtbot)
+    label.SetImage(CreateTestImage())
+    Wheel(label, 100)
+
+    label.SetImage(CreateTestImage())
+    assert ShownColumns(label) == (98, 101)
+
+    label.SetImage(CreateTestImage(IMAGE_WIDTH // 2, IMAGE_HEIGHT))
+    assert ShownColumns(label) == (1, IMAGE_WIDTH // 2 - 1)
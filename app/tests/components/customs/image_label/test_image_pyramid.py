@@ -0,0 +1,59 @@
+import cv2
+import numpy as np
+import pytest  # type: ignore
+from pytest_mock import MockerFixture
+from components.customs.image_label.image_pyramid import ImagePyramid
+
+
+def CreateTestImage(width: int = 1000, height: int = 600) -> np.ndarray:
+    return np.random.default_rng(0).integers(
+        0, 256, size=(height, width, 3), dtype=np.uint8
+    )
+
+
+def test_level_count_stops_at_the_min_level_size():
+    pyramid = ImagePyramid(CreateTestImage(1000, 600))
+
+    # 1000 >> 5 = 31 is below the min level size
+    assert pyramid.LevelCount == 5
+
+
+def test_small_image_has_only_the_original_level():
+    pyramid = ImagePyramid(CreateTestImage(40, 20))
+
+    assert pyramid.LevelCount == 1
+    assert pyramid.Level(3) is pyramid.Level(0)
+
+
+def test_level_zero_is_the_original_image():
+    image = CreateTestImage()
+    pyramid = ImagePyramid(image)
+
+    assert pyramid.Level(0) is image
+    assert (pyramid.Width, pyramid.Height) == (1000, 600)
+
+
+def test_levels_are_built_lazily(mocker: MockerFixture):
+    resizeSpy = mocker.spy(cv2, "resize")
+    pyramid = ImagePyramid(CreateTestImage())
+
+    assert resizeSpy.call_count == 0
+
+    assert pyramid.Level(2).shape == (150, 250, 3)
+    assert resizeSpy.call_count == 2  # levels 1 and 2
+
+    assert pyramid.Level(1).shape == (300, 500, 3)
+    assert resizeSpy.call_count == 2  # already built
+
+    assert pyramid.Level(3).shape == (75, 125, 3)
+    assert resizeSpy.call_count == 3  # built from level 2
+
+
+@pytest.mark.parametrize(
+    "scale, level",
+    [(4.0, 0), (1.0, 0), (0.8, 0), (0.5, 1), (0.3, 1), (0.25, 2), (0.001, 4)],
+)
+def test_level_for_scale_is_the_smallest_level_not_upsampled(scale: float, level: int):
+    pyramid = ImagePyramid(CreateTestImage())
+
+    assert pyramid.LevelForScale(scale) == level
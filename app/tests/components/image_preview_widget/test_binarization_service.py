@@ -0,0 +1,226 @@
+import threading
+from typing import Callable
+import numpy as np
+from pytestqt.qtbot import QtBot
+from PyQt6.QtCore import QRunnable, QThreadPool
+from components.image_preview_widget.binarization_service import BinarizationService
+
+
+class ManualThreadPool:
+    """
+    A thread pool which keeps the started tasks until they are run by the test, so the
+        task is run (and the result is delivered) on the test thread.
+    """
+
+    def __init__(self) -> None:
+        self.tasks: list[QRunnable] = []
+
+    def start(self, task: QRunnable) -> None:
+        self.tasks.append(task)
+
+    def RunNext(self) -> None:
+        self.tasks.pop(0).run()
+
+
+def Binarize(threshold: int) -> np.ndarray:
+    return np.full((2, 3), threshold, dtype=np.uint8)
+
+
+def Prepare(
+    binarize: Callable[[int], np.ndarray],
+) -> Callable[[int], Callable[[], np.ndarray]]:
+    return lambda threshold: lambda: binarize(threshold)
+
+
+def CreateService(
+    threadPool: ManualThreadPool,
+) -> tuple[BinarizationService, list[int], list[int]]:
+    """
+    Returns:
+        The service, the thresholds it binarized and the values of the images passed to
+            the callback.
+    """
+    binarized: list[int] = []
+    shown: list[int] = []
+
+    def binarize(threshold: int) -> np.ndarray:
+        binarized.append(threshold)
+        return Binarize(threshold)
+
+    service = BinarizationService(
+        Prepare(binarize),
+        lambda image, coverage: shown.append(int(image[0, 0])),
+        threadPool,  # type: ignore
+    )
+    return service, binarized, shown
+
+
+def test_request_when_idle_starts_a_job():
+    threadPool = ManualThreadPool()
+    service, binarized, shown = CreateService(threadPool)
+
+    service.Request(100)
+
+    assert service.IsBusy
+    assert len(threadPool.tasks) == 1
+
+    threadPool.RunNext()
+
+    assert not service.IsBusy
+    assert binarized == [100]
+    assert shown == [100]
+
+
+def test_requests_while_running_are_not_started():
+    threadPool = ManualThreadPool()
+    service, binarized, _ = CreateService(threadPool)
+
+    service.Request(100)
+    service.Request(110)
+    service.Request(120)
+
+    assert len(threadPool.tasks) == 1  # one job in flight
+    assert binarized == []
+
+
+def test_latest_request_wins():
+    threadPool = ManualThreadPool()
+    service, binarized, shown = CreateService(threadPool)
+
+    service.Request(100)
+    service.Request(110)
+    service.Request(120)
+    service.Request(130)
+
+    threadPool.RunNext()  # 100, then the pending 130 is started
+    assert len(threadPool.tasks) == 1
+    threadPool.RunNext()
+
+    assert binarized == [100, 130]
+    assert shown == [100, 130]
+    assert not service.IsBusy
+    assert len(threadPool.tasks) == 0
+
+
+def test_counters():
+    threadPool = ManualThreadPool()
+    service, _, _ = CreateService(threadPool)
+
+    service.Request(100)
+    service.Request(110)  # replaced by 120
+    service.Request(120)
+    threadPool.RunNext()
+    threadPool.RunNext()
+    service.Request(130)
+    threadPool.RunNext()
+
+    assert service.RequestedCount == 4
+    assert service.DroppedCount == 1
+    assert service.CompletedCount == 3
+
+
+def test_failed_binarization_shows_nothing_and_starts_the_pending_request():
+    threadPool = ManualThreadPool()
+    shown: list[np.ndarray | None] = []
+
+    def binarize(threshold: int) -> np.ndarray:
+        if threshold == 100:
+            raise ValueError("broken")
+        return Binarize(threshold)
+
+    service = BinarizationService(
+        Prepare(binarize), lambda image, coverage: shown.append(image), threadPool  # type: ignore
+    )
+
+    service.Request(100)
+    service.Request(110)
+    threadPool.RunNext()
+    threadPool.RunNext()
+
+    assert shown[0] is None
+    assert shown[1] is not None and shown[1][0, 0] == 110
+    assert service.CompletedCount == 2
+
+
+def test_jobs_run_one_at_a_time_on_the_thread_pool(qtbot: QtBot):
+    lock = threading.Lock()
+    running = 0
+    maxRunning = 0
+    shown: list[int] = []
+
+    def binarize(threshold: int) -> np.ndarray:
+        nonlocal running, maxRunning
+        with lock:
+            running += 1
+            maxRunning = max(maxRunning, running)
+        threading.Event().wait(0.01)
+        with lock:
+            running -= 1
+        return Binarize(threshold)
+
+    threadPool = QThreadPool()
+    service = BinarizationService(
+        Prepare(binarize),
+        lambda image, coverage: shown.append(int(image[0, 0])),
+        threadPool,
+    )
+
+    for threshold in range(10, 100, 10):
+        service.Request(threshold)
+
+    qtbot.waitUntil(lambda: not service.IsBusy)
+    threadPool.waitForDone()
+
+    assert maxRunning == 1
+    assert shown[0] == 10
+    assert shown[-1] == 90
+    assert service.CompletedCount == len(shown)
+    assert service.CompletedCount + service.DroppedCount == service.RequestedCount
+
+
+def test_coverage_is_counted_with_the_binary_image():
+    threadPool = ManualThreadPool()
+    coverages: list[float] = []
+
+    def binarize(threshold: int) -> np.ndarray:
+        image = np.zeros((2, 4), dtype=np.uint8)
+        image[:, :threshold] = 255
+        return image
+
+    service = BinarizationService(
+        Prepare(binarize),
+        lambda image, coverage: coverages.append(coverage),
+        threadPool,  # type: ignore
+    )
+
+    service.Request(1)
+    threadPool.RunNext()
+    service.Request(3)
+    threadPool.RunNext()
+
+    assert coverages == [0.25, 0.75]
+
+
+def test_binarization_is_prepared_when_requested():
+    threadPool = ManualThreadPool()
+    parameters = {"bias": 1}
+    biases: list[int] = []
+
+    def prepare(threshold: int) -> Callable[[], np.ndarray]:
+        bias = parameters["bias"]  # taken on the requesting thread
+        return lambda: Binarize(threshold + bias)
+
+    service = BinarizationService(
+        prepare,
+        lambda image, coverage: biases.append(int(image[0, 0])),
+        threadPool,  # type: ignore
+    )
+
+    service.Request(100)
+    parameters["bias"] = 2
+    service.Request(110)  # pending
+    parameters["bias"] = 3  # edited while both requests are waiting
+    threadPool.RunNext()
+    threadPool.RunNext()
+
+    assert biases == [101, 112]
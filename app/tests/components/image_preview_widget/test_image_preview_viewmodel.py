@@ -0,0 +1,225 @@
+from copy import deepcopy
+from typing import Generator
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from pytest_mock import MockerFixture
+from constants import (
+    MASK_PARAMETERS_CHANGED_EVENT_NAME,
+    MASK_PARAMETERS_PREVIEWED_EVENT_NAME,
+    THRESHOLD_MODE_GLOBAL,
+    THRESHOLD_MODE_MEAN,
+)
+from components.image_preview_widget.image_preview_viewmodel import (
+    ImagePreviewViewModel,
+)
+from modules.history_manager import HistoryManager
+from modules.image_cache import ImageCache
+from modules.mask_pipeline import MaskPipeline
+from modules.mask_store import ResampleMask
+from structs.application import Application
+from structs.image_meta import ImageMeta
+from structs.project import Project
+
+
+@pytest.fixture()
+def project() -> Generator[Project, None, None]:
+    HistoryManager.Reset()
+    project = Project()
+    project.images.append(
+        ImageMeta(
+            name="image.png",
+            thresholdMode=THRESHOLD_MODE_MEAN,
+            blockSize=31,
+            bias=10,
+            histogram=[1] * 256,
+        )
+    )
+    yield project
+    HistoryManager.Reset()
+
+
+def CreateViewModel(project: Project) -> ImagePreviewViewModel:
+    viewModel = ImagePreviewViewModel(project, Application())
+    viewModel.Index = 0
+    return viewModel
+
+
+def HistoryLength() -> int:
+    return len(HistoryManager._history)
+
+
+def test_parameter_edits_are_recorded_as_one_action(project: Project):
+    viewModel = CreateViewModel(project)
+
+    for blockSize in (33, 35, 37):  # the steps of a spin box
+        viewModel.BlockSize = blockSize
+    viewModel.Bias = 12
+    viewModel.CompleteThresholdParametersModification()
+
+    assert HistoryLength() == 1
+    image = project.images[0]
+    assert (image.thresholdMode, image.blockSize, image.bias) == (
+        THRESHOLD_MODE_MEAN,
+        37,
+        12,
+    )
+
+    HistoryManager.Undo()
+
+    assert (image.thresholdMode, image.blockSize, image.bias) == (
+        THRESHOLD_MODE_MEAN,
+        31,
+        10,
+    )
+
+
+def test_unchanged_parameters_are_not_recorded(project: Project):
+    viewModel = CreateViewModel(project)
+
+    viewModel.BlockSize = 33
+    viewModel.BlockSize = 31
+    viewModel.CompleteThresholdParametersModification()
+
+    assert HistoryLength() == 0
+
+
+def test_mode_change_records_the_pending_edits(project: Project):
+    viewModel = CreateViewModel(project)
+
+    viewModel.BlockSize = 41
+    viewModel.ThresholdMode = THRESHOLD_MODE_GLOBAL
+    viewModel.CompleteThresholdParametersModification()
+    viewModel.BlockSize = 43
+    viewModel.CompleteThresholdParametersModification()
+
+    assert HistoryLength() == 2
+
+    HistoryManager.Undo()
+    assert project.images[0].blockSize == 41
+
+    HistoryManager.Undo()
+    image = project.images[0]
+    assert (image.thresholdMode, image.blockSize) == (THRESHOLD_MODE_MEAN, 31)
+
+
+def test_coverage_is_answered_from_the_histogram(
+    project: Project, mocker: MockerFixture
+):
+    runSpy = mocker.spy(MaskPipeline, "Run")
+    viewModel = CreateViewModel(project)
+
+    assert viewModel.GetCoverage(127) == pytest.approx(0.5)
+    runSpy.assert_not_called()
+
+
+def test_color_range_edits_are_recorded_as_one_action(project: Project):
+    viewModel = CreateViewModel(project)
+    hueMin = viewModel.ColorRangeParameters.hueMin
+
+    for step in (1, 2, 3):  # the steps of a spin box
+        colorRange = deepcopy(viewModel.ColorRangeParameters)
+        colorRange.hueMin = hueMin + step
+        viewModel.ColorRangeParameters = colorRange
+    viewModel.CompleteColorRangeModification()
+
+    assert HistoryLength() == 1
+    assert project.images[0].colorRange.hueMin == hueMin + 3
+
+    HistoryManager.Undo()
+
+    assert project.images[0].colorRange.hueMin == hueMin
+
+
+def test_previewed_parameters_request_the_working_mask(
+    project: Project, mocker: MockerFixture
+):
+    triggerEvent = mocker.patch(
+        "modules.event_system.event_system.EventSystem.TriggerEvent"
+    )
+    viewModel = CreateViewModel(project)
+
+    viewModel.BlockSize = 33
+    viewModel.PreviewMaskParameters()
+
+    triggerEvent.assert_called_once()
+    eventName, index, buildMask = triggerEvent.call_args.args
+    assert (eventName, index) == (MASK_PARAMETERS_PREVIEWED_EVENT_NAME, 0)
+    assert callable(buildMask)
+    assert HistoryLength() == 0  # recorded once the edit is finished
+
+
+def test_recorded_parameters_store_the_working_mask(
+    project: Project, mocker: MockerFixture
+):
+    triggerEvent = mocker.patch(
+        "modules.event_system.event_system.EventSystem.TriggerEvent"
+    )
+    viewModel = CreateViewModel(project)
+
+    viewModel.BlockSize = 33
+    viewModel.CompleteThresholdParametersModification()
+
+    eventName, index, buildMask = triggerEvent.call_args.args
+    assert (eventName, index) == (MASK_PARAMETERS_CHANGED_EVENT_NAME, 0)
+    assert buildMask() is None  # the image is not loaded, the file is decoded
+
+
+def LoadGradient(viewModel: ImagePreviewViewModel, mocker: MockerFixture) -> None:
+    gradient = np.tile(np.arange(0, 256, 2, dtype=np.uint8), (64, 1))
+    image = cv.cvtColor(gradient, cv.COLOR_GRAY2BGR)
+    mocker.patch.object(ImageCache, "Get", return_value=image)
+    viewModel.LoadImage()
+
+
+def test_working_mask_is_built_from_the_gray_plane_in_the_global_mode(
+    project: Project, mocker: MockerFixture
+):
+    project.images[0].thresholdMode = THRESHOLD_MODE_GLOBAL
+    project.sculptureSetting.maskResolution = 32
+    viewModel = CreateViewModel(project)
+    LoadGradient(viewModel, mocker)
+    runSpy = mocker.spy(MaskPipeline, "Run")
+
+    viewModel.Threshold = 127
+    buildMask = viewModel.PrepareWorkingMask()
+    viewModel.Threshold = 10  # edited before the job runs
+    mask = buildMask()
+
+    assert mask is not None and mask.shape == (16, 32)
+    assert (mask[:, :16] == 0).all() and (mask[:, 16:] == 255).all()
+    runSpy.assert_not_called()
+
+
+def test_working_mask_of_the_other_modes_is_reduced_from_the_mask(
+    project: Project, mocker: MockerFixture
+):
+    project.sculptureSetting.maskResolution = 32
+    viewModel = CreateViewModel(project)
+    LoadGradient(viewModel, mocker)
+
+    mask = viewModel.PrepareWorkingMask()()
+
+    expected = viewModel.GetBinaryImage(viewModel.Threshold)
+    assert mask is not None and expected is not None
+    assert mask.shape == (16, 32)
+    assert np.array_equal(mask, ResampleMask(expected, (32, 16)))
+
+
+def test_binarization_uses_the_parameters_when_it_was_prepared(
+    project: Project, mocker: MockerFixture
+):
+    image = np.tile(np.arange(0, 256, 4, dtype=np.uint8), (64, 1))
+    mocker.patch.object(ImageCache, "Get", return_value=image)
+    runSpy = mocker.spy(MaskPipeline, "Run")
+    viewModel = CreateViewModel(project)
+
+    binarize = viewModel.PrepareBinarization(100)
+    viewModel.ThresholdMode = THRESHOLD_MODE_GLOBAL  # edited before the job runs
+    viewModel.BlockSize = 33
+    binaryImage = binarize()
+
+    assert binaryImage is not None
+    source = runSpy.call_args.args[4]
+    assert source is not None and source.Key == f"{THRESHOLD_MODE_MEAN}:31:10"
+    assert runSpy.call_args.args[1] == 100
@@ -0,0 +1,56 @@
+from typing import Callable
+import numpy as np
+from components.image_preview_widget.preview_loader import PreviewLoader
+from .test_binarization_service import ManualThreadPool
+
+
+def test_loaded_image_is_binarized_and_shown():
+    threadPool = ManualThreadPool()
+    shown: list[tuple] = []
+    loader = PreviewLoader(
+        lambda isCancelled: np.zeros((2, 3), dtype=np.uint8),
+        lambda: lambda: np.full((2, 3), 255, dtype=np.uint8),
+        lambda image, binaryImage, coverage: shown.append(
+            (image, binaryImage, coverage)
+        ),
+        threadPool,  # type: ignore
+    )
+
+    loader.Start()
+    threadPool.RunNext()
+
+    assert not loader.IsBusy
+    assert len(shown) == 1
+    assert shown[0][1][0, 0] == 255
+    assert shown[0][2] == 1.0
+
+
+def test_cancel_stops_the_decoding():
+    threadPool = ManualThreadPool()
+    polled: list[bool] = []
+    binarized: list[bool] = []
+    shown: list[tuple] = []
+    loader: PreviewLoader
+
+    def loadImage(isCancelled: Callable[[], bool]) -> np.ndarray | None:
+        polled.append(isCancelled())
+        loader.Cancel()  # the tab is closed while the image is decoded
+        polled.append(isCancelled())
+        return None if isCancelled() else np.zeros((2, 3), dtype=np.uint8)
+
+    loader = PreviewLoader(
+        loadImage,
+        lambda: lambda: binarized.append(True),  # type: ignore
+        lambda image, binaryImage, coverage: shown.append(
+            (image, binaryImage, coverage)
+        ),
+        threadPool,  # type: ignore
+    )
+
+    loader.Start()
+    threadPool.RunNext()
+
+    assert polled == [False, True]
+    assert binarized == []
+    assert shown == []
+    assert not loader.IsBusy
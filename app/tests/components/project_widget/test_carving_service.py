@@ -0,0 +1,126 @@
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from components.project_widget.carving_service import (
+    Carve,
+    CarvingJob,
+    CarvingService,
+    CarvingView,
+)
+from modules.incremental_carving import IncrementalCarver
+from modules.mask_store import MaskStore
+from tests.components.image_preview_widget.test_binarization_service import (
+    ManualThreadPool,
+)
+
+MASK_FOLDER = "/carving/masks"
+
+
+def CreateDiskMask(radius: int) -> np.ndarray:
+    mask = np.zeros((32, 32), dtype=np.uint8)
+    cv.circle(mask, (16, 16), radius, 255, -1)
+    return mask
+
+
+def CreateView(viewId: str, maskKey: str) -> CarvingView:
+    return CarvingView(
+        viewId=viewId,
+        key=f"{maskKey}:[0.0, 0.0, -1.0]",
+        imageHash=viewId,
+        maskKey=maskKey,
+        direction=(0.0, 0.0, -1.0),
+    )
+
+
+@pytest.fixture()
+def store(fs) -> MaskStore:
+    store = MaskStore(MASK_FOLDER)
+    store.Put("a", "a1", CreateDiskMask(12))
+    store.Put("b", "b1", CreateDiskMask(8))
+    return store
+
+
+def test_only_the_changed_views_are_carved(store: MaskStore):
+    carver = IncrementalCarver(16)
+    views = (CreateView("a", "a1"), CreateView("b", "b1"))
+
+    assert Carve(CarvingJob(carver, store, views))
+    assert sorted(carver.ViewIds) == ["a", "b"]
+    assert not Carve(CarvingJob(carver, store, views))  # nothing changed
+
+
+def test_views_keep_their_silhouette_until_the_new_mask_is_built(store: MaskStore):
+    carver = IncrementalCarver(16)
+    Carve(CarvingJob(carver, store, (CreateView("a", "a1"), CreateView("b", "b1"))))
+    volume = carver.Volume.copy()
+
+    # the mask of the new parameters of "a" is not built yet, "b" is deleted
+    assert Carve(CarvingJob(carver, store, (CreateView("a", "a2"),)))
+
+    assert carver.ViewIds == ["a"]
+    assert carver.GetKey("a") == CreateView("a", "a1").key
+    assert carver.Volume.sum() > volume.sum()  # the smaller disk of "b" is removed
+
+
+def test_edited_view_is_carved_from_its_mask_builder(store: MaskStore):
+    carver = IncrementalCarver(16)
+    Carve(CarvingJob(carver, store, (CreateView("a", "a1"),)))
+    volume = carver.Volume.copy()
+
+    # the mask of "a2" is not stored, it is built in memory while it is edited
+    view = CreateView("a", "a2")
+    edited = CarvingView(
+        viewId=view.viewId,
+        key=view.key,
+        imageHash=view.imageHash,
+        maskKey=view.maskKey,
+        direction=view.direction,
+        buildMask=lambda: CreateDiskMask(8),
+    )
+    assert Carve(CarvingJob(carver, store, (edited,)))
+
+    assert carver.GetKey("a") == view.key
+    assert carver.Volume.sum() < volume.sum()
+    assert not store.Contains("a", "a2")
+
+
+def test_latest_request_wins(store: MaskStore):
+    threadPool = ManualThreadPool()
+    carved: list[tuple[int, int]] = []
+    service = CarvingService(
+        lambda viewCount, voxelCount: carved.append((viewCount, voxelCount)),
+        threadPool,  # type: ignore
+    )
+    carver = IncrementalCarver(16)
+
+    service.Request(CarvingJob(carver, store, (CreateView("a", "a1"),)))
+    service.Request(CarvingJob(carver, store, (CreateView("b", "b1"),)))
+    service.Request(
+        CarvingJob(carver, store, (CreateView("a", "a1"), CreateView("b", "b1")))
+    )
+
+    assert len(threadPool.tasks) == 1  # one job in flight
+    threadPool.RunNext()
+    assert len(threadPool.tasks) == 1  # the last request
+    threadPool.RunNext()
+
+    assert not service.IsBusy
+    assert [viewCount for viewCount, _ in carved] == [1, 2]
+    assert carved[-1][1] == int(np.count_nonzero(carver.Volume))
+
+
+def test_unchanged_sculpture_is_not_reported(store: MaskStore):
+    threadPool = ManualThreadPool()
+    carved: list[tuple[int, int]] = []
+    service = CarvingService(
+        lambda viewCount, voxelCount: carved.append((viewCount, voxelCount)),
+        threadPool,  # type: ignore
+    )
+    job = CarvingJob(IncrementalCarver(16), store, (CreateView("a", "a1"),))
+
+    service.Request(job)
+    threadPool.RunNext()
+    service.Request(job)
+    threadPool.RunNext()
+
+    assert len(carved) == 1
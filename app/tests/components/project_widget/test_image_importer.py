@@ -0,0 +1,73 @@
+import hashlib
+import os
+import numpy as np
+import pytest  # type: ignore
+from pyfakefs.fake_filesystem import FakeFilesystem
+from pytest_mock import MockerFixture
+from components.project_widget.image_importer import ImageImporter, ImageImportJob
+from modules.image_store import ImageStore
+from modules.luminance_histogram import LuminanceHistogram
+from structs.image_meta import ImageMeta
+from tests.components.image_preview_widget.test_binarization_service import (
+    ManualThreadPool,
+)
+
+TEST_IMAGE_FOLDER = "/project/images"
+TEST_SOURCE_FOLDER = "/sources"
+
+
+@pytest.fixture()
+def store(fs: FakeFilesystem) -> ImageStore:
+    os.makedirs(TEST_IMAGE_FOLDER)
+    os.makedirs(TEST_SOURCE_FOLDER)
+    return ImageStore(TEST_IMAGE_FOLDER)
+
+
+def CreateJob(name: str, content: bytes) -> ImageImportJob:
+    sourcePath = os.path.join(TEST_SOURCE_FOLDER, name)
+    with open(sourcePath, "wb") as f:
+        f.write(content)
+    return ImageImportJob(sourcePath, ImageMeta(name=name))
+
+
+def Import(
+    store: ImageStore,
+    jobs: list[ImageImportJob],
+    storedHistograms: dict[str, str] | None = None,
+) -> None:
+    threadPool = ManualThreadPool()
+    importer = ImageImporter(threadPool)  # type: ignore
+    importer.Import(store, jobs, storedHistograms)
+    while len(threadPool.tasks) > 0:
+        threadPool.RunNext()
+
+
+def test_histogram_of_a_stored_file_is_reused(store: ImageStore, mocker: MockerFixture):
+    fromFile = mocker.patch.object(LuminanceHistogram, "FromFile")
+    storedName = f"{hashlib.sha256(b'photo').hexdigest()}.png"
+    job = CreateJob("photo.png", b"photo")
+
+    encoded = LuminanceHistogram(np.ones(256)).Encode()
+
+    Import(store, [job], {storedName: encoded})
+
+    assert job.image.storedName == storedName
+    assert job.image.histogram == encoded
+    fromFile.assert_not_called()
+
+
+def test_histogram_of_duplicates_is_computed_once(
+    store: ImageStore, mocker: MockerFixture
+):
+    fromFile = mocker.patch.object(
+        LuminanceHistogram,
+        "FromFile",
+        return_value=LuminanceHistogram(np.full(256, 2)),
+    )
+    jobs = [CreateJob("first.png", b"photo"), CreateJob("second.png", b"photo")]
+
+    Import(store, jobs)
+
+    assert fromFile.call_count == 1
+    encoded = LuminanceHistogram(np.full(256, 2)).Encode()
+    assert jobs[0].image.histogram == jobs[1].image.histogram == encoded
@@ -0,0 +1,54 @@
+from typing import Generator
+import pytest  # type: ignore
+from constants import THRESHOLD_MODE_GLOBAL, THRESHOLD_MODE_HSV, THRESHOLD_MODE_MEAN
+from components.project_widget.project_widget_view_model import (
+    ProjectWidgetViewModel,
+)
+from modules.auto_threshold import AutoThresholdResult
+from modules.history_manager import HistoryManager
+from modules.luminance_histogram import LuminanceHistogram
+from structs.application import Application
+from structs.image_meta import ImageMeta
+from structs.project import Project
+
+
+@pytest.fixture()
+def project() -> Generator[Project, None, None]:
+    HistoryManager.Reset()
+    project = Project()
+    project.images.append(ImageMeta(name="global.png", threshold=100))
+    project.images.append(
+        ImageMeta(name="adaptive.png", threshold=100, thresholdMode=THRESHOLD_MODE_MEAN)
+    )
+    project.images.append(
+        ImageMeta(name="color.png", threshold=100, thresholdMode=THRESHOLD_MODE_HSV)
+    )
+    yield project
+    HistoryManager.Reset()
+
+
+def test_auto_threshold_is_computed_for_the_global_mode_only(project: Project):
+    viewModel = ProjectWidgetViewModel(project, Application())
+
+    images, inputs = viewModel.PrepareAutoThreshold()
+
+    assert [image.name for image in images] == ["global.png"]
+    assert len(inputs) == 1
+
+
+def test_auto_threshold_skips_the_images_switched_to_another_mode(project: Project):
+    viewModel = ProjectWidgetViewModel(project, Application())
+    images, _ = viewModel.PrepareAutoThreshold()
+
+    project.images[0].thresholdMode = THRESHOLD_MODE_MEAN  # while computing
+    histogram = LuminanceHistogram([1] * 256).Encode()
+    viewModel.ApplyAutoThresholds(images, [AutoThresholdResult(0, 42, histogram)])
+
+    assert project.images[0].threshold == 100
+    assert len(HistoryManager._history) == 0
+
+    project.images[0].thresholdMode = THRESHOLD_MODE_GLOBAL
+    viewModel.ApplyAutoThresholds(images, [AutoThresholdResult(0, 42, histogram)])
+
+    assert project.images[0].threshold == 42
+    assert project.images[0].histogram == histogram
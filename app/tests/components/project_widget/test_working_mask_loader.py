@@ -0,0 +1,50 @@
+import numpy as np
+from pyfakefs.fake_filesystem import FakeFilesystem
+from pytest_mock import MockerFixture
+from components.project_widget import working_mask_loader
+from components.project_widget.working_mask_loader import WorkingMaskLoader
+from modules.mask_store import MaskStore
+from structs.image_meta import ImageMeta
+from tests.components.image_preview_widget.test_binarization_service import (
+    ManualThreadPool,
+)
+
+MASK_FOLDER = "/project/masks"
+
+
+def test_built_mask_is_stored_without_decoding_the_file(
+    fs: FakeFilesystem, mocker: MockerFixture
+):
+    computeWorkingMask = mocker.patch.object(working_mask_loader, "ComputeWorkingMask")
+    threadPool = ManualThreadPool()
+    loader = WorkingMaskLoader(threadPool)  # type: ignore
+    store = MaskStore(MASK_FOLDER)
+    mask = np.full((4, 6), 255, dtype=np.uint8)
+
+    loader.Request(
+        store, "hash", "key", "/image.png", ImageMeta(), 6, buildMask=lambda: mask
+    )
+    threadPool.RunNext()
+
+    computeWorkingMask.assert_not_called()
+    assert np.array_equal(store.Get("hash", "key"), mask)
+
+
+def test_file_is_decoded_if_the_mask_cannot_be_built(
+    fs: FakeFilesystem, mocker: MockerFixture
+):
+    mask = np.zeros((4, 6), dtype=np.uint8)
+    computeWorkingMask = mocker.patch.object(
+        working_mask_loader, "ComputeWorkingMask", return_value=mask
+    )
+    threadPool = ManualThreadPool()
+    loader = WorkingMaskLoader(threadPool)  # type: ignore
+    store = MaskStore(MASK_FOLDER)
+
+    loader.Request(
+        store, "hash", "key", "/image.png", ImageMeta(), 6, buildMask=lambda: None
+    )
+    threadPool.RunNext()
+
+    computeWorkingMask.assert_called_once()
+    assert store.Contains("hash", "key")
@@ -0,0 +1,77 @@
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from constants import THRESHOLD_MODE_MEAN, THRESHOLD_MODE_SAUVOLA
+from modules.adaptive_threshold import AdaptiveThreshold, LocalStatistics
+from modules.mask_pipeline import MaskPipeline
+
+
+def CreateUnevenImage() -> np.ndarray:
+    """
+    A bright disk on a background which gets brighter from left to right, so no global
+        threshold can separate them.
+    """
+    background = np.tile(np.linspace(20, 200, 256), (128, 1))
+    image = background.copy()
+    for centerX in (40, 210):
+        disk = np.zeros((128, 256), dtype=np.uint8)
+        cv.circle(disk, (centerX, 64), 20, 255, -1)
+        image[disk > 0] += 50
+
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def test_local_statistics_match_the_direct_computation():
+    gray = np.random.default_rng(0).integers(0, 256, (40, 60), dtype=np.uint8)
+    means, deviations = LocalStatistics(gray, 7)
+    assert deviations is not None
+
+    for y, x in [(0, 0), (20, 30), (39, 59), (3, 57)]:
+        window = gray[max(y - 3, 0) : y + 4, max(x - 3, 0) : x + 4].astype(np.float64)
+        assert abs(means[y, x] - window.mean()) < 1e-3
+        assert abs(deviations[y, x] - window.std()) < 1e-2
+
+
+def test_mean_mode_matches_opencv_inside_the_border():
+    gray = np.random.default_rng(1).integers(0, 256, (64, 64), dtype=np.uint8)
+    adaptive = AdaptiveThreshold(THRESHOLD_MODE_MEAN, 11, 5)
+
+    expected = cv.adaptiveThreshold(
+        gray, 255, cv.ADAPTIVE_THRESH_MEAN_C, cv.THRESH_BINARY, 11, 5
+    )
+    mask = adaptive.Apply(gray)
+
+    # OpenCV rounds the mean, the pixels on the rounding edge may differ
+    inner = (slice(5, -5), slice(5, -5))
+    assert np.mean(mask[inner] == expected[inner]) > 0.98
+
+
+@pytest.mark.parametrize("mode", [THRESHOLD_MODE_MEAN, THRESHOLD_MODE_SAUVOLA])
+def test_adaptive_modes_find_both_disks_under_uneven_lighting(mode: str):
+    gray = CreateUnevenImage()
+    # the disks are brighter than their surroundings, a negative bias keeps the flat
+    # background below the local threshold
+    mask = AdaptiveThreshold(mode, 61, -10).Apply(gray)
+
+    assert mask.dtype == np.uint8
+    assert mask[64, 40] == 255 and mask[64, 210] == 255
+    assert mask[5, 40] == 0 and mask[5, 210] == 0
+
+
+def test_invalid_parameters_raise():
+    with pytest.raises(ValueError):
+        AdaptiveThreshold("unknown", 11, 0)
+
+    with pytest.raises(ValueError):
+        AdaptiveThreshold(THRESHOLD_MODE_MEAN, 10, 0)
+
+
+def test_pipeline_caches_adaptive_masks_by_their_parameters():
+    gray = CreateUnevenImage()
+    first = AdaptiveThreshold(THRESHOLD_MODE_MEAN, 31, 5)
+    second = AdaptiveThreshold(THRESHOLD_MODE_MEAN, 31, 15)
+
+    mask = MaskPipeline.Run(gray, 128, [], source=first)
+    assert MaskPipeline.Run(gray, 128, [], source=first) is mask
+    assert MaskPipeline.Run(gray, 128, [], source=second) is not mask
+    assert not np.array_equal(MaskPipeline.Run(gray, 128, []), mask)
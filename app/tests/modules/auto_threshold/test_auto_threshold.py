@@ -0,0 +1,99 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from unittest.mock import Mock
+from pytest_mock import MockerFixture
+from constants import AUTO_THRESHOLD_OTSU_METHOD, AUTO_THRESHOLD_TRIANGLE_METHOD
+from modules.auto_threshold import (
+    AutoThresholdJob,
+    AutoThresholdResult,
+    OtsuThreshold,
+    TriangleThreshold,
+)
+from modules.luminance_histogram import LuminanceHistogram
+
+
+def CreateBimodalImage(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    dark = rng.normal(rng.uniform(20, 100), rng.uniform(5, 25), 3000)
+    bright = rng.normal(rng.uniform(140, 230), rng.uniform(5, 25), 1000)
+    return np.clip(np.concatenate([dark, bright]), 0, 255).astype(np.uint8)[None, :]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_otsu_threshold_matches_opencv(seed: int):
+    gray = CreateBimodalImage(seed)
+    expected, _ = cv.threshold(gray, 0, 255, cv.THRESH_BINARY | cv.THRESH_OTSU)
+
+    assert OtsuThreshold(LuminanceHistogram.FromGray(gray)) == int(expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_triangle_threshold_matches_opencv(seed: int):
+    gray = CreateBimodalImage(seed)
+    if seed % 2 == 1:
+        gray = 255 - gray  # the longer tail on the other side
+    expected, _ = cv.threshold(gray, 0, 255, cv.THRESH_BINARY | cv.THRESH_TRIANGLE)
+
+    assert TriangleThreshold(LuminanceHistogram.FromGray(gray)) == int(expected)
+
+
+def test_empty_histogram_has_zero_threshold():
+    empty = LuminanceHistogram([0] * 256)
+
+    assert OtsuThreshold(empty) == 0
+    assert TriangleThreshold(empty) == 0
+
+
+def test_known_histograms_are_not_decoded():
+    histogram = LuminanceHistogram.FromGray(CreateBimodalImage(0))
+    onProgress = Mock()
+    onFinished = Mock()
+    executorFactory = Mock()
+
+    job = AutoThresholdJob(
+        AUTO_THRESHOLD_OTSU_METHOD, onProgress, onFinished, executorFactory
+    )
+    job.Start([("first.png", histogram.Encode()), ("second.png", histogram.Encode())])
+
+    executorFactory.assert_not_called()
+    onProgress.assert_called_once_with(2, 2)
+    results: list[AutoThresholdResult] = onFinished.call_args.args[0]
+    assert [result.index for result in results] == [0, 1]
+    assert results[0].threshold == OtsuThreshold(histogram)
+
+
+def test_unknown_histograms_are_decoded_by_the_workers(mocker: MockerFixture):
+    gray = CreateBimodalImage(1)
+    mocker.patch("modules.luminance_histogram.LoadGrayImage", return_value=gray)
+    onProgress = Mock()
+    onFinished = Mock()
+
+    job = AutoThresholdJob(
+        AUTO_THRESHOLD_TRIANGLE_METHOD,
+        onProgress,
+        onFinished,
+        lambda workers: ThreadPoolExecutor(max_workers=workers),
+    )
+    job.Start([("first.png", ""), ("second.png", "")])
+
+    for _ in range(100):
+        if onFinished.called:
+            break
+        time.sleep(0.01)
+
+    results: list[AutoThresholdResult] = onFinished.call_args.args[0]
+    expected = TriangleThreshold(LuminanceHistogram.FromGray(gray))
+    assert [(result.index, result.threshold) for result in results] == [
+        (0, expected),
+        (1, expected),
+    ]
+    assert LuminanceHistogram.Decode(results[0].histogram) is not None
+    assert onProgress.call_args_list[-1] == mocker.call(2, 2)
+
+
+def test_unknown_method_raises_error():
+    with pytest.raises(ValueError):
+        AutoThresholdJob("unknown", Mock(), Mock())
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest  # type: ignore
+import cv2 as cv
+
+from constants import BRICK_SIZE
+from modules.brick_volume import (
+    BRICK_EMPTY,
+    BRICK_FULL,
+    BRICK_MIXED,
+    BrickVolume,
+    CarveBrickVolume,
+)
+from modules.sculpture_engine import CarveVolume, Silhouette
+
+
+def CreateDiskMask(size: int = 64) -> np.ndarray:
+    mask = np.zeros((size, size), dtype=np.uint8)
+    cv.circle(mask, (size // 2, size // 2), size // 2 - 1, 255, -1)
+    return mask
+
+
+def test_dense_round_trip():
+    rng = np.random.default_rng(0)
+    volume = np.zeros((32, 32, 32), dtype=bool)
+    volume[:8, :8, :8] = True  # a full brick
+    volume[8:16] = rng.random((8, 32, 32)) > 0.5  # mixed bricks
+
+    bricks = BrickVolume.FromDense(volume)
+
+    assert np.array_equal(bricks.ToDense(), volume)
+    assert bricks.States[0, 0, 0] == BRICK_FULL
+    assert bricks.States[1, 0, 0] == BRICK_MIXED
+    assert bricks.States[3, 3, 3] == BRICK_EMPTY
+    assert bricks.MixedBrickCount == 16
+    assert bricks.Count() == np.count_nonzero(volume)
+
+
+def test_contains_matches_dense_volume():
+    rng = np.random.default_rng(1)
+    volume = rng.random((16, 16, 16)) > 0.5
+    volume[8:, 8:, 8:] = True
+    bricks = BrickVolume.FromDense(volume)
+    zs, ys, xs = rng.integers(0, 16, (3, 500))
+
+    assert np.array_equal(bricks.Contains(zs, ys, xs), volume[zs, ys, xs])
+
+
+@pytest.mark.parametrize(
+    "directions",
+    [
+        [(0, 0, -1), (-1, 0, 0)],
+        [(0, 0, -1), (-1, 0, 0), (0, -1, 0)],
+        [(1, 1, 1), (-1, 0.5, 0)],
+    ],
+)
+@pytest.mark.parametrize("batchBricks", [1, 7, 4096])
+def test_carve_matches_dense_carving(
+    directions: list[tuple[float, float, float]], batchBricks: int
+):
+    silhouettes = [Silhouette(CreateDiskMask(), direction) for direction in directions]
+
+    bricks = CarveBrickVolume(silhouettes, 32, batchBricks)
+
+    assert np.array_equal(bricks.ToDense(), CarveVolume(silhouettes, 32))
+
+
+def test_carve_without_silhouettes_is_empty():
+    bricks = CarveBrickVolume([], 16)
+
+    assert bricks.Count() == 0
+    assert bricks.MixedBrickCount == 0
+
+
+def test_memory_follows_the_surface():
+    disk = CreateDiskMask(256)
+    silhouettes = [
+        Silhouette(disk, direction)
+        for direction in [(0, 0, -1), (-1, 0, 0), (0, -1, 0)]
+    ]
+
+    bricks = CarveBrickVolume(silhouettes, 256)
+
+    assert bricks.NBytes * 16 < 256**3
+    assert np.count_nonzero(bricks.States == BRICK_FULL) > 0
+
+
+@pytest.mark.parametrize("resolution", [0, BRICK_SIZE - 1, BRICK_SIZE * 4 + 1])
+def test_invalid_resolution(resolution: int):
+    with pytest.raises(ValueError):
+        BrickVolume(resolution)
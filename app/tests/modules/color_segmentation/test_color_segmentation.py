@@ -0,0 +1,88 @@
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from constants import THRESHOLD_MODE_HSV, THRESHOLD_MODE_LAB, THRESHOLD_MODE_MEAN
+from modules.color_segmentation import (
+    BgrToLab,
+    ColorPlanes,
+    ColorRangeMask,
+    LabToBgr,
+)
+from modules.mask_pipeline import MaskPipeline
+from structs.color_range import ColorRange
+
+
+def CreateColorImage() -> np.ndarray:
+    """
+    A red, a green and a blue square of the same luminance on a gray background, a
+        threshold of the gray image cannot tell them apart.
+    """
+    image = np.full((60, 180, 3), 128, dtype=np.uint8)
+    for index, color in enumerate([(0, 0, 255), (0, 255, 0), (255, 0, 0)]):
+        image[10:50, 60 * index + 10 : 60 * index + 50] = color
+
+    return image
+
+
+def test_hsv_range_keeps_only_the_green_square():
+    planes = ColorPlanes(CreateColorImage())
+    colorRange = ColorRange(hueMin=50, hueMax=70, saturationMin=100)
+
+    mask = ColorRangeMask(planes, THRESHOLD_MODE_HSV, colorRange).Apply()
+
+    assert mask.dtype == np.uint8
+    assert mask[30, 90] == 255
+    assert mask[30, 30] == 0 and mask[30, 150] == 0 and mask[5, 5] == 0
+
+
+def test_hsv_hue_range_wraps_around_for_the_reds():
+    image = CreateColorImage()
+    image[10:50, 10:30] = (60, 0, 255)  # red, hue slightly below 180
+    planes = ColorPlanes(image)
+    colorRange = ColorRange(hueMin=170, hueMax=10, saturationMin=100)
+
+    mask = ColorRangeMask(planes, THRESHOLD_MODE_HSV, colorRange).Apply()
+
+    assert mask[30, 15] == 255 and mask[30, 40] == 255
+    assert mask[30, 90] == 0 and mask[30, 150] == 0
+
+
+def test_lab_distance_selects_the_pixels_near_the_key_color():
+    planes = ColorPlanes(CreateColorImage())
+    colorRange = ColorRange(labColor=BgrToLab((255, 0, 0)), labDistance=10)
+
+    mask = ColorRangeMask(planes, THRESHOLD_MODE_LAB, colorRange).Apply()
+
+    assert mask[30, 150] == 255
+    assert mask[30, 30] == 0 and mask[30, 90] == 0 and mask[5, 5] == 0
+
+
+def test_lab_distances_are_kept_for_the_same_key_color():
+    planes = ColorPlanes(CreateColorImage())
+    color = tuple(BgrToLab((0, 255, 0)))
+
+    distances = planes.LabSquaredDistances(color)  # type: ignore
+    assert planes.LabSquaredDistances(color) is distances  # type: ignore
+    assert planes.LabSquaredDistances((0, 128, 128)) is not distances
+
+
+def test_lab_conversion_round_trips():
+    for color in [(255, 0, 0), (10, 200, 30), (128, 128, 128)]:
+        assert np.allclose(LabToBgr(BgrToLab(color)), color, atol=3)
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError):
+        ColorRangeMask(ColorPlanes(CreateColorImage()), THRESHOLD_MODE_MEAN)
+
+
+def test_pipeline_caches_color_masks_by_their_range():
+    image = CreateColorImage()
+    gray = cv.cvtColor(image, cv.COLOR_BGR2GRAY)
+    planes = ColorPlanes(image)
+    first = ColorRangeMask(planes, THRESHOLD_MODE_HSV, ColorRange(hueMin=50, hueMax=70))
+    second = ColorRangeMask(planes, THRESHOLD_MODE_HSV, ColorRange(hueMin=0, hueMax=10))
+
+    mask = MaskPipeline.Run(gray, 128, [], source=first)
+    assert MaskPipeline.Run(gray, 128, [], source=first) is mask
+    assert not np.array_equal(MaskPipeline.Run(gray, 128, [], source=second), mask)
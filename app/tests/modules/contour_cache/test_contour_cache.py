@@ -0,0 +1,102 @@
+import os
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from unittest.mock import Mock
+from pyfakefs.fake_filesystem import FakeFilesystem
+from constants import MASK_STAGE_DILATE
+from modules.contour_cache import ContourCache, Contours
+from structs.mask_stage import MaskStage
+
+TEST_CONTOUR_FOLDER = "/project/contours"
+
+
+def CreateMask() -> np.ndarray:
+    """
+    A filled circle with a square hole.
+    """
+    mask = np.zeros((200, 200), dtype=np.uint8)
+    cv.circle(mask, (100, 100), 80, 255, -1)
+    mask[80:120, 80:120] = 0
+    return mask
+
+
+def test_contours_have_an_outer_and_an_inner_polygon():
+    contours = Contours.FromMask(CreateMask(), 1.0)
+
+    assert contours.PolygonCount == 2
+    assert sorted(contours.holes.tolist()) == [False, True]
+    assert contours.points.dtype == np.float32
+    assert contours.offsets[-1] == contours.VertexCount
+
+    hole = contours.Polygon(int(np.argmax(contours.holes)))
+    assert len(hole) == 4
+
+
+def test_larger_tolerance_gives_fewer_vertices():
+    mask = CreateMask()
+
+    assert (
+        Contours.FromMask(mask, 3.0).VertexCount
+        < Contours.FromMask(mask, 0.5).VertexCount
+    )
+
+
+def test_empty_mask_has_no_polygons():
+    contours = Contours.FromMask(np.zeros((10, 10), dtype=np.uint8), 1.0)
+
+    assert contours.PolygonCount == 0
+    assert contours.points.shape == (0, 2)
+
+
+def test_contours_are_traced_once(fs: FakeFilesystem):
+    computeMask = Mock(return_value=CreateMask())
+    cache = ContourCache(TEST_CONTOUR_FOLDER)
+
+    first = cache.Get("hash", 128, [], 1.0, computeMask)
+    second = cache.Get("hash", 128, [], 1.0, computeMask)
+
+    assert first is second
+    assert computeMask.call_count == 1
+
+
+def test_contours_are_loaded_from_disk(fs: FakeFilesystem):
+    contours = ContourCache(TEST_CONTOUR_FOLDER).Get(
+        "hash", 128, [], 1.0, lambda: CreateMask()
+    )
+    computeMask = Mock()
+
+    loaded = ContourCache(TEST_CONTOUR_FOLDER).Get("hash", 128, [], 1.0, computeMask)
+
+    computeMask.assert_not_called()
+    assert contours is not None and loaded is not None
+    assert np.array_equal(loaded.points, contours.points)
+    assert np.array_equal(loaded.offsets, contours.offsets)
+    assert np.array_equal(loaded.holes, contours.holes)
+    assert len(os.listdir(TEST_CONTOUR_FOLDER)) == 1
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [
+        ("other hash", 128, [], 1.0),
+        ("hash", 100, [], 1.0),
+        ("hash", 128, [MaskStage(kind=MASK_STAGE_DILATE)], 1.0),
+        ("hash", 128, [], 2.0),
+    ],
+)
+def test_changed_parameters_trace_again(fs: FakeFilesystem, parameters: tuple):
+    cache = ContourCache(TEST_CONTOUR_FOLDER)
+    cache.Get("hash", 128, [], 1.0, lambda: CreateMask())
+    computeMask = Mock(return_value=CreateMask())
+
+    cache.Get(*parameters, computeMask)
+
+    computeMask.assert_called_once()
+
+
+def test_mask_failure_returns_none(fs: FakeFilesystem):
+    assert (
+        ContourCache(TEST_CONTOUR_FOLDER).Get("hash", 128, [], 1.0, lambda: None)
+        is None
+    )
@@ -0,0 +1,132 @@
+import os
+import numpy as np
+import cv2 as cv
+from unittest.mock import Mock, patch
+from modules.distance_field import ComputeSignedDistanceField, DistanceFieldCache
+from constants import MASK_STAGE_DILATE
+from structs.image_meta import ImageMeta
+from structs.mask_stage import MaskStage
+
+TEST_DISTANCE_FIELD_FOLDER = "/project/distance_fields"
+TEST_IMAGE_HASH = "a" * 64
+
+
+def CreateMask() -> np.ndarray:
+    mask = np.zeros((100, 100), dtype=np.uint8)
+    mask[30:70, 30:70] = 255
+    return mask
+
+
+def test_field_is_positive_inside_and_negative_outside():
+    field = ComputeSignedDistanceField(CreateMask())
+
+    assert field.dtype == np.float32
+    assert field[50, 50] == 20  # the center is 20 pixels from the nearest background
+    assert field[50, 20] == -10  # 10 pixels left of the square
+    assert field[50, 30] == 1
+    assert field[50, 29] == -1
+
+
+def test_field_is_euclidean():
+    field = ComputeSignedDistanceField(CreateMask())
+
+    # diagonally away from the corner (30, 30)
+    assert abs(field[20, 20] + np.hypot(10, 10)) < 0.01
+
+
+def test_field_is_computed_once_and_stored_as_float16():
+    cache = DistanceFieldCache(TEST_DISTANCE_FIELD_FOLDER)
+    computeMask = Mock(return_value=CreateMask())
+
+    first = cache.Get(TEST_IMAGE_HASH, 128, computeMask)
+    second = cache.Get(TEST_IMAGE_HASH, 128, computeMask)
+
+    assert computeMask.call_count == 1
+    assert first is not None and second is not None
+    assert second.dtype == np.float16
+    assert not second.flags.writeable
+    assert np.array_equal(first, second)
+    assert os.path.exists(cache.GetPath(TEST_IMAGE_HASH, 128))
+
+
+def test_changing_threshold_replaces_the_stored_field():
+    cache = DistanceFieldCache(TEST_DISTANCE_FIELD_FOLDER)
+    otherHash = "b" * 64
+
+    cache.Get(TEST_IMAGE_HASH, 100, CreateMask)
+    cache.Get(otherHash, 100, CreateMask)
+    cache.Get(TEST_IMAGE_HASH, 150, CreateMask)
+
+    assert not os.path.exists(cache.GetPath(TEST_IMAGE_HASH, 100))
+    assert os.path.exists(cache.GetPath(TEST_IMAGE_HASH, 150))
+    assert os.path.exists(cache.GetPath(otherHash, 100))
+
+
+def test_mask_stages_are_part_of_the_stored_field():
+    cache = DistanceFieldCache(TEST_DISTANCE_FIELD_FOLDER)
+    stages = [MaskStage(kind=MASK_STAGE_DILATE, size=3)]
+    disabledStages = [MaskStage(kind=MASK_STAGE_DILATE, size=3, enabled=False)]
+    computeMask = Mock(return_value=CreateMask())
+
+    cache.Get(TEST_IMAGE_HASH, 100, computeMask)
+    cache.Get(TEST_IMAGE_HASH, 100, computeMask, stages=disabledStages)
+    cache.Get(TEST_IMAGE_HASH, 100, computeMask, stages=stages)
+
+    assert computeMask.call_count == 2  # the disabled stages do not change the mask
+    assert cache.GetPath(TEST_IMAGE_HASH, 100, stages=stages) != cache.GetPath(
+        TEST_IMAGE_HASH, 100
+    )
+    assert os.listdir(TEST_DISTANCE_FIELD_FOLDER) == [
+        os.path.basename(cache.GetPath(TEST_IMAGE_HASH, 100, stages=stages))
+    ]
+
+
+def test_invalidate_removes_the_fields_of_the_image():
+    cache = DistanceFieldCache(TEST_DISTANCE_FIELD_FOLDER)
+    cache.Get(TEST_IMAGE_HASH, 100, CreateMask)
+
+    cache.Invalidate(TEST_IMAGE_HASH)
+
+    assert os.listdir(TEST_DISTANCE_FIELD_FOLDER) == []
+
+
+def test_invalid_stored_field_is_recomputed():
+    cache = DistanceFieldCache(TEST_DISTANCE_FIELD_FOLDER)
+    os.makedirs(TEST_DISTANCE_FIELD_FOLDER)
+    with open(cache.GetPath(TEST_IMAGE_HASH, 100), "wb") as f:
+        f.write(b"invalid")
+
+    field = cache.Get(TEST_IMAGE_HASH, 100, CreateMask)
+
+    assert field is not None and field[50, 50] == 20
+
+
+def test_invalid_stored_field_which_cannot_be_removed_is_recomputed():
+    cache = DistanceFieldCache(TEST_DISTANCE_FIELD_FOLDER)
+    os.makedirs(TEST_DISTANCE_FIELD_FOLDER)
+    with open(cache.GetPath(TEST_IMAGE_HASH, 100), "wb") as f:
+        f.write(b"invalid")
+
+    with patch("os.remove", side_effect=PermissionError("locked")):
+        field = cache.Get(TEST_IMAGE_HASH, 100, CreateMask)
+
+    assert field is not None and field[50, 50] == 20
+
+
+def test_images_of_the_same_file_keep_their_own_fields():
+    storedName = f"{TEST_IMAGE_HASH}.png"
+    image = ImageMeta(name="image.png", storedName=storedName)
+    copiedImage = ImageMeta(name="image.png (Copied)", storedName=storedName)
+    cache = DistanceFieldCache(TEST_DISTANCE_FIELD_FOLDER)
+
+    cache.Get(image.CacheId, 100, CreateMask)
+    cache.Get(copiedImage.CacheId, 150, CreateMask)
+
+    assert os.path.exists(cache.GetPath(image.CacheId, 100))
+    assert os.path.exists(cache.GetPath(copiedImage.CacheId, 150))
+
+
+def test_mask_failure_returns_none():
+    cache = DistanceFieldCache(TEST_DISTANCE_FIELD_FOLDER)
+
+    assert cache.Get(TEST_IMAGE_HASH, 100, lambda: None) is None
@@ -184,3 +184,45 @@ def test_call_the_event_with_arguments():
 
     assert callback1.called == 1
     assert callback1.call_args.args == ("test_argument1", "test_argument2")
+
+
+def test_unregistered_callback_will_be_not_triggered_when_event_is_triggered():
+    callback1 = Mock()
+    callback2 = Mock()
+    EventSystem.RegisterEvent(TEST_EVENT_NAME, callback1)
+    EventSystem.RegisterEvent(TEST_EVENT_NAME, callback2)
+
+    EventSystem.UnregisterEvent(TEST_EVENT_NAME, callback1)
+    EventSystem.TriggerEvent(TEST_EVENT_NAME)
+
+    assert callback1.called == 0
+    assert callback2.called == 1
+
+
+def test_unregister_a_callback_which_is_not_registered_does_nothing():
+    callback1 = Mock()
+    EventSystem.RegisterEvent(TEST_EVENT_NAME, callback1)
+
+    EventSystem.UnregisterEvent(TEST_EVENT_NAME, Mock())
+    EventSystem.UnregisterEvent(TEST_ISOLATED_EVENT_NAME, callback1)
+    EventSystem.TriggerEvent(TEST_EVENT_NAME)
+
+    assert callback1.called == 1
+
+
+def test_callback_can_unregister_itself_while_event_is_triggered():
+    callback1 = Mock()
+    callback2 = Mock()
+
+    def Callback1() -> None:
+        callback1()
+        EventSystem.UnregisterEvent(TEST_EVENT_NAME, Callback1)
+
+    EventSystem.RegisterEvent(TEST_EVENT_NAME, Callback1)
+    EventSystem.RegisterEvent(TEST_EVENT_NAME, callback2)
+
+    EventSystem.TriggerEvent(TEST_EVENT_NAME)
+    EventSystem.TriggerEvent(TEST_EVENT_NAME)
+
+    assert callback1.call_count == 1
+    assert callback2.call_count == 2
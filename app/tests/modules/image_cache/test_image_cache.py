@@ -0,0 +1,84 @@
+import os
+import numpy as np
+import pytest  # type: ignore
+from pyfakefs.fake_filesystem import FakeFilesystem
+from unittest.mock import Mock
+from modules.image_cache import ImageCache
+
+TEST_IMAGE_SHAPE = (10, 20, 3)
+TEST_IMAGE_BYTES = 10 * 20 * 3
+TEST_FOLDER = "/image-cache"
+
+
+def CreateFile(name: str, content: bytes = b"image") -> str:
+    os.makedirs(TEST_FOLDER, exist_ok=True)
+    filePath = os.path.join(TEST_FOLDER, name)
+    with open(filePath, "wb") as f:
+        f.write(content)
+    return filePath
+
+
+def CreateLoader() -> Mock:
+    return Mock(side_effect=lambda _: np.zeros(TEST_IMAGE_SHAPE, dtype=np.uint8))
+
+
+def test_image_is_decoded_only_once(fs: FakeFilesystem):
+    loader = CreateLoader()
+    imagePath = CreateFile("image.png")
+
+    firstImage = ImageCache.Get(imagePath, loader)
+    secondImage = ImageCache.Get(imagePath, loader)
+
+    assert firstImage is secondImage
+    assert loader.call_count == 1
+    assert ImageCache.Hits() == 1
+    assert ImageCache.Misses() == 1
+
+
+def test_cached_image_is_read_only(fs: FakeFilesystem):
+    image = ImageCache.Get(CreateFile("image.png"), CreateLoader())
+
+    assert image is not None
+    assert not image.flags.writeable
+
+
+def test_modified_file_is_decoded_again(fs: FakeFilesystem):
+    loader = CreateLoader()
+    imagePath = CreateFile("image.png")
+    ImageCache.Get(imagePath, loader)
+
+    CreateFile("image.png", b"modified image")
+    ImageCache.Get(imagePath, loader)
+
+    assert loader.call_count == 2
+    assert ImageCache.Misses() == 2
+
+
+def test_non_existed_file_returns_none(fs: FakeFilesystem):
+    loader = CreateLoader()
+
+    assert ImageCache.Get(os.path.join(TEST_FOLDER, "none.png"), loader) is None
+    loader.assert_not_called()
+
+
+def test_least_recently_used_image_is_evicted(fs: FakeFilesystem):
+    loader = CreateLoader()
+    ImageCache.SetBudget(2 * TEST_IMAGE_BYTES)
+
+    firstPath = CreateFile("first.png")
+    secondPath = CreateFile("second.png")
+    thirdPath = CreateFile("third.png")
+
+    ImageCache.Get(firstPath, loader)
+    ImageCache.Get(secondPath, loader)
+    ImageCache.Get(firstPath, loader)  # second is the least recently used now
+    ImageCache.Get(thirdPath, loader)
+
+    assert ImageCache.Evictions() == 1
+    assert ImageCache.UsedBytes() == 2 * TEST_IMAGE_BYTES
+
+    ImageCache.Get(firstPath, loader)
+    assert loader.call_count == 3
+
+    ImageCache.Get(secondPath, loader)
+    assert loader.call_count == 4
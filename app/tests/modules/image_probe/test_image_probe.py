@@ -0,0 +1,115 @@
+import io
+import numpy as np
+import pytest  # type: ignore
+from PIL import (
+    BmpImagePlugin,
+    Image,
+    JpegImagePlugin,
+    PngImagePlugin,
+)  # registered before faking
+from modules.image_probe import ImageHeader, ProbeImage, ProbeImages
+from structs.image_meta import ImageMeta
+
+TEST_IMAGE_FOLDER = "/probe"
+
+
+def CreateImageFile(name: str, image: Image.Image, **params) -> str:
+    # encoded in memory, the encoders write to the file descriptor of a real file
+    encoded = io.BytesIO()
+    image.save(
+        encoded, format=Image.registered_extensions()[name[name.rfind(".") :]], **params
+    )
+
+    filePath = f"{TEST_IMAGE_FOLDER}/{name}"
+    with open(filePath, "wb") as f:
+        f.write(encoded.getvalue())
+    return filePath
+
+
+@pytest.fixture(autouse=True)
+def setup(fs):
+    fs.create_dir(TEST_IMAGE_FOLDER)
+
+
+@pytest.mark.parametrize(
+    "mode, channels, dtype",
+    [("L", 1, "uint8"), ("RGB", 3, "uint8"), ("RGBA", 4, "uint8"), ("P", 3, "uint8")],
+)
+def test_png_header(mode: str, channels: int, dtype: str):
+    imagePath = CreateImageFile("image.png", Image.new(mode, (203, 157)))
+
+    assert ProbeImage(imagePath) == ImageHeader("PNG", 203, 157, channels, dtype)
+
+
+def test_16_bit_png_header():
+    pixels = np.zeros((31, 47), dtype=np.uint16)
+    imagePath = CreateImageFile("image.png", Image.fromarray(pixels, "I;16"))
+
+    assert ProbeImage(imagePath) == ImageHeader("PNG", 47, 31, 1, "uint16")
+
+
+@pytest.mark.parametrize("progressive", [False, True])
+@pytest.mark.parametrize("mode, channels", [("L", 1), ("RGB", 3)])
+def test_jpeg_header(mode: str, channels: int, progressive: bool):
+    exif = Image.Exif()
+    exif[0x010E] = "description " * 100  # a long APP1 segment before the frame
+    imagePath = CreateImageFile(
+        "image.jpg",
+        Image.new(mode, (640, 481)),
+        progressive=progressive,
+        exif=exif.tobytes(),
+    )
+
+    assert ProbeImage(imagePath) == ImageHeader("JPEG", 640, 481, channels, "uint8")
+
+
+def test_other_formats_are_probed_by_pil():
+    imagePath = CreateImageFile("image.bmp", Image.new("RGB", (12, 34)))
+
+    assert ProbeImage(imagePath) == ImageHeader("BMP", 12, 34, 3, "uint8")
+
+
+def test_invalid_files_are_not_probed():
+    with open(f"{TEST_IMAGE_FOLDER}/truncated.jpg", "wb") as f:
+        f.write(b"\xff\xd8\xff\xe0\x00\x10JFIF")
+    with open(f"{TEST_IMAGE_FOLDER}/text.png", "wb") as f:
+        f.write(b"not an image")
+
+    assert ProbeImage(f"{TEST_IMAGE_FOLDER}/truncated.jpg") is None
+    assert ProbeImage(f"{TEST_IMAGE_FOLDER}/text.png") is None
+    assert ProbeImage(f"{TEST_IMAGE_FOLDER}/missing.png") is None
+
+
+def test_images_are_probed_in_order():
+    imagePaths = [
+        CreateImageFile(f"image-{index}.png", Image.new("L", (index + 1, 10)))
+        for index in range(20)
+    ]
+    imagePaths.insert(5, f"{TEST_IMAGE_FOLDER}/missing.png")
+
+    headers = ProbeImages(imagePaths)
+
+    assert headers[5] is None
+    assert [header.width for header in headers if header is not None] == list(
+        range(1, 21)
+    )
+    assert ProbeImages([]) == []
+
+
+def test_header_is_stored_in_the_image_meta():
+    imagePath = CreateImageFile("image.png", Image.new("RGB", (64, 48)))
+    image = ImageMeta(name="image.png")
+    assert not image.IsProbed
+
+    header = ProbeImage(imagePath)
+    assert header is not None
+    header.ApplyTo(image)
+
+    assert image.IsProbed
+    assert (image.width, image.height, image.channels, image.dtype) == (
+        64,
+        48,
+        3,
+        "uint8",
+    )
+    assert header.DecodedBytes == 64 * 48 * 3
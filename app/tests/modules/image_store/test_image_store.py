@@ -0,0 +1,107 @@
+import os
+from unittest.mock import patch
+import pytest  # type: ignore
+from pyfakefs.fake_filesystem import FakeFilesystem
+from modules.image_store import ImageStore
+from utils.application import GetImageNameBasedOnExistedImageNames
+
+TEST_IMAGE_FOLDER = "/project/images"
+TEST_SOURCE_FOLDER = "/sources"
+
+
+@pytest.fixture()
+def store(fs: FakeFilesystem) -> ImageStore:
+    os.makedirs(TEST_IMAGE_FOLDER)
+    os.makedirs(TEST_SOURCE_FOLDER)
+    return ImageStore(TEST_IMAGE_FOLDER)
+
+
+def CreateSource(name: str, content: bytes) -> str:
+    sourcePath = os.path.join(TEST_SOURCE_FOLDER, name)
+    with open(sourcePath, "wb") as f:
+        f.write(content)
+    return sourcePath
+
+
+def test_imported_file_is_named_by_its_content(store: ImageStore):
+    storedName = store.Import(CreateSource("photo.PNG", b"photo"))
+
+    assert storedName.endswith(".png")
+    assert store.Contains(os.path.splitext(storedName)[0])
+    with open(os.path.join(TEST_IMAGE_FOLDER, storedName), "rb") as f:
+        assert f.read() == b"photo"
+    assert os.listdir(TEST_IMAGE_FOLDER) == [storedName]
+
+
+def test_identical_content_is_stored_once(store: ImageStore):
+    firstName = store.Import(CreateSource("first.png", b"photo"))
+    secondName = store.Import(CreateSource("second.png", b"photo"))
+    otherName = store.Import(CreateSource("other.png", b"other photo"))
+
+    assert firstName == secondName
+    assert otherName != firstName
+    assert sorted(os.listdir(TEST_IMAGE_FOLDER)) == sorted([firstName, otherName])
+
+
+def test_already_imported_source_is_not_read_again(store: ImageStore):
+    sourcePath = CreateSource("photo.png", b"photo")
+    storedName = store.Import(sourcePath)
+
+    with patch.object(store, "_CopyWithHash") as copyMocker:
+        assert store.Import(sourcePath) == storedName
+        copyMocker.assert_not_called()
+
+
+def test_duplicate_is_not_copied(store: ImageStore):
+    storedName = store.Import(CreateSource("first.png", b"photo"))
+
+    with patch.object(store, "_CopyWithHash") as copyMocker:
+        assert store.Import(CreateSource("second.png", b"photo")) == storedName
+        copyMocker.assert_not_called()
+
+
+def test_content_of_a_new_size_is_not_hashed_before_the_copy(store: ImageStore):
+    store.Import(CreateSource("first.png", b"photo"))
+
+    with patch.object(store, "_HashFile") as hashMocker:
+        store.Import(CreateSource("second.png", b"longer photo"))
+        hashMocker.assert_not_called()
+
+
+def test_same_size_with_other_content_is_stored(store: ImageStore):
+    firstName = store.Import(CreateSource("first.png", b"photo"))
+    secondName = store.Import(CreateSource("second.png", b"PHOTO"))
+
+    assert firstName != secondName
+    assert sorted(os.listdir(TEST_IMAGE_FOLDER)) == sorted([firstName, secondName])
+
+
+def test_stored_files_are_indexed_by_a_new_store(store: ImageStore):
+    storedName = store.Import(CreateSource("photo.png", b"photo"))
+
+    newStore = ImageStore(TEST_IMAGE_FOLDER)
+
+    assert newStore.Contains(os.path.splitext(storedName)[0])
+    assert newStore.Import(CreateSource("copy.png", b"photo")) == storedName
+    assert os.listdir(TEST_IMAGE_FOLDER) == [storedName]
+
+
+def test_non_existed_source_raises_error(store: ImageStore):
+    with pytest.raises(OSError):
+        store.Import(os.path.join(TEST_SOURCE_FOLDER, "none.png"))
+
+    assert os.listdir(TEST_IMAGE_FOLDER) == []
+
+
+def test_copied_image_names_are_distinct():
+    names = {"image.png"}
+
+    for _ in range(3):
+        names.add(GetImageNameBasedOnExistedImageNames("image.png", names))
+
+    assert names == {
+        "image.png",
+        "image.png (Copied)",
+        "image.png (Copied 2)",
+        "image.png (Copied 3)",
+    }
@@ -0,0 +1,127 @@
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+import modules.incremental_carving
+from modules.incremental_carving import IncrementalCarver
+from modules.sculpture_engine import CarveVolume, GatherPoints, Silhouette, VoxelCenters
+
+
+def CreateDiskMask(size: int = 64, radius: int = 31) -> np.ndarray:
+    mask = np.zeros((size, size), dtype=np.uint8)
+    cv.circle(mask, (size // 2, size // 2), radius, 255, -1)
+    return mask
+
+
+def test_gather_points_is_zero_outside_of_the_image():
+    image = np.full((4, 8), 7, dtype=np.int8)
+    centers = VoxelCenters(8)
+
+    values = GatherPoints(
+        image, (0, 0, -1), centers.reshape(1, 1, -1), centers.reshape(1, -1, 1), 0
+    )
+
+    assert values.shape == (1, 8, 8)
+    assert (values[0, 2:6] == 7).all()
+    assert (values[0, :2] == 0).all() and (values[0, 6:] == 0).all()
+
+
+def test_incremental_carving_matches_full_carving():
+    directions = [(0, 0, -1), (-1, 0, 0), (1, 1, 1)]
+    silhouettes = {
+        str(i): Silhouette(CreateDiskMask(), direction)
+        for i, direction in enumerate(directions)
+    }
+    carver = IncrementalCarver(24, slabVoxels=24 * 24 * 5)
+    for viewId, silhouette in silhouettes.items():
+        assert carver.SetView(viewId, silhouette, "disk")
+
+    assert np.array_equal(carver.Volume, CarveVolume(list(silhouettes.values()), 24))
+
+    # the threshold of a view changed: same direction, another mask
+    for viewId in ("0", "2"):
+        silhouettes[viewId] = Silhouette(
+            CreateDiskMask(radius=20), directions[int(viewId)]
+        )
+        assert carver.SetView(viewId, silhouettes[viewId], "small disk")
+
+    assert np.array_equal(carver.Volume, CarveVolume(list(silhouettes.values()), 24))
+
+    # the light direction of a view changed
+    silhouettes["1"] = Silhouette(CreateDiskMask(radius=20), (0, -1, 1))
+    assert carver.SetView("1", silhouettes["1"], "moved")
+
+    assert np.array_equal(carver.Volume, CarveVolume(list(silhouettes.values()), 24))
+
+    assert carver.RemoveView("2")
+    del silhouettes["2"]
+
+    assert np.array_equal(carver.Volume, CarveVolume(list(silhouettes.values()), 24))
+    assert carver.Counts.max() == 2
+
+
+def test_same_key_is_not_carved_again():
+    carver = IncrementalCarver(8)
+    silhouette = Silhouette(CreateDiskMask(), (0, 0, -1))
+
+    assert carver.SetView("view", silhouette, "key")
+    assert not carver.SetView(
+        "view", Silhouette(CreateDiskMask(radius=5), (0, 0, -1)), "key"
+    )
+    assert carver.GetKey("view") == "key"
+    assert np.array_equal(carver.Volume, CarveVolume([silhouette], 8))
+
+
+def test_unchanged_mask_keeps_the_counts():
+    carver = IncrementalCarver(8)
+    carver.SetView("view", Silhouette(CreateDiskMask(), (0, 0, -1)), "before")
+    counts = carver.Counts.copy()
+
+    assert carver.SetView("view", Silhouette(CreateDiskMask(), (0, 0, -1)), "after")
+    assert np.array_equal(carver.Counts, counts)
+
+
+def test_removing_every_view_empties_the_volume():
+    carver = IncrementalCarver(8)
+    carver.SetView("view", Silhouette(CreateDiskMask(), (1, 0, 0)), "key")
+
+    assert carver.RemoveView("view")
+    assert not carver.RemoveView("view")
+    assert not carver.Volume.any()
+    assert not carver.Counts.any()
+
+
+def test_more_views_than_a_byte_can_count():
+    carver = IncrementalCarver(8)
+    silhouettes = [
+        Silhouette(CreateDiskMask(), (0, 0, -1)),
+        Silhouette(CreateDiskMask(radius=20), (-1, 0, 0)),
+    ]
+    for i in range(300):
+        carver.SetView(str(i), silhouettes[i % 2], "key")
+
+    assert carver.Counts.dtype == np.uint16
+    assert carver.Counts.max() == 300
+    assert np.array_equal(carver.Volume, CarveVolume(silhouettes, 8))
+
+    for i in range(299):
+        carver.RemoveView(str(i))
+    assert carver.Counts.max() == 1
+    assert np.array_equal(carver.Volume, CarveVolume(silhouettes[1:], 8))
+
+
+def test_view_count_is_limited(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(modules.incremental_carving, "MAX_CARVE_VIEWS", 300)
+    carver = IncrementalCarver(1)
+    silhouette = Silhouette(CreateDiskMask(), (0, 0, -1))
+    for i in range(300):
+        carver.SetView(str(i), silhouette, "key")
+
+    with pytest.raises(ValueError):
+        carver.SetView("one more", silhouette, "key")
+
+    assert carver.SetView("0", Silhouette(CreateDiskMask(radius=5), (0, 0, -1)), "new")
+
+
+def test_invalid_resolution():
+    with pytest.raises(ValueError):
+        IncrementalCarver(0)
@@ -0,0 +1,76 @@
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from modules.luminance_histogram import LuminanceHistogram
+from modules.threshold_engine import ThresholdEngine
+
+
+def CreateImage() -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (40, 60, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("threshold", [0, 1, 64, 128, 200, 254, 255])
+def test_coverage_matches_the_binary_image(threshold: int):
+    image = CreateImage()
+    histogram = LuminanceHistogram.FromImage(image)
+
+    engine = ThresholdEngine()
+    engine.SetImage(image)
+    binaryImage = engine.Apply(threshold)
+
+    assert binaryImage is not None
+    assert histogram.ForegroundCount(threshold) == cv.countNonZero(binaryImage)
+    assert histogram.Coverage(threshold) == pytest.approx(
+        cv.countNonZero(binaryImage) / binaryImage.size
+    )
+
+
+def test_histogram_counts_every_pixel():
+    histogram = LuminanceHistogram.FromImage(CreateImage())
+
+    assert histogram.PixelCount == 40 * 60
+    assert histogram.Cumulative[-1] == histogram.PixelCount
+    assert histogram.Coverage(255) == 0.0
+
+
+def test_histogram_round_trips_through_list():
+    histogram = LuminanceHistogram.FromImage(CreateImage())
+    loaded = LuminanceHistogram(histogram.ToList())
+
+    assert np.array_equal(loaded.Counts, histogram.Counts)
+    assert np.array_equal(loaded.Cumulative, histogram.Cumulative)
+
+
+def test_histogram_round_trips_through_the_encoded_text():
+    histogram = LuminanceHistogram.FromImage(CreateImage())
+    encoded = histogram.Encode()
+    loaded = LuminanceHistogram.Decode(encoded)
+
+    assert loaded is not None
+    assert np.array_equal(loaded.Counts, histogram.Counts)
+    assert len(encoded) < len(str(histogram.ToList()))
+
+
+@pytest.mark.parametrize("encoded", ["", "not base64!", "AAAA", [1, 2]])
+def test_invalid_encoded_histogram_is_not_decoded(encoded):
+    assert LuminanceHistogram.Decode(encoded) is None
+
+
+def test_merged_histogram_sums_the_counts():
+    black = LuminanceHistogram.FromGray(np.zeros((10, 10), dtype=np.uint8))
+    white = LuminanceHistogram.FromGray(np.full((10, 30), 255, dtype=np.uint8))
+
+    merged = LuminanceHistogram.Merge([black, white])
+
+    assert merged.PixelCount == 400
+    assert merged.Coverage(128) == pytest.approx(0.75)
+    assert merged.Mean() == pytest.approx(255 * 0.75)
+
+
+def test_empty_histogram_has_no_coverage():
+    assert LuminanceHistogram([0] * 256).Coverage(128) == 0.0
+
+
+def test_invalid_number_of_bins_raises_error():
+    with pytest.raises(ValueError):
+        LuminanceHistogram([1, 2, 3])
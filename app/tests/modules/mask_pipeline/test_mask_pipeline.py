@@ -0,0 +1,115 @@
+import numpy as np
+from constants import (
+    MASK_STAGE_CLOSE,
+    MASK_STAGE_DILATE,
+    MASK_STAGE_ERODE,
+    MASK_STAGE_FILL_HOLES,
+    MASK_STAGE_OPEN,
+    MASK_STAGE_REMOVE_SMALL_COMPONENTS,
+)
+from modules.mask_pipeline import MaskPipeline
+from structs.mask_stage import MaskStage
+
+
+def CreateGray() -> np.ndarray:
+    """
+    A bright square with a 3x3 hole and a single bright speckle outside of it.
+    """
+    gray = np.zeros((40, 40), dtype=np.uint8)
+    gray[10:30, 10:30] = 200
+    gray[18:21, 18:21] = 0
+    gray[2, 2] = 200
+    return gray
+
+
+def test_threshold_without_stages():
+    gray = CreateGray()
+
+    mask = MaskPipeline.Run(gray, 100, [])
+
+    assert np.array_equal(mask, np.where(gray > 100, 255, 0))
+    assert not mask.flags.writeable
+
+
+def test_fill_holes_keeps_the_background():
+    stage = MaskStage(kind=MASK_STAGE_FILL_HOLES, size=0)
+
+    mask = MaskPipeline.Run(CreateGray(), 100, [stage])
+
+    assert mask[19, 19] == 255
+    assert mask[0, 0] == 0
+    assert np.count_nonzero(mask) == 20 * 20 + 1
+
+
+def test_fill_holes_skips_the_large_holes():
+    stage = MaskStage(kind=MASK_STAGE_FILL_HOLES, size=8)
+
+    assert MaskPipeline.Run(CreateGray(), 100, [stage])[19, 19] == 0
+
+
+def test_remove_small_components():
+    stage = MaskStage(kind=MASK_STAGE_REMOVE_SMALL_COMPONENTS, size=2)
+
+    mask = MaskPipeline.Run(CreateGray(), 100, [stage])
+
+    assert mask[2, 2] == 0
+    assert mask[10, 10] == 255
+
+
+def test_morphological_stages_change_the_area():
+    gray = CreateGray()
+    area = np.count_nonzero(MaskPipeline.Run(gray, 100, []))
+
+    def Area(kind: str) -> int:
+        return np.count_nonzero(MaskPipeline.Run(gray, 100, [MaskStage(kind=kind)]))
+
+    assert Area(MASK_STAGE_DILATE) > area
+    assert Area(MASK_STAGE_ERODE) < area
+    assert Area(MASK_STAGE_OPEN) < area  # the speckle is removed
+    assert Area(MASK_STAGE_CLOSE) > area  # the hole is closed
+
+
+def test_editing_a_stage_recomputes_only_the_following_stages():
+    gray = CreateGray()
+    imageKey = MaskPipeline.ImageKey(gray)
+    stages = [
+        MaskStage(kind=MASK_STAGE_FILL_HOLES, size=0),
+        MaskStage(kind=MASK_STAGE_REMOVE_SMALL_COMPONENTS, size=2),
+        MaskStage(kind=MASK_STAGE_DILATE),
+    ]
+    MaskPipeline.Run(gray, 100, stages, imageKey)
+    misses = MaskPipeline.Misses()
+
+    stages[2].size = 5
+    MaskPipeline.Run(gray, 100, stages, imageKey)
+
+    # the threshold and the first 2 stages are taken from the cache
+    assert MaskPipeline.Misses() == misses + 1
+    assert MaskPipeline.Hits() == 3
+
+
+def test_disabled_and_unknown_stages_are_skipped():
+    gray = CreateGray()
+    stages = [
+        MaskStage(kind=MASK_STAGE_DILATE, enabled=False),
+        MaskStage(kind="unknown"),
+    ]
+
+    assert np.array_equal(
+        MaskPipeline.Run(gray, 100, stages), np.where(gray > 100, 255, 0)
+    )
+
+
+def test_run_without_memoization_leaves_the_cache_untouched():
+    gray = CreateGray()
+    stages = [
+        MaskStage(kind=MASK_STAGE_FILL_HOLES, size=0),
+        MaskStage(kind=MASK_STAGE_OPEN, size=3),
+    ]
+
+    mask = MaskPipeline.Run(gray, 100, stages, memoize=False)
+
+    assert MaskPipeline.Hits() == 0
+    assert MaskPipeline.Misses() == 0
+    assert np.array_equal(mask, MaskPipeline.Run(gray, 100, stages))
+    assert MaskPipeline.Hits() == 0  # nothing was memoized by the first run
@@ -0,0 +1,88 @@
+import gc
+import os
+import tempfile
+from typing import Generator
+import numpy as np
+import pytest  # type: ignore
+from pyfakefs.fake_filesystem import FakeFilesystem
+from pytest_mock import MockerFixture
+from modules.mask_store import MaskStore
+
+
+@pytest.fixture()
+def maskFolder(fs: FakeFilesystem) -> Generator[str, None, None]:
+    """
+    A folder of the real file system, the fake one cannot be mapped.
+    """
+    fs.pause()
+    with tempfile.TemporaryDirectory() as folder:
+        yield os.path.join(folder, "masks")
+    fs.resume()
+
+
+def test_mapped_mask_is_removed_once_it_is_released(maskFolder: str):
+    store = MaskStore(maskFolder)
+    first = np.full((4, 6), 255, dtype=np.uint8)
+    store.Put("hash", "first", first)
+
+    mapped = store.Get("hash", "first")
+    assert isinstance(mapped, np.memmap)
+
+    store.Put("hash", "second", np.zeros((4, 6), dtype=np.uint8))
+
+    # still mapped, e.g. by the silhouette of a carved view
+    assert store.Contains("hash", "first")
+    assert np.array_equal(mapped, first)
+
+    del mapped
+    gc.collect()
+    store.Get("hash", "second")
+
+    assert not store.Contains("hash", "first")
+    assert store.Contains("hash", "second")
+
+
+def test_mask_which_cannot_be_removed_is_removed_later(
+    maskFolder: str, mocker: MockerFixture
+):
+    store = MaskStore(maskFolder)
+    store.Put("hash", "first", np.zeros((4, 6), dtype=np.uint8))
+
+    # the error of Windows when the file is mapped by another process or store
+    remove = mocker.patch("os.remove", side_effect=PermissionError)
+    store.Invalidate("hash")
+    assert store.Contains("hash", "first")
+
+    remove.side_effect = os.unlink
+    store.Get("other", "key")
+    store.Put("other", "key", np.zeros((4, 6), dtype=np.uint8))
+
+    assert not store.Contains("hash", "first")
+
+
+def test_restored_mask_is_not_removed(maskFolder: str):
+    store = MaskStore(maskFolder)
+    store.Put("hash", "first", np.zeros((4, 6), dtype=np.uint8))
+    mapped = store.Get("hash", "first")
+
+    store.Put("hash", "second", np.zeros((4, 6), dtype=np.uint8))
+    assert mapped is not None
+    mapped = store.Get("hash", "first")  # e.g. the parameters are restored by an undo
+
+    del mapped
+    gc.collect()
+    store.Get("hash", "second")
+
+    assert store.Contains("hash", "first")
+
+
+def test_prune_keeps_only_the_current_masks(maskFolder: str):
+    store = MaskStore(maskFolder)
+    for imageHash, key in [("a", "old"), ("a", "new"), ("b", "new"), ("c", "new")]:
+        store.Put(imageHash, key, np.zeros((4, 6), dtype=np.uint8))
+    # left over by a previous session
+    np.save(store.GetPath("a", "old"), np.zeros((4, 6), dtype=np.uint8))
+
+    MaskStore(store.CacheFolder).Prune([("a", "new"), ("b", "new")])
+
+    assert sorted(os.listdir(store.CacheFolder)) == ["a_new.npy", "b_new.npy"]
@@ -0,0 +1,121 @@
+import io
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from PIL import Image, JpegImagePlugin, PngImagePlugin  # registered before faking
+from constants import THRESHOLD_MODE_HSV, THRESHOLD_MODE_MEAN
+from modules.mask_store import ComputeWorkingMask, MaskKey, MaskStore, WorkingSize
+from structs.image_meta import ImageMeta
+from structs.mask_stage import MaskStage
+
+TEST_FOLDER = "/working"
+MASK_FOLDER = f"{TEST_FOLDER}/masks"
+
+
+def CreateImageFile(name: str, size=(1003, 601)) -> str:
+    """
+    A white disk on a black background.
+    """
+    width, height = size
+    pixels = np.zeros((height, width, 3), dtype=np.uint8)
+    cv.circle(
+        pixels, (width // 2, height // 2), min(width, height) // 3, (255, 255, 255), -1
+    )
+
+    # encoded in memory, the encoders write to the file descriptor of a real file
+    encoded = io.BytesIO()
+    Image.fromarray(pixels).save(encoded, format="PNG")
+
+    filePath = f"{TEST_FOLDER}/{name}"
+    with open(filePath, "wb") as f:
+        f.write(encoded.getvalue())
+    return filePath
+
+
+@pytest.fixture(autouse=True)
+def setup(fs):
+    fs.create_dir(TEST_FOLDER)
+
+
+def test_working_size_keeps_the_aspect_ratio():
+    assert WorkingSize(1003, 601, 512) == (512, 307)
+    assert WorkingSize(601, 1003, 512) == (307, 512)
+    assert WorkingSize(100, 50, 512) == (512, 256)
+
+
+def test_key_changes_with_the_mask_parameters():
+    image = ImageMeta(name="a.png")
+    key = MaskKey(image, 512)
+
+    assert MaskKey(ImageMeta(name="b.png"), 512) == key
+    assert MaskKey(image, 256) != key
+    assert MaskKey(ImageMeta(threshold=10), 512) != key
+    assert MaskKey(ImageMeta(thresholdMode=THRESHOLD_MODE_MEAN), 512) != key
+    assert MaskKey(ImageMeta(maskStages=[MaskStage(kind="open")]), 512) != key
+    assert MaskKey(ImageMeta(maskStages=[MaskStage(enabled=False)]), 512) == key
+
+
+def test_working_mask_is_resampled_to_the_resolution():
+    imagePath = CreateImageFile("disk.png")
+
+    mask = ComputeWorkingMask(imagePath, ImageMeta(), 256)
+
+    assert mask is not None
+    assert mask.shape == (153, 256) and mask.dtype == np.uint8
+    assert set(np.unique(mask)) == {0, 255}
+    assert mask[76, 128] == 255 and mask[5, 5] == 0
+    # the disk radius is a third of the height
+    assert (
+        abs(cv.countNonZero(mask) - np.pi * (153 / 3) ** 2) / cv.countNonZero(mask)
+        < 0.05
+    )
+
+
+def test_small_image_is_enlarged_to_the_resolution():
+    imagePath = CreateImageFile("small.png", size=(150, 100))
+
+    mask = ComputeWorkingMask(imagePath, ImageMeta(), 300)
+
+    assert mask is not None and mask.shape == (200, 300)
+    assert mask[100, 150] == 255 and mask[5, 5] == 0
+
+
+def test_working_mask_of_the_other_modes():
+    imagePath = CreateImageFile("disk.png")
+    image = ImageMeta(
+        thresholdMode=THRESHOLD_MODE_HSV,
+        maskStages=[MaskStage(kind="open", size=3)],
+    )
+    image.colorRange.valueMin = 128
+
+    mask = ComputeWorkingMask(imagePath, image, 128)
+
+    assert mask is not None and mask.shape == (77, 128)
+    assert mask[38, 64] == 255 and mask[2, 2] == 0
+
+
+def test_invalid_image_has_no_working_mask():
+    with open(f"{TEST_FOLDER}/broken.png", "wb") as f:
+        f.write(b"not an image")
+
+    assert ComputeWorkingMask(f"{TEST_FOLDER}/broken.png", ImageMeta(), 128) is None
+
+
+def test_store_keeps_only_the_current_mask_of_an_image():
+    store = MaskStore(MASK_FOLDER)
+    first = np.full((4, 6), 255, dtype=np.uint8)
+    second = np.zeros((4, 6), dtype=np.uint8)
+
+    assert store.Get("hash", "first") is None
+
+    stored = store.Put("hash", "first", first)
+    assert np.array_equal(stored, first) and not stored.flags.writeable
+    store.Put("other", "first", first)
+
+    store.Put("hash", "second", second)
+    assert not store.Contains("hash", "first")
+    assert np.array_equal(store.Get("hash", "second"), second)
+    assert store.Contains("other", "first")
+
+    store.Invalidate("hash")
+    assert store.Get("hash", "second") is None
@@ -0,0 +1,80 @@
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from modules.packed_mask import PackedMask
+
+
+def CreateMask(seed: int, height: int = 37, width: int = 53) -> np.ndarray:
+    """
+    A random 0/255 mask whose width is not a multiple of 8.
+    """
+    random = np.random.default_rng(seed)
+    return np.where(random.random((height, width)) > 0.5, 255, 0).astype(np.uint8)
+
+
+def test_conversion_is_lossless():
+    mask = CreateMask(0)
+    packed = PackedMask.FromMat(mask)
+
+    assert packed.Shape == mask.shape
+    assert packed.NBytes == 37 * 7
+    assert np.array_equal(packed.ToMat(), mask)
+
+
+def test_non_zero_pixels_are_set():
+    mask = np.array([[0, 1, 7, 255]], dtype=np.uint8)
+
+    assert PackedMask.FromMat(mask).ToMat().tolist() == [[0, 255, 255, 255]]
+
+
+@pytest.mark.parametrize(
+    "operation, expected",
+    [
+        (lambda a, b: a & b, cv.bitwise_and),
+        (lambda a, b: a | b, cv.bitwise_or),
+        (lambda a, b: a ^ b, cv.bitwise_xor),
+    ],
+)
+def test_boolean_operations_match_opencv(operation, expected):
+    first, second = CreateMask(1), CreateMask(2)
+
+    result = operation(PackedMask.FromMat(first), PackedMask.FromMat(second))
+
+    assert np.array_equal(result.ToMat(), expected(first, second))
+
+
+def test_not_keeps_the_padding_bits_clear():
+    mask = CreateMask(3)
+    inverted = ~PackedMask.FromMat(mask)
+
+    assert np.array_equal(inverted.ToMat(), cv.bitwise_not(mask))
+    assert inverted.Area() == mask.size - cv.countNonZero(mask)
+
+
+def test_area_and_projections_count_the_set_pixels():
+    mask = CreateMask(4)
+    packed = PackedMask.FromMat(mask)
+
+    assert packed.Area() == cv.countNonZero(mask)
+    assert np.array_equal(packed.RowProjection(), (mask > 0).sum(axis=1))
+    assert np.array_equal(packed.ColumnProjection(), (mask > 0).sum(axis=0))
+
+
+def test_iou_of_two_squares():
+    first = np.zeros((20, 20), dtype=np.uint8)
+    second = np.zeros((20, 20), dtype=np.uint8)
+    first[0:10, 0:10] = 255
+    second[5:15, 0:10] = 255
+
+    iou = PackedMask.FromMat(first).IoU(PackedMask.FromMat(second))
+
+    assert iou == pytest.approx(50 / 150)
+    assert PackedMask.Zeros(4, 4).IoU(PackedMask.Zeros(4, 4)) == 1.0
+
+
+def test_different_shapes_raise():
+    with pytest.raises(ValueError):
+        PackedMask.Zeros(4, 9) & PackedMask.Zeros(4, 8)
+
+    with pytest.raises(ValueError):
+        PackedMask(np.zeros((4, 1), dtype=np.uint8), 9)
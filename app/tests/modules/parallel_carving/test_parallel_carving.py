@@ -0,0 +1,66 @@
+from typing import Generator
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from pyfakefs.fake_filesystem import FakeFilesystem
+from modules.parallel_carving import CarveVolumeParallel, SharedVolume, SlabRanges
+from modules.sculpture_engine import CarveVolume, Silhouette
+
+
+@pytest.fixture(autouse=True)
+def RealFileSystem(fs: FakeFilesystem) -> Generator[None, None, None]:
+    # the shared memory blocks are files of the real /dev/shm
+    fs.pause()
+    yield
+    fs.resume()
+
+
+def CreateDiskMask(size: int = 64) -> np.ndarray:
+    mask = np.zeros((size, size), dtype=np.uint8)
+    cv.circle(mask, (size // 2, size // 2), size // 2 - 1, 255, -1)
+    return mask
+
+
+def test_slab_ranges_cover_the_volume():
+    for resolution, workers, slabVoxels in [
+        (64, 4, 10**9),
+        (64, 3, 64 * 64 * 5),
+        (5, 8, 1),
+    ]:
+        slabs = SlabRanges(resolution, workers, slabVoxels)
+
+        assert slabs[0][0] == 0 and slabs[-1][1] == resolution
+        assert all(stop == start for (_, stop), (start, _) in zip(slabs, slabs[1:]))
+        assert len(slabs) >= min(workers, resolution)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_parallel_carving_matches_single_process(workers: int):
+    silhouettes = [
+        Silhouette(CreateDiskMask(), direction)
+        for direction in [(0, 0, -1), (-1, 0, 0), (1, 1, 1)]
+    ]
+
+    with CarveVolumeParallel(
+        silhouettes, 32, workers, slabVoxels=32 * 32 * 3
+    ) as volume:
+        assert np.array_equal(volume.Array, CarveVolume(silhouettes, 32))
+
+
+def test_parallel_carving_without_silhouettes_is_empty():
+    with CarveVolumeParallel([], 8) as volume:
+        assert not volume.Array.any()
+
+
+def test_closed_volume_cannot_be_used():
+    volume = SharedVolume(4)
+    volume.Close()
+    volume.Close()
+
+    with pytest.raises(RuntimeError):
+        volume.Array
+
+
+def test_invalid_resolution():
+    with pytest.raises(ValueError):
+        CarveVolumeParallel([], 0)
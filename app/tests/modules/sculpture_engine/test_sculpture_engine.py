@@ -0,0 +1,102 @@
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from modules.sculpture_engine import (
+    CarveSlab,
+    CarveVolume,
+    ProjectionBasis,
+    SampleSilhouette,
+    Silhouette,
+    VoxelCenters,
+)
+
+
+def CreateDiskMask(size: int = 64) -> np.ndarray:
+    mask = np.zeros((size, size), dtype=np.uint8)
+    cv.circle(mask, (size // 2, size // 2), size // 2 - 1, 255, -1)
+    return mask
+
+
+def CreateSquareMask(size: int = 64) -> np.ndarray:
+    return np.full((size, size), 255, dtype=np.uint8)
+
+
+def test_projection_basis_is_orthonormal():
+    for direction in [(0, 0, -1), (0, -1, 0), (1, 2, 3), (-1, 0, 0)]:
+        forward, right, up = ProjectionBasis(direction)
+        basis = np.stack([forward, right, up])
+        assert np.allclose(basis @ basis.T, np.eye(3))
+
+    _, right, up = ProjectionBasis((0, 0, -1))
+    assert np.allclose(right, (1, 0, 0)) and np.allclose(up, (0, 1, 0))
+
+    with pytest.raises(ValueError):
+        ProjectionBasis((0, 0, 0))
+
+
+def test_axis_aligned_extrusion_is_broadcast_along_the_light():
+    centers = VoxelCenters(16)
+    samples = SampleSilhouette(
+        Silhouette(CreateDiskMask(), (0, 0, -1)), centers, centers, centers
+    )
+
+    assert samples.shape == (1, 16, 16)
+
+
+def test_single_silhouette_extrudes_the_mask():
+    mask = np.zeros((32, 32), dtype=np.uint8)
+    mask[:16, :] = 255  # the upper half
+
+    volume = CarveVolume([Silhouette(mask, (0, 0, -1))], 32)
+
+    assert volume.shape == (32, 32, 32)
+    assert volume[:, 16:, :].all()  # +y is the top of the mask
+    assert not volume[:, :16, :].any()
+
+
+def test_two_orthogonal_disks_carve_their_intersection():
+    resolution = 48
+    volume = CarveVolume(
+        [
+            Silhouette(CreateDiskMask(), (0, 0, -1)),
+            Silhouette(CreateDiskMask(), (-1, 0, 0)),
+        ],
+        resolution,
+    )
+
+    # the Steinmetz solid of two cylinders of radius r has the volume 16 r^3 / 3
+    radius = 31 / 32
+    voxelVolume = (2.0 / resolution) ** 3
+    assert abs(volume.sum() * voxelVolume - 16.0 * radius**3 / 3.0) < 0.1
+
+    # the shadows never exceed the silhouettes
+    centers = VoxelCenters(resolution)
+    front = volume.any(axis=0)
+    assert not (front & ~(centers[None, :] ** 2 + centers[:, None] ** 2 < 1.01)).any()
+
+
+def test_oblique_silhouette_keeps_its_shadow():
+    volume = CarveVolume([Silhouette(CreateSquareMask(), (1, 1, 1))], 32)
+
+    # the square covers the projection of the cube center
+    assert volume[16, 16, 16]
+    assert 0 < volume.sum() < volume.size
+
+
+def test_slabs_match_the_whole_volume():
+    silhouettes = [
+        Silhouette(CreateDiskMask(), (0, 0, -1)),
+        Silhouette(CreateDiskMask(), (1, -2, 1)),
+    ]
+
+    volume = CarveVolume(silhouettes, 40, slabVoxels=40 * 40 * 3)
+
+    assert np.array_equal(volume, CarveVolume(silhouettes, 40))
+    assert np.array_equal(CarveSlab(silhouettes, 40, 10, 17), volume[10:17])
+
+
+def test_no_silhouette_and_invalid_resolution():
+    assert not CarveVolume([], 8).any()
+
+    with pytest.raises(ValueError):
+        CarveVolume([], 0)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest  # type: ignore
+from modules.surface_extraction import ExtractSurface, SurfaceMesh
+
+
+def CreateBallVolume(resolution: int, radius: float) -> np.ndarray:
+    zs, ys, xs = np.mgrid[:resolution, :resolution, :resolution]
+    center = (resolution - 1) / 2
+    return (xs - center) ** 2 + (ys - center) ** 2 + (zs - center) ** 2 < radius**2
+
+
+def SignedVolume(mesh: SurfaceMesh) -> float:
+    points = mesh.vertices[mesh.indices].astype(np.float64)
+    return float(
+        np.einsum("ij,ij->i", points[:, 0], np.cross(points[:, 1], points[:, 2])).sum()
+        / 6
+    )
+
+
+def AssertClosed(mesh: SurfaceMesh) -> None:
+    """
+    Each directed edge is used once and its reverse by the neighbouring triangle.
+    """
+    triangles = mesh.indices.astype(np.int64)
+    edges = np.concatenate(
+        [triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]]
+    )
+    forward = edges[:, 0] * len(mesh.vertices) + edges[:, 1]
+    backward = edges[:, 1] * len(mesh.vertices) + edges[:, 0]
+
+    assert len(np.unique(forward)) == len(forward)
+    assert np.isin(forward, backward).all()
+
+
+def test_single_voxel_is_a_closed_octahedron():
+    volume = np.zeros((4, 4, 4), dtype=bool)
+    volume[1, 2, 1] = True
+
+    mesh = ExtractSurface(volume)
+
+    # a vertex at the center of each face of the voxel cube, a quad at each corner
+    assert mesh.vertices.shape == (8, 3) and mesh.vertices.dtype == np.float32
+    assert mesh.TriangleCount == 12 and mesh.indices.dtype == np.uint32
+    AssertClosed(mesh)
+    assert SignedVolume(mesh) > 0
+    # the voxel (z=1, y=2, x=1) is centered at (-0.25, 0.25, -0.25)
+    assert np.allclose(mesh.vertices.mean(axis=0), (-0.25, 0.25, -0.25))
+
+
+def test_ball_surface_is_closed_and_faces_outwards():
+    mesh = ExtractSurface(CreateBallVolume(48, 18))
+
+    AssertClosed(mesh)
+    assert abs(SignedVolume(mesh) - 4 / 3 * np.pi * (18 / 24) ** 3) < 0.05
+    assert np.abs(mesh.vertices).max() <= 1.0
+
+
+def test_empty_volume_has_no_triangles():
+    mesh = ExtractSurface(np.zeros((8, 8, 8), dtype=bool))
+
+    assert mesh.vertices.shape == (0, 3)
+    assert mesh.TriangleCount == 0
+    assert mesh.ToFaceData().shape == (0, 4, 4)
+
+
+def test_face_data_layout():
+    mesh = ExtractSurface(CreateBallVolume(16, 6))
+
+    faces = mesh.ToFaceData()
+
+    assert faces.shape == (mesh.TriangleCount, 4, 4) and faces.dtype == np.float32
+    assert faces.nbytes == mesh.TriangleCount * 64  # sizeof(FaceData)
+    assert (faces[:, :, 3] == 0).all()
+    assert np.array_equal(faces[:, 1:, :3], mesh.vertices[mesh.indices])
+    assert np.allclose(np.linalg.norm(faces[:, 0, :3], axis=1), 1, atol=1e-5)
+    # the normals point away from the center of the ball
+    centroids = faces[:, 1:, :3].mean(axis=1)
+    assert (np.einsum("ij,ij->i", faces[:, 0, :3], centroids) > 0).all()
+
+
+@pytest.mark.parametrize("shape", [(4, 4), (4, 4, 5), (0, 0, 0)])
+def test_invalid_volume(shape: tuple[int, ...]):
+    with pytest.raises(ValueError):
+        ExtractSurface(np.zeros(shape, dtype=bool))
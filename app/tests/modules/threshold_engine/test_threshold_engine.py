@@ -0,0 +1,72 @@
+import numpy as np
+import pytest  # type: ignore
+from modules.threshold_engine import ThresholdEngine
+from utils.images import ConvertToBinary
+
+TEST_IMAGE_SHAPE = (37, 53, 3)
+
+
+def CreateTestImage() -> np.ndarray:
+    return np.random.default_rng(0).integers(
+        0, 256, size=TEST_IMAGE_SHAPE, dtype=np.uint8
+    )
+
+
+def test_apply_without_image_returns_none():
+    engine = ThresholdEngine()
+    assert engine.Apply(100) is None
+
+
+@pytest.mark.parametrize("threshold", [0, 1, 100, 128, 254, 255])
+def test_apply_matches_convert_to_binary(threshold: int):
+    image = CreateTestImage()
+    engine = ThresholdEngine()
+    engine.SetImage(image)
+
+    binaryImage = engine.Apply(threshold)
+
+    assert binaryImage is not None
+    assert np.array_equal(binaryImage, ConvertToBinary(image, threshold))
+
+
+def test_apply_alternates_between_two_output_buffers():
+    image = CreateTestImage()
+    engine = ThresholdEngine()
+    engine.SetImage(image)
+
+    firstImage = engine.Apply(50)
+    secondImage = engine.Apply(200)
+    thirdImage = engine.Apply(100)
+
+    assert firstImage is not secondImage
+    assert firstImage is thirdImage
+    # the previous frame is kept while the next one is written
+    assert np.array_equal(secondImage, ConvertToBinary(image, 200))
+
+
+def test_apply_with_the_same_threshold_returns_the_same_buffer():
+    engine = ThresholdEngine()
+    engine.SetImage(CreateTestImage())
+
+    firstImage = engine.Apply(50)
+    secondImage = engine.Apply(50)
+
+    assert firstImage is secondImage
+
+
+def test_grayscale_image_is_used_directly():
+    image = CreateTestImage()[:, :, 0].copy()
+    engine = ThresholdEngine()
+    engine.SetImage(image)
+
+    assert engine.Gray is image
+    assert np.array_equal(engine.Apply(90), np.where(image > 90, 255, 0))
+
+
+def test_set_none_image_clears_the_engine():
+    engine = ThresholdEngine()
+    engine.SetImage(CreateTestImage())
+    engine.SetImage(None)
+
+    assert engine.Gray is None
+    assert engine.Apply(100) is None
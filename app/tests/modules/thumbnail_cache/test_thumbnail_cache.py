@@ -0,0 +1,127 @@
+import os
+import shutil
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from pyfakefs.fake_filesystem import FakeFilesystem
+from pytest_mock import MockerFixture
+from constants import TEST_PNG_IMAGE_PATH, THUMBNAIL_SIZE
+from modules import thumbnail_cache
+from modules.thumbnail_cache import ThumbnailCache
+from utils.application import GetImageFilePath, GetImageFolder
+
+TEST_PROJECT_DIRECTORY = "/project"
+
+
+@pytest.fixture()
+def projectDirectory(fs: FakeFilesystem) -> str:
+    fs.add_real_file(TEST_PNG_IMAGE_PATH, read_only=True)  # type: ignore
+    os.makedirs(GetImageFolder(TEST_PROJECT_DIRECTORY))
+    return TEST_PROJECT_DIRECTORY
+
+
+def CopyImage(projectDirectory: str, imageName: str) -> str:
+    imagePath = GetImageFilePath(projectDirectory, imageName)
+    shutil.copyfile(TEST_PNG_IMAGE_PATH, imagePath)
+    return imagePath
+
+
+def test_thumbnail_is_not_cached_before_building(projectDirectory: str):
+    imagePath = CopyImage(projectDirectory, "image.png")
+    assert ThumbnailCache(projectDirectory).GetCachedThumbnail(imagePath) is None
+
+
+def test_build_thumbnail_fits_the_thumbnail_size(projectDirectory: str):
+    imagePath = CopyImage(projectDirectory, "image.png")
+    cache = ThumbnailCache(projectDirectory)
+
+    thumbnailPath = cache.BuildThumbnail(imagePath)
+
+    assert thumbnailPath is not None
+    assert cache.GetCachedThumbnail(imagePath) == thumbnailPath
+
+    with open(thumbnailPath, "rb") as f:
+        thumbnail = cv.imdecode(
+            np.frombuffer(f.read(), dtype=np.uint8), cv.IMREAD_COLOR
+        )
+    assert max(thumbnail.shape[:2]) == THUMBNAIL_SIZE
+
+
+def test_identical_images_share_the_same_thumbnail(projectDirectory: str):
+    cache = ThumbnailCache(projectDirectory)
+
+    firstThumbnail = cache.BuildThumbnail(CopyImage(projectDirectory, "first.png"))
+    secondThumbnail = cache.BuildThumbnail(CopyImage(projectDirectory, "second.png"))
+
+    assert firstThumbnail is not None
+    assert firstThumbnail == secondThumbnail
+
+
+def test_saved_index_is_reused_by_a_new_cache(
+    projectDirectory: str,
+    mocker: MockerFixture,
+):
+    imagePath = CopyImage(projectDirectory, "image.png")
+    cache = ThumbnailCache(projectDirectory)
+    thumbnailPath = cache.BuildThumbnail(imagePath)
+    cache.SaveIndex()
+
+    decodeMocker = mocker.patch("modules.thumbnail_cache.LoadImage")
+
+    assert (
+        ThumbnailCache(projectDirectory).GetCachedThumbnail(imagePath) == thumbnailPath
+    )
+    decodeMocker.assert_not_called()
+
+
+def test_stored_image_is_not_hashed(projectDirectory: str, mocker: MockerFixture):
+    contentHash = "a" * 64
+    imagePath = CopyImage(projectDirectory, f"{contentHash}.png")
+    cache = ThumbnailCache(projectDirectory)
+    hashMocker = mocker.spy(cache, "_HashFile")
+
+    thumbnailPath = cache.BuildThumbnail(imagePath, contentHash)
+    cache.SaveIndex()
+
+    assert thumbnailPath is not None
+    assert os.path.basename(thumbnailPath).startswith(contentHash)
+    assert cache.GetCachedThumbnail(imagePath, contentHash) == thumbnailPath
+    hashMocker.assert_not_called()
+    assert cache.GetCachedThumbnail(imagePath) is None  # not indexed
+
+
+def test_modified_image_is_not_cached(projectDirectory: str):
+    imagePath = CopyImage(projectDirectory, "image.png")
+    cache = ThumbnailCache(projectDirectory)
+    cache.BuildThumbnail(imagePath)
+
+    with open(imagePath, "ab") as f:
+        f.write(b"modified")
+
+    assert cache.GetCachedThumbnail(imagePath) is None
+
+
+def test_large_image_is_decoded_at_a_reduced_scale(
+    projectDirectory: str,
+    mocker: MockerFixture,
+):
+    imagePath = CopyImage(projectDirectory, "image.png")
+    loadMocker = mocker.spy(thumbnail_cache, "LoadImage")
+
+    ThumbnailCache(projectDirectory).BuildThumbnail(imagePath)
+
+    height, width = cv.imread(TEST_PNG_IMAGE_PATH).shape[:2]
+    reduce = loadMocker.call_args[0][1]
+    assert reduce > 1
+    assert max(width, height) // reduce >= THUMBNAIL_SIZE
+
+
+def test_no_temporary_file_is_left(projectDirectory: str):
+    cache = ThumbnailCache(projectDirectory)
+
+    thumbnailPath = cache.BuildThumbnail(CopyImage(projectDirectory, "image.png"))
+
+    assert thumbnailPath is not None
+    assert os.listdir(os.path.dirname(thumbnailPath)) == [
+        os.path.basename(thumbnailPath)
+    ]
@@ -0,0 +1,56 @@
+import json
+from constants import DEFAULT_LIGHT_DIRECTION, MASK_STAGE_OPEN, THRESHOLD_MODE_GLOBAL
+from modules.luminance_histogram import LuminanceHistogram
+from modules.sculpture_engine import ProjectionBasis
+from structs.image_meta import ImageMeta
+from structs.project import Project
+
+
+def CreateProjectJson(**imageFields) -> str:
+    project = Project(projectName="project")
+    project.images.append(ImageMeta(name="image.png"))
+    data = json.loads(project.ToJson())
+    data["images"][0].update(imageFields)
+    return json.dumps(data)
+
+
+def test_invalid_image_metas_are_corrected_when_loaded():
+    project = Project()
+
+    assert project.FromJson(
+        CreateProjectJson(
+            thresholdMode="bogus",
+            blockSize=4,
+            lightDirection=[0, 0, 0],
+            histogram=[1, 2],
+            maskStages=[{"kind": MASK_STAGE_OPEN, "size": -3, "iterations": 0}],
+        )
+    )
+
+    image = project.images[0]
+    assert image.thresholdMode == THRESHOLD_MODE_GLOBAL
+    assert image.blockSize == 5
+    assert image.lightDirection == DEFAULT_LIGHT_DIRECTION
+    assert image.histogram == ""
+    assert (image.maskStages[0].size, image.maskStages[0].iterations) == (0, 1)
+
+    ProjectionBasis(tuple(image.lightDirection))  # the zero vector raises
+
+
+def test_non_finite_light_direction_is_replaced():
+    project = Project()
+
+    assert project.FromJson(CreateProjectJson(lightDirection=[float("nan"), 1, 0]))
+
+    assert project.images[0].lightDirection == DEFAULT_LIGHT_DIRECTION
+
+
+def test_histogram_of_older_projects_is_encoded():
+    project = Project()
+    counts = list(range(256))
+
+    assert project.FromJson(CreateProjectJson(histogram=counts))
+
+    histogram = LuminanceHistogram.Decode(project.images[0].histogram)
+    assert histogram is not None and histogram.ToList() == counts
+    assert len(json.dumps(project.images[0].histogram)) < len(json.dumps(counts))
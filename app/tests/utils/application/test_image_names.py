@@ -0,0 +1,50 @@
+from utils.application import GetImageNameBasedOnExistedImageNames
+
+
+def test_unused_name_is_kept():
+    assert (
+        GetImageNameBasedOnExistedImageNames("image.png", ["other.png"]) == "image.png"
+    )
+
+
+def test_first_copy_has_no_number():
+    assert (
+        GetImageNameBasedOnExistedImageNames("image.png", ["image.png"])
+        == "image.png (Copied)"
+    )
+
+
+def test_copies_are_numbered_from_two():
+    existedImageNames = ["image.png", "image.png (Copied)", "image.png (Copied 2)"]
+
+    assert (
+        GetImageNameBasedOnExistedImageNames("image.png", existedImageNames)
+        == "image.png (Copied 3)"
+    )
+
+
+def test_first_unused_number_is_taken():
+    existedImageNames = {"image.png", "image.png (Copied)", "image.png (Copied 3)"}
+
+    assert (
+        GetImageNameBasedOnExistedImageNames("image.png", existedImageNames)
+        == "image.png (Copied 2)"
+    )
+
+
+def test_copy_of_a_copy_is_named_after_it():
+    existedImageNames = {"image.png", "image.png (Copied)"}
+
+    assert (
+        GetImageNameBasedOnExistedImageNames("image.png (Copied)", existedImageNames)
+        == "image.png (Copied) (Copied)"
+    )
+
+
+def test_names_of_other_images_are_ignored():
+    existedImageNames = {"image.png", "photo.png (Copied)"}
+
+    assert (
+        GetImageNameBasedOnExistedImageNames("photo.png", existedImageNames)
+        == "photo.png"
+    )
@@ -0,0 +1,146 @@
+import io
+import os
+import struct
+import zlib
+import numpy as np
+import pytest  # type: ignore
+from PIL import Image, JpegImagePlugin, PngImagePlugin  # registered before faking
+import utils.images
+from utils.images import ConvertToBinary, LoadImage, LoadBinaryImage
+
+TEST_IMAGE_FOLDER = "/binary"
+
+
+def CreateImageFile(name: str, mode: str = "RGB", size=(203, 157)) -> str:
+    """
+    A gradient with random noise, the size is not a multiple of the reduce factors.
+    """
+    random = np.random.default_rng(0)
+    width, height = size
+    pixels = np.linspace(0, 255, width * height * 4).reshape(height, width, 4)
+    pixels = (pixels + random.integers(-40, 40, pixels.shape)).clip(0, 255)
+    image = Image.fromarray(pixels.astype(np.uint8), "RGBA").convert(mode)
+
+    # encoded in memory, the encoders write to the file descriptor of a real file
+    encoded = io.BytesIO()
+    image.save(encoded, format=Image.registered_extensions()[os.path.splitext(name)[1]])
+
+    filePath = f"{TEST_IMAGE_FOLDER}/{name}"
+    with open(filePath, "wb") as f:
+        f.write(encoded.getvalue())
+    return filePath
+
+
+@pytest.fixture(autouse=True)
+def setup(fs):
+    fs.create_dir(TEST_IMAGE_FOLDER)
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "P"])
+@pytest.mark.parametrize("reduce", [1, 2, 4])
+def test_mask_matches_the_loaded_image(mode: str, reduce: int):
+    imagePath = CreateImageFile("image.png", mode)
+
+    expected = ConvertToBinary(LoadImage(imagePath, reduce), 100)
+    mask = LoadBinaryImage(imagePath, 100, reduce, stripRows=16)
+
+    assert mask is not None
+    assert np.array_equal(mask, expected)
+
+
+def test_jpeg_is_decoded_in_grayscale_at_the_reduced_scale():
+    imagePath = CreateImageFile("image.jpg")
+
+    expected = ConvertToBinary(LoadImage(imagePath, 4), 128)
+    mask = LoadBinaryImage(imagePath, 128, 4, stripRows=8)
+
+    assert mask is not None and expected is not None
+    assert mask.shape == expected.shape
+    assert np.mean(mask != expected) < 0.01  # the decoder luminance may differ by 1
+
+
+def test_mask_is_written_into_the_preallocated_output():
+    imagePath = CreateImageFile("image.png")
+    output = np.full((79, 102), 7, dtype=np.uint8)
+
+    mask = LoadBinaryImage(imagePath, 100, 2, output=output, stripRows=10)
+
+    assert mask is output
+    assert set(np.unique(output).tolist()) <= {0, 255}
+
+
+def test_output_with_the_wrong_shape_raises():
+    imagePath = CreateImageFile("image.png")
+
+    with pytest.raises(ValueError):
+        LoadBinaryImage(imagePath, output=np.empty((10, 10), dtype=np.uint8))
+
+
+def test_invalid_file_returns_none():
+    filePath = f"{TEST_IMAGE_FOLDER}/invalid.png"
+    with open(filePath, "wb") as f:
+        f.write(b"invalid")
+
+    assert LoadBinaryImage(filePath) is None
+
+
+def CreatePngHeader(name: str, width: int, height: int) -> str:
+    """
+    A PNG file with the header of a grayscale image and no pixel data.
+    """
+
+    def Chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    data = (
+        b"\x89PNG\r\n\x1a\n"
+        + Chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+        + Chunk(b"IDAT", b"")
+        + Chunk(b"IEND", b"")
+    )
+
+    filePath = f"{TEST_IMAGE_FOLDER}/{name}"
+    with open(filePath, "wb") as f:
+        f.write(data)
+    return filePath
+
+
+def test_large_scans_are_opened_without_changing_the_limit_of_pil():
+    imagePath = CreatePngHeader("scan.png", 20000, 10000)  # rejected by Image.open
+    defaultLimit = Image.MAX_IMAGE_PIXELS
+
+    with pytest.raises(Image.DecompressionBombError):
+        Image.open(imagePath)
+    with utils.images._OpenLargeImage(imagePath) as image:
+        assert image.format == "PNG"
+        assert image.size == (20000, 10000)
+
+    assert Image.MAX_IMAGE_PIXELS == defaultLimit
+
+
+def test_images_over_the_limit_are_rejected(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    imagePath = CreateImageFile("image.png")
+    monkeypatch.setattr(utils.images, "MAX_LARGE_IMAGE_PIXELS", 100 * 100)
+
+    assert LoadBinaryImage(imagePath) is None
+
+
+def test_frames_which_cannot_be_reduced_are_rejected_over_the_budget(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    pngPath = CreateImageFile("image.png", size=(400, 300))
+    jpegPath = CreateImageFile("image.jpg", size=(400, 300))
+    monkeypatch.setattr(utils.images, "MAX_DECODED_FRAME_PIXELS", 100 * 100)
+
+    assert LoadBinaryImage(pngPath, reduce=4) is None
+    # decoded at 1/4 of the resolution, 100x75 pixels
+    mask = LoadBinaryImage(jpegPath, reduce=4)
+    assert mask is not None and mask.shape == (75, 100)
+    assert LoadBinaryImage(jpegPath, reduce=2) is None
@@ -0,0 +1,242 @@
+import io
+import math
+import os
+import numpy as np
+import cv2 as cv
+import pytest  # type: ignore
+from PIL import Image, JpegImagePlugin, PngImagePlugin  # registered before faking
+import utils.images
+from utils.images import ALPHA_BACKGROUND_COLOR, LoadGrayImage, LoadImage
+
+TEST_IMAGE_FOLDER = "/load"
+TEST_IMAGE_SIZE = (203, 157)  # not a multiple of the reduce factors
+
+
+def CreatePixels(size=TEST_IMAGE_SIZE) -> np.ndarray:
+    """
+    A (height, width, 4) RGBA gradient with random noise and random alpha.
+    """
+    random = np.random.default_rng(0)
+    width, height = size
+    pixels = np.linspace(0, 255, width * height * 4).reshape(height, width, 4)
+    pixels = (pixels + random.integers(-40, 40, pixels.shape)).clip(0, 255)
+    return pixels.astype(np.uint8)
+
+
+def SaveImage(image: Image.Image, name: str) -> str:
+    # encoded in memory, the encoders write to the file descriptor of a real file
+    encoded = io.BytesIO()
+    image.save(encoded, format=Image.registered_extensions()[os.path.splitext(name)[1]])
+
+    filePath = f"{TEST_IMAGE_FOLDER}/{name}"
+    with open(filePath, "wb") as f:
+        f.write(encoded.getvalue())
+    return filePath
+
+
+def ExpectedBGR(imagePath: str) -> np.ndarray:
+    """
+    The BGR pixels of the image file, computed without `LoadImage`.
+    """
+    with Image.open(imagePath) as image:
+        if "transparency" in image.info:
+            return _ExpectedBGR(image.convert("RGBA"))
+
+        return _ExpectedBGR(image)
+
+
+def _ExpectedBGR(image: Image.Image) -> np.ndarray:
+    if image.mode == "RGBA":
+        rgba = np.asarray(image).astype(np.float64)
+        alpha = rgba[:, :, 3:] / 255
+        background = np.array(ALPHA_BACKGROUND_COLOR[:3], dtype=np.float64)
+        rgb = np.rint(rgba[:, :, :3] * alpha + background * (1 - alpha))
+        return rgb[:, :, ::-1].astype(np.uint8)
+
+    if image.mode.startswith("I"):
+        gray = (np.asarray(image).astype(np.int64) >> 8).astype(np.uint8)
+        return np.repeat(gray[:, :, None], 3, axis=2)
+
+    return np.asarray(image.convert("RGB"))[:, :, ::-1]
+
+
+def BoxReduce(pixels: np.ndarray, factor: int) -> np.ndarray:
+    """
+    The mean of each `factor` x `factor` block, the border blocks may be partial.
+    """
+    height, width = pixels.shape[:2]
+    reduced = np.empty(
+        (math.ceil(height / factor), math.ceil(width / factor), pixels.shape[2])
+    )
+    for row in range(reduced.shape[0]):
+        for column in range(reduced.shape[1]):
+            block = pixels[
+                row * factor : (row + 1) * factor,
+                column * factor : (column + 1) * factor,
+            ]
+            reduced[row, column] = block.reshape(-1, pixels.shape[2]).mean(axis=0)
+    return reduced
+
+
+def CreateImage(mode: str) -> Image.Image:
+    pixels = CreatePixels()
+    if mode == "I;16":
+        return Image.fromarray(pixels[:, :, 0].astype(np.uint16) * 257)
+
+    image = Image.fromarray(pixels, "RGBA")
+    if mode == "RGBA-opaque":
+        image.putalpha(255)
+        return image
+
+    return image.convert(mode)
+
+
+@pytest.fixture(autouse=True)
+def setup(fs):
+    fs.create_dir(TEST_IMAGE_FOLDER)
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "RGBA-opaque", "L", "I;16", "P", "1"])
+def test_png_modes_are_loaded_as_bgr(mode: str):
+    imagePath = SaveImage(CreateImage(mode), "image.png")
+
+    loadedImage = LoadImage(imagePath)
+
+    assert loadedImage is not None
+    assert loadedImage.dtype == np.uint8
+    assert loadedImage.shape == (TEST_IMAGE_SIZE[1], TEST_IMAGE_SIZE[0], 3)
+    difference = np.abs(loadedImage.astype(int) - ExpectedBGR(imagePath).astype(int))
+    assert difference.max() <= 1  # the rounding of the alpha composition
+
+
+def test_jpeg_is_loaded_as_bgr():
+    imagePath = SaveImage(CreateImage("RGB"), "image.jpg")
+
+    loadedImage = LoadImage(imagePath)
+
+    assert loadedImage is not None
+    assert np.array_equal(loadedImage, ExpectedBGR(imagePath))
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "I;16", "P"])
+@pytest.mark.parametrize("reduce", [2, 4, 8])
+def test_png_is_reduced_by_a_box_filter(mode: str, reduce: int):
+    imagePath = SaveImage(CreateImage(mode), "image.png")
+
+    loadedImage = LoadImage(imagePath, reduce)
+
+    width, height = TEST_IMAGE_SIZE
+    assert loadedImage is not None
+    assert loadedImage.shape == (
+        math.ceil(height / reduce),
+        math.ceil(width / reduce),
+        3,
+    )
+    # reduced then composited (or shifted to 8 bits), the reference does the opposite
+    expected = BoxReduce(ExpectedBGR(imagePath).astype(np.float64), reduce)
+    assert np.abs(loadedImage - expected).max() <= 2
+
+
+@pytest.mark.parametrize("reduce", [2, 4, 8])
+def test_jpeg_is_reduced_by_the_decoder(reduce: int):
+    imagePath = SaveImage(CreateImage("RGB"), "image.jpg")
+
+    fullImage = LoadImage(imagePath)
+    loadedImage = LoadImage(imagePath, reduce)
+
+    width, height = TEST_IMAGE_SIZE
+    assert fullImage is not None and loadedImage is not None
+    assert loadedImage.shape == (
+        math.ceil(height / reduce),
+        math.ceil(width / reduce),
+        3,
+    )
+    expected = BoxReduce(fullImage.astype(np.float64), reduce)
+    assert np.abs(loadedImage - expected).mean() < 4  # DCT scaling is not a box filter
+
+
+def test_unsupported_reduce_factor_raises():
+    imagePath = SaveImage(CreateImage("RGB"), "image.png")
+
+    with pytest.raises(ValueError):
+        LoadImage(imagePath, 3)
+
+
+def test_invalid_file_returns_none():
+    filePath = f"{TEST_IMAGE_FOLDER}/broken.png"
+    with open(filePath, "wb") as f:
+        f.write(b"not an image")
+
+    assert LoadImage(filePath) is None
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L"])
+def test_pixels_are_converted_without_the_raw_encoder(
+    mode: str, monkeypatch: pytest.MonkeyPatch
+):
+    imagePath = SaveImage(CreateImage(mode), "image.png")
+    expected = LoadImage(imagePath)
+
+    def GetRawEncoder(*args):
+        raise AttributeError("_getencoder")  # the private API of PIL changed
+
+    monkeypatch.setattr(utils.images, "_GetRawEncoder", GetRawEncoder)
+    loadedImage = LoadImage(imagePath)
+
+    assert loadedImage is not None
+    assert np.array_equal(loadedImage, expected)
+
+
+def test_cancelled_load_stops_reading_the_file():
+    imagePath = SaveImage(CreateImage("RGB"), "image.png")
+    polls = 0
+
+    def isCancelled() -> bool:
+        nonlocal polls
+        polls += 1
+        return polls > 3
+
+    assert LoadImage(imagePath, isCancelled=isCancelled) is None
+    assert polls == 4  # stopped at the first read after the cancellation
+
+
+def test_load_which_is_not_cancelled_is_unchanged():
+    imagePath = SaveImage(CreateImage("RGB"), "image.jpg")
+
+    loadedImage = LoadImage(imagePath, 2, isCancelled=lambda: False)
+
+    assert loadedImage is not None
+    assert np.array_equal(loadedImage, LoadImage(imagePath, 2))
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "P"])
+def test_gray_image_is_the_gray_plane_of_the_loaded_image(mode: str):
+    imagePath = SaveImage(CreateImage(mode), "image.png")
+
+    gray = LoadGrayImage(imagePath)
+
+    loadedImage = LoadImage(imagePath)
+    assert gray is not None and loadedImage is not None
+    assert np.array_equal(gray, cv.cvtColor(loadedImage, cv.COLOR_BGR2GRAY))
+
+
+def test_jpeg_gray_image_is_decoded_without_the_chroma():
+    imagePath = SaveImage(CreateImage("RGB"), "image.jpg")
+
+    gray = LoadGrayImage(imagePath)
+
+    loadedImage = LoadImage(imagePath)
+    assert gray is not None and loadedImage is not None
+    assert gray.shape == (TEST_IMAGE_SIZE[1], TEST_IMAGE_SIZE[0])
+    difference = np.abs(
+        gray.astype(int) - cv.cvtColor(loadedImage, cv.COLOR_BGR2GRAY).astype(int)
+    )
+    assert np.mean(difference <= 1) > 0.99  # the colors are not clipped to RGB
+
+
+def test_invalid_file_has_no_gray_image():
+    imagePath = f"{TEST_IMAGE_FOLDER}/invalid.png"
+    with open(imagePath, "wb") as f:
+        f.write(b"not an image")
+
+    assert LoadGrayImage(imagePath) is None
@@ -1,4 +1,5 @@
 from typing import Generator, Self
+import numpy as np
 from PyQt6.QtCore import QAbstractItemModel, Qt
 from PyQt6.QtWidgets import QMenu, QTabWidget, QWidget
 from components.customs.opengl_widget.opengl_widget import OpenGLWidget
@@ -147,6 +148,14 @@ class TabWidgetActor:
         self.qtbot.wait(int(finalDelay * 1000))
         return self
 
+    def WaitUntilImagePreviewLoaded(self, index: int) -> Self:
+        assert self._tabWidget is not None
+        imagePreviewWidget = self._tabWidget.widget(index)
+        assert isinstance(imagePreviewWidget, ImagePreviewWidget)
+
+        self.qtbot.waitUntil(lambda: imagePreviewWidget.IsLoaded)
+        return self
+
     def CloseTabWithName(self, name: str) -> Self:
         assert self._tabWidget is not None
         for i in range(self._tabWidget.count()):
@@ -173,6 +182,13 @@ class ImagePreviewWidgetActor:
         self._imagePreviewWidget = imagePreviewWidget
         return self
 
+    def WaitUntilLoaded(self) -> Self:
+        assert self._imagePreviewWidget is not None
+        imagePreviewWidget = self._imagePreviewWidget
+
+        self.qtbot.waitUntil(lambda: imagePreviewWidget.IsLoaded)
+        return self
+
     def AssertThresholdSliderValue(self, value: int) -> Self:
         assert self._imagePreviewWidget is not None
         thresholdSliderValue = self._imagePreviewWidget.ui.thresholdSlider.value()
@@ -188,6 +204,20 @@ class ImagePreviewWidgetActor:
         self._imagePreviewWidget.ui.thresholdSlider.sliderReleased.emit()
         return self
 
+    def WaitUntilBinarized(self) -> Self:
+        assert self._imagePreviewWidget is not None
+        imagePreviewWidget = self._imagePreviewWidget
+
+        self.qtbot.waitUntil(lambda: not imagePreviewWidget.IsBinarizing)
+        return self
+
+    def AssertBinaryImage(self, image: np.ndarray) -> Self:
+        assert self._imagePreviewWidget is not None
+        binaryImage = self._imagePreviewWidget.ui.binaryImageLabel.Image
+        assert binaryImage is not None, "No binary image is shown"
+        assert np.array_equal(binaryImage, image), "The shown binary image differs"
+        return self
+
 
 @pytest.fixture()
 def imagePreviewWidgetActor(
@@ -221,7 +221,7 @@ class ImageAssertion(Assertable):
         assert imageData is not None, "Image data is not found"
 
         projectFolder = GetTestProjectDataFolder(project.projectName)
-        copiedImagePath = GetImageFilePath(projectFolder, self._imageName)
+        copiedImagePath = GetImageFilePath(projectFolder, imageData.FileName)
         if not self._imageBeCopied:
             assert not os.path.exists(
                 copiedImagePath
@@ -62,6 +62,13 @@ class FileDialogSetup:
             lambda *args, **kwargs: (output, success),  # type: ignore
         )
 
+    def SetOutputs(self, outputs: list[str], success: bool = True) -> None:
+        self._monkeypatch.setattr(
+            QFileDialog,
+            "getOpenFileNames",
+            lambda *args, **kwargs: (outputs, success),  # type: ignore
+        )
+
 
 @pytest.fixture()
 def fileDialogSetup(
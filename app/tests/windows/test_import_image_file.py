@@ -1,6 +1,8 @@
 from pyfakefs.fake_filesystem import FakeFilesystem
 from pytestqt.qtbot import QtBot
+from pytest_mock import MockerFixture
 from tests.windows.assertions import ProjectAssertion, ImageAssertion
+from modules.event_system.event_system import EventSystem
 from utils.application import GetImageNameBasedOnExistedImageNames
 from .actors import ProjectTreeActor
 
@@ -13,6 +15,7 @@ from .helper import (
 )
 from constants import (
     DEFAULT_THRESHOLD,
+    MODIFY_IMAGES_LIST_EVENT_NAME,
     TEST_NEW_PROJECT_NAME,
     TEST_NEW_PROJECT_NAME_2,
     TEST_PNG_IMAGE_PATH,
@@ -22,6 +25,7 @@ from converted_constants import TEST_PNG_IMAGE_NAME, TEST_PNG_IMAGE_NAME_2
 
 
 def test_import_image_file(
+    qtbot: QtBot,
     fixtureBuilder: FixtureBuilder,
     fileDialogSetup: FileDialogSetup,
     projectTreeActor: ProjectTreeActor,
@@ -39,12 +43,12 @@ def test_import_image_file(
         .Build()
     )
 
-    fileDialogSetup.SetOutput(TEST_PNG_IMAGE_PATH)
+    fileDialogSetup.SetOutputs([TEST_PNG_IMAGE_PATH])
     mainWindow.projectWidget.ui.importFileButton.click()
 
     # ================== checking the image is loadded ==================
     projectTreeActor.SetProjectTreeView(mainWindow.projectWidget.ui.projectTreeView)
-    assert projectTreeActor.NumberOfRows == 1
+    qtbot.waitUntil(lambda: projectTreeActor.NumberOfRows == 1)
     assert projectTreeActor.GetItemNameAt(0) == TEST_PNG_IMAGE_NAME
     ProjectAssertion(TEST_NEW_PROJECT_NAME).AssertImage(
         ImageAssertion(TEST_PNG_IMAGE_NAME).AssertThreshold(DEFAULT_THRESHOLD)
@@ -164,11 +168,11 @@ def test_automatically_modify_the_name_of_when_import_existed_image_name(
         .Build()
     )
 
-    fileDialogSetup.SetOutput(TEST_PNG_IMAGE_PATH)
+    fileDialogSetup.SetOutputs([TEST_PNG_IMAGE_PATH])
     mainWindow.projectWidget.ui.importFileButton.click()
 
     projectTreeActor.SetProjectTreeView(mainWindow.projectWidget.ui.projectTreeView)
-    assert projectTreeActor.NumberOfRows == 2
+    qtbot.waitUntil(lambda: projectTreeActor.NumberOfRows == 2)
     assert projectTreeActor.GetItemNameAt(0) == TEST_PNG_IMAGE_NAME
 
     NEW_IMAGE_NAME = GetImageNameBasedOnExistedImageNames(
@@ -180,3 +184,39 @@ def test_automatically_modify_the_name_of_when_import_existed_image_name(
     ProjectAssertion(TEST_NEW_PROJECT_NAME).AssertImage(
         ImageAssertion(TEST_PNG_IMAGE_NAME)
     ).AssertImage(ImageAssertion(NEW_IMAGE_NAME)).Assert()
+
+
+def test_import_multiple_image_files_at_once(
+    qtbot: QtBot,
+    fixtureBuilder: FixtureBuilder,
+    fileDialogSetup: FileDialogSetup,
+    projectTreeActor: ProjectTreeActor,
+    mocker: MockerFixture,
+):
+    mainWindow = (
+        fixtureBuilder.AddRealFile(TEST_PNG_IMAGE_PATH)
+        .AddRealFile(TEST_PNG_IMAGE_PATH_2)
+        .AddProject(ProjectBuilder().Name(TEST_NEW_PROJECT_NAME))
+        .AddApplication(ApplicationBuilder().AddRecentProject(TEST_NEW_PROJECT_NAME))
+        .Build()
+    )
+    triggerEventMocker = mocker.spy(EventSystem, "TriggerEvent")
+
+    fileDialogSetup.SetOutputs([TEST_PNG_IMAGE_PATH, TEST_PNG_IMAGE_PATH_2])
+    mainWindow.projectWidget.ui.importFileButton.click()
+
+    projectTreeActor.SetProjectTreeView(mainWindow.projectWidget.ui.projectTreeView)
+    qtbot.waitUntil(lambda: projectTreeActor.NumberOfRows == 2)
+
+    # the images keep the order of the selection, and the project is saved only once
+    assert projectTreeActor.GetItemNameAt(0) == TEST_PNG_IMAGE_NAME
+    assert projectTreeActor.GetItemNameAt(1) == TEST_PNG_IMAGE_NAME_2
+    assert (
+        triggerEventMocker.call_args_list.count(
+            mocker.call(MODIFY_IMAGES_LIST_EVENT_NAME)
+        )
+        == 1
+    )
+    ProjectAssertion(TEST_NEW_PROJECT_NAME).AssertImage(
+        ImageAssertion(TEST_PNG_IMAGE_NAME)
+    ).AssertImage(ImageAssertion(TEST_PNG_IMAGE_NAME_2)).Assert()
@@ -1,13 +1,17 @@
 from asyncio.log import logger  # type: ignore
 from components.image_preview_widget.image_preview_widget import ImagePreviewWidget
 from pytest_mock import MockerFixture
+from pytestqt.qtbot import QtBot
 from constants import (
     DEFAULT_THRESHOLD,
+    IMAGE_PREVIEW_CHANGED_EVENT_NAME,
+    IMAGE_PREVIEW_LOADING_TEXT,
     TEST_NEW_PROJECT_NAME,
     TEST_PNG_IMAGE_PATH,
     TEST_PNG_IMAGE_PATH_2,
     VIEW_TAB_NAME,
 )
+from modules.event_system.event_system import EventSystem
 from tests.windows.actors import ProjectTreeActor, TabWidgetActor
 from tests.windows.assertions import (
     ImageAssertion,
@@ -29,6 +33,7 @@ from utils.application import (
 from utils.images import ConvertToBinary, LoadImage
 from .actors import ImagePreviewWidgetActor, MainWindowActor, tabWidgetActor  # type: ignore
 from converted_constants import TEST_PNG_IMAGE_NAME
+from modules.threshold_engine import ThresholdEngine
 from PIL import Image
 
 
@@ -84,6 +89,7 @@ def test_cannot_close_the_view_tab(
     projectTreeActor.OpenContextMenuAt(0).ChooseOpenImageTabAction()
 
     tabWidgetActor.CloseTabWithName(VIEW_TAB_NAME)
+    tabWidgetActor.WaitUntilImagePreviewLoaded(1)
 
     TabWidgetAssertion(mainWindow.ui.centerTabWidget).AssertTabCount(
         2
@@ -118,6 +124,7 @@ def test_cannont_open_image_tab_multiple_times(
     TabWidgetAssertion(mainWindow.ui.centerTabWidget).AssertTabCount(1).Assert()
 
     projectTreeActor.OpenContextMenuAt(0).ChooseOpenImageTabAction()
+    tabWidgetActor.WaitUntilImagePreviewLoaded(1)
     TabWidgetAssertion(mainWindow.ui.centerTabWidget).AssertTabCount(
         2
     ).AssertImagePreviewWidgetNotEmpty(1).Assert()
@@ -174,6 +181,7 @@ def test_open_image_tab_with_correct_path(
     tabWidgetActor.SetTabWidget(mainWindow.ui.centerTabWidget)
 
     projectTreeActor.OpenContextMenuAt(0).ChooseOpenImageTabAction()
+    tabWidgetActor.WaitUntilImagePreviewLoaded(1)
 
     imageOpenMocker.assert_called_once_with(
         GetImageFilePath(
@@ -204,24 +212,21 @@ def test_modify_threshold_then_binary_image_is_updated(
     projectTreeActor.SetProjectTreeView(mainWindow.projectWidget.ui.projectTreeView)
     tabWidgetActor.SetTabWidget(mainWindow.ui.centerTabWidget)
 
-    loadedImage = ConvertToBinary(LoadImage(TEST_PNG_IMAGE_PATH))
-
-    thresholdSliderValueMocker = mocker.patch(
-        "cv2.threshold",
-        return_value=loadedImage,
-    )
+    applySpy = mocker.spy(ThresholdEngine, "Apply")
 
     projectTreeActor.OpenContextMenuAt(0).ChooseOpenImageTabAction()
     imagePreviewWidgetActor.SetImagePreviewWidget(
         mainWindow.ui.centerTabWidget.widget(1)  # type: ignore
-    )
+    ).WaitUntilLoaded()
 
     imagePreviewWidgetActor.AssertThresholdSliderValue(DEFAULT_THRESHOLD)
-    imagePreviewWidgetActor.DragThresholdSlider(123)
+    imagePreviewWidgetActor.DragThresholdSlider(123).WaitUntilBinarized()
 
-    assert thresholdSliderValueMocker.call_count >= 1
-    finalThresholdSliderValue = thresholdSliderValueMocker.call_args[0]
-    assert finalThresholdSliderValue[1] == 123  # threshold value
+    assert applySpy.call_count >= 1
+    assert applySpy.call_args[0][1] == 123  # threshold value
+    imagePreviewWidgetActor.AssertBinaryImage(
+        ConvertToBinary(LoadImage(TEST_PNG_IMAGE_PATH), 123)  # type: ignore
+    )
 
     ProjectAssertion(TEST_NEW_PROJECT_NAME).AssertImage(
         ImageAssertion(TEST_PNG_IMAGE_NAME).AssertThreshold(DEFAULT_THRESHOLD)
@@ -244,6 +249,7 @@ def test_modify_threshold_then_binary_image_is_updated(
 def test_open_project_with_non_default_image_metadata(
     fixtureBuilder: FixtureBuilder,
     projectTreeActor: ProjectTreeActor,
+    qtbot: QtBot,
 ):
     mainWindow = (
         fixtureBuilder.AddProject(
@@ -264,6 +270,7 @@ def test_open_project_with_non_default_image_metadata(
     )
     assert imagePreviewWidget.ui.thresholdSlider.value() == 123
 
+    qtbot.waitUntil(lambda: imagePreviewWidget.IsLoaded)
     TabWidgetAssertion(mainWindow.ui.centerTabWidget).AssertImagePreviewWidgetNotEmpty(
         1
     ).Assert()
@@ -272,6 +279,7 @@ def test_open_project_with_non_default_image_metadata(
 def test_undo_with_threshold_slider(
     fixtureBuilder: FixtureBuilder,
     projectTreeActor: ProjectTreeActor,
+    qtbot: QtBot,
 ):
     mainWindow = (
         fixtureBuilder.AddProject(
@@ -291,6 +299,7 @@ def test_undo_with_threshold_slider(
         mainWindow.ui.centerTabWidget.currentWidget()  # type: ignore
     )
 
+    qtbot.waitUntil(lambda: imagePreviewWidget.IsLoaded)
     imagePreviewWidget.ui.thresholdSlider.setValue(200)
     imagePreviewWidget.ui.thresholdSlider.sliderReleased.emit()
     assert mainWindow.windowTitle() == GetWindowTitle(TEST_NEW_PROJECT_NAME, True)
@@ -299,3 +308,73 @@ def test_undo_with_threshold_slider(
 
     assert imagePreviewWidget.ui.thresholdSlider.value() == 123
     assert mainWindow.windowTitle() == GetWindowTitle(TEST_NEW_PROJECT_NAME)
+
+
+def test_image_tab_appears_before_the_image_is_loaded(
+    fixtureBuilder: FixtureBuilder,
+    projectTreeActor: ProjectTreeActor,
+    tabWidgetActor: TabWidgetActor,
+):
+    mainWindow = (
+        fixtureBuilder.AddProject(
+            ProjectBuilder()
+            .Name(TEST_NEW_PROJECT_NAME)
+            .AddImage(ImageBuilder().ImportPath(TEST_PNG_IMAGE_PATH))
+        )
+        .AddApplication(ApplicationBuilder().AddRecentProject(TEST_NEW_PROJECT_NAME))
+        .Build()
+    )
+
+    projectTreeActor.SetProjectTreeView(mainWindow.projectWidget.ui.projectTreeView)
+    tabWidgetActor.SetTabWidget(mainWindow.ui.centerTabWidget)
+
+    projectTreeActor.OpenContextMenuAt(0).ChooseOpenImageTabAction()
+
+    imagePreviewWidget: ImagePreviewWidget = (
+        mainWindow.ui.centerTabWidget.currentWidget()  # type: ignore
+    )
+    assert not imagePreviewWidget.IsLoaded
+    assert imagePreviewWidget.ui.imagePreviewLabel.text() == IMAGE_PREVIEW_LOADING_TEXT
+    assert not imagePreviewWidget.ui.thresholdSlider.isEnabled()
+
+    tabWidgetActor.WaitUntilImagePreviewLoaded(1)
+    assert imagePreviewWidget.ui.thresholdSlider.isEnabled()
+    TabWidgetAssertion(mainWindow.ui.centerTabWidget).AssertImagePreviewWidgetNotEmpty(
+        1
+    ).Assert()
+
+
+def test_close_image_tab_while_loading_cancels_it(
+    fixtureBuilder: FixtureBuilder,
+    projectTreeActor: ProjectTreeActor,
+    tabWidgetActor: TabWidgetActor,
+    qtbot: QtBot,
+):
+    mainWindow = (
+        fixtureBuilder.AddProject(
+            ProjectBuilder()
+            .Name(TEST_NEW_PROJECT_NAME)
+            .AddImage(ImageBuilder().ImportPath(TEST_PNG_IMAGE_PATH))
+        )
+        .AddApplication(ApplicationBuilder().AddRecentProject(TEST_NEW_PROJECT_NAME))
+        .Build()
+    )
+
+    projectTreeActor.SetProjectTreeView(mainWindow.projectWidget.ui.projectTreeView)
+    tabWidgetActor.SetTabWidget(mainWindow.ui.centerTabWidget)
+
+    projectTreeActor.OpenContextMenuAt(0).ChooseOpenImageTabAction()
+    imagePreviewWidget: ImagePreviewWidget = (
+        mainWindow.ui.centerTabWidget.currentWidget()  # type: ignore
+    )
+
+    tabWidgetActor.CloseTabWithName(TEST_PNG_IMAGE_NAME)
+    qtbot.wait(200)
+
+    TabWidgetAssertion(mainWindow.ui.centerTabWidget).AssertTabCount(1).Assert()
+    assert not imagePreviewWidget.IsLoading
+    assert not imagePreviewWidget.IsLoaded
+    assert (
+        imagePreviewWidget._OnImagePreviewChanged
+        not in EventSystem._callbackMap[IMAGE_PREVIEW_CHANGED_EVENT_NAME]
+    )
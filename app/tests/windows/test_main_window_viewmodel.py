@@ -0,0 +1,46 @@
+import os
+from PIL import Image, PngImagePlugin  # registered before faking
+import pytest  # type: ignore
+from constants import APP_DATA_KEY, APPLICATION_DATA_FOLDER
+from components.new_project_dialog.viewmodel import NewProjectDialogViewModel
+from structs.application import Application
+from structs.image_meta import ImageMeta
+from structs.project import Project
+from utils.application import GetImageFilePath, GetProjectDataFile
+from windows.main_window_viewmodel import MainWindowViewModel
+
+TEST_PROJECT_DIRECTORY = "/projects/probed"
+
+
+@pytest.fixture()
+def projectFile(fs, monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setenv(APP_DATA_KEY, "/appdata")
+    fs.create_dir(os.path.join("/appdata", APPLICATION_DATA_FOLDER))
+
+    project = Project(projectName="probed")
+    project.images.append(ImageMeta(name="image.png"))  # imported before probing
+    project.images.append(ImageMeta(name="missing.png"))
+
+    projectFile = GetProjectDataFile("/projects", "probed")
+    fs.create_file(projectFile, contents=project.ToJson())
+
+    imagePath = GetImageFilePath(TEST_PROJECT_DIRECTORY, "image.png")
+    os.makedirs(os.path.dirname(imagePath))
+    with open(imagePath, "wb") as f:
+        Image.new("RGB", (47, 31)).save(f, format="PNG")
+
+    return projectFile
+
+
+def test_unprobed_images_are_probed_when_the_project_is_opened(projectFile: str):
+    application = Application()
+    application.recentProjectNames.append("probed")
+    application.recentProjectFilePaths["probed"] = projectFile
+    project = Project()
+    viewModel = MainWindowViewModel(application, project, NewProjectDialogViewModel())
+
+    assert viewModel.OpenProject(projectFile)
+
+    image, missingImage = project.images
+    assert (image.width, image.height, image.channels) == (47, 31, 3)
+    assert not missingImage.IsProbed
@@ -1,11 +1,18 @@
 import os
+from typing import Collection
 
 from constants import (
     APP_DATA_KEY,
     APPLICATION_DATA_FILE,
     APPLICATION_DATA_FOLDER,
+    CONTOUR_FOLDER,
+    DISTANCE_FIELD_FOLDER,
+    IMAGE_FOLDER,
+    MASK_FOLDER,
     PROJECT_DATA_FILE,
     TEST_NEW_PROJECT_PATH,
+    THUMBNAIL_FOLDER,
+    THUMBNAIL_INDEX_FILE,
 )
 
 
@@ -49,20 +56,61 @@ def GetWindowTitle(projectName: str | None = None, isModified: bool = False) ->
 
 
 def GetImageFolder(projectDirectory: str) -> str:
-    return os.path.normpath(os.path.join(projectDirectory, "images"))
+    return os.path.normpath(os.path.join(projectDirectory, IMAGE_FOLDER))
 
 
 def GetImageFilePath(projectDirectory: str, imageName: str) -> str:
     return os.path.normpath(os.path.join(GetImageFolder(projectDirectory), imageName))
 
 
+def GetThumbnailFolder(projectDirectory: str) -> str:
+    return os.path.normpath(os.path.join(projectDirectory, THUMBNAIL_FOLDER))
+
+
+def GetThumbnailFilePath(projectDirectory: str, contentHash: str) -> str:
+    return os.path.normpath(
+        os.path.join(GetThumbnailFolder(projectDirectory), f"{contentHash}.png")
+    )
+
+
+def GetThumbnailIndexFile(projectDirectory: str) -> str:
+    return os.path.normpath(
+        os.path.join(GetThumbnailFolder(projectDirectory), THUMBNAIL_INDEX_FILE)
+    )
+
+
+def GetContourFolder(projectDirectory: str) -> str:
+    return os.path.normpath(os.path.join(projectDirectory, CONTOUR_FOLDER))
+
+
+def GetDistanceFieldFolder(projectDirectory: str) -> str:
+    return os.path.normpath(os.path.join(projectDirectory, DISTANCE_FIELD_FOLDER))
+
+
+def GetMaskFolder(projectDirectory: str) -> str:
+    return os.path.normpath(os.path.join(projectDirectory, MASK_FOLDER))
+
+
 def GetImageNameBasedOnExistedImageNames(
     imageName: str,
-    existedImageNames: list[str],
+    existedImageNames: Collection[str],
 ) -> str:
-    finalName = imageName
+    """
+    Returns:
+        The `imageName` if it is not used yet, otherwise the first unused name among
+            "<name> (Copied)", "<name> (Copied 2)", "<name> (Copied 3)"...
+    """
+    if not isinstance(existedImageNames, (set, frozenset, dict)):
+        existedImageNames = set(existedImageNames)
+
+    if imageName not in existedImageNames:
+        return imageName
+
+    finalName = f"{imageName} (Copied)"
+    index = 2
 
     while finalName in existedImageNames:
-        finalName = f"{imageName} (Copied)"
+        finalName = f"{imageName} (Copied {index})"
+        index += 1
 
     return finalName
@@ -1,17 +1,240 @@
-from PIL import Image
+import math
+import struct
+from typing import IO, Callable
+from PIL import Image, ImageFile
 import numpy as np
 import cv2 as cv
 
-from constants import DEFAULT_THRESHOLD
+from constants import (
+    DEFAULT_THRESHOLD,
+    IMAGE_STRIP_ROWS,
+    MAX_DECODED_FRAME_PIXELS,
+    MAX_LARGE_IMAGE_PIXELS,
+)
+from utils.logger import logger
 
+SUPPORTED_REDUCE_FACTORS = (1, 2, 4, 8)
+ALPHA_BACKGROUND_COLOR = (255, 255, 255, 255)
+
+
+def LoadImage(
+    imagePath: str,
+    reduce: int = 1,
+    isCancelled: Callable[[], bool] | None = None,
+) -> cv.Mat | None:
+    """
+    Decode the image file into the BGR uint8 layout which is used through the whole
+        application. For the common modes (RGB, opaque RGBA) the decoded pixels are packed
+        by PIL directly in the BGR order, so the result costs a single allocation beside
+        the decoder's own buffer. Transparent pixels are composited on a white background,
+        grayscale (8 and 16 bits), bilevel and palette images are expanded to BGR.
+
+    Args:
+        imagePath: The path of the image file.
+        reduce: Decode at `1 / reduce` of the resolution (1, 2, 4 or 8). JPEG files are
+            scaled by the decoder itself (DCT scaling), other formats are decoded then
+            reduced with a box filter.
+        isCancelled: Polled while the file is read, the decoding stops (and None is
+            returned) once it returns True.
+
+    Returns:
+        The BGR image or None if the file cannot be decoded or the decoding is cancelled.
+    """
+    if reduce not in SUPPORTED_REDUCE_FACTORS:
+        raise ValueError(
+            f"Reduce factor {reduce} is not supported, use one of {SUPPORTED_REDUCE_FACTORS}"
+        )
 
-def LoadImage(imagePath: str) -> cv.Mat | None:
     try:
-        return cv.cvtColor(np.array(Image.open(imagePath)), cv.COLOR_RGB2BGR)  # type: ignore
-    except:
+        with open(imagePath, "rb") as file, Image.open(
+            file if isCancelled is None else _CancellableFile(file, isCancelled)
+        ) as image:
+            if reduce > 1:
+                image = _ReduceImage(image, reduce)
+
+            return _ToBGR(image)
+    except _LoadCancelled:
+        logger.debug(f'Loading image "{imagePath}" is cancelled')
+        return None
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.error(f'Failed to load image "{imagePath}": {e}')
         return None
 
 
+def LoadGrayImage(imagePath: str) -> cv.Mat | None:
+    """
+    Decode the image file into the grayscale plane binarized by `ThresholdEngine`, for
+        the callers which only need the luminance (e.g. `LuminanceHistogram.FromFile`).
+        JPEG files are decoded directly in grayscale, the decoder skips the chroma
+        planes, so a gray level may differ slightly from the plane of `LoadImage` (the
+        luminance is not taken from the colors clipped to RGB). The other formats are
+        decoded as `LoadImage` does, then converted.
+
+    Returns:
+        The uint8 grayscale image or None if the file cannot be decoded.
+    """
+    try:
+        with Image.open(imagePath) as image:
+            if image.format == "JPEG" and image.mode in ("RGB", "L"):
+                image.draft("L", image.size)
+
+            return _ToGray(image)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.error(f'Failed to load image "{imagePath}": {e}')
+        return None
+
+
+class _LoadCancelled(Exception):
+    pass
+
+
+class _CancellableFile:
+    """
+    The image file which raises `_LoadCancelled` on the next read once the load is
+        cancelled, the decoders of PIL read the file by blocks of at most 64 KiB.
+    """
+
+    def __init__(self, file: IO[bytes], isCancelled: Callable[[], bool]) -> None:
+        self._file = file
+        self._isCancelled = isCancelled
+
+    def read(self, size: int = -1) -> bytes:
+        if self._isCancelled():
+            raise _LoadCancelled()
+
+        return self._file.read(size)
+
+    def __getattr__(self, name: str):
+        return getattr(self._file, name)
+
+
+def _ReduceImage(image: Image.Image, reduce: int) -> Image.Image:
+    width, height = image.size
+    targetSize = (math.ceil(width / reduce), math.ceil(height / reduce))
+
+    if image.format == "JPEG":
+        image.draft(image.mode, targetSize)  # the decoder skips the unneeded DCT data
+
+    return _ReduceBy(image, _RemainingReduceFactor(image, width, reduce))
+
+
+def _ReduceBy(image: Image.Image, factor: int) -> Image.Image:
+    """
+    Box filter reduction, the blocks on the right and bottom borders may be partial.
+    """
+    if factor <= 1:
+        return image
+
+    image = _NormalizeMode(image)
+    if image.mode.startswith("I;16"):
+        image = image.convert("I")  # cannot be reduced
+
+    return image.reduce(factor)
+
+
+def _RemainingReduceFactor(image: Image.Image, width: int, reduce: int) -> int:
+    """
+    The factor which is left after the JPEG decoder scaled the image by `draft` (1 if it
+        did not), `width` is the width of the file.
+    """
+    return max(1, round(reduce * image.size[0] / width))
+
+
+def _NormalizeMode(image: Image.Image) -> Image.Image:
+    """
+    Convert the rare modes into RGB, RGBA, L or the 16-bit grayscale modes.
+    """
+    if image.mode == "P":
+        return image.convert("RGBA" if "transparency" in image.info else "RGB")
+    if image.mode in ("LA", "PA", "La", "RGBa"):
+        return image.convert("RGBA")
+    if image.mode in ("1", "F"):
+        return image.convert("L")
+    if image.mode not in ("RGB", "RGBA", "L", "I", "I;16", "I;16B", "I;16L"):
+        return image.convert("RGB")  # CMYK, YCbCr, LAB, ...
+
+    return image
+
+
+def _ToBGR(image: Image.Image) -> cv.Mat:
+    width, height = image.size
+    image = _NormalizeMode(image)
+
+    if image.mode == "RGBA":
+        alphaMin, _ = image.getextrema()[3]
+        if alphaMin < 255:
+            background = Image.new("RGBA", image.size, ALPHA_BACKGROUND_COLOR)
+            image = Image.alpha_composite(background, image)
+
+    if image.mode in ("RGB", "RGBA"):
+        return _PackPixels(image, "BGR", (height, width, 3))
+
+    if image.mode == "L":
+        gray = _PackPixels(image, "L", (height, width))
+    else:
+        gray = (np.asarray(image).clip(0, 65535) >> 8).astype(np.uint8)  # 16 bits
+
+    return cv.cvtColor(gray, cv.COLOR_GRAY2BGR)  # type: ignore
+
+
+def _PackPixels(
+    image: Image.Image,
+    rawmode: str,
+    shape: tuple[int, ...],
+) -> np.ndarray:
+    """
+    The same as `np.frombuffer(image.tobytes("raw", rawmode))` but the packed chunks are
+        written directly into the returned array, `tobytes` keeps all the chunks and joins
+        them which costs twice the size of the image.
+
+    The raw encoder is a private API of PIL (the version is pinned in the requirements),
+        if it is not available the pixels are converted by `_ConvertPixels` instead.
+    """
+    image.load()
+    try:
+        encoder = _GetRawEncoder(image, rawmode)
+    except (AttributeError, TypeError) as e:
+        logger.debug(f"Raw encoder is not available, converting the pixels: {e}")
+        return _ConvertPixels(image, rawmode)
+
+    target = np.empty(shape, dtype=np.uint8)
+    flatTarget = target.reshape(-1)
+    bufferSize = max(ImageFile.MAXBLOCK, image.size[0] * 4)
+
+    offset = 0
+    while True:
+        _, errorCode, data = encoder.encode(bufferSize)  # type: ignore
+        flatTarget[offset : offset + len(data)] = np.frombuffer(data, dtype=np.uint8)
+        offset += len(data)
+        if errorCode:
+            break
+
+    if errorCode < 0 or offset != target.size:
+        raise ValueError(f"Failed to pack the image pixels (error {errorCode})")
+
+    return target
+
+
+def _GetRawEncoder(image: Image.Image, rawmode: str):
+    encoder = Image._getencoder(image.mode, "raw", rawmode)  # type: ignore
+    encoder.setimage(image.im, (0, 0) + image.size)  # type: ignore
+    return encoder
+
+
+def _ConvertPixels(image: Image.Image, rawmode: str) -> np.ndarray:
+    """
+    The fallback of `_PackPixels` through the public array interface, which costs a
+        temporary copy of the image.
+    """
+    pixels = np.asarray(image)
+    if rawmode == "L":
+        return pixels.copy()
+
+    return cv.cvtColor(  # type: ignore
+        pixels, cv.COLOR_RGBA2BGR if image.mode == "RGBA" else cv.COLOR_RGB2BGR
+    )
+
+
 def ConvertToBinary(
     image: cv.Mat | None,
     threshold: int = DEFAULT_THRESHOLD,
@@ -26,3 +249,158 @@ def ConvertToBinary(
         return binaryImage  # type: ignore
     except:
         return grayImage  # type: ignore
+
+
+def LoadBinaryImage(
+    imagePath: str,
+    threshold: int = DEFAULT_THRESHOLD,
+    reduce: int = 1,
+    output: np.ndarray | None = None,
+    outputPath: str | None = None,
+    stripRows: int = IMAGE_STRIP_ROWS,
+) -> np.ndarray | None:
+    """
+    Binarize a very large image without `LoadImage`: the decoded frame is cut into row
+        strips and each strip is converted to grayscale, reduced, thresholded and written
+        into the preallocated mask, so neither the full BGR image nor the full grayscale
+        image is allocated.
+
+    The decoded frame itself is kept in memory while the mask is computed. JPEG files
+        are decoded directly in grayscale and at the reduced scale (DCT scaling), so their
+        frame is about as large as the mask. PIL cannot decode the other formats
+        partially, their whole frame is decoded in its own mode (e.g. 3 bytes per pixel
+        for RGB). The frames of more than `MAX_DECODED_FRAME_PIXELS` pixels are rejected
+        before they are decoded.
+
+    The result is the same as `ConvertToBinary(LoadImage(imagePath, reduce), threshold)`,
+        except for JPEG files whose luminance comes from the decoder (a gray level may
+        differ by 1).
+
+    Args:
+        imagePath: The path of the image file.
+        threshold: The pixels which are greater than the threshold are 255, otherwise 0.
+        reduce: Binarize at `1 / reduce` of the resolution (1, 2, 4 or 8).
+        output: The preallocated (ceil(height / reduce), ceil(width / reduce)) uint8 mask.
+        outputPath: Write the mask into a memory-mapped `.npy` file instead, ignored if
+            `output` is given.
+        stripRows: The number of mask rows computed at once.
+
+    Returns:
+        The mask (the `output`, the memory map or a new array), None if the file cannot be
+            decoded or its frame is too large.
+
+    Raises:
+        ValueError: If the `reduce` factor is not supported or the `output` has the wrong
+            shape.
+    """
+    if reduce not in SUPPORTED_REDUCE_FACTORS:
+        raise ValueError(
+            f"Reduce factor {reduce} is not supported, use one of {SUPPORTED_REDUCE_FACTORS}"
+        )
+
+    try:
+        with _OpenLargeImage(imagePath) as image:
+            width, height = image.size
+            shape = (math.ceil(height / reduce), math.ceil(width / reduce))
+
+            if output is not None and (
+                output.shape != shape or output.dtype != np.uint8
+            ):
+                raise ValueError(
+                    f"Output {output.shape} {output.dtype} does not match the mask {shape}"
+                )
+
+            if image.format == "JPEG" and image.mode in ("RGB", "L"):
+                image.draft("L", (shape[1], shape[0]))
+            else:
+                logger.info(
+                    f'"{imagePath}" cannot be reduced while it is decoded, its '
+                    f"{image.mode} frame is decoded whole"
+                )
+
+            if image.size[0] * image.size[1] > MAX_DECODED_FRAME_PIXELS:
+                raise Image.DecompressionBombError(
+                    f"Decoded frame ({image.size[0] * image.size[1]} pixels) exceeds "
+                    f"the limit of {MAX_DECODED_FRAME_PIXELS} pixels"
+                )
+            factor = _RemainingReduceFactor(image, width, reduce)
+
+            if output is None:
+                output = (
+                    np.lib.format.open_memmap(
+                        outputPath, mode="w+", dtype=np.uint8, shape=shape
+                    )
+                    if outputPath is not None
+                    else np.empty(shape, dtype=np.uint8)
+                )
+
+            image.load()
+            for top in range(0, shape[0], stripRows):
+                bottom = min(top + stripRows, shape[0])
+                strip = image.crop(
+                    (
+                        0,
+                        top * factor,
+                        image.size[0],
+                        min(bottom * factor, image.size[1]),
+                    )
+                )
+
+                cv.threshold(
+                    _ToGray(_ReduceBy(strip, factor)),
+                    threshold,
+                    255,
+                    cv.THRESH_BINARY,
+                    dst=output[top:bottom],
+                )
+
+        if isinstance(output, np.memmap):
+            output.flush()
+
+        return output
+    except (OSError, Image.DecompressionBombError) as e:
+        logger.error(f'Failed to binarize image "{imagePath}": {e}')
+        return None
+
+
+def _OpenLargeImage(imagePath: str) -> Image.Image:
+    """
+    Open the image as `Image.open` does but with the decompression bomb limit of the
+        large images (`LoadBinaryImage`), the limit of PIL (`Image.MAX_IMAGE_PIXELS`) rejects the
+        large scans and is shared by the whole process.
+
+    Raises:
+        Image.DecompressionBombError: If the image has more pixels than the limit.
+        Image.UnidentifiedImageError: If no plugin of PIL can open the file.
+    """
+    with open(imagePath, "rb") as f:
+        prefix = f.read(16)
+
+    Image.init()
+    for formatId in Image.ID:
+        factory, accept = Image.OPEN[formatId]
+        if accept is not None and not accept(prefix):
+            continue
+
+        try:
+            image = factory(imagePath, imagePath)  # the image owns the file
+        except (SyntaxError, IndexError, TypeError, struct.error):
+            continue
+
+        if image.size[0] * image.size[1] > MAX_LARGE_IMAGE_PIXELS:
+            image.close()
+            raise Image.DecompressionBombError(
+                f"Image size ({image.size[0] * image.size[1]} pixels) exceeds the limit "
+                f"of {MAX_LARGE_IMAGE_PIXELS} pixels"
+            )
+
+        return image
+
+    raise Image.UnidentifiedImageError(f'Cannot identify image file "{imagePath}"')
+
+
+def _ToGray(image: Image.Image) -> cv.Mat:
+    if image.mode == "L":
+        return _PackPixels(image, "L", (image.size[1], image.size[0]))
+
+    return cv.cvtColor(_ToBGR(image), cv.COLOR_BGR2GRAY)
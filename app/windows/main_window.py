@@ -8,11 +8,13 @@ from components.new_project_dialog.dialog import NewProjectDialog
 from components.project_widget.project_widget import ProjectWidget
 from components.opengl_setting_widget import OpenGLSettingWidget
 from constants import (
+    AUTO_THRESHOLD_PROGRESS_EVENT_NAME,
     CHANGE_PROJECT_EVENT_NAME,
     EMPTY_HISTORY_EVENT_NAME,
     HISTORY_NOT_EMPTY_EVENT_NAME,
     OPEN_IMAGE_TAB_EVENT_NAME,
     RECENT_PROJECTS_EVENT_NAME,
+    SCULPTURE_CHANGED_EVENT_NAME,
     VIEW_TAB_NAME,
 )
 from converted_uis.main_window import Ui_MainWindow
@@ -80,10 +82,27 @@ class MainWindow(QMainWindow):
             RECENT_PROJECTS_EVENT_NAME, self._RecentProjectsCallback
         )
         EventSystem.RegisterEvent(OPEN_IMAGE_TAB_EVENT_NAME, self._OpenImageTabCallback)
+        EventSystem.RegisterEvent(
+            AUTO_THRESHOLD_PROGRESS_EVENT_NAME, self._AutoThresholdProgressCallback
+        )
+        EventSystem.RegisterEvent(
+            SCULPTURE_CHANGED_EVENT_NAME, self._SculptureChangedCallback
+        )
 
     def _UpdateTitle(self) -> None:
         self.setWindowTitle(self.viewModel.WindowTitle)
 
+    def _AutoThresholdProgressCallback(self, done: int, total: int) -> None:
+        if done < total:
+            self.ui.statusbar.showMessage(f"Auto threshold: {done}/{total} images")
+        else:
+            self.ui.statusbar.showMessage(f"Auto threshold: {total} images done", 3000)
+
+    def _SculptureChangedCallback(self, viewCount: int, voxelCount: int) -> None:
+        self.ui.statusbar.showMessage(
+            f"Sculpture: {voxelCount} voxels carved from {viewCount} images", 3000
+        )
+
     def _OpenProjectCallback(self) -> None:
         options = QFileDialog.Option.ReadOnly
 
@@ -171,4 +190,6 @@ class MainWindow(QMainWindow):
         widget = centerTabWidget.widget(index)
 
         if widget and isinstance(widget, ImagePreviewWidget):
+            widget.Close()
             centerTabWidget.removeTab(index)
+            widget.deleteLater()
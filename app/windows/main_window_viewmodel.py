@@ -6,6 +6,7 @@ from components.new_project_dialog.viewmodel import NewProjectDialogViewModel
 from modules.dependency_injection.helper import as_dependency
 from modules.event_system.event_system import EventSystem
 from modules.history_manager import HistoryManager
+from modules.image_probe import ProbeImages
 from structs.application import Application
 from structs.project import Project
 
@@ -13,6 +14,7 @@ from utils.logger import logger
 from utils.application import (
     GetApplicationDataFolder,
     GetApplicationDataFile,
+    GetImageFilePath,
     GetImageFolder,
     GetProjectDataFile,
     GetProjectDataFolder,
@@ -146,6 +148,7 @@ class MainWindowViewModel:
                 self._RemoveRecentProject(projectName)
                 return False
 
+        self._ProbeImages()
         self._AddRecentProject(self.project.projectName, projectFile)
 
         EventSystem.TriggerEvent(CHANGE_PROJECT_EVENT_NAME)
@@ -157,6 +160,26 @@ class MainWindowViewModel:
         self._UpdateProjectDataFile()
         HistoryManager.Reset()
 
+    def _ProbeImages(self) -> None:
+        """
+        Read the headers of the images which were imported before their size was stored
+            in the image meta, once when the project is opened. All files are probed
+            concurrently, the sizes are saved with the project.
+        """
+        images = [image for image in self.project.images if not image.IsProbed]
+        headers = ProbeImages(
+            [
+                GetImageFilePath(
+                    self.application.CurrentProjectDirectory, image.FileName
+                )
+                for image in images
+            ]
+        )
+
+        for image, header in zip(images, headers):
+            if header is not None:
+                header.ApplyTo(image)
+
     def _RemoveRecentProject(self, projectName: str) -> None:
         if projectName in self.application.recentProjectNames:
             self.application.recentProjectNames.remove(projectName)